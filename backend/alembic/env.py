@@ -15,6 +15,9 @@ from app.models.user import User  # noqa: F401
 from app.models.message import Conversation, Message  # noqa: F401
 from app.models.grid_audit_run import GridAuditRun  # noqa: F401
 from app.models.usage_daily import UsageDaily  # noqa: F401
+from app.models.dashboard_metric import DashboardMetric  # noqa: F401
+from app.models.email_outbox import EmailOutbox  # noqa: F401
+from app.models.llm_cache import LlmCacheEntry  # noqa: F401
 
 settings = get_settings()
 config = context.config
@@ -0,0 +1,42 @@
+"""add llm_cache
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-06-09
+
+rank_and_explain re-sent byte-identical GPT-4o rerank prompts whenever
+regeneration ran on an unchanged pool (nightly refresh, a profile save that
+changed nothing the prompt reads). Responses are now cached here by prompt
+fingerprint with a TTL; see app/services/llm_cache.py.
+
+ix_llm_cache_expires_at backs the nightly purge. RLS on from day one — see
+f3a8c5d29014 for why no policies are needed.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "a3b4c5d6e7f8"
+down_revision = "f2a3b4c5d6e7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_cache",
+        sa.Column("key", sa.String(64), primary_key=True),
+        sa.Column("model", sa.String(64), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.text("NOW()")),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("hits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_hit_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_llm_cache_expires_at", "llm_cache", ["expires_at"])
+    op.execute('ALTER TABLE public."llm_cache" ENABLE ROW LEVEL SECURITY;')
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_cache_expires_at", table_name="llm_cache")
+    op.drop_table("llm_cache")
@@ -0,0 +1,36 @@
+"""add dashboard_metrics snapshot table
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-05-30
+
+One row per dashboard payload (stats, match_quality, investor_heatmap,
+revenue, adoption), refreshed on a schedule and after every sync. Same
+shape of idea as usage_daily: the dashboard reads a precomputed row
+instead of aggregating attendees/matches (and calling Extasy) per request.
+
+RLS on from day one — see f3a8c5d29014 for why no policies are needed.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "b8c9d0e1f2a3"
+down_revision = "a7b8c9d0e1f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dashboard_metrics",
+        sa.Column("key", sa.String(64), primary_key=True),
+        sa.Column("payload", postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column("computed_at", sa.DateTime(), nullable=False, server_default=sa.text("NOW()")),
+        sa.Column("duration_ms", sa.Integer(), nullable=True),
+    )
+    op.execute('ALTER TABLE public."dashboard_metrics" ENABLE ROW LEVEL SECURITY;')
+
+
+def downgrade() -> None:
+    op.drop_table("dashboard_metrics")
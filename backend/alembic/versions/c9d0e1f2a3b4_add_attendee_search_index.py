@@ -0,0 +1,86 @@
+"""add attendee search index — immutable unaccent, search_vector, trigram GINs
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-05-30
+
+/attendees/search used `unaccent(lower(col)) LIKE '%term%'` across five
+text columns: no index can serve that, so every directory keystroke scanned
+the table and unaccented every goals / ai_summary blob.
+
+  - `immutable_unaccent(text)`: `unaccent()` is only STABLE (it depends on
+    the dictionary search_path), so it can't appear in a generated column
+    or index expression. The wrapper pins the dictionary by schema and is
+    declared IMMUTABLE — the standard workaround.
+  - `attendees.search_vector`: generated, stored tsvector over the five
+    searched fields (weights A name/company, B title, C goals, D summary),
+    'simple' config — names and multilingual bios must not be stemmed.
+  - GIN on search_vector (FTS + prefix `:*` queries) and pg_trgm GINs on
+    the unaccented name / company / title (substring + similarity ranking
+    for type-ahead on the short fields).
+
+Supabase installs extensions into the `extensions` schema, other Postgres
+installs into `public`, so the schema is looked up rather than hard-coded.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "c9d0e1f2a3b4"
+down_revision = "b8c9d0e1f2a3"
+branch_labels = None
+depends_on = None
+
+# Keep in sync with Attendee.search_vector (app/models/attendee.py).
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', immutable_unaccent(lower(coalesce(name, '')))), 'A') || "
+    "setweight(to_tsvector('simple', immutable_unaccent(lower(coalesce(company, '')))), 'A') || "
+    "setweight(to_tsvector('simple', immutable_unaccent(lower(coalesce(title, '')))), 'B') || "
+    "setweight(to_tsvector('simple', immutable_unaccent(lower(coalesce(goals, '')))), 'C') || "
+    "setweight(to_tsvector('simple', immutable_unaccent(lower(coalesce(ai_summary, '')))), 'D')"
+)
+
+TRGM_COLUMNS = ("name", "company", "title")
+
+
+def _ext_schema(bind, name: str) -> str:
+    return bind.execute(
+        sa.text(
+            "SELECT n.nspname FROM pg_extension e "
+            "JOIN pg_namespace n ON n.oid = e.extnamespace WHERE e.extname = :name"
+        ),
+        {"name": name},
+    ).scalar_one()
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    bind = op.get_bind()
+    unaccent_schema = _ext_schema(bind, "unaccent")
+    trgm_schema = _ext_schema(bind, "pg_trgm")
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION public.immutable_unaccent(text)
+        RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT {unaccent_schema}.unaccent('{unaccent_schema}.unaccent'::regdictionary, $1) $$
+    """)
+
+    op.execute(
+        f"ALTER TABLE attendees ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+    )
+    op.execute("CREATE INDEX ix_attendees_search_vector ON attendees USING gin (search_vector)")
+    for col in TRGM_COLUMNS:
+        op.execute(
+            f"CREATE INDEX ix_attendees_{col}_trgm ON attendees "
+            f"USING gin (immutable_unaccent(lower({col})) {trgm_schema}.gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    for col in TRGM_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_attendees_{col}_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_attendees_search_vector")
+    op.drop_column("attendees", "search_vector")
+    op.execute("DROP FUNCTION IF EXISTS public.immutable_unaccent(text)")
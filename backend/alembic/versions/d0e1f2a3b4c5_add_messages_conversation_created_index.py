@@ -0,0 +1,31 @@
+"""add (conversation_id, created_at, id) index on messages
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-05-31
+
+GET /messages/conversations/{match_id} now pages history by keyset on
+(created_at, id) within a conversation. The single-column
+ix_messages_conversation_id finds the rows but still has to sort the whole
+conversation for every page; this composite serves the ORDER BY + LIMIT
+directly (forwards for `after`, backwards for the newest page / `before`).
+`id` is the tie-breaker for messages sharing a timestamp.
+"""
+from alembic import op
+
+revision = "d0e1f2a3b4c5"
+down_revision = "c9d0e1f2a3b4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_messages_conversation_created",
+        "messages",
+        ["conversation_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_conversation_created", table_name="messages")
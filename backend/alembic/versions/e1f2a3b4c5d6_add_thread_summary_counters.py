@@ -0,0 +1,46 @@
+"""add threads.post_count / latest_post_at + thread_posts keyset index
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-05-31
+
+/threads ran a COUNT and a latest-post query per thread (22 round trips
+for the 11 default threads) on every 5s poll of the warm-up page. The
+counters are now maintained by POST /threads/{slug} inside the post's
+transaction, so the listing is one SELECT. Backfilled from thread_posts.
+
+ix_thread_posts_thread_created serves the keyset-paginated post feed the
+same way ix_messages_conversation_created serves conversation history.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "e1f2a3b4c5d6"
+down_revision = "d0e1f2a3b4c5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("threads", sa.Column("post_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("threads", sa.Column("latest_post_at", sa.DateTime(), nullable=True))
+    op.execute("""
+        UPDATE threads t
+        SET post_count = s.n, latest_post_at = s.latest
+        FROM (
+            SELECT thread_id, COUNT(*) AS n, MAX(created_at) AS latest
+            FROM thread_posts GROUP BY thread_id
+        ) s
+        WHERE s.thread_id = t.id
+    """)
+    op.create_index(
+        "ix_thread_posts_thread_created",
+        "thread_posts",
+        ["thread_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_thread_posts_thread_created", table_name="thread_posts")
+    op.drop_column("threads", "latest_post_at")
+    op.drop_column("threads", "post_count")
@@ -0,0 +1,54 @@
+"""add email_outbox
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-06-08
+
+_send_email used to POST to Resend synchronously (15s timeout) from inside
+the async crons and generate_matches_for_attendee, blocking the event loop
+that serves HTTP. Gated mail is now written here and delivered by the
+outbox worker in Resend batches, with retries.
+
+ix_email_outbox_due is partial: the worker only ever scans pending/sending
+rows, and sent rows pile up.
+
+RLS on from day one — see f3a8c5d29014 for why no policies are needed.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "f2a3b4c5d6e7"
+down_revision = "e1f2a3b4c5d6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.text("NOW()")),
+        sa.Column("to_email", sa.String(320), nullable=False),
+        sa.Column("subject", sa.Text(), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column("critical", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False, server_default=sa.text("NOW()")),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+        sa.Column("provider_id", sa.String(64), nullable=True),
+    )
+    op.create_index(
+        "ix_email_outbox_due",
+        "email_outbox",
+        ["next_attempt_at"],
+        postgresql_where=sa.text("status IN ('pending', 'sending')"),
+    )
+    op.execute('ALTER TABLE public."email_outbox" ENABLE ROW LEVEL SECURITY;')
+
+
+def downgrade() -> None:
+    op.drop_index("ix_email_outbox_due", table_name="email_outbox")
+    op.drop_table("email_outbox")
@@ -4,6 +4,7 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.deps import require_auth, require_admin
+from app.core.responses import model_response
 from app.models.user import User
 from app.models.attendee import Attendee, TicketType
 from app.schemas.attendee import AttendeeCreate, AttendeeResponse, AttendeeListResponse, OnboardingSubmit, OnboardingResponse
@@ -15,41 +16,29 @@ router = APIRouter(prefix="/attendees", tags=["attendees"])
 async def search_attendees(
     q: str = Query(..., min_length=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
     _user: User = Depends(require_auth),
 ):
-    """Full-text search across name, company, title, goals, and ai_summary.
+    """Ranked search across name, company, title, goals, and ai_summary.
 
-    Accent-insensitive: wraps both the term and the columns in `unaccent()`
-    so typing "stephanie" matches "Stéphanie", "chloe" matches "Chloé", etc.
-    Requires the `unaccent` Postgres extension.
+    Accent-insensitive ("stephanie" matches "Stéphanie"), prefix-matching for
+    type-ahead, served by the search_vector / trigram indexes — see
+    app/services/attendee_search.py. Pass `next_cursor` back as `cursor` for
+    the next page.
     """
-    from sqlalchemy import or_
-    term = f"%{q.lower()}%"
-
-    def u(col):
-        return func.unaccent(func.lower(col))
-
-    uterm = func.unaccent(term)
-    query = (
-        select(Attendee)
-        .where(
-            or_(
-                u(Attendee.name).like(uterm),
-                u(Attendee.company).like(uterm),
-                u(Attendee.title).like(uterm),
-                u(Attendee.goals).like(uterm),
-                u(Attendee.ai_summary).like(uterm),
-            )
-        )
-        .limit(limit)
-    )
-    result = await db.execute(query)
-    attendees = result.scalars().all()
-    return AttendeeListResponse(
-        attendees=[AttendeeResponse.model_validate(a) for a in attendees],
-        total=len(attendees),
-    )
+    from app.services.attendee_search import build_search_query, encode_cursor
+    try:
+        query = build_search_query(q, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    rows = (await db.execute(query)).all()
+    page, more = rows[:limit], len(rows) > limit
+    return model_response(AttendeeListResponse(
+        attendees=[AttendeeResponse.model_validate(a) for a, _rank in page],
+        total=len(page),
+        next_cursor=encode_cursor(page[-1][1], page[-1][0].id) if more else None,
+    ))
 
 
 @router.get("", response_model=AttendeeListResponse)
@@ -74,10 +63,12 @@ async def list_attendees(
         count_query = count_query.where(Attendee.ticket_type == ticket_type)
     total = (await db.execute(count_query)).scalar()
 
-    return AttendeeListResponse(
+    # Up to 1000 rows: skip FastAPI's response_model re-validation, see
+    # app/core/responses.py.
+    return model_response(AttendeeListResponse(
         attendees=[AttendeeResponse.model_validate(a) for a in attendees],
         total=total,
-    )
+    ))
 
 
 @router.get("/{attendee_id}", response_model=AttendeeResponse)
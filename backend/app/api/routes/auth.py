@@ -8,13 +8,13 @@ from sqlalchemy import select
 
 from app.core.config import get_settings
 from app.core.database import get_db
-from app.core.security import verify_password, get_password_hash, create_access_token, create_reset_token, decode_reset_token
-from app.core.deps import require_auth
+from app.core.security import verify_password_async, hash_password_async, create_access_token, create_reset_token, decode_reset_token
+from app.core.deps import invalidate_user_cache, require_auth
 from app.core.limiter import limiter
 from app.models.user import User
 from app.models.attendee import Attendee
 from app.schemas.auth import RegisterRequest, LoginRequest, Token, UserResponse, ForgotPasswordRequest, ResetPasswordRequest, ClaimAccountRequest, JoinRequest
-from app.services.profile_pipeline import refresh_profile_matches, run_full_enrichment
+from app.services.profile_pipeline import request_profile_refresh, run_full_enrichment
 from app.services.embeddings import generate_ai_summary
 from app.services.email import send_password_reset_email, send_welcome_email
 from app.services.avatars import upload_avatar, AvatarError, MAX_BYTES
@@ -138,6 +138,10 @@ async def register(
     if (await db.execute(select(User).where(User.email == data.email))).scalars().first():
         raise HTTPException(status_code=400, detail="Email already registered")
 
+    # Hash before the attendee upsert so the ~250ms bcrypt run doesn't sit
+    # inside the write transaction.
+    hashed_password = await hash_password_async(data.password)
+
     attendee = await _upsert_attendee_from_payload(
         db, data, force_ticket_type=None, enforce_ticket_gate=True,
     )
@@ -147,7 +151,7 @@ async def register(
     # Create auth user
     user = User(
         email=data.email,
-        hashed_password=get_password_hash(data.password),
+        hashed_password=hashed_password,
         full_name=data.name,
         attendee_id=attendee.id,
     )
@@ -163,7 +167,8 @@ async def register(
     if attendee.enriched_at is None:
         asyncio.create_task(run_full_enrichment(attendee.id))
     else:
-        asyncio.create_task(refresh_profile_matches(attendee.id))
+        # immediate: no one is mid-edit at login, skip the quiet period.
+        request_profile_refresh(attendee.id, immediate=True)
 
     token = create_access_token({"sub": str(user.id)})
     return Token(access_token=token)
@@ -190,6 +195,8 @@ async def join(
             detail="Email already registered — please log in instead.",
         )
 
+    hashed_password = await hash_password_async(data.password)
+
     attendee = await _upsert_attendee_from_payload(
         db, data, force_ticket_type="SPONSOR", enforce_ticket_gate=False,
     )
@@ -197,7 +204,7 @@ async def join(
 
     user = User(
         email=data.email,
-        hashed_password=get_password_hash(data.password),
+        hashed_password=hashed_password,
         full_name=data.name,
         attendee_id=attendee.id,
     )
@@ -266,12 +273,13 @@ async def claim_account(
     # Promote a real email onto the attendee row if they supplied one
     # (replaces the placeholder). attendees.email is unique, so a collision
     # with another attendee surfaces as IntegrityError below.
+    hashed_password = await hash_password_async(data.password)
     if data.email and new_email != (attendee.email or "").lower():
         attendee.email = new_email
 
     user = User(
         email=new_email,
-        hashed_password=get_password_hash(data.password),
+        hashed_password=hashed_password,
         full_name=attendee.name,
         attendee_id=attendee.id,
     )
@@ -294,7 +302,7 @@ async def claim_account(
 async def login(request: Request, data: LoginRequest, db: AsyncSession = Depends(get_db)):
     """Authenticate with email + password, returns JWT token."""
     user = (await db.execute(select(User).where(User.email == data.email))).scalars().first()
-    if not user or not verify_password(data.password, user.hashed_password):
+    if not user or not await verify_password_async(data.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Incorrect email or password")
 
     # Adoption tracking — stamp last_login_at, throttled to once/hour and
@@ -368,11 +376,14 @@ async def update_profile(
     attendee.embedding = None
 
     await db.commit()
+    if "name" in data:
+        invalidate_user_cache(user.id)  # after commit, so no re-cache of the old name
     await db.refresh(attendee)
 
-    # Save triggers an immediate re-embed + match refresh (the "enrich your
-    # profile to unlock better matches" loop) instead of waiting for the cron.
-    asyncio.create_task(refresh_profile_matches(attendee.id))
+    # Save queues a re-embed + match refresh (the "enrich your profile to
+    # unlock better matches" loop) instead of waiting for the cron. Queued,
+    # not run: consecutive saves within the quiet period share one refresh.
+    request_profile_refresh(attendee.id)
 
     from app.schemas.attendee import AttendeeResponse
     return {
@@ -447,11 +458,12 @@ async def forgot_password(request: Request, data: ForgotPasswordRequest, db: Asy
     user = (await db.execute(select(User).where(User.email == data.email))).scalars().first()
     if user:
         token = create_reset_token(str(user.id))
-        # Fire-and-forget. send_password_reset_email is a SYNC httpx call;
-        # awaiting it inline blocks the event loop and was hanging the request
-        # ~60s on prod. Run it in a thread, detached, so the response returns
-        # immediately (same detached-task rationale as the profile_pipeline
-        # triggers used at registration/join).
+        # Fire-and-forget. send_password_reset_email used to be a SYNC httpx
+        # call; awaiting it inline blocked the event loop and was hanging the
+        # request ~60s on prod. It now only enqueues to the email outbox, but
+        # stays in a detached thread so the response never waits on rendering
+        # (same detached-task rationale as the profile_pipeline triggers used
+        # at registration/join).
         # force=True: account recovery is transactional and must reach real
         # (non-team) attendees even while EMAIL_MODE=allowlist gates bulk
         # engagement mail. Without it, a CLAIMED non-team account (e.g.
@@ -515,6 +527,7 @@ async def reset_password(data: ResetPasswordRequest, db: AsyncSession = Depends(
     if not user:
         raise HTTPException(status_code=400, detail="Reset link is invalid or has expired")
 
-    user.hashed_password = get_password_hash(data.new_password)
+    user.hashed_password = await hash_password_async(data.new_password)
     await db.commit()
+    invalidate_user_cache(user.id)
     return {"message": "Password updated successfully"}
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
@@ -27,7 +26,7 @@ from app.services.concierge import (
     profile_data_quality,
     select_next_field_to_offer,
 )
-from app.services.profile_pipeline import refresh_profile_matches
+from app.services.profile_pipeline import request_profile_refresh
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/chat", tags=["chat"])
@@ -218,11 +217,11 @@ async def save_field(
 
     # photo_url doesn't affect embeddings or match quality, so skip the
     # background re-embed — saves an OpenAI call + match-gen round-trip.
-    # Dispatch detached (asyncio.create_task, not BackgroundTasks) per
-    # profile_pipeline's docstring: BackgroundTasks holds the request worker
-    # through the 10-20s pipeline and can 504 the edge.
+    # Queued (profile_pipeline.refresh_queue), not BackgroundTasks: that holds
+    # the request worker through the 10-20s pipeline and can 504 the edge.
+    # Several save_field calls in a row collapse into one refresh.
     if data.field != "photo_url":
-        asyncio.create_task(refresh_profile_matches(attendee.id))
+        request_profile_refresh(attendee.id)
     return {"ok": True}
 
 
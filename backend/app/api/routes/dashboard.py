@@ -1,12 +1,15 @@
 import csv
 import io
 from collections import defaultdict
+from datetime import datetime
 
 import httpx
 import structlog
 logger = structlog.get_logger(__name__)
-from fastapi import APIRouter, Depends, Query, BackgroundTasks
-from sqlalchemy import select, func, and_
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, func, and_, or_, text
+from sqlalchemy.dialects.postgresql import array as pg_array
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.config import get_settings
@@ -14,6 +17,23 @@ from app.models.attendee import Attendee, Match
 from app.schemas.attendee import DashboardStats
 from app.core.deps import require_auth, require_admin
 from app.models.user import User
+from app.services.exports import (
+    EXPORT_FORMATS,
+    FEEDBACK_COLUMNS,
+    MATCH_COLUMNS,
+    build_match_export_query,
+    encode_export,
+    export_filename,
+    parse_columns,
+    serialize_row,
+    stream_partitions,
+)
+from app.services.dashboard_metrics import (
+    refresh_dashboard_metrics,
+    refresh_if_stale,
+    refresh_in_progress,
+    serve_metric,
+)
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 settings = get_settings()
@@ -59,6 +79,37 @@ def _linkedin_pending(attendee) -> bool:
     return True
 
 
+def _filled(expr):
+    """SQL twin of Python truthiness for a text column or a JSONB `->>` path:
+    NULL and '' are falsy, anything else counts."""
+    return func.coalesce(expr, "") != ""
+
+
+def _json_flag_set(expr):
+    """Truthiness for a JSONB `->>` value that may be a bool, string or
+    number (e.g. `linkedin_unscrapable`): JSON false/0/null/"" are falsy."""
+    return func.coalesce(expr, "").notin_(["", "false", "0", "null"])
+
+
+_EP = Attendee.enriched_profile
+_HAS_LINKEDIN_DATA = _filled(_EP["linkedin"]["headline"].astext)
+_HAS_GRID = _filled(_EP["grid"]["grid_name"].astext)
+_PASS_NAME = _EP["extasy"]["ticket_name"].astext
+
+
+def _linkedin_pending_clause():
+    """`_linkedin_pending` as a WHERE/FILTER clause, so the dashboard can
+    count the backlog in SQL instead of loading every attendee's JSONB.
+    Keep the two in lockstep."""
+    return and_(
+        _filled(Attendee.linkedin_url),
+        ~_HAS_LINKEDIN_DATA,
+        ~_json_flag_set(_EP["linkedin_unscrapable"].astext),
+        ~_json_flag_set(_EP["linkedin_enriched_at"].astext),
+        ~func.coalesce(Attendee.email, "").like("%@demo.proofoftalk.io"),
+    )
+
+
 def _summarise_revenue(valid_orders: list[dict]) -> dict:
     """Aggregate revenue / paid / comp from already-filtered valid orders.
 
@@ -122,10 +173,19 @@ def _compute_kpi_rates(
     return mutual_accept_rate, scheduled_rate, show_rate
 
 
-@router.get("/stats", response_model=DashboardStats)
-async def get_stats(db: AsyncSession = Depends(get_db), _user: User = Depends(require_auth)):
+async def _compute_stats(db: AsyncSession) -> dict:
     """Organiser dashboard: event-wide stats."""
-    total_attendees = (await db.execute(select(func.count(Attendee.id)))).scalar() or 0
+    # One aggregate row for attendees, one for matches (FILTER clauses instead
+    # of a round trip per counter), one grouped unnest for top sectors.
+    att = (
+        await db.execute(
+            select(
+                func.count(Attendee.id),
+                func.count(Attendee.id).filter(Attendee.ai_summary.isnot(None)),
+            )
+        )
+    ).one()
+    total_attendees, enriched_count = att[0] or 0, att[1] or 0
 
     # Exclude matches involving admin-linked attendees so demo/test accounts don't skew stats
     admin_attendee_subq = (
@@ -143,57 +203,42 @@ async def get_stats(db: AsyncSession = Depends(get_db), _user: User = Depends(re
         Match.status_b.in_(["accepted", "met"]),
     )
 
-    matches_generated = (
-        await db.execute(select(func.count(Match.id)).where(non_admin_filter))
-    ).scalar() or 0
-    # matches_accepted = mutual accepts (both sides said yes), consistent with mutual_accepted_count
-    matches_accepted = (
-        await db.execute(select(func.count(Match.id)).where(mutual_filter))
-    ).scalar() or 0
-    matches_declined = (
-        await db.execute(
-            select(func.count(Match.id)).where(
-                and_(non_admin_filter, Match.status == "declined")
-            )
-        )
-    ).scalar() or 0
-    mutual_accepted_count = matches_accepted  # same query — reuse
-    scheduled_count = (
+    m = (
         await db.execute(
-            select(func.count(Match.id)).where(
-                and_(non_admin_filter, Match.meeting_time.isnot(None))
-            )
-        )
-    ).scalar() or 0
-    show_count = (
-        await db.execute(
-            select(func.count(Match.id)).where(
-                and_(
-                    non_admin_filter,
-                    (Match.met_at.isnot(None)) | (Match.status == "met") | (Match.meeting_outcome == "met"),
-                )
+            select(
+                func.count(Match.id).filter(non_admin_filter).label("generated"),
+                # matches_accepted = mutual accepts (both sides said yes), consistent with mutual_accepted_count
+                func.count(Match.id).filter(mutual_filter).label("accepted"),
+                func.count(Match.id).filter(
+                    and_(non_admin_filter, Match.status == "declined")
+                ).label("declined"),
+                func.count(Match.id).filter(
+                    and_(non_admin_filter, Match.meeting_time.isnot(None))
+                ).label("scheduled"),
+                func.count(Match.id).filter(
+                    and_(
+                        non_admin_filter,
+                        (Match.met_at.isnot(None)) | (Match.status == "met") | (Match.meeting_outcome == "met"),
+                    )
+                ).label("shown"),
+                # Average match score (non-admin matches only)
+                func.avg(Match.overall_score).filter(non_admin_filter).label("avg_score"),
+                func.avg(Match.satisfaction_score).label("avg_satisfaction"),
             )
         )
-    ).scalar() or 0
+    ).one()
+    matches_generated = m.generated or 0
+    matches_accepted = m.accepted or 0
+    matches_declined = m.declined or 0
+    mutual_accepted_count = matches_accepted  # same aggregate — reuse
+    scheduled_count = m.scheduled or 0
+    show_count = m.shown or 0
+    avg_score = m.avg_score or 0.0
+    avg_satisfaction = m.avg_satisfaction or 0.0
 
     # Enrichment coverage: % of attendees with AI summary
-    enriched_count = (
-        await db.execute(
-            select(func.count(Attendee.id)).where(
-                Attendee.ai_summary.isnot(None)
-            )
-        )
-    ).scalar() or 0
     enrichment_coverage = enriched_count / total_attendees if total_attendees > 0 else 0.0
 
-    # Average match score (non-admin matches only)
-    avg_score = (
-        await db.execute(select(func.avg(Match.overall_score)).where(non_admin_filter))
-    ).scalar() or 0.0
-    avg_satisfaction = (
-        await db.execute(select(func.avg(Match.satisfaction_score)).where(Match.satisfaction_score.isnot(None)))
-    ).scalar() or 0.0
-
     # Match type distribution (non-admin matches only)
     type_result = await db.execute(
         select(Match.match_type, func.count(Match.id))
@@ -202,16 +247,16 @@ async def get_stats(db: AsyncSession = Depends(get_db), _user: User = Depends(re
     )
     match_type_distribution = {row[0]: row[1] for row in type_result.fetchall()}
 
-    # Top sectors from attendee interests (flatten and count)
-    attendees_result = await db.execute(select(Attendee.interests))
-    all_interests = []
-    for row in attendees_result.fetchall():
-        if row[0]:
-            all_interests.extend(row[0])
-
-    from collections import Counter
-    interest_counts = Counter(all_interests).most_common(10)
-    top_sectors = [{"sector": s, "count": c} for s, c in interest_counts]
+    # Top sectors from attendee interests — flattened and counted in SQL.
+    sectors = select(func.unnest(Attendee.interests).label("sector")).subquery()
+    n = func.count().label("n")
+    sector_rows = await db.execute(
+        select(sectors.c.sector, n)
+        .group_by(sectors.c.sector)
+        .order_by(n.desc(), sectors.c.sector)
+        .limit(10)
+    )
+    top_sectors = [{"sector": s, "count": c} for s, c in sector_rows.fetchall()]
     mutual_accept_rate, scheduled_rate, show_rate = _compute_kpi_rates(
         matches_generated=matches_generated,
         mutual_accepted_count=mutual_accepted_count,
@@ -232,50 +277,75 @@ async def get_stats(db: AsyncSession = Depends(get_db), _user: User = Depends(re
         post_meeting_satisfaction=float(avg_satisfaction or 0.0),
         top_sectors=top_sectors,
         match_type_distribution=match_type_distribution,
-    )
+    ).model_dump(exclude={"computed_at", "age_seconds"})
 
 
-@router.get("/match-quality")
-async def match_quality(db: AsyncSession = Depends(get_db), _user: User = Depends(require_auth)):
+@router.get("/stats", response_model=DashboardStats)
+async def get_stats(db: AsyncSession = Depends(get_db), _user: User = Depends(require_auth)):
+    """Organiser dashboard: event-wide stats (served from the metrics snapshot)."""
+    return await serve_metric(db, "stats", _compute_stats)
+
+
+async def _compute_match_quality(db: AsyncSession) -> dict:
     """Match quality distribution and analytics."""
-    result = await db.execute(
-        select(Match.overall_score, Match.match_type, Match.status)
-    )
-    matches = result.fetchall()
-
-    # Bucket scores into ranges
-    buckets = {"0.0-0.2": 0, "0.2-0.4": 0, "0.4-0.6": 0, "0.6-0.8": 0, "0.8-1.0": 0}
-    for score, _, _ in matches:
-        if score < 0.2:
-            buckets["0.0-0.2"] += 1
-        elif score < 0.4:
-            buckets["0.2-0.4"] += 1
-        elif score < 0.6:
-            buckets["0.4-0.6"] += 1
-        elif score < 0.8:
-            buckets["0.6-0.8"] += 1
-        else:
-            buckets["0.8-1.0"] += 1
+    # Bucket scores into ranges — counted in SQL, one row back.
+    score = Match.overall_score
+    row = (
+        await db.execute(
+            select(
+                func.count(Match.id),
+                func.count(Match.id).filter(score < 0.2),
+                func.count(Match.id).filter(and_(score >= 0.2, score < 0.4)),
+                func.count(Match.id).filter(and_(score >= 0.4, score < 0.6)),
+                func.count(Match.id).filter(and_(score >= 0.6, score < 0.8)),
+                func.count(Match.id).filter(score >= 0.8),
+                func.count(Match.id).filter(Match.status == "accepted"),
+            )
+        )
+    ).one()
+    total, b0, b1, b2, b3, b4, accepted = (x or 0 for x in row)
+    buckets = {"0.0-0.2": b0, "0.2-0.4": b1, "0.4-0.6": b2, "0.6-0.8": b3, "0.8-1.0": b4}
 
     return {
-        "total_matches": len(matches),
+        "total_matches": total,
         "score_distribution": buckets,
-        "acceptance_rate": (
-            sum(1 for _, _, s in matches if s == "accepted") / len(matches)
-            if matches
-            else 0.0
-        ),
+        "acceptance_rate": accepted / total if total else 0.0,
     }
 
 
+@router.get("/match-quality")
+async def match_quality(db: AsyncSession = Depends(get_db), _user: User = Depends(require_auth)):
+    """Match quality distribution and analytics (served from the metrics snapshot)."""
+    return await serve_metric(db, "match_quality", _compute_match_quality)
+
+
 @router.get("/matches-by-type")
 async def matches_by_type(
     match_type: str = Query(...),
     limit: int = Query(20, le=100),
     db: AsyncSession = Depends(get_db),
     _user: User = Depends(require_auth),
+    format: str = Query("json", pattern="^(json|csv|jsonl)$"),
+    columns: str | None = Query(None, description="Comma-separated export columns (csv/jsonl only)"),
 ):
-    """Drill-down: return matches of a given type with attendee names."""
+    """Drill-down: return matches of a given type with attendee names.
+
+    `format=csv|jsonl` streams EVERY match of that type (limit ignored) as a
+    download instead of the top-N JSON drill-down. That is a bulk export —
+    including the feedback columns — so it is admin-only like /export/matches;
+    the JSON drill-down stays open to any signed-in user.
+    """
+    if format in ("csv", "jsonl"):
+        if not _user.is_admin:
+            raise HTTPException(status_code=403, detail="Admin access required")
+        return _streaming_export(
+            columns,
+            default=_MATCH_EXPORT_DEFAULT,
+            fmt=format,
+            stem=f"matches_{match_type}",
+            match_type=match_type,
+            order_by=(Match.overall_score.desc(), Match.id),
+        )
     result = await db.execute(
         select(Match)
         .where(Match.match_type == match_type)
@@ -311,50 +381,101 @@ async def matches_by_type(
     return {"matches": matches_out, "total": len(matches_out)}
 
 
+def _streaming_export(columns, *, default, fmt: str, stem: str, **filters) -> StreamingResponse:
+    """Validate the column list, then stream the match export as a download."""
+    try:
+        cols = parse_columns(columns, default)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    stmt = build_match_export_query(cols, **filters)
+    return StreamingResponse(
+        encode_export(stream_partitions(stmt), cols, fmt),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(stem, fmt)}"'},
+    )
+
+
+# Default column set for the generic match export: everything except the
+# free-text explanation (large, and rarely wanted in a training table).
+_MATCH_EXPORT_DEFAULT = tuple(c for c in MATCH_COLUMNS if c != "explanation")
+
+
 @router.get("/feedback-dataset")
 async def feedback_dataset(
-    limit: int = Query(500, ge=1, le=5000),
+    limit: int | None = Query(None, ge=1),
     db: AsyncSession = Depends(get_db),
     _admin: User = Depends(require_admin),
+    format: str = Query("json", pattern="^(json|csv|jsonl)$"),
+    columns: str | None = Query(None, description="Comma-separated columns; default = the feedback row"),
+    match_type: str | None = Query(None),
+    created_after: datetime | None = Query(None),
+    created_before: datetime | None = Query(None),
 ):
-    """Export match outcomes for analytics / training pipelines."""
-    result = await db.execute(
-        select(Match)
-        .where(
-            (Match.decline_reason.isnot(None))
-            | (Match.meeting_outcome.isnot(None))
-            | (Match.satisfaction_score.isnot(None))
-        )
-        .order_by(Match.created_at.desc())
-        .limit(limit)
+    """Export match outcomes for analytics / training pipelines.
+
+    `format=json` (default) keeps the old buffered `{rows, total}` body,
+    capped at 5000 rows (500 by default). `format=csv|jsonl` streams every
+    matching row through a server-side cursor — use it for full exports.
+    """
+    filters = dict(
+        feedback_only=True,
+        match_type=match_type,
+        created_after=created_after,
+        created_before=created_before,
     )
-    rows = result.scalars().all()
-    dataset = []
-    for m in rows:
-        attendee_a = await db.get(Attendee, m.attendee_a_id)
-        attendee_b = await db.get(Attendee, m.attendee_b_id)
-        dataset.append(
-            {
-                "match_id": str(m.id),
-                "attendee_a_id": str(m.attendee_a_id),
-                "attendee_a_name": attendee_a.name if attendee_a else None,
-                "attendee_b_id": str(m.attendee_b_id),
-                "attendee_b_name": attendee_b.name if attendee_b else None,
-                "match_type": m.match_type,
-                "overall_score": float(m.overall_score),
-                "status": m.status,
-                "decline_reason": m.decline_reason,
-                "meeting_time": m.meeting_time.isoformat() if m.meeting_time else None,
-                "met_at": m.met_at.isoformat() if m.met_at else None,
-                "meeting_outcome": m.meeting_outcome,
-                "satisfaction_score": m.satisfaction_score,
-                "explanation_confidence": m.explanation_confidence,
-                "created_at": m.created_at.isoformat(),
-            }
+    if format in ("csv", "jsonl"):
+        return _streaming_export(
+            columns, default=FEEDBACK_COLUMNS, fmt=format, stem="feedback_dataset",
+            limit=limit, **filters,
         )
+
+    try:
+        cols = parse_columns(columns, FEEDBACK_COLUMNS)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    # One projected query with the attendee names joined in — no per-row
+    # db.get(Attendee) round trips.
+    stmt = build_match_export_query(cols, limit=min(limit or 500, 5000), **filters)
+    rows = (await db.execute(stmt)).mappings().all()
+    dataset = [serialize_row(r, cols) for r in rows]
     return {"rows": dataset, "total": len(dataset)}
 
 
+@router.get("/export/matches")
+async def export_matches(
+    _admin: User = Depends(require_admin),
+    format: str = Query("csv", pattern="^(csv|jsonl)$"),
+    columns: str | None = Query(None, description="Comma-separated columns; default = all but explanation"),
+    match_type: str | None = Query(None),
+    status: str | None = Query(None),
+    tier: str | None = Query(None),
+    min_score: float | None = Query(None, ge=0.0, le=1.0),
+    feedback_only: bool = Query(False),
+    created_after: datetime | None = Query(None),
+    created_before: datetime | None = Query(None),
+    limit: int | None = Query(None, ge=1),
+):
+    """Admin: stream match rows as CSV / JSONL with column selection + filters.
+
+    Bounded memory regardless of size (server-side cursor, one chunk in
+    flight), so a 100k-row training export doesn't take a worker down.
+    """
+    return _streaming_export(
+        columns,
+        default=_MATCH_EXPORT_DEFAULT,
+        fmt=format,
+        stem="matches",
+        match_type=match_type,
+        status=status,
+        tier=tier,
+        min_score=min_score,
+        feedback_only=feedback_only,
+        created_after=created_after,
+        created_before=created_before,
+        limit=limit,
+    )
+
+
 @router.get("/attendees-by-sector")
 async def attendees_by_sector(
     sector: str = Query(...),
@@ -362,10 +483,11 @@ async def attendees_by_sector(
     _user: User = Depends(require_auth),
 ):
     """Drill-down: return attendees whose interests include a given sector."""
-    result = await db.execute(select(Attendee))
-    all_attendees = result.scalars().all()
-
-    matching = [a for a in all_attendees if a.interests and sector in a.interests]
+    result = await db.execute(
+        select(Attendee.id, Attendee.name, Attendee.title, Attendee.company)
+        .where(Attendee.interests.any(sector))
+    )
+    matching = result.all()
 
     return {
         "attendees": [
@@ -453,16 +575,19 @@ async def sync_status(
 
 @router.post("/sync-extasy")
 async def sync_extasy(
+    background_tasks: BackgroundTasks,
     _admin: User = Depends(require_admin),
 ):
     """Admin: pull confirmed (PAID) attendees from Extasy, upsert into DB, then enrich new attendees."""
     from app.services.extasy_sync import sync_and_enrich
     result = await sync_and_enrich()
+    background_tasks.add_task(refresh_metrics_in_background)
     return {"status": "completed", **result}
 
 
 @router.post("/sync-checkins")
 async def sync_checkins(
+    background_tasks: BackgroundTasks,
     _admin: User = Depends(require_admin),
 ):
     """Admin: pull the Extasy check-ins feed (per-attendee claimed passes),
@@ -470,17 +595,20 @@ async def sync_checkins(
     Recovers the people the buyer-keyed orders/tickets sync collapses or misses."""
     from app.services.checkins_sync import sync_checkins_to_db
     result = await sync_checkins_to_db()
+    background_tasks.add_task(refresh_metrics_in_background)
     return {"status": "completed", **result}
 
 
 @router.post("/sync-speakers")
 async def sync_speakers(
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     _admin: User = Depends(require_admin),
 ):
     """Admin: pull master speaker sheet from Google and upsert into attendees."""
     from app.services.speakers_sheet_sync import sync_speakers_sheet
     result = await sync_speakers_sheet(fetch=True)
+    background_tasks.add_task(refresh_metrics_in_background)
     return {"status": "completed", **result}
 
 
@@ -508,12 +636,8 @@ async def nudge_trigger(
     return await trigger_nudges(db, dry_run=False)
 
 
-@router.get("/investor-heatmap")
-async def investor_heatmap(db: AsyncSession = Depends(get_db), _user: User = Depends(require_auth)):
+async def _compute_investor_heatmap(db: AsyncSession) -> dict:
     """Investor activity heatmap: vertical_tags × intent signals for capital deployers."""
-    result = await db.execute(select(Attendee))
-    attendees = result.scalars().all()
-
     # All 11 verticals
     ALL_VERTICALS = [
         "tokenisation_of_finance", "infrastructure_and_scaling", "decentralized_finance",
@@ -523,38 +647,72 @@ async def investor_heatmap(db: AsyncSession = Depends(get_db), _user: User = Dep
     ]
     CAPITAL_INTENTS = {"deploying_capital", "co_investment", "deal_making"}
 
-    # Build heatmap: for each vertical, count attendees and capital-active attendees
+    # Per-vertical counts in one grouped query: unnest vertical_tags, dedupe
+    # (attendee, vertical) so a repeated tag counts once, and test the
+    # capital intents with an array overlap instead of a Python set.
+    score = func.coalesce(Attendee.deal_readiness_score, 0.0)
+    tagged = (
+        select(
+            Attendee.id,
+            func.unnest(Attendee.vertical_tags).label("vertical"),
+            Attendee.intent_tags.overlap(pg_array(sorted(CAPITAL_INTENTS))).label("capital"),
+            score.label("score"),
+        )
+        .distinct()
+        .subquery()
+    )
+    rows = await db.execute(
+        select(
+            tagged.c.vertical,
+            func.count(),
+            func.count().filter(tagged.c.capital),
+            func.avg(tagged.c.score),
+        )
+        .where(tagged.c.vertical.in_(ALL_VERTICALS))
+        .group_by(tagged.c.vertical)
+    )
+    per_vertical = {v: (n, cap, avg) for v, n, cap, avg in rows.all()}
+
     heatmap = []
     for vertical in ALL_VERTICALS:
-        in_vertical = [a for a in attendees if vertical in (a.vertical_tags or [])]
-        capital_active = [a for a in in_vertical if CAPITAL_INTENTS & set(a.intent_tags or [])]
-        avg_deal = (
-            sum(a.deal_readiness_score or 0 for a in in_vertical) / len(in_vertical)
-            if in_vertical else 0.0
-        )
+        n, cap, avg_deal = per_vertical.get(vertical, (0, 0, 0.0))
         heatmap.append({
             "vertical": vertical,
             "label": vertical.replace("_", " ").title(),
-            "attendee_count": len(in_vertical),
-            "capital_active": len(capital_active),
-            "avg_deal_readiness": round(avg_deal, 2),
+            "attendee_count": n,
+            "capital_active": cap,
+            "avg_deal_readiness": round(float(avg_deal or 0.0), 2),
         })
 
     # Sort by capital_active descending
     heatmap.sort(key=lambda x: x["capital_active"], reverse=True)
 
     # Deal readiness distribution
-    high = sum(1 for a in attendees if (a.deal_readiness_score or 0) >= 0.75)
-    medium = sum(1 for a in attendees if 0.4 <= (a.deal_readiness_score or 0) < 0.75)
-    low = sum(1 for a in attendees if (a.deal_readiness_score or 0) < 0.4)
+    dist = (
+        await db.execute(
+            select(
+                func.count(Attendee.id),
+                func.count(Attendee.id).filter(score >= 0.75),
+                func.count(Attendee.id).filter(and_(score >= 0.4, score < 0.75)),
+                func.count(Attendee.id).filter(score < 0.4),
+            )
+        )
+    ).one()
+    total, high, medium, low = (x or 0 for x in dist)
 
     return {
         "heatmap": heatmap,
-        "total_attendees": len(attendees),
+        "total_attendees": total,
         "deal_readiness_distribution": {"high": high, "medium": medium, "low": low},
     }
 
 
+@router.get("/investor-heatmap")
+async def investor_heatmap(db: AsyncSession = Depends(get_db), _user: User = Depends(require_auth)):
+    """Investor heatmap (served from the metrics snapshot)."""
+    return await serve_metric(db, "investor_heatmap", _compute_investor_heatmap)
+
+
 @router.get("/grid-health")
 async def grid_health_check(
     _admin: User = Depends(require_admin),
@@ -564,6 +722,18 @@ async def grid_health_check(
     return await health_check()
 
 
+@router.get("/llm-cache")
+async def llm_cache_status(
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(require_admin),
+):
+    """Rerank LLM cache: table size/age plus this worker's hit/miss counters.
+    Counters are per-worker and reset on deploy; stored_hits is the durable
+    total across workers."""
+    from app.services.llm_cache import llm_cache_summary
+    return await llm_cache_summary(db)
+
+
 async def _re_enrich_grid_job() -> dict:
     """Long-running Grid re-enrichment — runs in background via jobs service.
 
@@ -667,11 +837,7 @@ async def _get_extasy_orders() -> tuple[list, str | None]:
         return [], f"Extasy API unavailable: {exc}"
 
 
-@router.get("/revenue")
-async def revenue_stats(
-    db: AsyncSession = Depends(get_db),
-    _admin: User = Depends(require_admin),
-):
+async def _compute_revenue(db: AsyncSession) -> dict:
     """Revenue tracking, registration funnel, and attendee growth from Extasy."""
     orders, err = await _get_extasy_orders()
     if err:
@@ -736,67 +902,68 @@ async def revenue_stats(
     growth = [{"week": w, "registrations": c} for w, c in sorted(weekly.items())]
 
     # ── Profile completeness from DB ──────────────────────────────────────
-    result = await db.execute(select(Attendee))
-    attendees = result.scalars().all()
-    total_db = len(attendees)
-    with_goals = sum(1 for a in attendees if a.goals)
-    with_linkedin = sum(1 for a in attendees if a.linkedin_url)
+    # One aggregate row (FILTER per counter, JSONB path tests) instead of
+    # loading every attendee with its embedding + JSONB into Python.
     # `with_linkedin_data`: actually have a scraped headline. `pending_linkedin_enrichment`:
     # genuine actionable scrape backlog only — see `_linkedin_pending` (excludes dead,
     # already-attempted empty stubs, and demo personas that previously inflated this 90 → ~2).
-    with_linkedin_data = sum(
-        1 for a in attendees
-        if ((a.enriched_profile or {}).get("linkedin") or {}).get("headline")
-    )
-    pending_linkedin_enrichment = sum(1 for a in attendees if _linkedin_pending(a))
-    with_twitter = sum(1 for a in attendees if a.twitter_handle)
-    with_website = sum(1 for a in attendees if a.company_website)
-    with_grid = sum(1 for a in attendees if (a.enriched_profile or {}).get("grid", {}).get("grid_name"))
-    with_photo = sum(1 for a in attendees if a.photo_url)
-    with_targets = sum(1 for a in attendees if a.target_companies)
-
-    # ── Source breakdown ──────────────────────────────────────────────────
-    from_extasy = sum(1 for a in attendees if "extasy" in str(a.enriched_profile or ""))
-    from_speakers = sum(1 for a in attendees if a.email and "speaker.proofoftalk.io" in a.email)
-    from_seed = sum(1 for a in attendees if a.email and "@example.com" in a.email)
+    # Source breakdown: extasy rows carry an `extasy` block or an
+    # `extasy*` source tag (extasy_sync / ingest_extasy).
+    is_extasy = or_(_EP.has_key("extasy"), func.coalesce(_EP["source"].astext, "").like("extasy%"))
+    email = func.coalesce(Attendee.email, "")
+    c = (
+        await db.execute(
+            select(
+                func.count(Attendee.id).label("total"),
+                func.count(Attendee.id).filter(_filled(Attendee.goals)).label("with_goals"),
+                func.count(Attendee.id).filter(_filled(Attendee.linkedin_url)).label("with_linkedin"),
+                func.count(Attendee.id).filter(_HAS_LINKEDIN_DATA).label("with_linkedin_data"),
+                func.count(Attendee.id).filter(_linkedin_pending_clause()).label("pending_linkedin"),
+                func.count(Attendee.id).filter(_filled(Attendee.twitter_handle)).label("with_twitter"),
+                func.count(Attendee.id).filter(_filled(Attendee.company_website)).label("with_website"),
+                func.count(Attendee.id).filter(_HAS_GRID).label("with_grid"),
+                func.count(Attendee.id).filter(_filled(Attendee.photo_url)).label("with_photo"),
+                func.count(Attendee.id).filter(_filled(Attendee.target_companies)).label("with_targets"),
+                func.count(Attendee.id).filter(is_extasy).label("from_extasy"),
+                func.count(Attendee.id).filter(email.contains("speaker.proofoftalk.io")).label("from_speakers"),
+                func.count(Attendee.id).filter(email.contains("@example.com")).label("from_seed"),
+            )
+        )
+    ).one()
+    total_db = c.total or 0
+    from_extasy, from_speakers, from_seed = c.from_extasy, c.from_speakers, c.from_seed
     from_other = total_db - from_extasy - from_speakers - from_seed
 
     # ── Rhuna ticket types (mirrors the Rhuna pass-name view) ─────────────
     # Granular pass name lives at enriched_profile.extasy.ticket_name —
     # see backfill_rhuna_pass_names.py for the migration. The 4-value
     # TicketType enum is too coarse to surface to ops, so we group by
-    # the raw Rhuna pass name here. Same loop also computes per-pass
+    # the raw Rhuna pass name here. Same grouped query also computes per-pass
     # profile-completeness for the matchmaking-readiness cross-tab.
-    ticket_type_counter: dict[str, int] = defaultdict(int)
-    pass_completeness: dict[str, dict] = defaultdict(
-        lambda: {
-            "total": 0, "with_goals": 0, "with_linkedin_data": 0,
-            "with_target_companies": 0, "with_photo": 0, "with_grid": 0,
-        }
-    )
-    for a in attendees:
-        ext = (a.enriched_profile or {}).get("extasy") or {}
-        pass_name = ext.get("ticket_name")
-        if not pass_name:
-            continue
-        ticket_type_counter[pass_name] += 1
-        b = pass_completeness[pass_name]
-        b["total"] += 1
-        if a.goals: b["with_goals"] += 1
-        if ((a.enriched_profile or {}).get("linkedin") or {}).get("headline"):
-            b["with_linkedin_data"] += 1
-        if a.target_companies: b["with_target_companies"] += 1
-        if a.photo_url: b["with_photo"] += 1
-        if ((a.enriched_profile or {}).get("grid") or {}).get("grid_name"):
-            b["with_grid"] += 1
+    pass_name = _PASS_NAME.label("pass_name")
+    pass_rows = (
+        await db.execute(
+            select(
+                pass_name,
+                func.count(Attendee.id).label("total"),
+                func.count(Attendee.id).filter(_filled(Attendee.goals)).label("with_goals"),
+                func.count(Attendee.id).filter(_HAS_LINKEDIN_DATA).label("with_linkedin_data"),
+                func.count(Attendee.id).filter(_filled(Attendee.target_companies)).label("with_target_companies"),
+                func.count(Attendee.id).filter(_filled(Attendee.photo_url)).label("with_photo"),
+                func.count(Attendee.id).filter(_HAS_GRID).label("with_grid"),
+            )
+            .where(_filled(_PASS_NAME))
+            .group_by(pass_name)
+        )
+    ).mappings().all()
 
     ticket_types_breakdown = sorted(
-        ({"pass_name": k, "count": v} for k, v in ticket_type_counter.items()),
+        ({"pass_name": r["pass_name"], "count": r["total"]} for r in pass_rows),
         key=lambda x: -x["count"],
     )
-    ticket_types_total = sum(ticket_type_counter.values())
+    ticket_types_total = sum(r["total"] for r in pass_rows)
     pass_completeness_list = sorted(
-        ({"pass_name": k, **v} for k, v in pass_completeness.items()),
+        (dict(r) for r in pass_rows),
         key=lambda x: -x["total"],
     )
 
@@ -850,15 +1017,15 @@ async def revenue_stats(
         },
         "profile_completeness": {
             "total": total_db,
-            "with_goals": with_goals,
-            "with_linkedin": with_linkedin,
-            "with_linkedin_data": with_linkedin_data,
-            "pending_linkedin_enrichment": pending_linkedin_enrichment,
-            "with_twitter": with_twitter,
-            "with_website": with_website,
-            "with_grid": with_grid,
-            "with_photo": with_photo,
-            "with_targets": with_targets,
+            "with_goals": c.with_goals,
+            "with_linkedin": c.with_linkedin,
+            "with_linkedin_data": c.with_linkedin_data,
+            "pending_linkedin_enrichment": c.pending_linkedin,
+            "with_twitter": c.with_twitter,
+            "with_website": c.with_website,
+            "with_grid": c.with_grid,
+            "with_photo": c.with_photo,
+            "with_targets": c.with_targets,
         },
         "ticket_types_breakdown": {
             "total": ticket_types_total,
@@ -869,6 +1036,16 @@ async def revenue_stats(
     }
 
 
+@router.get("/revenue")
+async def revenue_stats(
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(require_admin),
+):
+    """Revenue tracking from the metrics snapshot — Extasy is only called by
+    the refresh, never on a page load."""
+    return await serve_metric(db, "revenue", _compute_revenue)
+
+
 # ── Sponsor Intelligence ──────────────────────────────────────────────────
 
 @router.get("/sponsors")
@@ -941,11 +1118,7 @@ async def list_recent_jobs(
     return {"jobs": list_recent(limit=limit)}
 
 
-@router.get("/adoption")
-async def get_adoption(
-    db: AsyncSession = Depends(get_db),
-    _admin: User = Depends(require_admin),
-):
+async def _compute_adoption(db: AsyncSession) -> dict:
     """Admin-only adoption + usage metrics. Account/signup numbers are
     historical (correct immediately); usage numbers start at zero and grow
     from tracking-start forward. See the adoption-usage-tracking design."""
@@ -1102,3 +1275,90 @@ async def get_adoption(
         },
         "usage_by_day": usage_by_day,
     }
+
+
+@router.get("/adoption")
+async def get_adoption(
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(require_admin),
+):
+    """Admin-only adoption + usage metrics (served from the metrics snapshot)."""
+    return await serve_metric(db, "adoption", _compute_adoption)
+
+
+# ── Materialized metrics ──────────────────────────────────────────────────
+# Every card above is computed by its _compute_* function and stored in
+# dashboard_metrics (see app/services/dashboard_metrics.py). The endpoints
+# serve the stored row; these two routes expose the refresh + freshness.
+
+METRIC_COMPUTERS = {
+    "stats": _compute_stats,
+    "match_quality": _compute_match_quality,
+    "investor_heatmap": _compute_investor_heatmap,
+    "revenue": _compute_revenue,
+    "adoption": _compute_adoption,
+}
+
+
+async def refresh_metrics(db: AsyncSession, keys=None) -> dict:
+    """Recompute + store the dashboard snapshots. Used by the interval cron,
+    the post-sync triggers and the "Refresh now" button."""
+    return await refresh_dashboard_metrics(db, METRIC_COMPUTERS, keys)
+
+
+async def refresh_metrics_if_stale(db: AsyncSession, fresher_than: datetime) -> dict:
+    """Scheduled refresh: skipped when another worker already refreshed
+    every snapshot at or after `fresher_than` (see refresh_if_stale)."""
+    return await refresh_if_stale(db, METRIC_COMPUTERS, fresher_than)
+
+
+async def refresh_metrics_in_background(keys=None) -> None:
+    """Fire-and-forget refresh in its own session (request sessions are closed
+    by the time a BackgroundTask runs). Skipped if one is already running in
+    this worker — that run will pick up the same fresh data."""
+    if refresh_in_progress():
+        return
+    from app.core.database import async_session
+    try:
+        async with async_session() as db:
+            await refresh_metrics(db, keys)
+    except Exception as exc:
+        logger.warning("dashboard_metrics: background refresh failed", error=str(exc))
+
+
+@router.post("/metrics/refresh")
+async def refresh_dashboard_metrics_now(
+    keys: list[str] | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(require_admin),
+):
+    """Admin "Refresh now": recompute the requested snapshots (default: all)
+    synchronously and return the per-key timings."""
+    unknown = [k for k in (keys or []) if k not in METRIC_COMPUTERS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown metric(s): {', '.join(unknown)}")
+    result = await refresh_metrics(db, keys)
+    return {"status": "completed", **result}
+
+
+@router.get("/metrics/freshness")
+async def dashboard_metrics_freshness(
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(require_admin),
+):
+    """When was each dashboard snapshot last computed, and how long it took."""
+    now = datetime.utcnow()
+    rows = (await db.execute(
+        text("SELECT key, computed_at, duration_ms FROM dashboard_metrics ORDER BY key")
+    )).all()
+    return {
+        "metrics": [
+            {
+                "key": r.key,
+                "computed_at": r.computed_at.isoformat(),
+                "age_seconds": int((now - r.computed_at).total_seconds()),
+                "duration_ms": r.duration_ms,
+            }
+            for r in rows
+        ],
+    }
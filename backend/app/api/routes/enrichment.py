@@ -5,7 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.attributes import flag_modified
 from app.core.database import get_db
-from app.models.attendee import Attendee
+from app.models.attendee import Attendee, ENRICHMENT_COLUMNS, ensure_heavy, load_heavy
 from app.services.enrichment import EnrichmentService
 from app.services.embeddings import generate_ai_summary, embed_attendee, classify_intents, classify_verticals
 from app.core.deps import require_auth, require_admin
@@ -17,9 +17,14 @@ router = APIRouter(prefix="/enrichment", tags=["enrichment"])
 @router.get("/{attendee_id}/status")
 async def enrichment_status(attendee_id: UUID, db: AsyncSession = Depends(get_db), _user: User = Depends(require_auth)):
     """Return per-source enrichment status for an attendee."""
-    attendee = await db.get(Attendee, attendee_id)
+    attendee = await db.get(Attendee, attendee_id, options=[load_heavy(*ENRICHMENT_COLUMNS)])
     if not attendee:
         raise HTTPException(status_code=404, detail="Attendee not found")
+    await ensure_heavy(db, attendee, *ENRICHMENT_COLUMNS)
+    # Presence only — checked in SQL rather than shipping 1536 floats here.
+    has_embedding = (
+        await db.execute(select(Attendee.embedding.isnot(None)).where(Attendee.id == attendee_id))
+    ).scalar()
 
     ep = attendee.enriched_profile or {}
     pot = attendee.pot_history or {}
@@ -37,7 +42,7 @@ async def enrichment_status(attendee_id: UUID, db: AsyncSession = Depends(get_db
         "attendee_id": str(attendee_id),
         "last_enriched": attendee.enriched_at.isoformat() if attendee.enriched_at else None,
         "ai_summary": bool(attendee.ai_summary),
-        "embedding": attendee.embedding is not None,
+        "embedding": bool(has_embedding),
         "sources": {
             "registration": {
                 "available": True,
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import secrets
 from uuid import UUID
@@ -22,12 +21,13 @@ from app.schemas.attendee import (
 )
 from app.services.avatars import upload_avatar, AvatarError, MAX_BYTES
 from app.services.matching import MatchingEngine
-from app.services.profile_pipeline import refresh_profile_matches
+from app.services.profile_pipeline import request_profile_refresh
 from app.services.slots import mutual_free_slots, has_conflict, normalise_location
 from app.services.match_visibility import ViewerMatch, order_and_cap, tier_limit, next_tier_unlock
 from app.services.concierge import profile_data_quality, compute_completeness_pct
 from app.core.deps import require_auth, require_admin
 from app.core.limiter import limiter
+from app.core.responses import model_response
 from app.models.user import User
 
 logger = logging.getLogger(__name__)
@@ -68,10 +68,14 @@ async def _build_match_response(db: AsyncSession, match: Match, viewer_id: UUID)
     resp = MatchResponse.model_validate(match)
     if matched:
         is_mutual = match.status_a == "accepted" and match.status_b == "accepted"
-        att_dict = AttendeeResponse.model_validate(matched).model_dump()
-        resp.matched_attendee = AttendeeResponse(
-            **redact_for_privacy(att_dict, is_mutual_match=is_mutual)
-        )
+        # One validate pass, then redact the model's own field dict in place.
+        # (Was validate → model_dump → redact → AttendeeResponse(**dict): a
+        # second full validation per match, ×50 on every match list.) Every
+        # redacted value is None or the company string, both valid for the
+        # field types, so skipping re-validation is safe.
+        attendee_resp = AttendeeResponse.model_validate(matched)
+        redact_for_privacy(attendee_resp.__dict__, is_mutual_match=is_mutual)
+        resp.matched_attendee = attendee_resp
         if is_mutual and not match.meeting_time:
             # limit=None: the picker needs the COMPLETE both-free set so it can grey
             # out already-booked times. The UI still slices the first 4 for the chip
@@ -219,22 +223,22 @@ async def get_matches(
     if getattr(user, "is_admin", False):
         rows.sort(key=lambda m: m.overall_score or 0.0, reverse=True)
         responses = [await _build_match_response(db, m, attendee_id) for m in rows[:limit]]
-        return MatchListResponse(
+        return model_response(MatchListResponse(
             matches=responses, attendee_id=attendee_id, tier=tier,
             viewer=AttendeeResponse.model_validate(attendee),
             visible_count=len(responses), locked_count=0,
             next_tier_at=None, completeness_pct=pct,
-        )
+        ))
 
     vms = [_to_viewer_match(m, attendee_id) for m in rows]
     visible, locked = order_and_cap(vms, _viewer_limit(attendee, tier))
     responses = [await _build_match_response(db, vm.match, attendee_id) for vm in visible]
-    return MatchListResponse(
+    return model_response(MatchListResponse(
         matches=responses, attendee_id=attendee_id, tier=tier,
         viewer=AttendeeResponse.model_validate(attendee),
         visible_count=len(responses), locked_count=locked,
         next_tier_at=next_tier_unlock(tier), completeness_pct=pct,
-    )
+    ))
 
 
 @router.get("/m/{token}", response_model=MatchListResponse)
@@ -285,13 +289,13 @@ async def get_matches_by_magic_link(
     )
     has_account = user_row.scalars().first() is not None
 
-    return MatchListResponse(
+    return model_response(MatchListResponse(
         matches=responses, attendee_id=attendee.id, tier=tier,
         viewer=AttendeeResponse.model_validate(attendee),
         visible_count=len(responses), locked_count=locked,
         next_tier_at=next_tier_unlock(tier), completeness_pct=pct,
         has_account=has_account,
-    )
+    ))
 
 
 @router.get("/m/{token}/incoming-summary")
@@ -621,8 +625,9 @@ async def update_profile_via_magic_link(
         attendee.goals = (data.goals or "").strip() or None
 
     await db.commit()
-    # Self-fill via magic link also unlocks/refreshes matches immediately.
-    asyncio.create_task(refresh_profile_matches(attendee.id))
+    # Self-fill via magic link also unlocks/refreshes matches (queued, so a
+    # burst of edits shares one refresh).
+    request_profile_refresh(attendee.id)
     return {"status": "updated"}
 
 
@@ -1,17 +1,32 @@
+import asyncio
+import json
 from uuid import UUID
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select, tuple_, update
 
+from app.core.config import get_settings
 from app.core.database import get_db
 from app.core.deps import require_auth
+from app.core.security import create_stream_ticket, decode_stream_ticket
 from app.models.user import User
 from app.models.attendee import Attendee, Match
 from app.models.message import Conversation, Message
+from app.services import realtime
+from app.utils.cursors import decode_time_cursor, encode_time_cursor
 
 router = APIRouter(prefix="/messages", tags=["messages"])
 
+# SSE comment line every 25s: keeps proxies (Railway, nginx) from closing an
+# idle stream and lets us notice a dead client within one interval.
+STREAM_HEARTBEAT_SECONDS = 25
+
+# Messages per history page. The thread opens on the newest page; older
+# pages are fetched with ?before=<cursor>.
+HISTORY_PAGE_SIZE = 50
+
 
 async def _get_attendee(user: User, db: AsyncSession) -> Attendee:
     if not user.attendee_id:
@@ -22,11 +37,11 @@ async def _get_attendee(user: User, db: AsyncSession) -> Attendee:
     return attendee
 
 
-async def _get_and_verify_match(match_id: UUID, attendee: Attendee, db: AsyncSession) -> Match:
+async def _get_and_verify_match(match_id: UUID, attendee_id: UUID, db: AsyncSession) -> Match:
     match = await db.get(Match, match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
-    if attendee.id not in (match.attendee_a_id, match.attendee_b_id):
+    if attendee_id not in (match.attendee_a_id, match.attendee_b_id):
         raise HTTPException(status_code=403, detail="Access denied — not your match")
     return match
 
@@ -151,36 +166,101 @@ async def list_conversations(
     return {"conversations": summaries}
 
 
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        return decode_time_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/conversations/{match_id}")
 async def get_conversation(
     match_id: UUID,
+    before: str | None = Query(None, description="Cursor: return messages older than this one"),
+    after: str | None = Query(None, description="Cursor: return messages newer than this one"),
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=200),
     user: User = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get or create a conversation for a match and return all messages."""
-    attendee = await _get_attendee(user, db)
-    match = await _get_and_verify_match(match_id, attendee, db)
+    """Get or create a conversation for a match and return one page of
+    messages (oldest→newest within the page).
+
+    No cursor = the newest `limit` messages. Pages are keyset on
+    (created_at, id) against ix_messages_conversation_created, so opening a
+    10,000-message thread costs the same as a 10-message one. Loading an
+    older page (`before`) does not touch read receipts.
+    """
+    if before and after:
+        raise HTTPException(status_code=400, detail="Pass either before or after, not both")
+    if not user.attendee_id:
+        raise HTTPException(status_code=403, detail="No attendee profile linked to account")
+    me_id = user.attendee_id
+    match = await _get_and_verify_match(match_id, me_id, db)
     conv = await _get_or_create_conversation(match.id, db)
+    other_id = match.attendee_b_id if match.attendee_a_id == me_id else match.attendee_a_id
+
+    # Both parties in one projected query — db.get(Attendee) pulled the
+    # embedding + enriched_profile JSONB just to render a name.
+    people = {
+        r.id: r for r in (await db.execute(
+            select(
+                Attendee.id, Attendee.name, Attendee.company,
+                Attendee.title, Attendee.ticket_type,
+            ).where(Attendee.id.in_([me_id, other_id]))
+        )).all()
+    }
+    me, other = people.get(me_id), people.get(other_id)
+    if me is None:
+        raise HTTPException(status_code=404, detail="Attendee profile not found")
 
-    msgs = (await db.execute(
-        select(Message).where(Message.conversation_id == conv.id)
-        .order_by(Message.created_at.asc())
-    )).scalars().all()
-
-    # Mark unread messages from other party as read
-    for msg in msgs:
-        if msg.sender_attendee_id != attendee.id and msg.read_at is None:
-            msg.read_at = datetime.utcnow()
+    if before is None:
+        # Read receipts as ONE set-based UPDATE (was: load every message,
+        # flip read_at on ORM objects one by one, flush N rows).
+        marked = (await db.execute(
+            update(Message)
+            .where(
+                Message.conversation_id == conv.id,
+                Message.sender_attendee_id != me_id,
+                Message.read_at.is_(None),
+            )
+            .values(read_at=datetime.utcnow())
+            .returning(Message.id)
+            .execution_options(synchronize_session=False)
+        )).scalars().all()
+        if marked:
+            # Lets the reader's other tabs drop their badge without polling.
+            await realtime.publish(db, {
+                "type": "read",
+                "to": str(me_id),
+                "match_id": str(match.id),
+                "conversation_id": str(conv.id),
+                "unread_delta": -len(marked),
+            })
     await db.commit()
 
-    # Build message list with sender info
-    other_id = match.attendee_b_id if match.attendee_a_id == attendee.id else match.attendee_a_id
-    other = await db.get(Attendee, other_id)
+    key = tuple_(Message.created_at, Message.id)
+    stmt = select(
+        Message.id, Message.conversation_id, Message.sender_attendee_id,
+        Message.content, Message.created_at, Message.read_at,
+    ).where(Message.conversation_id == conv.id)
+    if after:
+        stmt = stmt.where(key > tuple_(*_decode_cursor(after))).order_by(
+            Message.created_at.asc(), Message.id.asc()
+        )
+    else:
+        if before:
+            stmt = stmt.where(key < tuple_(*_decode_cursor(before)))
+        stmt = stmt.order_by(Message.created_at.desc(), Message.id.desc())
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not after:
+        rows.reverse()
 
     message_list = []
-    for msg in msgs:
-        is_mine = msg.sender_attendee_id == attendee.id
-        sender_name = attendee.name if is_mine else (other.name if other else "Unknown")
+    for msg in rows:
+        is_mine = msg.sender_attendee_id == me_id
+        sender_name = me.name if is_mine else (other.name if other else "Unknown")
         message_list.append({
             "id": str(msg.id),
             "conversation_id": str(msg.conversation_id),
@@ -192,6 +272,7 @@ async def get_conversation(
             "is_mine": is_mine,
         })
 
+    oldest, newest = (rows[0], rows[-1]) if rows else (None, None)
     return {
         "conversation_id": str(conv.id),
         "match_id": str(match.id),
@@ -204,6 +285,11 @@ async def get_conversation(
             "ticket_type": other.ticket_type,
         } if other else None,
         "messages": message_list,
+        # Older history exists beyond this page (newest-first/`before` pages)
+        # or newer messages exist beyond it (`after` pages).
+        "has_more": has_more,
+        "before_cursor": encode_time_cursor(oldest.created_at, oldest.id) if oldest else before,
+        "after_cursor": encode_time_cursor(newest.created_at, newest.id) if newest else after,
     }
 
 
@@ -220,19 +306,19 @@ async def send_message(
         raise HTTPException(status_code=400, detail="Message cannot be empty")
 
     attendee = await _get_attendee(user, db)
-    await _get_and_verify_match(match_id, attendee, db)
+    match = await _get_and_verify_match(match_id, attendee.id, db)
     conv = await _get_or_create_conversation(match_id, db)
 
     msg = Message(
         conversation_id=conv.id,
         sender_attendee_id=attendee.id,
         content=content,
+        created_at=datetime.utcnow(),
     )
     db.add(msg)
-    await db.commit()
-    await db.refresh(msg)
+    await db.flush()
 
-    return {
+    payload = {
         "id": str(msg.id),
         "conversation_id": str(msg.conversation_id),
         "sender_attendee_id": str(msg.sender_attendee_id),
@@ -242,6 +328,39 @@ async def send_message(
         "read_at": None,
         "is_mine": True,
     }
+    # NOTIFY rides the INSERT's transaction: delivered on commit, never for
+    # a rolled-back message. The sender's own other tabs get it too.
+    recipient_id = match.attendee_b_id if match.attendee_a_id == attendee.id else match.attendee_a_id
+    for to, is_mine, delta in ((recipient_id, False, 1), (attendee.id, True, 0)):
+        await realtime.publish(db, {
+            "type": "message",
+            "to": str(to),
+            "match_id": str(match.id),
+            "conversation_id": str(conv.id),
+            "unread_delta": delta,
+            "message": {**payload, "is_mine": is_mine},
+        })
+    await db.commit()
+
+    return payload
+
+
+async def _unread_total(db: AsyncSession, attendee_id: UUID) -> int:
+    """Unread messages addressed to `attendee_id`, as one COUNT.
+
+    Replaces the match-ids → conversation-ids → load-every-unread-row chain
+    this endpoint used to run on every 10s poll.
+    """
+    return (await db.execute(
+        select(func.count(Message.id))
+        .join(Conversation, Conversation.id == Message.conversation_id)
+        .join(Match, Match.id == Conversation.match_id)
+        .where(
+            (Match.attendee_a_id == attendee_id) | (Match.attendee_b_id == attendee_id),
+            Message.sender_attendee_id != attendee_id,
+            Message.read_at.is_(None),
+        )
+    )).scalar_one()
 
 
 @router.get("/unread-count")
@@ -249,31 +368,81 @@ async def unread_count(
     user: User = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
 ):
-    """Total count of unread messages for the current user."""
-    attendee = await _get_attendee(user, db)
+    """Total count of unread messages for the current user.
 
-    matches = (await db.execute(
-        select(Match.id).where(
-            (Match.attendee_a_id == attendee.id) | (Match.attendee_b_id == attendee.id)
-        )
-    )).scalars().all()
+    Polling fallback only — connected clients get deltas over /stream.
+    """
+    if not user.attendee_id:
+        raise HTTPException(status_code=403, detail="No attendee profile linked to account")
+    return {"unread_count": await _unread_total(db, user.attendee_id)}
 
-    if not matches:
-        return {"unread_count": 0}
 
-    convs = (await db.execute(
-        select(Conversation.id).where(Conversation.match_id.in_(matches))
-    )).scalars().all()
+@router.post("/stream-ticket")
+async def stream_ticket(user: User = Depends(require_auth)):
+    """Mint a 60s ticket for GET /messages/stream (EventSource can't send
+    an Authorization header)."""
+    if not user.attendee_id:
+        raise HTTPException(status_code=403, detail="No attendee profile linked to account")
+    return {"ticket": create_stream_ticket(str(user.id))}
 
-    if not convs:
-        return {"unread_count": 0}
 
-    unread = (await db.execute(
-        select(Message).where(
-            (Message.conversation_id.in_(convs))
-            & (Message.sender_attendee_id != attendee.id)
-            & (Message.read_at.is_(None))
-        )
-    )).scalars().all()
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
-    return {"unread_count": len(unread)}
+
+@router.get("/stream")
+async def stream(
+    request: Request,
+    ticket: str = Query(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """Server-Sent Events: new messages + unread-count deltas for the caller.
+
+    Events: `unread` (absolute count, sent first), `message`, `read`
+    (carry `unread_delta`), `resync` (refetch everything). 503 when the
+    push channel is unavailable — the client keeps polling.
+    """
+    user_id = decode_stream_ticket(ticket)
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Invalid or expired stream ticket")
+    user = await db.get(User, UUID(user_id))
+    if not user or not user.attendee_id:
+        raise HTTPException(status_code=403, detail="No attendee profile linked to account")
+    if not get_settings().REALTIME_ENABLED:
+        raise HTTPException(status_code=503, detail="Real-time delivery disabled")
+
+    attendee_id = user.attendee_id
+    # Subscribe BEFORE counting so nothing committed in between is missed
+    # (worst case a delta is applied on top of a count that already has it;
+    # the next read/resync corrects it).
+    try:
+        queue = await realtime.broker.subscribe(attendee_id)
+    except Exception:
+        raise HTTPException(status_code=503, detail="Real-time delivery unavailable")
+    try:
+        initial = await _unread_total(db, attendee_id)
+    except Exception:
+        realtime.broker.unsubscribe(attendee_id, queue)
+        raise
+
+    async def events():
+        try:
+            yield "retry: 5000\n\n"
+            yield _sse("unread", {"unread_count": initial})
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                # The same dict is queued to every tab of this attendee — copy.
+                data = {k: v for k, v in event.items() if k not in ("type", "to")}
+                yield _sse(event.get("type", "message"), data)
+        finally:
+            realtime.broker.unsubscribe(attendee_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
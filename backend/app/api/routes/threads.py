@@ -1,14 +1,16 @@
 """Pre-event warm-up threads — topic-based group discussions."""
 import uuid
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.models.message import Thread, ThreadPost
 from app.models.attendee import Attendee
 from app.core.deps import require_auth
 from app.models.user import User
+from app.utils.cursors import decode_time_cursor, encode_time_cursor
 
 router = APIRouter(prefix="/threads", tags=["threads"])
 
@@ -38,6 +40,23 @@ async def _ensure_default_threads(db: AsyncSession) -> None:
     await db.commit()
 
 
+async def _bump_post_counters(db: AsyncSession, thread_id, added: int, latest: datetime) -> None:
+    """Move the thread's post_count / latest_post_at for `added` new posts.
+
+    Call in the same transaction as the INSERT(s). Relative UPDATE
+    (post_count + n), so concurrent posts can't lose an increment.
+    """
+    await db.execute(
+        update(Thread)
+        .where(Thread.id == thread_id)
+        .values(
+            post_count=Thread.post_count + added,
+            latest_post_at=func.greatest(func.coalesce(Thread.latest_post_at, latest), latest),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
 # ── Schemas ──────────────────────────────────────────────────────────────────
 
 class ThreadSummary(BaseModel):
@@ -70,41 +89,34 @@ async def list_threads(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(require_auth),
 ):
-    """List all warm-up threads with post counts. Attendee's verticals are flagged."""
+    """List all warm-up threads with post counts. Attendee's verticals are flagged.
+
+    Served from the threads.post_count / latest_post_at counters that
+    create_post maintains — one SELECT regardless of posting volume.
+    """
     await _ensure_default_threads(db)
 
-    attendee = await db.get(Attendee, user.attendee_id) if user.attendee_id else None
-    my_verticals = set(attendee.vertical_tags or []) if attendee else set()
+    my_verticals: set[str] = set()
+    if user.attendee_id:
+        tags = (await db.execute(
+            select(Attendee.vertical_tags).where(Attendee.id == user.attendee_id)
+        )).scalar_one_or_none()
+        my_verticals = set(tags or [])
 
     threads = (await db.execute(select(Thread).order_by(Thread.title))).scalars().all()
 
-    summaries = []
-    for t in threads:
-        # Post count
-        count_result = await db.execute(
-            select(func.count(ThreadPost.id)).where(ThreadPost.thread_id == t.id)
-        )
-        post_count = count_result.scalar() or 0
-
-        # Latest post
-        latest_result = await db.execute(
-            select(ThreadPost.created_at)
-            .where(ThreadPost.thread_id == t.id)
-            .order_by(ThreadPost.created_at.desc())
-            .limit(1)
-        )
-        latest_row = latest_result.first()
-        latest_at = latest_row[0].isoformat() if latest_row else None
-
-        summaries.append(ThreadSummary(
+    summaries = [
+        ThreadSummary(
             id=str(t.id),
             slug=t.slug,
             title=t.title,
             description=t.description,
-            post_count=post_count,
-            latest_post_at=latest_at,
+            post_count=t.post_count or 0,
+            latest_post_at=t.latest_post_at.isoformat() if t.latest_post_at else None,
             is_member=t.slug in my_verticals,
-        ))
+        )
+        for t in threads
+    ]
 
     # Sort: member threads first, then by post count
     summaries.sort(key=lambda s: (not s.is_member, -s.post_count))
@@ -115,27 +127,50 @@ async def list_threads(
 async def get_thread(
     slug: str,
     limit: int = Query(50, ge=1, le=200),
+    before: str | None = Query(None, description="Cursor: return posts older than this one"),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(require_auth),
 ):
-    """Get a thread's posts."""
+    """Get one page of a thread's posts (oldest→newest within the page).
+
+    No cursor = the newest `limit` posts; older pages via ?before=<cursor>.
+    Keyset on (created_at, id) against ix_thread_posts_thread_created.
+    """
     thread = (await db.execute(select(Thread).where(Thread.slug == slug))).scalars().first()
     if not thread:
         raise HTTPException(status_code=404, detail="Thread not found")
 
-    attendee = await db.get(Attendee, user.attendee_id) if user.attendee_id else None
-
-    posts_result = await db.execute(
-        select(ThreadPost)
-        .where(ThreadPost.thread_id == thread.id)
-        .order_by(ThreadPost.created_at.asc())
-        .limit(limit)
-    )
-    posts = posts_result.scalars().all()
+    stmt = select(
+        ThreadPost.id, ThreadPost.sender_attendee_id, ThreadPost.content, ThreadPost.created_at,
+    ).where(ThreadPost.thread_id == thread.id)
+    if before:
+        try:
+            ts, post_id = decode_time_cursor(before)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(tuple_(ThreadPost.created_at, ThreadPost.id) < tuple_(ts, post_id))
+    posts = (await db.execute(
+        stmt.order_by(ThreadPost.created_at.desc(), ThreadPost.id.desc()).limit(limit + 1)
+    )).all()
+    has_more = len(posts) > limit
+    posts = posts[:limit]
+    posts.reverse()
+
+    # Authors in one projected IN query (was db.get(Attendee) per post,
+    # each pulling the embedding + enriched_profile JSONB).
+    sender_ids = {p.sender_attendee_id for p in posts}
+    senders = {}
+    if sender_ids:
+        senders = {
+            r.id: r for r in (await db.execute(
+                select(Attendee.id, Attendee.name, Attendee.title, Attendee.company)
+                .where(Attendee.id.in_(sender_ids))
+            )).all()
+        }
 
     post_outputs = []
     for p in posts:
-        sender = await db.get(Attendee, p.sender_attendee_id)
+        sender = senders.get(p.sender_attendee_id)
         post_outputs.append(ThreadPostOut(
             id=str(p.id),
             sender_name=sender.name if sender else "Unknown",
@@ -144,7 +179,7 @@ async def get_thread(
             sender_attendee_id=str(p.sender_attendee_id),
             content=p.content,
             created_at=p.created_at.isoformat(),
-            is_mine=attendee is not None and p.sender_attendee_id == attendee.id,
+            is_mine=user.attendee_id is not None and p.sender_attendee_id == user.attendee_id,
         ))
 
     return {
@@ -153,8 +188,11 @@ async def get_thread(
             "slug": thread.slug,
             "title": thread.title,
             "description": thread.description,
+            "post_count": thread.post_count or 0,
         },
         "posts": post_outputs,
+        "has_more": has_more,
+        "before_cursor": encode_time_cursor(posts[0].created_at, posts[0].id) if posts else before,
     }
 
 
@@ -169,8 +207,8 @@ async def create_post(
     if not user.attendee_id:
         raise HTTPException(status_code=400, detail="No attendee profile linked")
 
-    thread = (await db.execute(select(Thread).where(Thread.slug == slug))).scalars().first()
-    if not thread:
+    thread_id = (await db.execute(select(Thread.id).where(Thread.slug == slug))).scalar_one_or_none()
+    if not thread_id:
         raise HTTPException(status_code=404, detail="Thread not found")
 
     content = data.content.strip()
@@ -179,22 +217,26 @@ async def create_post(
     if len(content) > 2000:
         raise HTTPException(status_code=400, detail="Post too long (max 2000 chars)")
 
-    attendee = await db.get(Attendee, user.attendee_id)
+    author = (await db.execute(
+        select(Attendee.name, Attendee.title, Attendee.company).where(Attendee.id == user.attendee_id)
+    )).first()
 
     post = ThreadPost(
-        thread_id=thread.id,
+        thread_id=thread_id,
         sender_attendee_id=user.attendee_id,
         content=content,
+        created_at=datetime.utcnow(),
     )
     db.add(post)
+    await db.flush()
+    await _bump_post_counters(db, thread_id, 1, post.created_at)
     await db.commit()
-    await db.refresh(post)
 
     return ThreadPostOut(
         id=str(post.id),
-        sender_name=attendee.name if attendee else "Unknown",
-        sender_title=attendee.title if attendee else "",
-        sender_company=attendee.company if attendee else "",
+        sender_name=author.name if author else "Unknown",
+        sender_title=author.title if author else "",
+        sender_company=author.company if author else "",
         sender_attendee_id=str(post.sender_attendee_id),
         content=post.content,
         created_at=post.created_at.isoformat(),
@@ -18,6 +18,14 @@ class Settings(BaseSettings):
     # on a 57-attendee enrichment loop; ceiling is now 50 concurrent.
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 30
+    # Dedicated connection for LISTEN (real-time message push, see
+    # app/services/realtime.py). LISTEN needs a session that outlives one
+    # transaction, which the transaction-mode pooler (:6543) can't give, so
+    # blank = derive the Supabase SESSION-mode pooler (same host, :5432) from
+    # DATABASE_URL. Set explicitly to a direct connection string if needed.
+    REALTIME_DATABASE_URL: str = ""
+    # Kill-switch for GET /messages/stream. Off = clients stay on polling.
+    REALTIME_ENABLED: bool = True
 
     # OpenAI
     OPENAI_API_KEY: str = ""
@@ -29,11 +37,19 @@ class Settings(BaseSettings):
     AI_AGENT_ENABLED: bool = False
     AI_RERANK_ENABLED: bool = False
     AI_CONFIDENCE_ENABLED: bool = True
+    # Stream the curated rerank and persist each match as its entry arrives,
+    # so a fresh signup's first cards show up before GPT finishes the list.
+    # Off = one blocking call, matches written when the whole answer is in.
+    AI_RERANK_STREAMING: bool = True
     AI_NUDGE_ENABLED: bool = False
 
     # Matching runtime controls
     MATCH_BATCH_SIZE: int = 100
     MATCH_MAX_CONCURRENCY: int = 4
+    # LLM response cache (services/llm_cache.py): a rerank whose prompt is
+    # byte-identical to one answered within the TTL reuses that answer
+    # instead of calling OpenAI again. 0 disables the cache.
+    LLM_CACHE_TTL_HOURS: int = 24 * 7
 
     # AWS
     AWS_REGION: str = "eu-west-1"
@@ -93,6 +109,14 @@ class Settings(BaseSettings):
     # addresses. For team testing: "@proofoftalk.io,@xventures.de".
     EMAIL_ALLOWLIST: str = ""
 
+    # Email outbox worker (services/email_outbox.py). Gated mail is queued in
+    # the email_outbox table and delivered via Resend's batch endpoint (up to
+    # 100 emails per request). Resend allows 2 requests/s per team, so keep
+    # RATE × worker count at or under 2. RESEND_API_BASE=local swaps in the
+    # in-process stand-in (logs instead of sending) for dev and tests.
+    RESEND_API_BASE: str = "https://api.resend.com"
+    EMAIL_SEND_RATE_PER_SECOND: float = 1.0
+
     # Auth
     SECRET_KEY: str = "change-me-in-production"
     # 30 days — covers the multi-week pre-event window + the 2-day event
@@ -101,6 +125,20 @@ class Settings(BaseSettings):
     # value) was kicking returning users out the next morning (Sithum,
     # 2026-05-17). Reset SECRET_KEY post-event to force everyone to re-auth.
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 30
+    # bcrypt pool per worker process (see core/security.py). 2 threads ≈ 8
+    # logins/s per worker at ~250ms each; beyond MAX_QUEUE waiting calls,
+    # auth routes return 503 + Retry-After rather than queue unboundedly.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Profile-save → match-refresh queue (services/profile_pipeline.py). A
+    # dirty attendee is refreshed once they've been quiet for QUIET seconds
+    # (or MAX_DELAY after their first unprocessed edit, whichever is first);
+    # at most CONCURRENCY refreshes (5 LLM calls + GPT-4o rerank each) run
+    # per worker at once.
+    PROFILE_REFRESH_QUIET_SECONDS: float = 20.0
+    PROFILE_REFRESH_MAX_DELAY_SECONDS: float = 120.0
+    PROFILE_REFRESH_CONCURRENCY: int = 3
 
     # Supabase REST / Storage. Service-role key bypasses RLS — server-side
     # only, never expose to the client. Used by the avatar upload service.
@@ -1,10 +1,13 @@
 import secrets as _secrets
+import time
+from collections import OrderedDict
 from uuid import UUID
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.core.config import get_settings
 from app.core.database import get_db
@@ -14,12 +17,80 @@ from app.models.user import User
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
 
+# ── Authenticated-user cache (per worker) ────────────────────────────────────
+# Every authenticated request used to decode the JWT and SELECT the users row
+# before doing any real work. Entries here are keyed by the bearer token and
+# hold the decoded payload + a column snapshot of the User, so a warm request
+# does neither. The snapshot is re-attached to the request's session with
+# merge(load=False) — no SELECT, but still a tracked persistent instance, so
+# routes that mutate `user` (update_profile renames full_name) flush as before.
+#
+# Staleness: entries live USER_CACHE_TTL_SECONDS (never past the token's own
+# exp). In-process writes call invalidate_user_cache(); changes made from
+# another worker or straight in SQL (is_admin flips) show up within the TTL.
+USER_CACHE_TTL_SECONDS = 60
+USER_CACHE_MAX_ENTRIES = 10_000
+
+_user_cache: "OrderedDict[str, tuple[float, dict, dict]]" = OrderedDict()
+_tokens_by_user: dict[str, set[str]] = {}
+
+
+def _snapshot(user: User) -> dict:
+    # All mapped columns: anything left unset would be "expired" on the
+    # re-attached instance and trigger a lazy load (illegal under asyncio).
+    return {c.key: getattr(user, c.key) for c in User.__mapper__.column_attrs}
+
+
+def _cache_put(token: str, payload: dict, user: User) -> None:
+    expires_at = min(time.time() + USER_CACHE_TTL_SECONDS, float(payload.get("exp") or 0))
+    _user_cache[token] = (expires_at, payload, _snapshot(user))
+    _user_cache.move_to_end(token)
+    _tokens_by_user.setdefault(str(user.id), set()).add(token)
+    while len(_user_cache) > USER_CACHE_MAX_ENTRIES:
+        _cache_drop(next(iter(_user_cache)))
+
+
+def _cache_drop(token: str) -> None:
+    entry = _user_cache.pop(token, None)
+    if entry is None:
+        return
+    uid = str(entry[2]["id"])
+    tokens = _tokens_by_user.get(uid)
+    if tokens is not None:
+        tokens.discard(token)
+        if not tokens:
+            del _tokens_by_user[uid]
+
+
+def invalidate_user_cache(user_id=None) -> None:
+    """Drop cached entries for one user (all their tokens), or everything."""
+    if user_id is None:
+        _user_cache.clear()
+        _tokens_by_user.clear()
+        return
+    for token in list(_tokens_by_user.get(str(user_id), ())):
+        _cache_drop(token)
+
+
 async def get_current_user(
+    request: Request,
     token: str | None = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
 ) -> User | None:
     if not token:
         return None
+
+    entry = _user_cache.get(token)
+    if entry is not None:
+        expires_at, payload, cols = entry
+        if expires_at > time.time():
+            # Shared with sliding_token_refresh so the JWT is decoded once.
+            request.state.jwt_payload = payload
+            cached = User(**cols)
+            make_transient_to_detached(cached)
+            return await db.merge(cached, load=False)
+        _cache_drop(token)
+
     try:
         payload = decode_token(token)
         user_id = payload.get("sub")
@@ -27,8 +98,12 @@ async def get_current_user(
             return None
     except JWTError:
         return None
+    request.state.jwt_payload = payload
     result = await db.execute(select(User).where(User.id == UUID(user_id)))
-    return result.scalars().first()
+    user = result.scalars().first()
+    if user is not None:
+        _cache_put(token, payload, user)
+    return user
 
 
 async def require_auth(user: User | None = Depends(get_current_user)) -> User:
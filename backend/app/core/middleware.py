@@ -0,0 +1,84 @@
+"""Pure-ASGI response-header middleware.
+
+Replaces the two `@app.middleware("http")` layers main.py used to register
+(security_headers, sliding_token_refresh). Each of those was a
+BaseHTTPMiddleware: per request it spawned a task group, wrapped the body
+in a memory stream and re-wrapped the response — twice. That overhead hit
+every route, and streaming responses (SSE /messages/stream, CSV exports)
+were piped through both stream wrappers.
+
+This middleware only touches the `http.response.start` message: headers
+are edited in place and the body is passed through untouched, never
+buffered. Throughput numbers: scripts/bench_middleware.py.
+"""
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
+}
+
+# Sliding token refresh: an authenticated request whose still-valid JWT is
+# within this many seconds of expiry gets a fresh token in X-Refresh-Token.
+# The frontend axios interceptor swaps it into localStorage. Net effect:
+# active users never see "session expired" mid-conference; idle users
+# still expire after the normal TTL.
+REFRESH_WINDOW_SECONDS = 7200
+
+
+def refreshed_token(scope: Scope) -> str | None:
+    """New access token for this request, or None if no refresh is due.
+
+    Reuses the payload get_current_user already decoded into
+    request.state (scope["state"]); decodes only for routes that never
+    authenticated. Any invalid/expired token → None, the route's auth deps
+    handle it.
+    """
+    auth = Headers(scope=scope).get("authorization", "")
+    if not auth.lower().startswith("bearer "):
+        return None
+    try:
+        from app.core.security import decode_token, create_access_token
+        payload = (scope.get("state") or {}).get("jwt_payload")
+        if payload is None:
+            payload = decode_token(auth.split(None, 1)[1])
+        exp = float(payload.get("exp") or 0)
+        sub = payload.get("sub")
+        remaining = exp - time.time()
+        if sub and 0 < remaining < REFRESH_WINDOW_SECONDS:
+            return create_access_token({"sub": sub})
+    except Exception:
+        pass
+    return None
+
+
+class ResponseHeadersMiddleware:
+    """Security headers + sliding token refresh, set on the way out."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in SECURITY_HEADERS.items():
+                    headers[name] = value
+                token = refreshed_token(scope)
+                if token:
+                    headers["X-Refresh-Token"] = token
+                    if "access-control-expose-headers" not in headers:
+                        headers["Access-Control-Expose-Headers"] = "X-Refresh-Token"
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
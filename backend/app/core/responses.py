@@ -0,0 +1,39 @@
+"""orjson-backed JSON responses.
+
+FastAPI's default path for a route with `response_model=` is: the handler
+builds a Pydantic model → FastAPI dumps it to a dict → VALIDATES that dict
+against response_model again → jsonable_encoder walks it → json.dumps. On
+the big list routes (50 matches with a nested attendee each, up to 1000
+attendees from GET /attendees) the second validation + encoder walk cost
+more CPU than building the payload did.
+
+`model_response()` skips all of that: one model_dump, one orjson.dumps,
+and returning a Response makes FastAPI bypass response_model processing
+(the model is still declared on the route for OpenAPI). Only use it when
+the handler already builds the exact response_model type — nothing
+re-checks the shape on the way out.
+
+`FastJSONResponse` is also the app-wide default_response_class, so plain
+dict routes (dashboard snapshots) get orjson encoding too.
+Numbers: scripts/bench_serialization.py.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+# OPT_UTC_Z keeps UTC datetimes as "...Z", byte-identical to what Pydantic's
+# JSON mode (the old path) produced — the frontend parses both, but cached
+# payloads and tests compare strings.
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+
+class FastJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> FastJSONResponse:
+    """Serialize an already-validated response model straight to JSON."""
+    return FastJSONResponse(model.model_dump(), status_code=status_code)
@@ -1,3 +1,6 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 import bcrypt
 from jose import JWTError, jwt
@@ -15,6 +18,91 @@ def get_password_hash(password: str) -> str:
     return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
 
+# ── Password hashing off the event loop ──────────────────────────────────────
+# One bcrypt call is ~200-300ms of CPU. Called inline from an async route it
+# froze the whole worker for that long — during the welcome-email wave the
+# login spike stalled /matches for everyone on the box. Routes now await the
+# *_async wrappers below, which run bcrypt (it releases the GIL) on a small
+# DEDICATED pool: capped so a login burst can't eat every core, and separate
+# from the default executor so it can't starve asyncio.to_thread users (email
+# sends, sheet sync). Past PASSWORD_HASH_MAX_QUEUE waiting calls we fail fast
+# with PasswordHashBusy (503 + Retry-After) instead of queueing for minutes.
+# The sync functions above stay for scripts.
+
+class PasswordHashBusy(RuntimeError):
+    """Hash pool saturated — caller should retry shortly."""
+
+
+class _HashPool:
+    def __init__(self, workers: int, max_queue: int) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+        # Only touched on the event loop thread.
+        self._pending = 0
+        self._peak_queued = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+        self._run_ms_total = 0.0
+
+    async def run(self, fn, *args):
+        if self._pending >= self.workers + self.max_queue:
+            self._rejected += 1
+            raise PasswordHashBusy("password hashing queue full")
+        self._pending += 1
+        self._peak_queued = max(self._peak_queued, self._pending - self.workers)
+        submitted = time.perf_counter()
+
+        def _timed():
+            started = time.perf_counter()
+            return fn(*args), started, time.perf_counter()
+
+        try:
+            result, started, finished = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _timed
+            )
+        finally:
+            self._pending -= 1
+        wait_ms = (started - submitted) * 1000
+        self._completed += 1
+        self._wait_ms_total += wait_ms
+        self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+        self._run_ms_total += (finished - started) * 1000
+        return result
+
+    def metrics(self) -> dict:
+        done = self._completed or 1
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(self._pending, self.workers),
+            "queued": max(0, self._pending - self.workers),
+            "peak_queued": self._peak_queued,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_wait_ms": round(self._wait_ms_total / done, 1),
+            "max_wait_ms": round(self._wait_ms_max, 1),
+            "avg_run_ms": round(self._run_ms_total / done, 1),
+        }
+
+
+_hash_pool = _HashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await _hash_pool.run(verify_password, plain, hashed)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _hash_pool.run(get_password_hash, password)
+
+
+def password_hash_metrics() -> dict:
+    return _hash_pool.metrics()
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
@@ -25,7 +113,15 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
 
 
 def decode_token(token: str) -> dict:
-    return jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+    """Decode an ACCESS token. Single-purpose tokens (reset links, stream
+    tickets) are signed with the same key, so they're refused here by their
+    `purpose` claim — otherwise a 60-second ticket read out of an access log
+    authenticates as a bearer token and the sliding refresh trades it for a
+    full session."""
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+    if payload.get("purpose"):
+        raise JWTError("single-purpose token is not an access token")
+    return payload
 
 
 def create_reset_token(user_id: str) -> str:
@@ -46,3 +142,33 @@ def decode_reset_token(token: str) -> str | None:
         return payload.get("sub")
     except JWTError:
         return None
+
+
+STREAM_TICKET_AUDIENCE = "stream"
+
+
+def create_stream_ticket(user_id: str) -> str:
+    """60-second JWT with purpose='stream' for GET /messages/stream.
+
+    EventSource can't send an Authorization header, so the SSE URL carries a
+    ticket in the query string — short-lived and single-purpose so the one
+    that lands in access logs is useless as a login token. Its own audience
+    as well as its purpose: jwt.decode without audience="stream" (every
+    access-token path) rejects it."""
+    return jwt.encode(
+        {"sub": user_id, "purpose": "stream", "aud": STREAM_TICKET_AUDIENCE,
+         "exp": datetime.now(timezone.utc) + timedelta(seconds=60)},
+        settings.SECRET_KEY,
+        algorithm=ALGORITHM,
+    )
+
+
+def decode_stream_ticket(ticket: str) -> str | None:
+    """Decode and validate a stream ticket. Returns user_id or None."""
+    try:
+        payload = jwt.decode(ticket, settings.SECRET_KEY, algorithms=[ALGORITHM], audience=STREAM_TICKET_AUDIENCE)
+        if payload.get("purpose") != "stream":
+            return None
+        return payload.get("sub")
+    except JWTError:
+        return None
@@ -1,6 +1,7 @@
 import asyncio
 import structlog
 from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -12,6 +13,8 @@ from apscheduler.triggers.interval import IntervalTrigger
 
 from app.core.config import get_settings
 from app.core.limiter import limiter
+from app.core.middleware import ResponseHeadersMiddleware
+from app.core.responses import FastJSONResponse
 from app.api.routes import attendees, matches, enrichment, dashboard, auth, chat, messages, threads, integration
 
 settings = get_settings()
@@ -112,14 +115,17 @@ async def _run_with_heartbeat(job_name: str, coro_factory):
 async def _daily_extasy_sync():
     from app.services.extasy_sync import sync_and_enrich
     await _run_with_heartbeat("daily_extasy_sync", sync_and_enrich)
+    _trigger_dashboard_metrics_refresh()
 
 async def _daily_checkins_sync():
     from app.services.checkins_sync import sync_checkins_to_db
     await _run_with_heartbeat("daily_checkins_sync", sync_checkins_to_db)
+    _trigger_dashboard_metrics_refresh()
 
 async def _daily_speakers_sync():
     from app.services.speakers_sheet_sync import sync_speakers_sheet
     await _run_with_heartbeat("daily_speakers_sync", lambda: sync_speakers_sheet(fetch=True))
+    _trigger_dashboard_metrics_refresh()
 
 async def _daily_grid_audit():
     from app.services.grid_audit import run_and_persist
@@ -145,6 +151,7 @@ async def _daily_match_refresh():
         async with async_session() as db:
             return await refresh_matches_for_new_attendees(db)
     await _run_with_heartbeat("daily_match_refresh", _go)
+    _trigger_dashboard_metrics_refresh()
 
 async def _daily_usage_snapshot():
     from app.core.database import async_session
@@ -153,6 +160,55 @@ async def _daily_usage_snapshot():
         async with async_session() as db:
             return await compute_and_upsert_usage_daily(db)
     await _run_with_heartbeat("daily_usage_snapshot", _go)
+    _trigger_dashboard_metrics_refresh()
+
+async def _daily_llm_cache_purge():
+    from app.services.llm_cache import purge_expired
+    await _run_with_heartbeat("daily_llm_cache_purge", purge_expired)
+
+
+DASHBOARD_METRICS_INTERVAL_MINUTES = 10
+
+
+async def _dashboard_metrics_refresh(since: datetime | None = None):
+    """Recompute the materialized dashboard snapshots (dashboard_metrics).
+
+    Runs every 10 min and once after each sync / match refresh / usage
+    snapshot, so the admin dashboard reads precomputed rows instead of
+    aggregating the raw tables (and calling Extasy) on every page load.
+
+    Every worker's scheduler fires this, so it goes through
+    refresh_metrics_if_stale: one worker refreshes per interval and the
+    others skip. An interval run skips snapshots under 9 min old (a minute
+    of slack for worker start skew); a post-sync run (`since` = when the
+    sync finished) skips only if another worker refreshed after that.
+    """
+    from app.core.database import async_session
+    from app.api.routes.dashboard import refresh_metrics_if_stale
+    if since is None:
+        since = datetime.utcnow() - timedelta(minutes=DASHBOARD_METRICS_INTERVAL_MINUTES - 1)
+    async def _go():
+        async with async_session() as db:
+            return await refresh_metrics_if_stale(db, since)
+    await _run_with_heartbeat("dashboard_metrics_refresh", _go)
+
+
+def _trigger_dashboard_metrics_refresh():
+    """Queue a one-off dashboard refresh right after a data-changing job.
+
+    A fixed job id + replace_existing coalesces back-to-back triggers (the
+    02:00-02:15 sync chain) into a single pending run instead of three.
+    """
+    try:
+        scheduler.add_job(
+            _dashboard_metrics_refresh,
+            kwargs={"since": datetime.utcnow()},
+            id="dashboard_metrics_refresh_event",
+            replace_existing=True,
+            **_JOB_DEFAULTS,
+        )
+    except Exception as exc:
+        logger.warning("scheduler: could not queue dashboard_metrics_refresh", error=str(exc))
 
 
 async def _morning_schedule_email():
@@ -277,6 +333,9 @@ scheduler.add_job(_daily_match_refresh,     CronTrigger(hour=3, minute=30, timez
 # Usage snapshot at 03:45 UTC — runs AFTER match refresh so it captures a
 # full day of login/magic-link activity into usage_daily (one row/day).
 scheduler.add_job(_daily_usage_snapshot,    CronTrigger(hour=3, minute=45, timezone="UTC"), **_JOB_DEFAULTS)
+# LLM cache purge at 04:00 UTC: drop llm_cache rows past their TTL (reads
+# already ignore them; this just keeps the table from growing).
+scheduler.add_job(_daily_llm_cache_purge,   CronTrigger(hour=4, minute=0,  timezone="UTC"), **_JOB_DEFAULTS)
 # Reciprocity-notify every 2h: forward pending-interest pull-backs +
 # mutual-completion emails. IntervalTrigger fires immediately on startup
 # then every 2h. mutual_notified_at dedup prevents double-sends.
@@ -297,13 +356,27 @@ scheduler.add_job(_mid_event_reengagement,  CronTrigger(year=2026, month=6, day=
 # digest. Per-attendee 72h throttle. Complements the once-lifetime match-intro
 # email which only fires on first match-generation.
 scheduler.add_job(_daily_match_digest,      CronTrigger(hour=9, minute=0, timezone="UTC"), **_JOB_DEFAULTS)
+# Dashboard metrics every 10 min: recompute the dashboard_metrics snapshots the
+# admin dashboard serves from. Also queued after every sync (see
+# _trigger_dashboard_metrics_refresh) and via POST /dashboard/metrics/refresh.
+scheduler.add_job(_dashboard_metrics_refresh, IntervalTrigger(minutes=DASHBOARD_METRICS_INTERVAL_MINUTES), **_JOB_DEFAULTS)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     scheduler.start()
-    logger.info("scheduler: started — extasy 02:00, speakers 02:15, grid audit 02:30, enrichment 03:00, match refresh 03:30, usage snapshot 03:45 (UTC); reciprocity_notify every 2h; morning_schedule 07:00 Europe/Paris (only fires June 2/3 2026); match_digest 09:00 UTC")
+    # Outbound mail is queued by _send_email and delivered here, off the
+    # request/cron code paths (services/email_outbox.py).
+    email_outbox.start()
+    logger.info("scheduler: started — extasy 02:00, speakers 02:15, grid audit 02:30, enrichment 03:00, match refresh 03:30, usage snapshot 03:45, llm cache purge 04:00 (UTC); reciprocity_notify every 2h; morning_schedule 07:00 Europe/Paris (only fires June 2/3 2026); match_digest 09:00 UTC; dashboard_metrics every 10m")
     yield
     scheduler.shutdown(wait=False)
+    from app.services.realtime import broker as _realtime_broker
+    await _realtime_broker.close()
+    from app.services.profile_pipeline import refresh_queue as _refresh_queue
+    await _refresh_queue.close()
+    from app.services.advisory_locks import refresh_locks as _refresh_locks
+    await _refresh_locks.close()
+    await email_outbox.close()
     logger.info("scheduler: stopped")
 
 # ── App ───────────────────────────────────────────────────────────────────────
@@ -312,6 +385,8 @@ app = FastAPI(
     description="AI Matchmaking Engine for Proof of Talk 2026",
     version="0.1.0",
     lifespan=lifespan,
+    # orjson for every JSON route; see app/core/responses.py.
+    default_response_class=FastJSONResponse,
     docs_url="/api/docs" if settings.DEBUG else None,
     redoc_url="/api/redoc" if settings.DEBUG else None,
     openapi_url="/api/openapi.json" if settings.DEBUG else None,
@@ -332,46 +407,29 @@ app.add_middleware(
     expose_headers=["X-Refresh-Token"],
 )
 
-# ── Security headers ──────────────────────────────────────────────────────────
-@app.middleware("http")
-async def security_headers(request: Request, call_next):
-    response = await call_next(request)
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-    return response
-
-
-# ── Sliding token refresh ─────────────────────────────────────────────────────
-# When an authenticated request comes in with a still-valid JWT that is
-# within 2h of expiry, return a fresh token in the X-Refresh-Token
-# response header. The frontend axios interceptor swaps it into
-# localStorage on the next response. Net effect: active users never see
-# a "session expired" mid-conference; idle users still expire after the
-# normal 8h TTL.
-@app.middleware("http")
-async def sliding_token_refresh(request: Request, call_next):
-    response = await call_next(request)
-    auth = request.headers.get("authorization", "")
-    if not auth.lower().startswith("bearer "):
-        return response
-    token = auth.split(None, 1)[1]
-    try:
-        import time as _time
-        from app.core.security import decode_token, create_access_token
-        payload = decode_token(token)
-        exp = float(payload.get("exp") or 0)
-        sub = payload.get("sub")
-        # Refresh if less than 2h left and still valid
-        remaining = exp - _time.time()
-        if sub and 0 < remaining < 7200:
-            response.headers["X-Refresh-Token"] = create_access_token({"sub": sub})
-            response.headers.setdefault("Access-Control-Expose-Headers", "X-Refresh-Token")
-    except Exception:
-        pass  # invalid/expired token — let the route's auth deps handle it
-    return response
+# ── Security headers + sliding token refresh ─────────────────────────────────
+# One pure-ASGI layer (app/core/middleware.py) that edits headers on
+# http.response.start without buffering the body. Replaced two
+# @app.middleware("http") functions whose BaseHTTPMiddleware plumbing cost a
+# task group + stream wrap per request each. Added after CORS so it stays
+# the outermost layer, as the decorators were.
+app.add_middleware(ResponseHeadersMiddleware)
+
+# ── Password-hash pool saturated → 503, client retries ───────────────────────
+from app.core.security import PasswordHashBusy, password_hash_metrics  # noqa: E402
+from app.services.profile_pipeline import refresh_queue_metrics  # noqa: E402
+from app.services.email_outbox import email_outbox  # noqa: E402
+from app.services.llm_cache import llm_cache_metrics  # noqa: E402
+
+
+@app.exception_handler(PasswordHashBusy)
+async def password_hash_busy_handler(request: Request, exc: PasswordHashBusy):
+    logger.warning("password_hash_busy", path=request.url.path, **password_hash_metrics())
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Sign-in is busy right now — please try again in a few seconds."},
+        headers={"Retry-After": "5"},
+    )
 
 # ── Global exception handler (no stack traces in responses) ──────────────────
 @app.exception_handler(Exception)
@@ -419,6 +477,15 @@ async def health():
         "service": settings.APP_NAME,
         "db": db_status,
         "db_error": db_error,
+        # bcrypt pool for this worker: queue depth, waits, rejections.
+        "password_hash": password_hash_metrics(),
+        # Profile-save → match-refresh queue for this worker: dirty backlog,
+        # merged requests, slot waits.
+        "profile_refresh": refresh_queue_metrics(),
+        # Email outbox worker: buffered/queued/sent/retried/failed counts.
+        "email_outbox": email_outbox.metrics(),
+        # Rerank LLM cache for this worker: hits/misses/stores/errors.
+        "llm_cache": llm_cache_metrics(),
     }
 
 
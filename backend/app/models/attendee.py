@@ -1,8 +1,9 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Text, DateTime, Enum as SAEnum, Float, Boolean
-from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
+from sqlalchemy import String, Text, DateTime, Enum as SAEnum, Float, Boolean, Computed, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Load, Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY, TSVECTOR
 from pgvector.sqlalchemy import Vector
 from app.core.database import Base
 import enum
@@ -65,15 +66,25 @@ class Attendee(Base):
         Boolean, default=False, server_default="false", nullable=False
     )
     ai_summary_edited_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
-    embedding: Mapped[list] = mapped_column(Vector(1536), nullable=True)  # OpenAI embedding
+    # OpenAI embedding. Deferred (see HEAVY_COLUMNS below): only the matching
+    # engine reads it, via load_heavy()/ensure_heavy().
+    embedding: Mapped[list] = mapped_column(
+        Vector(1536), nullable=True, deferred=True, deferred_raiseload=True
+    )
     intent_tags: Mapped[list] = mapped_column(ARRAY(String), default=list)  # AI-classified intents
     vertical_tags: Mapped[list] = mapped_column(ARRAY(String), default=list)  # 1000minds sector verticals
     deal_readiness_score: Mapped[float] = mapped_column(Float, nullable=True)  # 0-1 score
     inferred_customer_profile: Mapped[dict] = mapped_column(JSONB, default=dict)  # GPT-inferred ICP: who would buy/partner with this attendee
 
     # Data intelligence extras
-    crunchbase_data: Mapped[dict] = mapped_column(JSONB, default=dict)  # Crunchbase/PitchBook data
-    pot_history: Mapped[dict] = mapped_column(JSONB, default=dict)   # Previous POT event attendance
+    # Crunchbase/PitchBook data + previous POT attendance. Deferred: only the
+    # enrichment status route reads them.
+    crunchbase_data: Mapped[dict] = mapped_column(
+        JSONB, default=dict, deferred=True, deferred_raiseload=True
+    )
+    pot_history: Mapped[dict] = mapped_column(
+        JSONB, default=dict, deferred=True, deferred_raiseload=True
+    )
     enriched_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)  # Last enrichment run
 
     # Speaker consent gate. "not_required" (default, matchable) / "pending"
@@ -101,6 +112,71 @@ class Attendee(Base):
     # 72h per-attendee throttle. NULL = never sent. Used by run_match_digest cron.
     last_match_digest_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
+    # Directory search index — generated + stored by Postgres (migration
+    # c9d0e1f2a3b4), never written by the app. Deferred so select(Attendee)
+    # doesn't drag it along; only app/services/attendee_search.py reads it.
+    search_vector = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', immutable_unaccent(lower(coalesce(name, '')))), 'A') || "
+            "setweight(to_tsvector('simple', immutable_unaccent(lower(coalesce(company, '')))), 'A') || "
+            "setweight(to_tsvector('simple', immutable_unaccent(lower(coalesce(title, '')))), 'B') || "
+            "setweight(to_tsvector('simple', immutable_unaccent(lower(coalesce(goals, '')))), 'C') || "
+            "setweight(to_tsvector('simple', immutable_unaccent(lower(coalesce(ai_summary, '')))), 'D')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+
+# Heavy Attendee columns, deferred by default. Before this, every db.get /
+# select(Attendee) — including the ones that only wanted name/company/title —
+# pulled the 1536-float embedding (~19KB of pgvector text per row, parsed
+# client-side) plus the JSONB blobs; that was most of the 30s
+# /messages/conversations hang. Touching one of these on a row loaded without
+# it raises (deferred_raiseload) instead of lazy-loading, which in async
+# would be a MissingGreenlet anyway — so a missed call site fails loudly.
+#
+# enriched_profile and inferred_customer_profile stay eager: AttendeeResponse
+# serializes enriched_profile on every attendee-returning route, and the
+# embedding text + candidate rerank read the ICP on every matching path, so
+# deferring them would only add a second round-trip.
+HEAVY_COLUMNS = ("embedding", "crunchbase_data", "pot_history")
+
+# Named projections for the two callers that need heavy data.
+MATCHING_COLUMNS = ("embedding",)
+ENRICHMENT_COLUMNS = ("crunchbase_data", "pot_history")
+
+
+def load_heavy(*names: str):
+    """Loader option undeferring heavy columns (all of them if none named).
+
+        select(Attendee).options(load_heavy(*MATCHING_COLUMNS))
+        await db.get(Attendee, id, options=[load_heavy("embedding")])
+    """
+    option = Load(Attendee)
+    for name in names or HEAVY_COLUMNS:
+        option = option.undefer(getattr(Attendee, name))
+    return option
+
+
+async def ensure_heavy(db: AsyncSession, attendee: Attendee, *names: str) -> Attendee:
+    """Load any still-unloaded heavy columns onto an already-loaded row.
+
+    Needed because db.get() answers from the identity map without SQL — if
+    the row was loaded earlier in the session without the column, the
+    load_heavy() option on a later get() never runs. No-op (no query) when
+    everything asked for is already loaded, or for transient/pending rows
+    (and for non-ORM stand-ins, which have no state to load into).
+    """
+    state = inspect(attendee, raiseerr=False)
+    if state is None or not state.persistent:
+        return attendee
+    missing = [n for n in (names or HEAVY_COLUMNS) if n in state.unloaded]
+    if missing:
+        await db.refresh(attendee, attribute_names=missing)
+    return attendee
+
 
 class Match(Base):
     __tablename__ = "matches"
@@ -0,0 +1,19 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+from app.core.database import Base
+
+
+class DashboardMetric(Base):
+    """One precomputed dashboard payload per key ("stats", "revenue", ...),
+    overwritten by the dashboard-metrics refresh. The admin dashboard reads
+    these rows instead of re-aggregating the raw tables on every page load.
+    See app/services/dashboard_metrics.py.
+    """
+    __tablename__ = "dashboard_metrics"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    payload: Mapped[dict] = mapped_column(JSONB, default=dict)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Boolean, DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from app.core.database import Base
+
+
+class EmailOutbox(Base):
+    """One outbound email that already passed the EMAIL_MODE / allowlist /
+    kill-switch gates. `payload` is the exact Resend request body; the
+    outbox worker (app/services/email_outbox.py) delivers due rows in
+    batches and reschedules failures with backoff.
+
+    status: pending → sending (claimed, lease until next_attempt_at) →
+    sent | failed. A `sending` row whose lease ran out (worker died
+    mid-delivery) is claimed again.
+    """
+    __tablename__ = "email_outbox"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    to_email: Mapped[str] = mapped_column(String(320))
+    subject: Mapped[str] = mapped_column(Text)
+    payload: Mapped[dict] = mapped_column(JSONB)
+    # Account-recovery mail: delivered first, and the only mail that still
+    # goes out if EMAIL_GLOBAL_DISABLED is flipped while it's queued.
+    critical: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    status: Mapped[str] = mapped_column(String(20), default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    provider_id: Mapped[str | None] = mapped_column(String(64), nullable=True)  # Resend email id
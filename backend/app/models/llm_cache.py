@@ -0,0 +1,22 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+from app.core.database import Base
+
+
+class LlmCacheEntry(Base):
+    """One cached LLM response, keyed by the fingerprint of the request
+    (model, sampling params, normalized prompt). `payload` is the parsed JSON
+    the model returned. Rows past `expires_at` are ignored on read and deleted
+    by the nightly purge. See app/services/llm_cache.py.
+    """
+    __tablename__ = "llm_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)  # sha256 hex
+    model: Mapped[str] = mapped_column(String(64))
+    payload: Mapped[dict | list] = mapped_column(JSONB)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    expires_at: Mapped[datetime] = mapped_column(DateTime)
+    hits: Mapped[int] = mapped_column(Integer, default=0)
+    last_hit_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
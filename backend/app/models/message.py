@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Text, DateTime
+from sqlalchemy import Index, Integer, Text, DateTime
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 from app.core.database import Base
@@ -16,6 +16,10 @@ class Conversation(Base):
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Keyset pagination of a conversation's history (newest page first).
+        Index("ix_messages_conversation_created", "conversation_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     conversation_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), index=True)
@@ -34,11 +38,19 @@ class Thread(Base):
     title: Mapped[str] = mapped_column(Text)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Denormalized summary for the /threads listing, bumped in create_post's
+    # transaction (was a COUNT + latest-post query per thread per request).
+    post_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    latest_post_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
 
 class ThreadPost(Base):
     """Individual post in a warm-up thread."""
     __tablename__ = "thread_posts"
+    __table_args__ = (
+        # Keyset pagination of a thread's posts (newest page first).
+        Index("ix_thread_posts_thread_created", "thread_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     thread_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), index=True)
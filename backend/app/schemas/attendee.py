@@ -75,6 +75,8 @@ def redact_for_privacy(attendee_dict: dict, is_mutual_match: bool = False) -> di
 class AttendeeListResponse(BaseModel):
     attendees: list[AttendeeResponse]
     total: int
+    # Keyset cursor for the next page (search only); None on the last page.
+    next_cursor: str | None = None
 
 
 class MatchResponse(BaseModel):
@@ -186,6 +188,9 @@ class DashboardStats(BaseModel):
     post_meeting_satisfaction: float = 0.0
     top_sectors: list[dict]
     match_type_distribution: dict
+    # Freshness of the materialized snapshot this was served from.
+    computed_at: str | None = None
+    age_seconds: int | None = None
 
 
 class PriorityIntroResponse(BaseModel):
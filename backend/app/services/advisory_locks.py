@@ -0,0 +1,152 @@
+"""Cross-worker mutual exclusion via Postgres session-level advisory locks.
+
+An asyncio.Lock only serializes callers inside one gunicorn worker; two
+workers refreshing the same attendee at once doubled OpenAI spend and raced
+on pair rows. Advisory locks live in Postgres, so every worker sees them.
+
+Session-level advisory locks belong to a SERVER connection. Through the
+transaction pooler (:6543) consecutive statements can land on different
+server connections, so a lock taken there would be held by whoever got that
+connection next. Like the realtime LISTEN connection, each worker therefore
+keeps ONE dedicated asyncpg connection on the session pooler (see
+realtime.listen_dsn) and takes all of its locks on it. Postgres releases
+them if that connection dies, so a crashed worker can't wedge a key.
+
+Advisory locks are re-entrant per session: a second pg_try_advisory_lock on
+the same connection succeeds. Callers must therefore serialize in-process
+themselves (profile_pipeline does) and use this only for the cross-worker
+half.
+
+Fail-open: if the lock connection can't be opened, callers proceed
+unlocked (logged, retried after LOCK_RETRY_SECONDS). The lock is a cost
+guard; the pair unique constraint stays the correctness backstop.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+import asyncpg
+
+from app.services.realtime import listen_dsn
+
+logger = logging.getLogger(__name__)
+
+# First key of the two-int advisory lock form, so our keys can't collide
+# with anything else that takes advisory locks on this database.
+REFRESH_NAMESPACE = 0x504F5452  # "POTR"
+# Singleton jobs that should run in one worker at a time (key per job).
+JOBS_NAMESPACE = 0x504F544A  # "POTJ"
+DASHBOARD_METRICS_KEY = 1
+
+# After a failed connect, don't retry (and don't stall every caller on a
+# connect timeout) for this long.
+LOCK_RETRY_SECONDS = 30
+CONNECT_TIMEOUT_SECONDS = 5
+
+# hold(): how often to re-try a key another worker holds, and for how long
+# before giving up and running anyway (a refresh is ~5-10s; 3 min means the
+# holder is stuck, and waiting longer only drops the user's edit).
+LOCK_POLL_SECONDS = 1.0
+LOCK_WAIT_TIMEOUT_SECONDS = 180.0
+
+
+def attendee_lock_key(attendee_id: uuid.UUID) -> int:
+    """Stable signed int4 for an attendee id — identical in every worker
+    (builtin hash() is salted per process for str, so not used here)."""
+    return int.from_bytes(attendee_id.bytes[:4], "big", signed=True)
+
+
+class AdvisoryLocks:
+    def __init__(self, namespace: int = REFRESH_NAMESPACE):
+        self.namespace = namespace
+        self._conn: asyncpg.Connection | None = None
+        # asyncpg connections run one query at a time.
+        self._io = asyncio.Lock()
+        self._down_until = 0.0
+
+    async def _connection(self) -> asyncpg.Connection | None:
+        if self._conn is not None and not self._conn.is_closed():
+            return self._conn
+        if time.monotonic() < self._down_until:
+            return None
+        try:
+            self._conn = await asyncpg.connect(
+                listen_dsn(), timeout=CONNECT_TIMEOUT_SECONDS, statement_cache_size=0
+            )
+            return self._conn
+        except Exception as exc:  # noqa: BLE001
+            self._conn = None
+            self._down_until = time.monotonic() + LOCK_RETRY_SECONDS
+            logger.warning("advisory locks unavailable (%s); proceeding unlocked", exc)
+            return None
+
+    async def try_acquire(self, key: int, namespace: int | None = None) -> bool | None:
+        """True = acquired, False = held by another worker, None = no lock
+        connection (fail-open). `namespace` overrides the instance's."""
+        async with self._io:
+            conn = await self._connection()
+            if conn is None:
+                return None
+            try:
+                return await conn.fetchval(
+                    "SELECT pg_try_advisory_lock($1, $2)", namespace or self.namespace, key
+                )
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("pg_try_advisory_lock failed (%s); proceeding unlocked", exc)
+                await self._drop()
+                return None
+
+    async def release(self, key: int, namespace: int | None = None) -> None:
+        async with self._io:
+            if self._conn is None or self._conn.is_closed():
+                return  # connection gone → Postgres already released it
+            try:
+                await self._conn.fetchval(
+                    "SELECT pg_advisory_unlock($1, $2)", namespace or self.namespace, key
+                )
+            except Exception as exc:  # noqa: BLE001
+                # Closing the session is the only other way to free the key.
+                logger.warning("pg_advisory_unlock failed (%s); dropping lock connection", exc)
+                await self._drop()
+
+    @asynccontextmanager
+    async def hold(self, key: int, namespace: int | None = None):
+        """Wait (polling) until `key` is ours, run the body, release.
+
+        Yields True when the lock is held, False when running unlocked
+        (no lock connection, or LOCK_WAIT_TIMEOUT_SECONDS spent waiting on
+        another worker).
+        """
+        args = (key,) if namespace is None else (key, namespace)
+        deadline = time.monotonic() + LOCK_WAIT_TIMEOUT_SECONDS
+        held = await self.try_acquire(*args)
+        while held is False and time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_SECONDS)
+            held = await self.try_acquire(*args)
+        if held is False:
+            logger.warning(
+                "advisory lock %s:%s still held after %.0fs; proceeding",
+                namespace or self.namespace, key, LOCK_WAIT_TIMEOUT_SECONDS,
+            )
+        try:
+            yield bool(held)
+        finally:
+            if held:
+                await self.release(*args)
+
+    async def _drop(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                await conn.close(timeout=2)
+            except Exception:  # noqa: BLE001
+                conn.terminate()
+
+    async def close(self) -> None:
+        async with self._io:
+            await self._drop()
+
+
+refresh_locks = AdvisoryLocks()
@@ -0,0 +1,112 @@
+"""Directory search over attendees — indexed, ranked, keyset-paginated.
+
+Backed by migration c9d0e1f2a3b4:
+  - `attendees.search_vector`: stored tsvector over name/company (A),
+    title (B), goals (C), ai_summary (D), built from
+    `immutable_unaccent(lower(col))`, served by a GIN index;
+  - pg_trgm GIN indexes on `immutable_unaccent(lower(name|company|title))`.
+
+A row matches when either
+  - every typed word is a word PREFIX in the tsvector ("stef ven" finds
+    "Stéfan Venter" — type-ahead), or
+  - the whole term is a SUBSTRING of the unaccented name / company / title
+    ("coin" finds "Bitcoin Suisse"), answered by the trigram indexes.
+Both sides are unaccented, so the old accent-insensitive behaviour holds:
+"stephanie" matches "Stéphanie", "chloe" matches "Chloé".
+
+Ranking: best of ts_rank (weighted, so a name hit beats a summary hit) and
+trigram word_similarity against name / company. Pagination is keyset on
+(rank DESC, id ASC) via an opaque cursor — no OFFSET rescans.
+"""
+import base64
+import json
+import re
+import uuid
+
+from sqlalchemy import Select, and_, func, literal, or_, select
+
+from app.models.attendee import Attendee
+
+# Words for the tsquery. \w is unicode-aware, so accented letters survive
+# here and are unaccented in SQL; everything else (tsquery operators,
+# punctuation) is dropped, which also makes the query injection-safe.
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _u(expr):
+    return func.immutable_unaccent(func.lower(expr))
+
+
+def prefix_tsquery_text(q: str) -> str | None:
+    """'Stéph  ven!' -> 'stéph:* & ven:*' (None when no searchable word)."""
+    words = _WORD.findall(q.lower())
+    if not words:
+        return None
+    return " & ".join(f"{w}:*" for w in words)
+
+
+def _like_pattern(q: str) -> str:
+    # Backslash is Postgres' default LIKE escape, so no ESCAPE clause needed.
+    escaped = q.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def encode_cursor(rank: float, attendee_id) -> str:
+    raw = json.dumps([rank, str(attendee_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, uuid.UUID]:
+    """Raises ValueError on a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, aid = json.loads(base64.urlsafe_b64decode(padded))
+        return float(rank), uuid.UUID(aid)
+    except Exception as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+def build_search_query(q: str, limit: int, cursor: str | None = None) -> Select:
+    """SELECT (Attendee, rank) for one page of results, best match first.
+
+    Fetches `limit + 1` rows so the caller can tell whether a next page
+    exists without a COUNT.
+    """
+    q = q.strip()
+    uterm = _u(literal(q))
+    pattern = func.immutable_unaccent(literal(_like_pattern(q)))
+
+    substring_hit = or_(
+        _u(Attendee.name).like(pattern),
+        _u(Attendee.company).like(pattern),
+        _u(Attendee.title).like(pattern),
+    )
+    similarity = func.greatest(
+        func.word_similarity(uterm, _u(Attendee.name)),
+        func.word_similarity(uterm, _u(Attendee.company)),
+    )
+
+    tsq_text = prefix_tsquery_text(q)
+    if tsq_text is not None:
+        tsq = func.to_tsquery("simple", func.immutable_unaccent(literal(tsq_text)))
+        match = or_(Attendee.search_vector.op("@@")(tsq), substring_hit)
+        rank = func.greatest(func.ts_rank(Attendee.search_vector, tsq), similarity)
+    else:
+        # Punctuation-only query ("++", "@"): nothing for FTS, substring only.
+        match = substring_hit
+        rank = similarity
+    rank = rank.label("rank")
+
+    stmt = select(Attendee, rank).where(match)
+    if cursor:
+        last_rank, last_id = decode_cursor(cursor)
+        # Row-wise (rank DESC, id ASC) "after" predicate. `rank` is recomputed
+        # per row, so compare against the expression, not the label.
+        rank_expr = rank.element
+        stmt = stmt.where(
+            or_(
+                rank_expr < last_rank,
+                and_(rank_expr == last_rank, Attendee.id > last_id),
+            )
+        )
+    return stmt.order_by(rank.desc(), Attendee.id).limit(limit + 1)
@@ -8,8 +8,10 @@ for net-new attendees (`refresh_matches_for_new_attendees`), so existing
 Match rows never auto-refresh. The LLM-side fixes only prevent NEW leaks.
 This module is the cleanup path for everything stored before those fixes.
 
-The actual masking reuses `MatchingEngine._mask_text_for_candidate` so
-the same word-boundary semantics apply here as on the LLM prompt side.
+The actual masking reuses `MatchingEngine._mask_texts_for_candidate` so
+the same word-boundary semantics apply here as on the LLM prompt side; the
+explanation and every context string of a row go through one sub() pass
+of the candidate's cached pattern.
 """
 from types import SimpleNamespace
 
@@ -53,35 +55,37 @@ def redact_b2b_in_match_fields(
         return {}
 
     changes: dict = {}
+    context = shared_context if isinstance(shared_context, dict) else {}
+
+    # Flatten every maskable string of the row, mask in one pass, then put
+    # the results back where they came from.
+    slots: list[tuple[str, int]] = []
+    texts: list[str | None] = [explanation]
+    for key in ("synergies", "action_items", "sectors"):
+        items = context.get(key)
+        if not isinstance(items, list):
+            continue
+        for i, item in enumerate(items):
+            if isinstance(item, str):
+                slots.append((key, i))
+                texts.append(item)
+    masked = MatchingEngine._mask_texts_for_candidate(texts, target)
 
-    masked_explanation = MatchingEngine._mask_text_for_candidate(explanation, target)
     # Empty input returns "" from the mask; treat that as "no real change"
     # unless the original was also empty - then there's nothing to write.
-    original_explanation = explanation or ""
-    if masked_explanation != original_explanation:
-        changes["explanation"] = masked_explanation
+    if masked[0] != (explanation or ""):
+        changes["explanation"] = masked[0]
 
-    if isinstance(shared_context, dict):
-        cleaned = {**shared_context}
-        any_field_changed = False
-        for key in ("synergies", "action_items", "sectors"):
-            items = cleaned.get(key)
-            if not isinstance(items, list):
-                continue
-            new_items = []
-            list_changed = False
-            for item in items:
-                if not isinstance(item, str):
-                    new_items.append(item)
-                    continue
-                masked_item = MatchingEngine._mask_text_for_candidate(item, target)
-                if masked_item != item:
-                    list_changed = True
-                new_items.append(masked_item)
-            if list_changed:
-                cleaned[key] = new_items
-                any_field_changed = True
-        if any_field_changed:
-            changes["shared_context"] = cleaned
+    cleaned: dict | None = None
+    for (key, i), original, new in zip(slots, texts[1:], masked[1:]):
+        if new == original:
+            continue
+        if cleaned is None:
+            cleaned = {**context}
+        if cleaned[key] is context[key]:
+            cleaned[key] = list(context[key])
+        cleaned[key][i] = new
+    if cleaned is not None:
+        changes["shared_context"] = cleaned
 
     return changes
@@ -0,0 +1,226 @@
+"""Materialized dashboard metrics — one precomputed payload row per key.
+
+The admin dashboard used to recompute /stats, /match-quality,
+/investor-heatmap, /revenue and /adoption from the raw tables on every page
+load, and /revenue also hit the Extasy API live. Now each payload is computed
+by a refresh (scheduled every few minutes, after every sync, and on the
+admin "Refresh now" button) and stored in `dashboard_metrics`; the endpoints
+serve the stored row plus its freshness (`computed_at`, `age_seconds`).
+
+This module owns the store only. The compute functions themselves live next
+to the endpoints in app/api/routes/dashboard.py (METRIC_COMPUTERS) and are
+passed in, so the SQL for a dashboard card stays in one place.
+"""
+import asyncio
+import json
+import logging
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Awaitable, Callable, Iterable
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.advisory_locks import DASHBOARD_METRICS_KEY, JOBS_NAMESPACE, refresh_locks
+
+logger = logging.getLogger(__name__)
+
+# A snapshot older than this is treated as missing and recomputed inline by
+# the endpoint. The scheduled refresh runs far more often than this, so in
+# practice it only kicks in when the scheduler is down (cf. the Apr 28
+# silent-cron incident) — the dashboard then degrades to the old live path
+# instead of quietly showing hour-old numbers.
+MAX_SNAPSHOT_AGE_SECONDS = 60 * 60
+
+Computer = Callable[[AsyncSession], Awaitable[dict]]
+
+# One refresh at a time per worker: the interval job, a post-sync trigger and
+# the "Refresh now" button can all land together, and running the same
+# aggregates three times in parallel buys nothing.
+_refresh_lock = asyncio.Lock()
+
+# Scheduled refreshes (interval + post-sync) fire in EVERY gunicorn worker's
+# APScheduler, so without a cross-worker guard each worker recomputed every
+# card and called Extasy once per interval. refresh_if_stale() takes a
+# Postgres advisory lock, then skips if every snapshot is already newer than
+# the caller needs — the first worker in refreshes, the rest find it done.
+
+
+def _json_default(value):
+    # Postgres avg() comes back as Decimal; keep it numeric for the frontend.
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def with_freshness(payload: dict, computed_at: datetime, now: datetime | None = None) -> dict:
+    """Attach `computed_at` / `age_seconds` so the UI can show "updated 3 min ago"."""
+    now = now or datetime.utcnow()
+    return {
+        **payload,
+        "computed_at": computed_at.isoformat(),
+        "age_seconds": max(0, int((now - computed_at).total_seconds())),
+    }
+
+
+async def read_metric(db: AsyncSession, key: str):
+    """Return the stored row (payload, computed_at) for `key`, or None."""
+    return (
+        await db.execute(
+            text("SELECT payload, computed_at FROM dashboard_metrics WHERE key = :key"),
+            {"key": key},
+        )
+    ).first()
+
+
+async def upsert_metric(
+    db: AsyncSession, key: str, payload: dict, duration_ms: int | None = None
+) -> datetime:
+    """Write `payload` for `key` (idempotent on key) and commit. Returns computed_at."""
+    computed_at = datetime.utcnow()
+    await db.execute(
+        text("""
+            INSERT INTO dashboard_metrics (key, payload, computed_at, duration_ms)
+            VALUES (:key, CAST(:payload AS JSONB), :computed_at, :duration_ms)
+            ON CONFLICT (key) DO UPDATE SET
+                payload     = EXCLUDED.payload,
+                computed_at = EXCLUDED.computed_at,
+                duration_ms = EXCLUDED.duration_ms
+        """),
+        {
+            "key": key,
+            "payload": json.dumps(payload, default=_json_default),
+            "computed_at": computed_at,
+            "duration_ms": duration_ms,
+        },
+    )
+    await db.commit()
+    return computed_at
+
+
+async def compute_and_store(db: AsyncSession, key: str, compute: Computer) -> tuple[dict, datetime]:
+    """Run one compute function and persist its payload.
+
+    A payload carrying an `error` key (e.g. Extasy down for /revenue) is NOT
+    stored — the previous good snapshot keeps being served — and is raised
+    as RuntimeError so the caller can count it.
+    """
+    started = time.monotonic()
+    payload = await compute(db)
+    if isinstance(payload, dict) and payload.get("error"):
+        raise RuntimeError(payload["error"])
+    duration_ms = int((time.monotonic() - started) * 1000)
+    computed_at = await upsert_metric(db, key, payload, duration_ms)
+    return payload, computed_at
+
+
+async def serve_metric(db: AsyncSession, key: str, compute: Computer) -> dict:
+    """Endpoint path: the stored snapshot if fresh enough, else compute inline.
+
+    An inline compute that fails to persist (pooler hiccup, table not yet
+    migrated) still returns the live payload — the dashboard never breaks
+    because the store did.
+    """
+    row = await read_metric(db, key)
+    now = datetime.utcnow()
+    if row is not None and (now - row.computed_at).total_seconds() <= MAX_SNAPSHOT_AGE_SECONDS:
+        return with_freshness(row.payload, row.computed_at, now)
+
+    started = time.monotonic()
+    payload = await compute(db)
+    if isinstance(payload, dict) and payload.get("error"):
+        # Source unavailable: an old snapshot beats an error card.
+        if row is not None:
+            return with_freshness(row.payload, row.computed_at, now)
+        return payload
+    try:
+        computed_at = await upsert_metric(db, key, payload, int((time.monotonic() - started) * 1000))
+    except Exception as exc:
+        logger.warning("dashboard_metrics: could not store %s: %s", key, exc)
+        await db.rollback()
+        computed_at = datetime.utcnow()
+    return with_freshness(payload, computed_at)
+
+
+async def refresh_dashboard_metrics(
+    db: AsyncSession,
+    computers: dict[str, Computer],
+    keys: Iterable[str] | None = None,
+) -> dict:
+    """Recompute and store every key in `keys` (default: all of `computers`).
+
+    Keys are independent: one failing (Extasy timeout, bad row) is logged,
+    rolled back and counted, the rest still refresh. Returns a stats dict
+    for the cron heartbeat (`errors > 0` marks the run "partial").
+    """
+    async with _refresh_lock:
+        return await _refresh_keys(db, computers, keys)
+
+
+async def _refresh_keys(db: AsyncSession, computers: dict[str, Computer], keys) -> dict:
+    wanted = list(keys) if keys is not None else list(computers)
+    refreshed: dict[str, int] = {}
+    failed: dict[str, str] = {}
+    for key in wanted:
+        compute = computers.get(key)
+        if compute is None:
+            failed[key] = "unknown metric"
+            continue
+        started = time.monotonic()
+        try:
+            await compute_and_store(db, key, compute)
+            refreshed[key] = int((time.monotonic() - started) * 1000)
+        except Exception as exc:
+            logger.warning("dashboard_metrics: refresh of %s failed: %s", key, exc)
+            failed[key] = f"{type(exc).__name__}: {exc}"
+            await db.rollback()
+
+    stats = {"refreshed": len(refreshed), "errors": len(failed), "duration_ms": refreshed}
+    if failed:
+        stats["failed"] = failed
+    logger.info("dashboard_metrics: %s", stats)
+    return stats
+
+
+async def oldest_snapshot(db: AsyncSession, keys: Iterable[str]) -> datetime | None:
+    """computed_at of the stalest snapshot among `keys`; None if any is missing."""
+    keys = list(keys)
+    row = (
+        await db.execute(
+            text("SELECT count(*) AS n, min(computed_at) AS oldest FROM dashboard_metrics WHERE key IN :keys")
+            .bindparams(bindparam("keys", expanding=True)),
+            {"keys": keys},
+        )
+    ).first()
+    if row is None or row.n < len(keys):
+        return None
+    return row.oldest
+
+
+async def refresh_if_stale(
+    db: AsyncSession,
+    computers: dict[str, Computer],
+    fresher_than: datetime,
+) -> dict:
+    """Scheduled-refresh path: refresh every key unless all snapshots were
+    computed at or after `fresher_than` (by another worker, typically).
+
+    Holds the dashboard advisory lock for the whole check-and-refresh, so a
+    second worker waits for the first and then sees its fresh rows. Without
+    a lock connection it fails open to the freshness check alone.
+    """
+    async with _refresh_lock:
+        async with refresh_locks.hold(DASHBOARD_METRICS_KEY, namespace=JOBS_NAMESPACE):
+            oldest = await oldest_snapshot(db, computers)
+            if oldest is not None and oldest >= fresher_than:
+                stats = {"refreshed": 0, "errors": 0, "skipped": "fresh", "oldest": oldest.isoformat()}
+                logger.info("dashboard_metrics: %s", stats)
+                return stats
+            return await _refresh_keys(db, computers, None)
+
+
+def refresh_in_progress() -> bool:
+    return _refresh_lock.locked()
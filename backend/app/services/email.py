@@ -10,6 +10,7 @@ import os
 
 import httpx
 from app.core.config import get_settings
+from app.services.email_outbox import email_outbox
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +41,8 @@ def _send_email(
     force: bool = False,
     critical: bool = False,
 ) -> bool:
-    """Send an email via Resend. Returns True on success, False on failure.
+    """Send an email via Resend. Returns True once accepted, False when gated
+    out or (direct path only) when Resend refuses it.
 
     Central gate for ALL outbound mail. EMAIL_MODE controls who actually
     receives:
@@ -61,6 +63,11 @@ def _send_email(
     `critical=True` marks account-recovery mail (password reset). It is the
     ONLY thing that survives EMAIL_GLOBAL_DISABLED — the master kill-switch
     that blocks every other send regardless of force/EMAIL_MODE.
+
+    Inside the app the gates run here, at enqueue time, and the payload goes
+    to the outbox worker (services/email_outbox.py) — no HTTP on the caller's
+    event loop. True then means "queued"; the worker retries failures.
+    Operator scripts have no worker and still POST synchronously.
     """
     settings = get_settings()
     if not settings.RESEND_API_KEY:
@@ -117,6 +124,17 @@ def _send_email(
     if attachments:
         payload["attachments"] = attachments
 
+    if email_outbox.started:
+        email_outbox.submit(payload, critical=critical)
+        logger.info("Email queued for %s (subject: %s)", to_email, subject[:50])
+        return True
+    return _post_now(payload)
+
+
+def _post_now(payload: dict) -> bool:
+    """Synchronous single send — the pre-outbox path, kept for scripts."""
+    settings = get_settings()
+    to_email, subject = payload["to"][0], payload["subject"]
     try:
         resp = httpx.post(
             RESEND_API_URL,
@@ -166,6 +184,12 @@ def _render_email(
             omit on transactional/security mail like password resets).
         accent: eyebrow + button colour (terracotta, matching the newsletter).
     """
+    # Plain f-strings on purpose: CPython compiles them to a single string
+    # build, so there's no template to parse per send. Measured with
+    # scripts/bench_email_render.py (2026-10-19): 5-20µs per email including
+    # the send_* body, all templates — noise next to one Resend round-trip.
+    # A precompiled slot/join template engine benchmarked no faster; re-run the
+    # bench before reaching for one.
     cream = "#F6F4EF"
     ink = "#211500"  # brand dark (Media Kit)
     body_color = "#3A3A3A"
@@ -0,0 +1,358 @@
+"""Durable email outbox: gated mail is queued and delivered off the event loop.
+
+_send_email (services/email.py) used to call httpx.post synchronously with a
+15s timeout. It runs inside the async crons (interest_cron, match_digest_cron,
+t_minus_one_reminder, mid_event_reengagement, morning_schedule) and at the end
+of generate_matches_for_attendee, so every send froze the event loop that
+also serves HTTP. Now, once the EMAIL_MODE / allowlist / kill-switch gates
+pass, _send_email hands the Resend payload to `email_outbox.submit()` and
+returns at once.
+
+The worker (one per process, started in the app lifespan):
+  1. writes submitted payloads to the email_outbox table in one INSERT,
+  2. claims up to BATCH_SIZE due rows with FOR UPDATE SKIP LOCKED, so
+     several gunicorn workers can drain the same table,
+  3. delivers them through one pooled httpx.AsyncClient via
+     POST /emails/batch, throttled to EMAIL_SEND_RATE_PER_SECOND requests,
+  4. marks rows sent, or reschedules them with exponential backoff; after
+     MAX_ATTEMPTS a row is left as `failed` with its last error.
+
+Resend's batch endpoint rejects the whole batch if one email is invalid and
+doesn't take attachments, so a 4xx batch is retried email by email and
+attachment mail always goes through POST /emails.
+
+Delivery is at-least-once: a worker that dies between Resend's 200 and the
+status update leaves a `sending` row that is claimed again once its lease
+runs out. The Idempotency-Key header lets Resend drop that repeat (24h).
+Submitted-but-not-yet-inserted payloads live in memory for well under a
+second; close() writes them out on shutdown.
+
+Nothing starts the worker outside the app (operator scripts such as
+send_welcome_batch.py), so _send_email keeps its synchronous POST there —
+those scripts rely on a per-recipient result.
+"""
+import asyncio
+import collections
+import hashlib
+import json
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import bindparam, insert, select, update
+
+from app.core.config import get_settings
+from app.core.database import async_session
+from app.models.email_outbox import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100               # Resend /emails/batch maximum
+MAX_ATTEMPTS = 6               # retries at 30s, 1m, 2m, 4m, 8m, then failed
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+SENDING_LEASE_SECONDS = 300    # a claimed row is claimable again after this
+POLL_SECONDS = 15.0            # picks up due retries and other workers' rows
+HTTP_TIMEOUT_SECONDS = 15
+LOCAL_BASE_URL = "http://resend.local"
+
+_t = EmailOutbox.__table__
+# One executemany for every outcome of a delivery pass.
+_RECORD = (
+    update(_t)
+    .where(_t.c.id == bindparam("oid"))
+    .values(
+        status=bindparam("new_status"),
+        sent_at=bindparam("sent"),
+        next_attempt_at=bindparam("next_at"),
+        last_error=bindparam("error"),
+        provider_id=bindparam("pid"),
+    )
+)
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff before attempt `attempts + 1`."""
+    return min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+
+
+def _retry_after(resp: httpx.Response) -> float:
+    try:
+        return max(0.0, float(resp.headers.get("retry-after", 1)))
+    except ValueError:
+        return 1.0
+
+
+class LocalResend:
+    """In-process stand-in for the Resend API, mounted via httpx.MockTransport.
+
+    Answers POST /emails and POST /emails/batch the way Resend does (ids in
+    request order, whole-batch rejection on one bad email, no attachments in
+    batch) and records each accepted email in `sent`. `fail_with` is a list
+    of status codes to return before succeeding, e.g. [429, 503]; `reject`
+    is a set of recipients answered with 422. Used when RESEND_API_BASE=local
+    and by the tests.
+    """
+
+    def __init__(self, fail_with=(), reject=()):
+        self.fail_with = list(fail_with)
+        self.reject = set(reject)
+        self.sent: list[dict] = []
+        self.requests: list[tuple[str, int]] = []  # (path, emails in request)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        emails = body if isinstance(body, list) else [body]
+        is_batch = request.url.path.endswith("/batch")
+        self.requests.append((request.url.path, len(emails)))
+        if self.fail_with:
+            code = self.fail_with.pop(0)
+            return httpx.Response(code, json={"message": "stand-in failure"}, headers={"retry-after": "0"})
+        if is_batch and any(e.get("attachments") for e in emails):
+            return httpx.Response(422, json={"message": "attachments are not supported in batch"})
+        if any(to in self.reject for e in emails for to in e["to"]):
+            return httpx.Response(422, json={"message": "invalid `to` field"})
+        ids = [f"local-{uuid.uuid4().hex[:12]}" for _ in emails]
+        for email, eid in zip(emails, ids):
+            self.sent.append({**email, "id": eid})
+            logger.info("local resend: %s -> %s", email["subject"][:50], ", ".join(email["to"]))
+        if is_batch:
+            return httpx.Response(200, json={"data": [{"id": eid} for eid in ids]})
+        return httpx.Response(200, json={"id": ids[0]})
+
+
+class EmailOutboxWorker:
+    def __init__(self, rate_per_second: float, transport: httpx.AsyncBaseTransport | None = None):
+        self.rate = rate_per_second
+        self._transport = transport
+        self._buffer: collections.deque = collections.deque()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._next_request_at = 0.0
+        self._m = {
+            "submitted": 0, "queued": 0, "sent": 0, "retried": 0, "failed": 0,
+            "requests": 0, "http_errors": 0,
+        }
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Must be called on the event loop (app lifespan)."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def submit(self, payload: dict, *, critical: bool = False) -> None:
+        """Queue one gated email and return. Never blocks; callable from the
+        event loop or from a worker thread (forgot-password sends from
+        asyncio.to_thread)."""
+        self._buffer.append((payload, critical))
+        self._m["submitted"] += 1
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._wakeup.set()
+        else:
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            claimed = 0
+            try:
+                await self._persist_buffer()
+                claimed = await self.deliver_due()
+            except Exception:  # noqa: BLE001 — DB blip; rows stay queued, retry next pass
+                logger.exception("email outbox: delivery pass failed")
+            if claimed >= BATCH_SIZE:
+                continue  # backlog: go again right away (the throttle paces us)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _persist_buffer(self) -> int:
+        items = []
+        while self._buffer:
+            items.append(self._buffer.popleft())
+        if not items:
+            return 0
+        rows = [
+            {"id": uuid.uuid4(), "to_email": p["to"][0], "subject": p["subject"], "payload": p, "critical": c}
+            for p, c in items
+        ]
+        try:
+            async with async_session() as db:
+                await db.execute(insert(EmailOutbox), rows)
+                await db.commit()
+        except Exception:
+            self._buffer.extendleft(reversed(items))  # keep order; next pass retries
+            raise
+        self._m["queued"] += len(rows)
+        return len(rows)
+
+    async def deliver_due(self) -> int:
+        """Claim up to BATCH_SIZE due rows, deliver them, record the outcomes.
+        Returns the number of rows claimed."""
+        now = datetime.utcnow()
+        due = (
+            select(EmailOutbox.id)
+            .where(EmailOutbox.status.in_(("pending", "sending")), EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.critical.desc(), EmailOutbox.next_attempt_at)
+            .limit(BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        claim = (
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due))
+            .values(
+                status="sending",
+                attempts=EmailOutbox.attempts + 1,
+                next_attempt_at=now + timedelta(seconds=SENDING_LEASE_SECONDS),
+            )
+            .returning(EmailOutbox.id, EmailOutbox.payload, EmailOutbox.attempts, EmailOutbox.critical)
+            .execution_options(synchronize_session=False)
+        )
+        async with async_session() as db:
+            claimed = (await db.execute(claim)).all()
+            await db.commit()
+        if not claimed:
+            return 0
+        outcomes = await self._deliver(claimed)
+        async with async_session() as db:
+            await db.execute(_RECORD, outcomes)
+            await db.commit()
+        return len(claimed)
+
+    async def _deliver(self, claimed: list) -> list[dict]:
+        """Send claimed rows; one outcome dict (for _RECORD) per row."""
+        settings = get_settings()
+        results: dict = {}
+        batchable, single = [], []
+        for row in claimed:
+            # Gates ran at enqueue; only the master kill-switch is re-checked
+            # so flipping it also stops mail that is already queued.
+            if settings.EMAIL_GLOBAL_DISABLED and not row.critical:
+                results[row.id] = ("failed", None, "EMAIL_GLOBAL_DISABLED at delivery")
+            elif row.payload.get("attachments"):
+                single.append(row)
+            else:
+                batchable.append(row)
+        if batchable:
+            results.update(await self._send_batch(batchable))
+        for row in single:
+            results[row.id] = await self._send_one(row)
+        now = datetime.utcnow()
+        return [self._outcome(row, *results[row.id], now) for row in claimed]
+
+    def _outcome(self, row, kind: str, provider_id: str | None, error: str | None, now: datetime) -> dict:
+        if kind == "retry" and row.attempts >= MAX_ATTEMPTS:
+            kind = "failed"
+        if kind == "failed":
+            logger.warning(
+                "email outbox: giving up on %s after %d attempt(s): %s",
+                row.payload["to"][0], row.attempts, error,
+            )
+        self._m["retried" if kind == "retry" else kind] += 1
+        return {
+            "oid": row.id,
+            "new_status": {"sent": "sent", "retry": "pending"}.get(kind, "failed"),
+            "sent": now if kind == "sent" else None,
+            "next_at": now + timedelta(seconds=retry_delay(row.attempts)) if kind == "retry" else now,
+            "error": error,
+            "pid": provider_id,
+        }
+
+    async def _send_batch(self, rows: list) -> dict:
+        ids = sorted(r.id.bytes for r in rows)
+        key = "outbox-batch-" + hashlib.sha256(b"".join(ids)).hexdigest()[:32]
+        resp, error = await self._post("/emails/batch", [r.payload for r in rows], key)
+        if error is None:
+            data = resp.json().get("data") or []
+            return {
+                r.id: ("sent", data[i].get("id") if i < len(data) else None, None)
+                for i, r in enumerate(rows)
+            }
+        if resp is not None and 400 <= resp.status_code < 500 and resp.status_code != 429:
+            # One invalid email rejects the whole batch — isolate it.
+            logger.warning("email outbox: batch of %d rejected (%s); sending one by one", len(rows), error)
+            return {r.id: await self._send_one(r) for r in rows}
+        return {r.id: ("retry", None, error) for r in rows}
+
+    async def _send_one(self, row) -> tuple:
+        resp, error = await self._post("/emails", row.payload, f"outbox-{row.id}")
+        if error is None:
+            return ("sent", resp.json().get("id"), None)
+        if resp is not None and 400 <= resp.status_code < 500 and resp.status_code != 429:
+            return ("failed", None, error)  # permanent: bad address, payload, key
+        return ("retry", None, error)
+
+    async def _post(self, path: str, body, idempotency_key: str) -> tuple:
+        """(response, None) on 2xx; (response | None, error string) otherwise."""
+        await self._throttle()
+        try:
+            resp = await self._http().post(path, json=body, headers={"Idempotency-Key": idempotency_key})
+        except httpx.HTTPError as exc:
+            self._m["http_errors"] += 1
+            return None, f"{type(exc).__name__}: {exc}"[:500]
+        self._m["requests"] += 1
+        if resp.status_code in (200, 201):
+            return resp, None
+        if resp.status_code == 429:
+            # Rate limited: pause the whole worker, not just these rows.
+            self._next_request_at = max(self._next_request_at, time.monotonic() + _retry_after(resp))
+        return resp, f"HTTP {resp.status_code}: {resp.text[:300]}"
+
+    async def _throttle(self) -> None:
+        now = time.monotonic()
+        if self._next_request_at > now:
+            await asyncio.sleep(self._next_request_at - now)
+            now = self._next_request_at
+        self._next_request_at = now + (1.0 / self.rate if self.rate > 0 else 0.0)
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            settings = get_settings()
+            base, transport = settings.RESEND_API_BASE, self._transport
+            if base == "local":
+                base, transport = LOCAL_BASE_URL, transport or httpx.MockTransport(LocalResend())
+            self._client = httpx.AsyncClient(
+                base_url=base,
+                transport=transport,
+                timeout=HTTP_TIMEOUT_SECONDS,
+                headers={"Authorization": f"Bearer {settings.RESEND_API_KEY}"},
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+            )
+        return self._client
+
+    def metrics(self) -> dict:
+        return {"running": self.started, "buffered": len(self._buffer), **self._m}
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Shutdown: stop the worker (rows it had claimed are re-claimed after
+        their lease) and write still-buffered payloads to the table."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await asyncio.wait_for(self._persist_buffer(), timeout)
+        except Exception:  # noqa: BLE001
+            logger.exception("email outbox: %d queued email(s) lost on shutdown", len(self._buffer))
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+email_outbox = EmailOutboxWorker(rate_per_second=get_settings().EMAIL_SEND_RATE_PER_SECOND)
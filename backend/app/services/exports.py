@@ -0,0 +1,220 @@
+"""Streaming CSV / JSONL exports of match rows.
+
+`/dashboard/feedback-dataset` and `/dashboard/matches-by-type` used to load
+every matching Match ORM row (plus two `db.get(Attendee)` per row for the
+names) and return one JSON body — fine for a 20-row drill-down, an OOM for
+a 100k-row training export. This module instead:
+
+  - projects only the requested columns (attendee names come from a join,
+    never the embedding / enriched_profile blobs),
+  - reads through a server-side cursor (`AsyncSession.stream` + yield_per),
+    one partition at a time,
+  - encodes each partition to CSV or JSONL bytes as it arrives,
+
+so memory stays at one chunk regardless of result size. Used by the
+dashboard routes (wrapped in a StreamingResponse) and by
+scripts/export_matches.py.
+
+Pooler note: the cursor lives inside the one transaction the streaming
+session opens, so pgbouncer keeps it on a single server connection for the
+whole export — no prepared-statement hopping (see app/core/database.py).
+"""
+import csv
+import io
+import json
+import logging
+from datetime import date, datetime
+from typing import AsyncIterator, Iterable, Sequence
+from uuid import UUID
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import aliased
+
+from app.models.attendee import Attendee, Match
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+}
+
+# Rows fetched per cursor round trip (and per encoded chunk).
+DEFAULT_CHUNK_SIZE = 1000
+
+_A = aliased(Attendee, name="attendee_a")
+_B = aliased(Attendee, name="attendee_b")
+
+# Every exportable column → the SQL expression that produces it. Keys are the
+# public column names (CSV header / JSONL keys); add here, not in the routes.
+MATCH_COLUMNS = {
+    "match_id": Match.id,
+    "created_at": Match.created_at,
+    "attendee_a_id": Match.attendee_a_id,
+    "attendee_a_name": _A.name,
+    "attendee_a_company": _A.company,
+    "attendee_b_id": Match.attendee_b_id,
+    "attendee_b_name": _B.name,
+    "attendee_b_company": _B.company,
+    "match_type": Match.match_type,
+    "tier": Match.tier,
+    "overall_score": Match.overall_score,
+    "similarity_score": Match.similarity_score,
+    "complementary_score": Match.complementary_score,
+    "explanation": Match.explanation,
+    "explanation_confidence": Match.explanation_confidence,
+    "status": Match.status,
+    "status_a": Match.status_a,
+    "status_b": Match.status_b,
+    "decline_reason": Match.decline_reason,
+    "meeting_time": Match.meeting_time,
+    "met_at": Match.met_at,
+    "meeting_outcome": Match.meeting_outcome,
+    "satisfaction_score": Match.satisfaction_score,
+}
+
+# The historical /feedback-dataset row shape, kept as its default.
+FEEDBACK_COLUMNS = (
+    "match_id", "attendee_a_id", "attendee_a_name", "attendee_b_id", "attendee_b_name",
+    "match_type", "overall_score", "status", "decline_reason", "meeting_time", "met_at",
+    "meeting_outcome", "satisfaction_score", "explanation_confidence", "created_at",
+)
+
+# Feedback-dataset filter: rows that carry any outcome signal.
+HAS_FEEDBACK = (
+    Match.decline_reason.isnot(None)
+    | Match.meeting_outcome.isnot(None)
+    | Match.satisfaction_score.isnot(None)
+)
+
+
+def parse_columns(requested: str | Sequence[str] | None, default: Sequence[str]) -> list[str]:
+    """Resolve a `columns=a,b,c` parameter. Raises ValueError on unknown names."""
+    if not requested:
+        return list(default)
+    if isinstance(requested, str):
+        requested = [requested]
+    names = [c.strip() for part in requested for c in part.split(",") if c.strip()]
+    unknown = [c for c in names if c not in MATCH_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+    # De-dupe, keep caller order.
+    return list(dict.fromkeys(names))
+
+
+def build_match_export_query(
+    columns: Sequence[str],
+    *,
+    match_type: str | None = None,
+    status: str | None = None,
+    tier: str | None = None,
+    min_score: float | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    feedback_only: bool = False,
+    order_by=None,
+    limit: int | None = None,
+) -> Select:
+    """SELECT just `columns` from matches, joining attendees only if a name /
+    company column was asked for (outer join: a deleted attendee still
+    exports its match row, with an empty name)."""
+    stmt = select(*(MATCH_COLUMNS[c].label(c) for c in columns)).select_from(Match)
+    if any(c.startswith("attendee_a_") and c != "attendee_a_id" for c in columns):
+        stmt = stmt.outerjoin(_A, _A.id == Match.attendee_a_id)
+    if any(c.startswith("attendee_b_") and c != "attendee_b_id" for c in columns):
+        stmt = stmt.outerjoin(_B, _B.id == Match.attendee_b_id)
+
+    if match_type:
+        stmt = stmt.where(Match.match_type == match_type)
+    if status:
+        stmt = stmt.where(Match.status == status)
+    if tier:
+        stmt = stmt.where(Match.tier == tier)
+    if min_score is not None:
+        stmt = stmt.where(Match.overall_score >= min_score)
+    if created_after is not None:
+        stmt = stmt.where(Match.created_at >= created_after)
+    if created_before is not None:
+        stmt = stmt.where(Match.created_at < created_before)
+    if feedback_only:
+        stmt = stmt.where(HAS_FEEDBACK)
+
+    # Deterministic order so a re-run exports rows in the same sequence; id
+    # breaks created_at ties.
+    stmt = stmt.order_by(*(order_by if order_by is not None else (Match.created_at.desc(), Match.id)))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def _plain(value):
+    """JSON/CSV-safe scalar: UUIDs and datetimes as strings, rest as-is."""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def serialize_row(row, columns: Sequence[str]) -> dict:
+    return {c: _plain(row[c]) for c in columns}
+
+
+async def stream_partitions(stmt: Select, chunk_size: int = DEFAULT_CHUNK_SIZE, session=None) -> AsyncIterator[list]:
+    """Yield lists of row mappings through a server-side cursor.
+
+    Opens its own session unless one is passed: a StreamingResponse body
+    runs after the request's `get_db` session has been closed.
+    """
+    if session is None:
+        from app.core.database import async_session
+        async with async_session() as db:
+            async for part in stream_partitions(stmt, chunk_size, session=db):
+                yield part
+        return
+
+    result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+    async for part in result.mappings().partitions(chunk_size):
+        yield part
+
+
+def _csv_chunk(rows: Iterable[dict], columns: Sequence[str], header: bool) -> str:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=columns, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue()
+
+
+def _jsonl_chunk(rows: Iterable[dict]) -> str:
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+
+
+async def encode_export(
+    partitions: AsyncIterator[list], columns: Sequence[str], fmt: str
+) -> AsyncIterator[bytes]:
+    """Turn row partitions into CSV / JSONL byte chunks, one per partition.
+
+    The CSV header is always emitted, even for an empty export, so a
+    downstream `csv.DictReader` never sees a header-less file.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    header_pending = fmt == "csv"
+    total = 0
+    async for part in partitions:
+        rows = [serialize_row(r, columns) for r in part]
+        total += len(rows)
+        if fmt == "csv":
+            yield _csv_chunk(rows, columns, header_pending).encode("utf-8")
+            header_pending = False
+        else:
+            yield _jsonl_chunk(rows).encode("utf-8")
+    if header_pending:
+        yield _csv_chunk([], columns, True).encode("utf-8")
+    logger.info("exports: streamed %d rows as %s", total, fmt)
+
+
+def export_filename(stem: str, fmt: str) -> str:
+    return f"{stem}_{datetime.utcnow():%Y%m%d_%H%M}.{fmt}"
@@ -17,6 +17,9 @@ run_mutual_notifications(db):
 
 Both functions:
 - Use async SQLAlchemy (no Supabase REST).
+- Are a fixed handful of queries regardless of pool size: one projected
+  read (aggregated / joined in SQL, no per-recipient db.get), the sends,
+  one bulk UPDATE for the dedup/throttle stamps.
 - Are best-effort per-attendee / per-match (exceptions caught, tallied).
 - Commit once at the end of their run.
 - Return {"sent": int, "skipped": int, "errors": int} for the heartbeat.
@@ -24,8 +27,9 @@ Both functions:
 import logging
 from datetime import datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import case, func, literal_column, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.models.attendee import Attendee, Match
 from app.services.email import send_interest_notification, send_mutual_match_email
@@ -35,78 +39,96 @@ logger = logging.getLogger(__name__)
 # How long to throttle between "people want to meet you" emails per attendee.
 _INTEREST_THROTTLE_HOURS = 20
 
+# Attendee columns a mutual-match email needs from each party.
+_PARTY_FIELDS = ("name", "title", "company", "email", "email_opt_out", "magic_access_token")
+
+
+def _incoming_interest_counts():
+    """recipient_id → n incoming pending interests, as a subquery.
+
+    A match is "incoming" for the side still at pending while the other side
+    has accepted; the CASE picks that side so one scan + GROUP BY counts it.
+    """
+    a_waits = (Match.status_b == "accepted") & (Match.status_a == "pending")
+    b_waits = (Match.status_a == "accepted") & (Match.status_b == "pending")
+    recipient_id = case((a_waits, Match.attendee_a_id), else_=Match.attendee_b_id).label("recipient_id")
+    return (
+        select(recipient_id, func.count().label("n"))
+        .where(a_waits | b_waits)
+        # By output name, so the CASE (and its binds) isn't repeated.
+        .group_by(literal_column("recipient_id"))
+        .subquery("incoming")
+    )
+
 
 async def run_interest_notifications(db: AsyncSession) -> dict:
     """Send 'N people want to meet you' to eligible attendees.
 
+    Three statements whatever the pool size: one aggregate (per-recipient
+    incoming count joined to that recipient's send-gate columns), the sends,
+    then one UPDATE stamping last_interest_notified_at for everyone reached.
+
     Returns {"sent", "skipped", "errors"}.
     """
     sent = skipped = errors = 0
 
-    # Step 1: find all matches where one side is accepted and the other pending.
-    # These are the "incoming pending" matches that signal unreciprocated interest.
+    # Counted in SQL and joined to just the columns the gates read — the
+    # old version loaded every pending-sided Match and then db.get()-ed
+    # each recipient's full Attendee row, one round-trip per recipient.
+    # LEFT JOIN so a recipient with no attendee row still counts as skipped.
+    incoming = _incoming_interest_counts()
     result = await db.execute(
-        select(Match).where(
-            # Either a accepted and b is still pending, or vice-versa
-            (
-                (Match.status_a == "accepted") & (Match.status_b == "pending")
-            ) | (
-                (Match.status_b == "accepted") & (Match.status_a == "pending")
-            )
+        select(
+            incoming.c.recipient_id,
+            incoming.c.n,
+            Attendee.name,
+            Attendee.email,
+            Attendee.email_opt_out,
+            Attendee.magic_access_token,
+            Attendee.last_interest_notified_at,
         )
+        .select_from(incoming)
+        .outerjoin(Attendee, Attendee.id == incoming.c.recipient_id)
     )
-    matches = result.scalars().all()
+    recipients = result.all()
 
-    # Step 2: aggregate per-pending-attendee counts.
-    counts: dict = {}   # attendee_id (uuid) -> incoming count
-    for m in matches:
-        if m.status_a == "accepted" and m.status_b == "pending":
-            counts[m.attendee_b_id] = counts.get(m.attendee_b_id, 0) + 1
-        if m.status_b == "accepted" and m.status_a == "pending":
-            counts[m.attendee_a_id] = counts.get(m.attendee_a_id, 0) + 1
-
-    if not counts:
+    if not recipients:
         return {"sent": 0, "skipped": 0, "errors": 0}
 
-    # Step 3: for each attendee with ≥1 incoming, apply eligibility checks.
-    throttle_cutoff = datetime.utcnow() - timedelta(hours=_INTEREST_THROTTLE_HOURS)
+    now = datetime.utcnow()
+    throttle_cutoff = now - timedelta(hours=_INTEREST_THROTTLE_HOURS)
+    notified: list = []
 
-    for attendee_id, count in counts.items():
+    for row in recipients:
         try:
-            attendee: Attendee | None = await db.get(Attendee, attendee_id)
-            if attendee is None:
-                skipped += 1
-                continue
-
-            email = (attendee.email or "").strip()
+            email = (row.email or "").strip()
             if not email:
                 skipped += 1
                 continue
-            if getattr(attendee, "email_opt_out", False):
+            if row.email_opt_out:
                 skipped += 1
                 continue
             if email.lower().endswith("@demo.proofoftalk.io"):
                 skipped += 1
                 continue
-            if not attendee.magic_access_token:
+            if not row.magic_access_token:
                 skipped += 1
                 continue
             # Throttle: skip if last notified within the last 20 hours
-            last_notified = getattr(attendee, "last_interest_notified_at", None)
-            if last_notified is not None and last_notified >= throttle_cutoff:
+            if row.last_interest_notified_at is not None and row.last_interest_notified_at >= throttle_cutoff:
                 skipped += 1
                 continue
 
             # Eligible — send
             ok = send_interest_notification(
                 to_email=email,
-                attendee_name=attendee.name or "",
-                count=count,
-                magic_token=attendee.magic_access_token,
+                attendee_name=row.name or "",
+                count=row.n,
+                magic_token=row.magic_access_token,
                 force=True,
             )
             if ok:
-                attendee.last_interest_notified_at = datetime.utcnow()
+                notified.append(row.recipient_id)
                 sent += 1
             else:
                 skipped += 1
@@ -114,12 +136,19 @@ async def run_interest_notifications(db: AsyncSession) -> dict:
         except Exception as exc:
             logger.warning(
                 "interest_cron: error processing attendee %s: %s",
-                attendee_id, exc, exc_info=True,
+                row.recipient_id, exc, exc_info=True,
             )
             errors += 1
 
-    # Commit all timestamp stamps in one shot.
+    # Stamp everyone reached in one UPDATE, one commit.
     try:
+        if notified:
+            await db.execute(
+                update(Attendee)
+                .where(Attendee.id.in_(notified))
+                .values(last_interest_notified_at=now)
+                .execution_options(synchronize_session=False)
+            )
         await db.commit()
     except Exception as exc:
         logger.error("interest_cron: commit failed: %s", exc)
@@ -130,67 +159,68 @@ async def run_interest_notifications(db: AsyncSession) -> dict:
 async def run_mutual_notifications(db: AsyncSession) -> dict:
     """Send 'mutual match confirmed' emails for newly mutual matches.
 
-    Finds matches where status='accepted' AND mutual_notified_at IS NULL.
+    Finds matches where status='accepted' AND mutual_notified_at IS NULL,
+    with both parties' columns joined in the same query.
     Sends to both parties (respecting opt-out / no-email per-party).
-    Stamps mutual_notified_at=now after sending (dedup guard).
+    Stamps mutual_notified_at=now after sending (dedup guard), one UPDATE
+    for the whole run.
 
     Returns {"sent", "skipped", "errors"}.
     """
     sent = skipped = errors = 0
 
-    # Fetch all un-notified mutual matches.
+    party_a, party_b = aliased(Attendee, name="party_a"), aliased(Attendee, name="party_b")
     result = await db.execute(
-        select(Match).where(
+        select(
+            Match.id,
+            *(getattr(party_a, f).label(f"a_{f}") for f in _PARTY_FIELDS),
+            *(getattr(party_b, f).label(f"b_{f}") for f in _PARTY_FIELDS),
+        )
+        .outerjoin(party_a, party_a.id == Match.attendee_a_id)
+        .outerjoin(party_b, party_b.id == Match.attendee_b_id)
+        .where(
             Match.status == "accepted",
             Match.mutual_notified_at.is_(None),
         )
     )
-    matches = result.scalars().all()
+    matches = result.all()
+    processed: list = []
 
     for match in matches:
         try:
-            attendee_a: Attendee | None = await db.get(Attendee, match.attendee_a_id)
-            attendee_b: Attendee | None = await db.get(Attendee, match.attendee_b_id)
-
-            match_had_send = False
-
+            party = {
+                side: {f: getattr(match, f"{side}_{f}") for f in _PARTY_FIELDS}
+                for side in ("a", "b")
+            }
             for recipient, partner in [
-                (attendee_a, attendee_b),
-                (attendee_b, attendee_a),
+                (party["a"], party["b"]),
+                (party["b"], party["a"]),
             ]:
-                if recipient is None:
-                    skipped += 1
-                    continue
-                email = (recipient.email or "").strip()
+                email = (recipient["email"] or "").strip()
                 if not email:
                     skipped += 1
                     continue
-                if getattr(recipient, "email_opt_out", False):
+                if recipient["email_opt_out"]:
                     skipped += 1
                     continue
 
-                partner_name = partner.name if partner else ""
-                partner_title = (partner.title if partner and hasattr(partner, "title") else "") or ""
-                partner_company = (partner.company if partner and hasattr(partner, "company") else "") or ""
-
                 ok = send_mutual_match_email(
                     to_email=email,
-                    attendee_name=recipient.name or "",
-                    other_name=partner_name or "",
-                    other_title=partner_title,
-                    other_company=partner_company,
-                    magic_token=getattr(recipient, "magic_access_token", None),
+                    attendee_name=recipient["name"] or "",
+                    other_name=partner["name"] or "",
+                    other_title=partner["title"] or "",
+                    other_company=partner["company"] or "",
+                    magic_token=recipient["magic_access_token"],
                     force=True,
                 )
                 if ok:
                     sent += 1
-                    match_had_send = True
                 else:
                     skipped += 1
 
             # Stamp the match regardless of per-party opt-outs (prevents
             # re-processing this match forever when one side has no email).
-            match.mutual_notified_at = datetime.utcnow()
+            processed.append(match.id)
 
         except Exception as exc:
             logger.warning(
@@ -200,6 +230,13 @@ async def run_mutual_notifications(db: AsyncSession) -> dict:
             errors += 1
 
     try:
+        if processed:
+            await db.execute(
+                update(Match)
+                .where(Match.id.in_(processed), Match.mutual_notified_at.is_(None))
+                .values(mutual_notified_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
         await db.commit()
     except Exception as exc:
         logger.error("interest_cron: mutual commit failed: %s", exc)
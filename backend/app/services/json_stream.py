@@ -0,0 +1,111 @@
+"""Incremental parser for a streamed top-level JSON array.
+
+The rerank prompt asks GPT for one JSON array of ranked entries. Streamed,
+that array arrives a few characters at a time; waiting for the closing `]`
+means nothing can be used until the whole answer (up to max_tokens) is in,
+and a response cut off by max_tokens fails json.loads and is thrown away.
+
+JsonArrayStream.feed() takes each text delta and returns the array elements
+that completed inside it, decoded. Anything before the opening `[` (a
+```json fence, a stray "Here you go:") and after the closing `]` is ignored.
+An element that doesn't decode is skipped and counted in `malformed`, so one
+bad entry doesn't cost the rest. `closed` says whether the closing `]` was
+seen — False at the end of the stream means the answer was truncated and
+only the elements returned so far are valid.
+"""
+import json
+
+_STRUCTURAL = frozenset('"{}[],\\')
+
+
+class JsonArrayStream:
+    def __init__(self) -> None:
+        self.started = False
+        self.closed = False
+        self.count = 0
+        self.malformed = 0
+        self._buf: list[str] | None = None  # chars of the element in progress
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> list:
+        """Consume the next chunk; return the elements it completed."""
+        out: list = []
+        i, n = 0, len(text)
+        while i < n and not self.closed:
+            if not self.started:
+                i = text.find("[", i)
+                if i < 0:
+                    break
+                self.started = True
+                i += 1
+                continue
+            ch = text[i]
+            buf = self._buf
+            if buf is None:
+                # Between elements.
+                if ch == "]":
+                    self.closed = True
+                elif not (ch == "," or ch.isspace()):
+                    self._buf = buf = []
+                    continue  # re-read ch as the element's first char
+                i += 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    buf.append(ch)
+                    i += 1
+                    if not self._depth:
+                        self._emit(out)  # a bare string element
+                    continue
+                else:
+                    # Copy the run of ordinary string chars in one slice.
+                    j = i + 1
+                    while j < n and text[j] not in ('"', "\\"):
+                        j += 1
+                    buf.append(text[i:j])
+                    i = j
+                    continue
+                buf.append(ch)
+                i += 1
+                continue
+            if not self._depth and buf and ch in ",]":
+                # End of a scalar element (number / true / false / null).
+                self._emit(out)
+                self.closed = ch == "]"
+                i += 1
+                continue
+            if ch not in _STRUCTURAL:
+                j = i + 1
+                while j < n and text[j] not in _STRUCTURAL:
+                    j += 1
+                buf.append(text[i:j])
+                i = j
+                continue
+            buf.append(ch)
+            i += 1
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if not self._depth:
+                    self._emit(out)
+        return out
+
+    def _emit(self, out: list) -> None:
+        raw = "".join(self._buf or ())
+        self._buf = None
+        self._depth = 0
+        try:
+            out.append(json.loads(raw))
+            self.count += 1
+        except json.JSONDecodeError:
+            self.malformed += 1
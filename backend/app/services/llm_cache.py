@@ -0,0 +1,146 @@
+"""Prompt-fingerprint cache for LLM responses, stored in Postgres (llm_cache).
+
+rank_and_explain builds its GPT-4o prompt entirely from the target's profile,
+the candidates' descriptions and their similarity scores. When regeneration
+runs on an unchanged pool — the nightly refresh, a profile save that touched
+nothing the prompt reads — it used to send the same ~8 KB prompt again and
+pay full price and ~10s of latency for the same answer.
+
+The key is a sha256 over the model, the sampling params and the normalized
+prompt, so any change to any input (a profile edit, a new candidate, a moved
+similarity score, a prompt-copy change) is a different key and a fresh call.
+Only responses that parsed as JSON are stored; a hit returns that JSON
+without touching OpenAI. Entries live LLM_CACHE_TTL_HOURS, so a silent
+model update behind the same model name can't pin an old answer forever.
+
+Best-effort by design: the cache runs in its own short session (never the
+caller's transaction), and any failure is logged, counted and treated as a
+miss. Hit/miss counters surface on /health and GET /dashboard/llm-cache.
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import get_settings
+from app.core.database import async_session
+from app.models.llm_cache import LlmCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every stored answer at once (e.g. after changing how
+# responses are post-processed before storing).
+KEY_VERSION = 1
+
+# Per-worker counters since process start. The persisted per-row `hits`
+# column gives the cross-worker total on the dashboard.
+_counters = {"hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+
+def _normalize(prompt: str) -> str:
+    """Strip trailing whitespace per line and surrounding blank lines — the
+    only variation an f-string prompt picks up that the model can't see."""
+    return "\n".join(line.rstrip() for line in prompt.strip().splitlines())
+
+
+def fingerprint(*, model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+    """Cache key for one chat completion request."""
+    material = json.dumps(
+        [KEY_VERSION, model, round(float(temperature), 4), int(max_tokens), _normalize(prompt)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _ttl_hours() -> int:
+    return get_settings().LLM_CACHE_TTL_HOURS
+
+
+async def lookup(key: str):
+    """The stored JSON for `key` if present and unexpired, else None.
+
+    One statement: the hit bump doubles as the read (UPDATE … RETURNING).
+    """
+    if _ttl_hours() <= 0:
+        return None
+    now = datetime.utcnow()
+    try:
+        async with async_session() as session:
+            payload = (
+                await session.execute(
+                    update(LlmCacheEntry)
+                    .where(LlmCacheEntry.key == key, LlmCacheEntry.expires_at > now)
+                    .values(hits=LlmCacheEntry.hits + 1, last_hit_at=now)
+                    .returning(LlmCacheEntry.payload)
+                )
+            ).scalar_one_or_none()
+            await session.commit()
+    except Exception as exc:
+        _counters["errors"] += 1
+        logger.warning("llm_cache: lookup failed, treating as miss: %s", exc)
+        payload = None
+    _counters["hits" if payload is not None else "misses"] += 1
+    return payload
+
+
+async def store(key: str, model: str, payload) -> None:
+    """Upsert `payload` under `key` with a fresh TTL."""
+    ttl = _ttl_hours()
+    if ttl <= 0:
+        return
+    now = datetime.utcnow()
+    values = dict(model=model, payload=payload, created_at=now,
+                  expires_at=now + timedelta(hours=ttl), hits=0, last_hit_at=None)
+    stmt = pg_insert(LlmCacheEntry).values(key=key, **values)
+    try:
+        async with async_session() as session:
+            await session.execute(stmt.on_conflict_do_update(index_elements=[LlmCacheEntry.key], set_=values))
+            await session.commit()
+        _counters["stores"] += 1
+    except Exception as exc:
+        _counters["errors"] += 1
+        logger.warning("llm_cache: store failed: %s", exc)
+
+
+async def purge_expired() -> dict:
+    """Delete expired rows (nightly cron). Returns {"deleted": n}."""
+    async with async_session() as session:
+        result = await session.execute(
+            delete(LlmCacheEntry).where(LlmCacheEntry.expires_at <= datetime.utcnow())
+        )
+        await session.commit()
+    return {"deleted": result.rowcount or 0}
+
+
+def llm_cache_metrics() -> dict:
+    looked_up = _counters["hits"] + _counters["misses"]
+    return {
+        **_counters,
+        "hit_rate": round(_counters["hits"] / looked_up, 3) if looked_up else None,
+    }
+
+
+async def llm_cache_summary(db) -> dict:
+    """Dashboard payload: table-wide totals (all workers) + this worker's counters."""
+    now = datetime.utcnow()
+    row = (
+        await db.execute(
+            select(
+                func.count().label("entries"),
+                func.count().filter(LlmCacheEntry.expires_at > now).label("live"),
+                func.coalesce(func.sum(LlmCacheEntry.hits), 0).label("hits"),
+                func.max(LlmCacheEntry.last_hit_at).label("last_hit_at"),
+            )
+        )
+    ).one()
+    return {
+        "ttl_hours": _ttl_hours(),
+        "entries": row.entries,
+        "live_entries": row.live,
+        "stored_hits": int(row.hits),
+        "last_hit_at": row.last_hit_at.isoformat() if row.last_hit_at else None,
+        "worker": llm_cache_metrics(),
+    }
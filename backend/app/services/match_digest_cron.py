@@ -7,7 +7,7 @@ run_match_digest(db):
     attendees.last_match_digest_at. Highest-overall-score match is
     featured in the email body.
 
-    A "new" match for attendee A is a Match row where:
+    A "new" match for attendee A is a Match row where (evaluated in SQL):
       - A is on one side (attendee_a_id or attendee_b_id)
       - tier in ('curated', 'priority_intro')
       - created_at > A.last_match_digest_at (or all matches if NULL)
@@ -20,8 +20,9 @@ top-tier candidates land in their pool.
 import logging
 from datetime import datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import func, or_, select, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.models.attendee import Attendee, Match
 from app.services.email import send_match_digest_email
@@ -39,13 +40,61 @@ DIGEST_TIERS = ("curated", "priority_intro")
 
 
 def _naive(dt: datetime) -> datetime:
-    """Strip tzinfo so naive cutoffs compare cleanly. Match.created_at comes
-    back from Postgres as tz-aware (+00:00) even though the model declares
+    """Strip tzinfo so naive cutoffs compare cleanly. Timestamps come back
+    from Postgres as tz-aware (+00:00) even though the model declares
     DateTime without timezone=True; the codebase's other crons use naive
     datetime.utcnow(), so we normalize the DB side."""
     return dt.replace(tzinfo=None) if dt.tzinfo is not None else dt
 
 
+def _pending_pool():
+    """Every digest-tier match, once per side still pending on it:
+    (recipient_id, other_id, match_id, overall_score, created_at)."""
+    def side(me, other, my_status):
+        return select(
+            me.label("recipient_id"),
+            other.label("other_id"),
+            Match.id.label("match_id"),
+            Match.overall_score,
+            Match.created_at,
+        ).where(Match.tier.in_(DIGEST_TIERS), my_status == "pending")
+
+    return union_all(
+        side(Match.attendee_a_id, Match.attendee_b_id, Match.status_a),
+        side(Match.attendee_b_id, Match.attendee_a_id, Match.status_b),
+    ).subquery("pool")
+
+
+def _is_new(pool):
+    """Pool row created after the recipient's last digest (all, if never sent)."""
+    return or_(
+        Attendee.last_match_digest_at.is_(None),
+        pool.c.created_at > Attendee.last_match_digest_at,
+    )
+
+
+def _screen(row, throttle_cutoff: datetime, threshold: int) -> tuple[bool, str | None]:
+    """(past throttle + threshold, send address or None if a send-gate fails)."""
+    if row.attendee_id is None:
+        return False, None
+    # Throttle: skip if last digest was within the throttle window.
+    last_digest = row.last_match_digest_at
+    if last_digest is not None and _naive(last_digest) >= throttle_cutoff:
+        return False, None
+    if row.new_count < threshold:
+        return False, None
+
+    # Standard send-gates (mirrors interest_cron).
+    email_addr = (row.email or "").strip()
+    if not email_addr or row.email_opt_out:
+        return True, None
+    if email_addr.lower().endswith("@demo.proofoftalk.io"):
+        return True, None
+    if not row.magic_access_token:
+        return True, None
+    return True, email_addr
+
+
 async def run_match_digest(
     db: AsyncSession,
     threshold: int = DEFAULT_THRESHOLD,
@@ -56,109 +105,119 @@ async def run_match_digest(
     """Send the new-matches digest. Returns {sent, skipped, errors, eligible}.
 
     `max_sends` caps a single run to protect sender reputation. When the cap
-    bites, the cron exits early; the remainder are picked up the next day.
+    bites, the cron exits early; the remainder are picked up the next day
+    and are not tallied in this run's skipped / eligible.
+
+    Three reads/writes regardless of pool size: the per-recipient aggregate
+    (with gate columns), the featured match for those who pass, and one
+    UPDATE stamping last_match_digest_at.
     """
     if now is None:
         now = datetime.utcnow()
     sent = skipped = errors = 0
 
-    # Step 1: pull every curated/priority_intro match in scope. Filter
-    # in-memory so we can apply per-attendee created_at-vs-last_digest_at
-    # logic without a self-join.
+    # Step 1: per-recipient new-pending count, computed in SQL and joined to
+    # the columns the gates read. Was: every digest-tier Match loaded into
+    # Python, then a db.get() per recipient. count(*) FILTER keeps recipients
+    # with zero new matches in the result so they still tally as skipped.
+    pool = _pending_pool()
     result = await db.execute(
-        select(Match).where(Match.tier.in_(DIGEST_TIERS))
+        select(
+            pool.c.recipient_id,
+            func.count().filter(_is_new(pool)).label("new_count"),
+            Attendee.id.label("attendee_id"),
+            Attendee.name,
+            Attendee.email,
+            Attendee.email_opt_out,
+            Attendee.magic_access_token,
+            Attendee.last_match_digest_at,
+        )
+        .select_from(pool)
+        .outerjoin(Attendee, Attendee.id == pool.c.recipient_id)
+        .group_by(pool.c.recipient_id, Attendee.id)
     )
-    all_matches = result.scalars().all()
-
-    # Step 2: aggregate per-attendee. For each attendee, collect matches
-    # where THEIR side is still pending (un-reviewed).
-    per_attendee: dict = {}   # attendee_id -> list[Match]
-    for m in all_matches:
-        # Side A's pool: A is recipient; A's pending status counts the row.
-        if m.status_a == "pending":
-            per_attendee.setdefault(m.attendee_a_id, []).append((m, "a"))
-        # Side B's pool: B is recipient; B's pending status counts the row.
-        if m.status_b == "pending":
-            per_attendee.setdefault(m.attendee_b_id, []).append((m, "b"))
-
-    if not per_attendee:
+    recipients = result.all()
+
+    if not recipients:
         return {"sent": 0, "skipped": 0, "errors": 0, "eligible": 0}
 
     eligible_count = 0
     throttle_cutoff = now - timedelta(hours=throttle_hours)
 
-    # Step 3: for each candidate, fetch attendee, filter to *new* matches,
-    # check eligibility, send.
-    for attendee_id, match_tuples in per_attendee.items():
-        try:
-            attendee: Attendee | None = await db.get(Attendee, attendee_id)
-            if attendee is None:
-                skipped += 1
-                continue
-
-            # Throttle: skip if last digest was within the throttle window.
-            last_digest = attendee.last_match_digest_at
-            if last_digest is not None and _naive(last_digest) >= throttle_cutoff:
-                skipped += 1
-                continue
-
-            # "New since last digest" — if never sent, every pending match counts.
-            cutoff = _naive(last_digest) if last_digest is not None else datetime.min
-            new_matches = [m for m, _side in match_tuples if _naive(m.created_at) > cutoff]
-            if len(new_matches) < threshold:
-                skipped += 1
-                continue
-
-            eligible_count += 1
-
-            # Standard send-gates (mirrors interest_cron).
-            email_addr = (attendee.email or "").strip()
-            if not email_addr:
-                skipped += 1
-                continue
-            if getattr(attendee, "email_opt_out", False):
-                skipped += 1
-                continue
-            if email_addr.lower().endswith("@demo.proofoftalk.io"):
-                skipped += 1
-                continue
-            if not attendee.magic_access_token:
-                skipped += 1
-                continue
-
-            # Feature the highest-overall-score new match.
-            top_match = max(new_matches, key=lambda m: m.overall_score or 0.0)
-            top_other_id = (
-                top_match.attendee_b_id
-                if top_match.attendee_a_id == attendee.id
-                else top_match.attendee_a_id
+    # Step 2: throttle, threshold and send-gates on the projected rows. Only
+    # screened here — tallied in step 4, in the same order as the sends, so a
+    # run the cap stops early counts exactly what it reached.
+    screened = [(row, *_screen(row, throttle_cutoff, threshold)) for row in recipients]
+    candidate_ids = [row.recipient_id for row, _eligible, email_addr in screened if email_addr]
+
+    # Step 3: the highest-overall-score new match per candidate, with the
+    # counterpart's display columns, in one query (row_number() per
+    # recipient rather than DISTINCT ON, so it runs on any backend).
+    featured: dict = {}
+    if candidate_ids:
+        other = aliased(Attendee, name="other")
+        rank = func.row_number().over(
+            partition_by=pool.c.recipient_id,
+            order_by=(func.coalesce(pool.c.overall_score, 0.0).desc(), pool.c.created_at.desc()),
+        ).label("rank")
+        ranked = (
+            select(
+                pool.c.recipient_id,
+                Match.explanation,
+                other.id.label("other_id"),
+                other.name.label("other_name"),
+                other.title.label("other_title"),
+                other.company.label("other_company"),
+                other.privacy_mode.label("other_privacy_mode"),
+                rank,
             )
-            top_other = await db.get(Attendee, top_other_id)
-            if top_other is None:
+            .select_from(pool)
+            .join(Attendee, Attendee.id == pool.c.recipient_id)
+            .join(Match, Match.id == pool.c.match_id)
+            .outerjoin(other, other.id == pool.c.other_id)
+            .where(pool.c.recipient_id.in_(candidate_ids), _is_new(pool))
+            .subquery("ranked")
+        )
+        result = await db.execute(select(ranked).where(ranked.c.rank == 1))
+        featured = {row.recipient_id: row for row in result.all()}
+
+    # Step 4: tally + send, stopping at the cap.
+    stamped: list = []
+    for row, eligible, email_addr in screened:
+        if not eligible:
+            skipped += 1
+            continue
+        eligible_count += 1
+        if not email_addr:
+            skipped += 1
+            continue
+        try:
+            top = featured.get(row.recipient_id)
+            if top is None or top.other_id is None:
                 skipped += 1
                 continue
 
             # Respect b2b_only privacy on the featured candidate.
-            if getattr(top_other, "privacy_mode", "full") == "b2b_only":
-                top_name = top_other.company or "Anonymous"
+            if (top.other_privacy_mode or "full") == "b2b_only":
+                top_name = top.other_company or "Anonymous"
                 top_title = ""
             else:
-                top_name = top_other.name or ""
-                top_title = top_other.title or ""
+                top_name = top.other_name or ""
+                top_title = top.other_title or ""
 
             ok = send_match_digest_email(
                 to_email=email_addr,
-                attendee_name=attendee.name or "",
-                new_count=len(new_matches),
+                attendee_name=row.name or "",
+                new_count=row.new_count,
                 top_match_name=top_name,
                 top_match_title=top_title,
-                top_match_company=top_other.company or "",
-                top_explanation=top_match.explanation or "",
-                magic_token=attendee.magic_access_token,
+                top_match_company=top.other_company or "",
+                top_explanation=top.explanation or "",
+                magic_token=row.magic_access_token,
                 force=True,
             )
             if ok:
-                attendee.last_match_digest_at = now
+                stamped.append(row.recipient_id)
                 sent += 1
                 if sent >= max_sends:
                     break
@@ -168,11 +227,18 @@ async def run_match_digest(
         except Exception as exc:
             logger.warning(
                 "match_digest_cron: error processing attendee %s: %s",
-                attendee_id, exc, exc_info=True,
+                row.recipient_id, exc, exc_info=True,
             )
             errors += 1
 
     try:
+        if stamped:
+            await db.execute(
+                update(Attendee)
+                .where(Attendee.id.in_(stamped))
+                .values(last_match_digest_at=now)
+                .execution_options(synchronize_session=False)
+            )
         await db.commit()
     except Exception as exc:
         logger.error("match_digest_cron: commit failed: %s", exc)
@@ -1,19 +1,31 @@
 import json
 import asyncio
+import contextlib
+import copy
+import functools
+import hashlib
 import logging
 import re
+import string
+import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
 
 logger = logging.getLogger(__name__)
-from sqlalchemy import select, text, delete as sql_delete, or_, and_
+from sqlalchemy import select, text, delete as sql_delete, update, or_, and_, cast, column, func, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.ext.asyncio import AsyncSession
 from openai import AsyncOpenAI
 from app.core.config import get_settings
-from app.models.attendee import Attendee, Match
+from app.models.attendee import Attendee, Match, MATCHING_COLUMNS, ensure_heavy, load_heavy
 from app.models.user import User
 from app.services.embeddings import embed_attendee, generate_ai_summary, classify_intents, classify_verticals, infer_customer_profile
+from app.services import llm_cache
+from app.services.json_stream import JsonArrayStream
 
 settings = get_settings()
 client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
@@ -25,6 +37,11 @@ MIN_MATCH_SCORE = 0.60
 # pairing at 0.60 is worse than no match.
 MIN_NON_OBVIOUS_SCORE = 0.65
 
+# Curated rerank sampling params. Part of the llm_cache / batch fingerprint,
+# so the live call and the batch request must use the same values.
+RERANK_TEMPERATURE = 0.2
+RERANK_MAX_TOKENS = 2000
+
 # Deep-pool tiers (deeper-match-pool spec, 2026-05-21)
 CURATED_COUNT = 8          # top candidates that get the full GPT-4o rerank + explanation
 DEEP_POOL_SIZE = 20        # default total ranked candidates per attendee (curated + deep)
@@ -54,6 +71,27 @@ DEEP_TIER_EXPLANATION = (
     "worth a look. Complete your profile to unlock a richer AI explanation."
 )
 
+# Columns a regen rewrites on a stale pending row it reuses in place.
+# Everything else (statuses, meeting, decline, hide, met) is user-owned.
+REFRESHED_MATCH_FIELDS = (
+    "similarity_score", "complementary_score", "overall_score", "match_type",
+    "explanation", "shared_context", "explanation_confidence", "tier",
+)
+# Conflict target for INSERT ... ON CONFLICT: must match the uq_matches_pair
+# expression index (migration c4f1a2e8b3d7) so Postgres can infer it.
+MATCH_PAIR_KEY = (
+    func.least(Match.attendee_a_id, Match.attendee_b_id),
+    func.greatest(Match.attendee_a_id, Match.attendee_b_id),
+)
+
+
+def shard_of(attendee_id: uuid.UUID, shards: int) -> int:
+    """Shard of an attendee in a sharded regeneration. A hash of the id
+    bytes rather than hash(): the same in every process and every run."""
+    digest = hashlib.blake2b(attendee_id.bytes, digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+
 # Cross-sector verticals that create high-value complementary matches
 COMPLEMENTARY_VERTICALS = {
     "policy_regulation_macro": ["infrastructure_and_scaling", "tokenisation_of_finance", "decentralized_finance", "privacy"],
@@ -158,6 +196,91 @@ def _candidate_signal_text(candidate: Attendee) -> str:
     return " ".join(parts).lower()
 
 
+# ── Per-attendee feature records (deterministic rerank) ────────────────────
+# Verticals as bits, so "does any of A's verticals complement any of B's" is
+# one AND against A's precomputed complement mask instead of a nested loop
+# over vertical pairs. Bits cover the taxonomy only (fixed at import, so the
+# table can't grow with whatever free-form tags profiles carry); a tag
+# outside it maps to 0 and is kept as a string in `off_taxonomy`, where it
+# still counts as a shared vertical but complements nothing.
+_VERTICAL_BITS: dict[str, int] = {
+    v: 1 << i for i, v in enumerate(sorted(
+        set(COMPLEMENTARY_VERTICALS)
+        | {v for vs in COMPLEMENTARY_VERTICALS.values() for v in vs}
+        | {v for vs in GRID_SECTOR_TO_VERTICALS.values() for v in vs}
+    ))
+}
+
+
+def _vertical_mask(verticals) -> int:
+    mask = 0
+    for v in verticals:
+        mask |= _VERTICAL_BITS.get(v, 0)
+    return mask
+
+
+# COMPLEMENTARY_VERTICALS as a matrix: vertical → mask of verticals it complements.
+_COMPLEMENT_MATRIX: dict[str, int] = {v: _vertical_mask(vs) for v, vs in COMPLEMENTARY_VERTICALS.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class AttendeeFeatures:
+    """What _deterministic_rerank and the prompt builder read from one
+    attendee, computed once per engine (MatchingEngine._features)."""
+    vertical_mask: int          # vertical_tags | Grid-derived verticals
+    off_taxonomy: frozenset     # of those, the ones without a bit
+    complement_mask: int        # OR of _COMPLEMENT_MATRIX rows for those verticals
+    has_grid_products: bool
+    icp_keywords: tuple         # _icp_signal_keywords
+    signal_text: str            # _candidate_signal_text
+
+
+def _keyword_hits(keywords, text: str) -> list[str]:
+    """Keywords of `keywords` contained in `text` (substring test), sorted."""
+    return sorted(kw for kw in keywords if kw and kw in text)
+
+
+def attendee_features(attendee: Attendee) -> AttendeeFeatures:
+    verticals = set(attendee.vertical_tags or []) | _grid_verticals(attendee)
+    mask = complement = 0
+    off_taxonomy = []
+    for v in verticals:
+        bit = _VERTICAL_BITS.get(v)
+        if bit is None:
+            off_taxonomy.append(v)
+        else:
+            mask |= bit
+            complement |= _COMPLEMENT_MATRIX.get(v, 0)
+    grid = (attendee.enriched_profile or {}).get("grid") or {}
+    return AttendeeFeatures(
+        vertical_mask=mask,
+        off_taxonomy=frozenset(off_taxonomy),
+        complement_mask=complement,
+        has_grid_products=bool(grid.get("grid_products")),
+        icp_keywords=tuple(_icp_signal_keywords(attendee)),
+        signal_text=_candidate_signal_text(attendee),
+    )
+
+
+# ── b2b name masking ─────────────────────────────────────────────────────
+# One compiled pattern per (name, company): the full name and each name part
+# >= 3 chars as a single longest-first alternation, so one sub() pass masks
+# every form. Compiling per token per call used to dominate prompt builds
+# and the historical redaction scan. Bounded: names are attendee-scoped and
+# the process sees a few thousand at most.
+_MASK_FIELD_SEP = "\x00"  # non-word char, so \b behaves as at a field end
+
+
+@functools.lru_cache(maxsize=4096)
+def _b2b_name_masker(name: str, company: str):
+    """text → text with `name` / its parts replaced by `company`."""
+    tokens = sorted({name, *(p for p in name.split() if len(p) >= 3)}, key=len, reverse=True)
+    pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, tokens)) + r")\b", re.IGNORECASE)
+    # Literal replacement: a backslash in a company name must not be read
+    # as a group reference.
+    return functools.partial(pattern.sub, company.replace("\\", "\\\\"))
+
+
 def _grid_context(attendee: Attendee) -> str:
     """Build a concise Grid intelligence summary for GPT-4o candidate descriptions."""
     grid = (attendee.enriched_profile or {}).get("grid") or {}
@@ -182,9 +305,20 @@ def _grid_context(attendee: Attendee) -> str:
 class MatchingEngine:
     """3-stage AI matchmaking pipeline: Embed -> Retrieve -> Rank & Explain."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, prefetched_rankings: dict[str, list] | None = None):
         self.db = db
         self._candidate_cache: dict[str, dict] = {}
+        # id(attendee) → (attendee, updated_at, AttendeeFeatures). Keyed by
+        # object so transient (id-less) attendees never collide; holding the
+        # instance keeps id() from being reused while the engine lives.
+        self._feature_cache: dict[int, tuple] = {}
+        # Rerank answers fetched ahead of time by prefetch_rankings_via_batch,
+        # keyed by prompt fingerprint. Pass the same dict to several engines
+        # (one per session) to share one batch across them.
+        self._prefetched_rankings = prefetched_rankings if prefetched_rankings is not None else {}
+        # Set by generate_shard when other processes regenerate the same
+        # pool concurrently: only a pair's owner (_owns_pair) rewrites it.
+        self._pair_ownership = False
 
     # ── Stage 1: Embed ──────────────────────────────────────────────────
 
@@ -225,7 +359,8 @@ class MatchingEngine:
         self.db.add(attendee)
         await self.db.commit()
         await self.db.refresh(attendee)
-        return attendee
+        # refresh() leaves deferred columns unloaded; retrieval reads embedding.
+        return await ensure_heavy(self.db, attendee, *MATCHING_COLUMNS)
 
     async def process_all_attendees(self) -> int:
         """Process all attendees that don't have embeddings yet."""
@@ -334,6 +469,9 @@ class MatchingEngine:
         self, attendee: Attendee, top_k: int = 10
     ) -> list[tuple[Attendee, float]]:
         """Find top-K most similar attendees using pgvector cosine distance."""
+        # Only the subject's embedding is read; candidates come back by id and
+        # are hydrated without it (the similarity itself is computed in SQL).
+        await ensure_heavy(self.db, attendee, *MATCHING_COLUMNS)
         if attendee.embedding is None:
             attendee = await self.process_attendee(attendee)
 
@@ -398,6 +536,16 @@ class MatchingEngine:
 
         return candidates
 
+    def _features(self, attendee: Attendee) -> AttendeeFeatures:
+        """attendee_features(attendee), cached for this engine's lifetime."""
+        stamp = getattr(attendee, "updated_at", None)
+        hit = self._feature_cache.get(id(attendee))
+        if hit is not None and hit[1] == stamp:
+            return hit[2]
+        features = attendee_features(attendee)
+        self._feature_cache[id(attendee)] = (attendee, stamp, features)
+        return features
+
     # ── Stage 3: Rank & Explain (GPT-4o) ────────────────────────────────
 
     @staticmethod
@@ -440,7 +588,8 @@ class MatchingEngine:
         candidates the text is returned unchanged.
 
         Strategy: replace word-boundary occurrences of the candidate's full
-        name, then their first and last name (parts >= 3 chars), with the
+        name or their first and last name (parts >= 3 chars), longest first
+        in one pass (_b2b_name_masker), with the
         company name — the same referent _display_name gives the LLM, so
         the surrounding text stays coherent. Tokens shorter than 3 chars
         are skipped to avoid clobbering common English words (e.g. "Bo",
@@ -450,22 +599,24 @@ class MatchingEngine:
         """
         if not text:
             return ""
+        return MatchingEngine._mask_texts_for_candidate([text], candidate)[0]
+
+    @staticmethod
+    def _mask_texts_for_candidate(texts: list[str | None], candidate) -> list[str]:
+        """_mask_text_for_candidate over several fields of one candidate in a
+        single sub() pass (fields joined on a non-word separator). None →
+        "", like the single-field helper. Non-b2b candidates pass through."""
+        texts = [t or "" for t in texts]
         if getattr(candidate, "privacy_mode", "full") != "b2b_only":
-            return text
+            return texts
         name = (getattr(candidate, "name", None) or "").strip()
         if not name:
-            return text
+            return texts
         company = (getattr(candidate, "company", None) or "").strip() or "the company"
-        tokens = sorted(
-            {name, *(p for p in name.split() if len(p) >= 3)},
-            key=len,
-            reverse=True,
-        )
-        masked = text
-        for token in tokens:
-            pattern = re.compile(rf"\b{re.escape(token)}\b", re.IGNORECASE)
-            masked = pattern.sub(company, masked)
-        return masked
+        mask = _b2b_name_masker(name, company)
+        if any(_MASK_FIELD_SEP in t for t in texts):
+            return [mask(t) for t in texts]
+        return mask(_MASK_FIELD_SEP.join(texts)).split(_MASK_FIELD_SEP)
 
     @staticmethod
     def _realign_entries_by_name(
@@ -516,7 +667,8 @@ class MatchingEngine:
         candidate,
         sim_score: float,
         position: int,
-        target_icp_keywords: set[str],
+        target_icp_keywords,
+        candidate_features: AttendeeFeatures | None = None,
     ) -> str:
         """Build the per-candidate description block that goes into the
         rank_and_explain prompt. Extracted from the loop so tests can pin
@@ -527,8 +679,8 @@ class MatchingEngine:
         """
         grid_info = _grid_context(candidate)
         candidate_icp = _icp_summary(candidate, max_personas=2)
-        candidate_text = _candidate_signal_text(candidate)
-        icp_hits = sorted(kw for kw in target_icp_keywords if kw and kw in candidate_text)
+        candidate_text = candidate_features.signal_text if candidate_features else _candidate_signal_text(candidate)
+        icp_hits = _keyword_hits(target_icp_keywords, candidate_text)
         icp_hit_line = (
             f"\n  ICP MATCH SIGNAL: candidate profile contains target's ICP keywords: {', '.join(icp_hits[:6])}"
             if icp_hits else ""
@@ -541,9 +693,11 @@ class MatchingEngine:
         if not display_name:
             display_name = "Anonymous B2B attendee" if is_b2b else (getattr(candidate, "name", "") or "")
         display_title = "" if is_b2b else (candidate.title or "")
-        display_goals = cls._mask_text_for_candidate(candidate.goals, candidate) or "Not specified"
-        display_summary = cls._mask_text_for_candidate(candidate.ai_summary, candidate) or "Not available"
-        display_grid = cls._mask_text_for_candidate(grid_info, candidate)
+        display_goals, display_summary, display_grid = cls._mask_texts_for_candidate(
+            [candidate.goals, candidate.ai_summary, grid_info], candidate,
+        )
+        display_goals = display_goals or "Not specified"
+        display_summary = display_summary or "Not available"
         return (
             f"Candidate {position+1}:\n"
             f"  Name: {display_name}\n"
@@ -561,15 +715,12 @@ class MatchingEngine:
             + icp_hit_line
         )
 
-    async def rank_and_explain(
+    async def _build_rerank_prompt(
         self,
         attendee: Attendee,
         candidates: list[tuple[Attendee, float]],
-    ) -> list[dict]:
-        """Use GPT-4o to re-rank candidates and generate match explanations."""
-        if not candidates:
-            return []
-
+    ) -> str:
+        """The GPT-4o rerank prompt for `attendee` over `candidates`."""
         # Fetch prior decline reasons for feedback loop
         decline_feedback = ""
         try:
@@ -596,11 +747,12 @@ class MatchingEngine:
         except Exception:
             pass  # Non-critical; proceed without feedback
 
-        # Precompute target attendee's ICP keyword set for "candidate matches my ICP" hints
-        target_icp_keywords = _icp_signal_keywords(attendee)
+        # Target's ICP keyword set for "candidate matches my ICP" hints; both
+        # sides come from the feature cache the rerank reuses afterwards.
+        target_icp_keywords = self._features(attendee).icp_keywords
 
         candidate_descriptions = [
-            self._describe_candidate(c, s, i, target_icp_keywords)
+            self._describe_candidate(c, s, i, target_icp_keywords, self._features(c))
             for i, (c, s) in enumerate(candidates)
         ]
 
@@ -667,26 +819,188 @@ Return a JSON array ranked from best to worst match. Each entry:
 }}
 
 Return ONLY the JSON array. No markdown, no commentary."""
+        return prompt
 
-        response = await client.chat.completions.create(
-            model=settings.OPENAI_RERANK_MODEL or settings.OPENAI_CHAT_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
-            max_tokens=2000,
-        )
-
+    @staticmethod
+    def _parse_rerank_response(raw: str | None) -> list | None:
+        """The JSON array from a rerank answer, or None if it didn't parse."""
         try:
-            raw = response.choices[0].message.content.strip()
+            raw = (raw or "").strip()
             # Strip markdown code fences if GPT wraps response
             if raw.startswith("```"):
                 raw = raw.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
-            ranked = json.loads(raw)
-            # Re-anchor entries by candidate_name so a misordered LLM response
-            # can't bind an explanation/score boost to the wrong candidate
-            # (bug reported by Arda Askin 2026-05-26: his #2 card showed AIVM
-            # but the explanation talked about Arrington Capital).
-            ranked = self._realign_entries_by_name(ranked, candidates)
+            return json.loads(raw)
         except json.JSONDecodeError:
+            return None
+
+    @staticmethod
+    def _rerank_model() -> str:
+        return settings.OPENAI_RERANK_MODEL or settings.OPENAI_CHAT_MODEL
+
+    async def rank_and_explain(
+        self,
+        attendee: Attendee,
+        candidates: list[tuple[Attendee, float]],
+        on_entry: Callable[[dict], Awaitable[None]] | None = None,
+    ) -> list[dict]:
+        """Use GPT-4o to re-rank candidates and generate match explanations.
+
+        With `on_entry`, a live call is streamed: each ranked entry is
+        finished (realigned, rerank-scored, confidence) and handed to
+        `on_entry` as soon as its JSON object closes, in LLM order, with the
+        same values it has in the returned list. Prefetched and cached
+        answers never call `on_entry` — the caller handles the return value
+        as usual.
+        """
+        if not candidates:
+            return []
+
+        prompt = await self._build_rerank_prompt(attendee, candidates)
+
+        # Identical prompt (same target, candidates, scores, feedback) within
+        # the TTL → reuse the stored answer instead of another GPT-4o call.
+        # Post-processing (_finish_ranking: realign, rerank, confidence) still
+        # runs. A batch prefetch (overnight rebuilds) answers first; anything it
+        # missed goes through the cache and then the live call as before.
+        model = self._rerank_model()
+        cache_key = llm_cache.fingerprint(
+            model=model, prompt=prompt, temperature=RERANK_TEMPERATURE, max_tokens=RERANK_MAX_TOKENS,
+        )
+        ranked = self._prefetched_rankings.pop(cache_key, None)
+        if ranked is None:
+            ranked = await llm_cache.lookup(cache_key)
+        if ranked is None and on_entry is not None:
+            return await self._stream_rank_and_explain(
+                prompt, model, cache_key, attendee, candidates, on_entry,
+            )
+        if ranked is None:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=RERANK_TEMPERATURE,
+                max_tokens=RERANK_MAX_TOKENS,
+            )
+            ranked = self._parse_rerank_response(response.choices[0].message.content)
+            if ranked is not None:
+                await llm_cache.store(cache_key, model, ranked)
+        return self._finish_ranking(ranked, attendee, candidates)
+
+    async def _stream_rank_and_explain(
+        self,
+        prompt: str,
+        model: str,
+        cache_key: str,
+        attendee: Attendee,
+        candidates: list[tuple[Attendee, float]],
+        on_entry: Callable[[dict], Awaitable[None]],
+    ) -> list[dict]:
+        """Streaming twin of the live call in rank_and_explain.
+
+        The non-streamed call parses nothing until all ~2000 tokens are in
+        (10s+ on a full curated pool) and a response cut off by max_tokens
+        fails json.loads and falls back to similarity order. Here entries are
+        parsed off the stream as they close (JsonArrayStream), so a truncated
+        answer — or a connection dropped mid-stream — keeps every entry that
+        arrived whole. Only a complete, parseable answer goes into llm_cache.
+        """
+        parser = JsonArrayStream()
+        chunks: list[str] = []
+        finished: list[dict] = []
+        seen_topics: set = set()
+        target = self._features(attendee)
+
+        async def _read_items():
+            # Only the stream side is guarded: a connection that breaks after
+            # at least one whole entry ends the answer early. Errors from
+            # on_entry (persist + commit) happen in the consumer below and
+            # propagate — they are not a dropped stream.
+            try:
+                stream = await client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=RERANK_TEMPERATURE,
+                    max_tokens=RERANK_MAX_TOKENS,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    chunks.append(delta)
+                    for item in parser.feed(delta):
+                        yield item
+            except Exception as exc:  # noqa: BLE001
+                if not parser.count:
+                    raise
+                logger.warning("rerank stream for %s broke after %d entries: %s", attendee.id, parser.count, exc)
+
+        async with contextlib.aclosing(_read_items()) as items:
+            async for item in items:
+                # deepcopy: realign/rerank mutate the entry; `chunks` keeps the raw answer for the cache.
+                entry = self._finish_entry(copy.deepcopy(item), target, candidates, seen_topics)
+                if entry is not None:
+                    finished.append(entry)
+                    await on_entry(entry)
+
+        if not parser.closed:
+            if not parser.count:
+                # Nothing usable arrived — same fallback as an unparseable answer.
+                return self._finish_ranking(None, attendee, candidates)
+            logger.warning(
+                "rerank stream for %s truncated: keeping %d of %d candidates",
+                attendee.id, parser.count, len(candidates),
+            )
+        else:
+            ranked = self._parse_rerank_response("".join(chunks))
+            if ranked is not None:
+                await llm_cache.store(cache_key, model, ranked)
+        if settings.AI_RERANK_ENABLED:
+            finished.sort(key=lambda e: float(e.get("overall_score", 0.0)), reverse=True)
+        return finished
+
+    @staticmethod
+    def _is_valid_entry(entry) -> bool:
+        """A ranked entry we can persist: an object with a numeric score."""
+        if not isinstance(entry, dict):
+            return False
+        score = entry.get("overall_score", 0.0)
+        return isinstance(score, (int, float)) and not isinstance(score, bool)
+
+    def _finish_entry(
+        self,
+        entry,
+        target: AttendeeFeatures,
+        candidates: list[tuple[Attendee, float]],
+        seen_topics: set,
+    ) -> dict | None:
+        """Validate, realign and score ONE ranked entry (None = dropped).
+        Applied in LLM order with a shared `seen_topics`, this gives each
+        entry exactly the values _finish_ranking would; only the final sort
+        needs the whole list."""
+        if not self._is_valid_entry(entry):
+            return None
+        # Re-anchor entries by candidate_name so a misordered LLM response
+        # can't bind an explanation/score boost to the wrong candidate
+        # (bug reported by Arda Askin 2026-05-26: his #2 card showed AIVM
+        # but the explanation talked about Arrington Capital).
+        kept = self._realign_entries_by_name([entry], candidates)
+        if not kept:
+            return None
+        # Deterministic rerank for diversity/novelty and duplicate-topic suppression
+        if settings.AI_RERANK_ENABLED:
+            entry["overall_score"] = self._rerank_score(entry, target, candidates, seen_topics)
+        if settings.AI_CONFIDENCE_ENABLED:
+            entry["explanation_confidence"] = self._estimate_explanation_confidence(entry)
+        return entry
+
+    def _finish_ranking(
+        self,
+        ranked: list | None,
+        attendee: Attendee,
+        candidates: list[tuple[Attendee, float]],
+    ) -> list[dict]:
+        """Realign, rerank and score a parsed rerank answer (None → similarity order)."""
+        if ranked is None:
             # Fallback: return candidates in similarity order
             ranked = [
                 {
@@ -700,16 +1014,22 @@ Return ONLY the JSON array. No markdown, no commentary."""
                 }
                 for i, (_, sim_score) in enumerate(candidates)
             ]
-
-        # Deterministic rerank for diversity/novelty and duplicate-topic suppression
+            if settings.AI_RERANK_ENABLED:
+                ranked = self._deterministic_rerank(ranked, attendee, candidates)
+            if settings.AI_CONFIDENCE_ENABLED:
+                for entry in ranked:
+                    entry["explanation_confidence"] = self._estimate_explanation_confidence(entry)
+            return ranked
+
+        target = self._features(attendee)
+        seen_topics: set = set()
+        finished = [
+            e for e in (self._finish_entry(entry, target, candidates, seen_topics) for entry in ranked)
+            if e is not None
+        ]
         if settings.AI_RERANK_ENABLED:
-            ranked = self._deterministic_rerank(ranked, attendee, candidates)
-
-        if settings.AI_CONFIDENCE_ENABLED:
-            for entry in ranked:
-                entry["explanation_confidence"] = self._estimate_explanation_confidence(entry)
-
-        return ranked
+            finished.sort(key=lambda e: float(e.get("overall_score", 0.0)), reverse=True)
+        return finished
 
     @staticmethod
     def _extract_primary_topic(entry: dict) -> str:
@@ -730,68 +1050,70 @@ Return ONLY the JSON array. No markdown, no commentary."""
         suppress_duplicate_topics: bool = True,
     ) -> list[dict]:
         """Apply deterministic boosts/penalties after LLM ranking."""
-        adjusted = []
-        seen_topics = set()
-        target_icp_kws = _icp_signal_keywords(attendee)
+        seen_topics: set = set()
+        target = self._features(attendee)
         for entry in ranked:
-            score = float(entry.get("overall_score", 0.0))
-            match_type = str(entry.get("match_type", "complementary"))
-            topic = self._extract_primary_topic(entry)
+            entry["overall_score"] = self._rerank_score(
+                entry, target, candidates, seen_topics if suppress_duplicate_topics else None,
+            )
+        return sorted(ranked, key=lambda e: float(e.get("overall_score", 0.0)), reverse=True)
 
-            # Small novelty boost for non-obvious cross-sector pairings.
-            if match_type == "non_obvious":
+    def _rerank_score(
+        self,
+        entry: dict,
+        target: AttendeeFeatures,
+        candidates: list[tuple],
+        seen_topics: set | None,
+    ) -> float:
+        """One entry's boosted score. `seen_topics` carries the duplicate-topic
+        penalty across entries in LLM order (None = no suppression); nothing
+        else depends on the other entries, which is what lets the streaming
+        rerank score each entry as it arrives."""
+        score = float(entry.get("overall_score", 0.0))
+        match_type = str(entry.get("match_type", "complementary"))
+
+        # Small novelty boost for non-obvious cross-sector pairings.
+        if match_type == "non_obvious":
+            score += 0.03
+
+        # Penalize repeated primary topics to reduce duplicate recommendations.
+        if seen_topics is not None:
+            topic = self._extract_primary_topic(entry)
+            if topic in seen_topics:
+                score -= 0.05
+            else:
+                seen_topics.add(topic)
+
+        # Vertical affinity boost — combine explicit tags + Grid sector intelligence
+        idx = entry.get("candidate_index", 0) - 1
+        if 0 <= idx < len(candidates):
+            cand = self._features(candidates[idx][0])
+            # Explicit vertical_tags merged with Grid-derived verticals,
+            # as bitmasks (see AttendeeFeatures).
+            if target.complement_mask & cand.vertical_mask:
+                score += 0.04
+            elif target.vertical_mask & cand.vertical_mask or not target.off_taxonomy.isdisjoint(cand.off_taxonomy):
+                score += 0.02
+
+            # Extra boost when Grid products suggest supply/demand fit
+            if target.has_grid_products and cand.has_grid_products:
+                score += 0.02  # both have verified product data = higher confidence
+
+            # ICP boost — ranked below explicit target_companies (already prompt-weighted)
+            # and above pure similarity (which is the baseline floor)
+            text = cand.signal_text
+            icp_hits = sum(1 for kw in target.icp_keywords if kw in text)
+            if icp_hits >= 2:
+                score += 0.05  # strong ICP signal — multiple keyword hits
+            elif icp_hits == 1:
                 score += 0.03
 
-            # Penalize repeated primary topics to reduce duplicate recommendations.
-            if suppress_duplicate_topics:
-                if topic in seen_topics:
-                    score -= 0.05
-                else:
-                    seen_topics.add(topic)
-
-            # Vertical affinity boost — combine explicit tags + Grid sector intelligence
-            idx = entry.get("candidate_index", 0) - 1
-            if 0 <= idx < len(candidates):
-                candidate = candidates[idx][0]
-                # Merge explicit vertical_tags with Grid-derived verticals
-                a_verts = set(attendee.vertical_tags or []) | _grid_verticals(attendee)
-                c_verts = set(candidate.vertical_tags or []) | _grid_verticals(candidate)
-                complementary_hit = any(
-                    v in COMPLEMENTARY_VERTICALS.get(av, [])
-                    for av in a_verts for v in c_verts
-                )
-                if complementary_hit:
-                    score += 0.04
-                elif a_verts & c_verts:
-                    score += 0.02
-
-                # Extra boost when Grid products suggest supply/demand fit
-                a_grid = (attendee.enriched_profile or {}).get("grid") or {}
-                c_grid = (candidate.enriched_profile or {}).get("grid") or {}
-                if a_grid.get("grid_products") and c_grid.get("grid_products"):
-                    score += 0.02  # both have verified product data = higher confidence
-
-                # ICP boost — ranked below explicit target_companies (already prompt-weighted)
-                # and above pure similarity (which is the baseline floor)
-                candidate_text = _candidate_signal_text(candidate)
-                icp_hits = sum(1 for kw in target_icp_kws if kw and kw in candidate_text)
-                if icp_hits >= 2:
-                    score += 0.05  # strong ICP signal — multiple keyword hits
-                elif icp_hits == 1:
-                    score += 0.03
-
-                # Two-way ICP fit — candidate's ICP also points back at target
-                candidate_icp_kws = _icp_signal_keywords(candidate)
-                if candidate_icp_kws:
-                    target_text = _candidate_signal_text(attendee)
-                    if any(kw in target_text for kw in candidate_icp_kws):
-                        score += 0.03  # mutual fit = deal-ready signal
-
-            entry["overall_score"] = max(0.0, min(1.0, score))
-            adjusted.append(entry)
-
-        adjusted.sort(key=lambda e: float(e.get("overall_score", 0.0)), reverse=True)
-        return adjusted
+            # Two-way ICP fit — candidate's ICP also points back at target
+            text = target.signal_text
+            if any(kw in text for kw in cand.icp_keywords):
+                score += 0.03  # mutual fit = deal-ready signal
+
+        return max(0.0, min(1.0, score))
 
     @staticmethod
     def _estimate_explanation_confidence(entry: dict) -> float:
@@ -846,10 +1168,14 @@ Return ONLY the JSON array. No markdown, no commentary."""
     ) -> list[Match]:
         """Persist ranked candidates above `floor`, tagged with `tier`.
 
-        Dedups against rows already in the session/DB in either direction
-        (autoflush makes prior-tier adds visible to the SELECT).
+        Set-based: one SELECT for every existing pair in the batch (either
+        direction), one UPDATE ... FROM (VALUES ...) for the stale pending rows
+        reused in place, one INSERT ... ON CONFLICT DO NOTHING for the rest.
+        Pre-2026-06 this was a SELECT per entry plus a savepoint per INSERT —
+        100+ round trips for a 50-row sponsor pool. Returns rows in ranked order.
         """
-        persisted: list[Match] = []
+        picked: list[tuple[uuid.UUID, dict]] = []
+        seen: set = set()
         for entry in ranked:
             idx = entry["candidate_index"] - 1
             if idx < 0 or idx >= len(candidates):
@@ -861,62 +1187,157 @@ Return ONLY the JSON array. No markdown, no commentary."""
                 continue
             if entry.get("match_type") == "non_obvious" and overall_score < non_obvious_floor:
                 continue
+            # GPT occasionally repeats a candidate_index; first (best) wins.
+            if candidate.id in seen:
+                continue
+            seen.add(candidate.id)
+
+            picked.append((candidate.id, {
+                "similarity_score": sim_score,
+                "complementary_score": entry.get("complementary_score", sim_score),
+                "overall_score": overall_score,
+                "match_type": entry.get("match_type", "complementary"),
+                "explanation": entry.get("explanation", ""),
+                "shared_context": entry.get("shared_context", {}),
+                "explanation_confidence": entry.get("explanation_confidence"),
+                "tier": tier,
+            }))
+        if not picked:
+            return []
 
-            existing = (
-                await self.db.execute(
-                    select(Match).where(
-                        or_(
-                            (Match.attendee_a_id == attendee.id)
-                            & (Match.attendee_b_id == candidate.id),
-                            (Match.attendee_a_id == candidate.id)
-                            & (Match.attendee_b_id == attendee.id),
-                        )
-                    )
-                )
-            ).scalars().first()
-            if existing is not None:
+        existing = await self._existing_pairs(attendee.id, [cid for cid, _ in picked])
+        refreshes: list[tuple[Match, dict]] = []
+        inserts: list[dict] = []
+        unowned: list[Match] = []
+        for cid, fields in picked:
+            row = existing.get(cid)
+            if row is None:
+                inserts.append({"attendee_a_id": attendee.id, "attendee_b_id": cid, **fields})
+            elif self._is_stale_pending(row):
+                if self._pair_ownership and not self._owns_pair(attendee.id, cid):
+                    # Sharded run: the owner's ranking wrote (or will write)
+                    # this row — don't flip it back and forth between shards.
+                    unowned.append(row)
+                    continue
                 # Reuse the row in place when it's fully stale (pending/pending,
                 # untouched) so its match id stays STABLE across regens — an open
-                # client never 404s on accept/decline. Never overwrite a row the
-                # user has acted on (accepted/declined/scheduled/hidden/met).
-                if self._is_stale_pending(existing):
-                    existing.similarity_score = sim_score
-                    existing.complementary_score = entry.get("complementary_score", sim_score)
-                    existing.overall_score = overall_score
-                    existing.match_type = entry.get("match_type", "complementary")
-                    existing.explanation = entry.get("explanation", "")
-                    existing.shared_context = entry.get("shared_context", {})
-                    existing.explanation_confidence = entry.get("explanation_confidence")
-                    existing.tier = tier
-                    await self.db.flush()
-                    persisted.append(existing)
-                # else: user-touched — leave exactly as the user left it.
-                continue
+                # client never 404s on accept/decline.
+                refreshes.append((row, fields))
+            # else: user-touched (accepted/declined/scheduled/hidden/met) —
+            # leave exactly as the user left it.
 
-            match = Match(
-                attendee_a_id=attendee.id,
-                attendee_b_id=candidate.id,
-                similarity_score=sim_score,
-                complementary_score=entry.get("complementary_score", sim_score),
-                overall_score=overall_score,
-                match_type=entry.get("match_type", "complementary"),
-                explanation=entry.get("explanation", ""),
-                shared_context=entry.get("shared_context", {}),
-                explanation_confidence=entry.get("explanation_confidence"),
-                tier=tier,
+        written = await self._refresh_stale_rows(refreshes) + await self._insert_new_pairs(inserts)
+        if self._pair_ownership:
+            written += await self._claim_raced_pairs(attendee.id, inserts, written, dict(picked))
+        by_counterpart = {self._counterpart(m, attendee.id): m for m in unowned + written}
+        return [by_counterpart[cid] for cid, _ in picked if cid in by_counterpart]
+
+    @staticmethod
+    def _owns_pair(attendee_id: uuid.UUID, counterpart_id: uuid.UUID) -> bool:
+        """In a sharded regeneration each pair's row is written by one side
+        only: the lower id, i.e. least() of the uq_matches_pair key (UUID
+        int order is Postgres' uuid order). Whichever shard reaches the pair
+        first, the result is the owner's ranking whenever the owner ranked
+        the other side at all."""
+        return attendee_id.int < counterpart_id.int
+
+    async def _claim_raced_pairs(
+        self, attendee_id: uuid.UUID, inserts: list[dict], written: list[Match], fields_by_cid: dict,
+    ) -> list[Match]:
+        """Owned pairs whose INSERT lost to another shard between our SELECT
+        and INSERT (ON CONFLICT DO NOTHING skipped them): refresh the row the
+        other shard wrote, so the owner still wins the race."""
+        got = {self._counterpart(m, attendee_id) for m in written}
+        lost = [
+            r["attendee_b_id"] for r in inserts
+            if r["attendee_b_id"] not in got and self._owns_pair(attendee_id, r["attendee_b_id"])
+        ]
+        if not lost:
+            return []
+        now = await self._existing_pairs(attendee_id, lost)
+        return await self._refresh_stale_rows([
+            (row, fields_by_cid[cid]) for cid, row in now.items() if self._is_stale_pending(row)
+        ])
+
+    @staticmethod
+    def _counterpart(match: Match, attendee_id: uuid.UUID) -> uuid.UUID:
+        return match.attendee_b_id if match.attendee_a_id == attendee_id else match.attendee_a_id
+
+    async def _existing_pairs(self, attendee_id: uuid.UUID, counterpart_ids: list) -> dict:
+        """Every match row pairing `attendee_id` with one of `counterpart_ids`,
+        in either direction, keyed by counterpart id. One SELECT per batch."""
+        if not counterpart_ids:
+            return {}
+        rows = (await self.db.execute(
+            select(Match).where(
+                or_(
+                    and_(Match.attendee_a_id == attendee_id, Match.attendee_b_id.in_(counterpart_ids)),
+                    and_(Match.attendee_b_id == attendee_id, Match.attendee_a_id.in_(counterpart_ids)),
+                )
             )
-            # Savepoint-wrap so a concurrent writer that won the
-            # (LEAST(a,b), GREATEST(a,b)) unique-index race causes us to
-            # skip this row instead of aborting the entire transaction.
-            try:
-                async with self.db.begin_nested():
-                    self.db.add(match)
-                    await self.db.flush()
-                persisted.append(match)
-            except IntegrityError:
-                # Other writer beat us to it; their row stands, move on.
-                pass
-        return persisted
+        )).scalars().all()
+        return {self._counterpart(m, attendee_id): m for m in rows}
+
+    async def _refresh_stale_rows(self, refreshes: list[tuple[Match, dict]]) -> list[Match]:
+        """Rewrite REFRESHED_MATCH_FIELDS on reused stale rows in ONE statement.
+
+        The stale-pending guard is repeated in the WHERE clause: a user who
+        accepts/declines between our prefetch and this UPDATE keeps their row
+        untouched, and that row is left out of the result. The in-memory
+        objects are brought in line without being marked dirty, so the
+        caller's commit doesn't write them a second time.
+        """
+        if not refreshes:
+            return []
+        table = Match.__table__
+        fresh = values(
+            column("id", table.c.id.type),
+            *(column(f, table.c[f].type) for f in REFRESHED_MATCH_FIELDS),
+            name="fresh",
+        ).data([(m.id, *(fields[f] for f in REFRESHED_MATCH_FIELDS)) for m, fields in refreshes])
+        stmt = (
+            update(Match)
+            .where(Match.id == fresh.c.id, *self._stale_pending_conditions())
+            # CAST: a VALUES column that is NULL in every row types as text.
+            .values({f: cast(fresh.c[f], table.c[f].type) for f in REFRESHED_MATCH_FIELDS})
+            .returning(Match.id)
+            .execution_options(synchronize_session=False)
+        )
+        refreshed = set((await self.db.execute(stmt)).scalars().all())
+        out = []
+        for m, fields in refreshes:
+            if m.id in refreshed:
+                for f, value in fields.items():
+                    set_committed_value(m, f, value)
+                out.append(m)
+        return out
+
+    async def _insert_new_pairs(self, rows: list[dict]) -> list[Match]:
+        """INSERT every row in one statement; a pair a concurrent writer already
+        holds is skipped by the unique index (ON CONFLICT DO NOTHING) instead
+        of aborting the transaction. Returns the inserted rows in input order."""
+        if not rows:
+            return []
+        stmt = (
+            pg_insert(Match)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=list(MATCH_PAIR_KEY))
+            .returning(Match)
+        )
+        inserted = {m.attendee_b_id: m for m in (await self.db.execute(stmt)).scalars().all()}
+        return [inserted[r["attendee_b_id"]] for r in rows if r["attendee_b_id"] in inserted]
+
+    @staticmethod
+    def _stale_pending_conditions() -> list:
+        """SQL twin of `_is_stale_pending`."""
+        return [
+            Match.status_a == "pending",
+            Match.status_b == "pending",
+            Match.meeting_time.is_(None),
+            Match.decline_reason.is_(None),
+            Match.hidden_by_user.is_(False),
+            Match.met_at.is_(None),
+        ]
 
     @staticmethod
     def _is_stale_pending(match: Match) -> bool:
@@ -988,12 +1409,7 @@ Return ONLY the JSON array. No markdown, no commentary."""
                 Match.attendee_a_id == attendee_id,
                 Match.attendee_b_id == attendee_id,
             ),
-            Match.status_a == "pending",
-            Match.status_b == "pending",
-            Match.meeting_time.is_(None),
-            Match.decline_reason.is_(None),
-            Match.hidden_by_user.is_(False),
-            Match.met_at.is_(None),
+            *self._stale_pending_conditions(),
         ]
         if keep_ids:
             conditions.append(Match.id.notin_(keep_ids))
@@ -1096,8 +1512,8 @@ Return ONLY the JSON array. No markdown, no commentary."""
                 shared_context={},
                 tier="priority_intro",
             )
-            # Same race-guard as _persist_ranked: savepoint so a concurrent
-            # writer doesn't blow the whole commit.
+            # Race-guard: savepoint so a concurrent writer that won the
+            # unique-pair race doesn't blow the whole commit.
             try:
                 async with self.db.begin_nested():
                     self.db.add(new_match)
@@ -1113,9 +1529,34 @@ Return ONLY the JSON array. No markdown, no commentary."""
         await self.db.commit()
         return existing_matches
 
+    async def _candidate_pool(
+        self, attendee: Attendee, top_k: int, clear_existing: bool,
+    ) -> list[tuple[Attendee, float]]:
+        """Stage 2 for generate_matches_for_attendee: the ranked neighbour
+        pool, minus counterparts locked by a user decision. Shared with
+        prefetch_rankings_via_batch so both build the same curated prompt."""
+        locked_counterparts: set = set()
+        if clear_existing:
+            locked_counterparts = await self._collect_locked_counterparts(attendee.id)
+
+        # Stage 2: Retrieve a deeper neighbour set so we can split into
+        # a curated head (GPT-explained) and a similarity-only deep tail.
+        # SPONSOR ticket_type gets a larger pool (50 vs 20) - gold partners
+        # need volume for prospecting, regular attendees do not.
+        ticket_str = str(
+            attendee.ticket_type.value if hasattr(attendee.ticket_type, "value") else attendee.ticket_type
+        ).lower()
+        is_sponsor = ticket_str == "sponsor"
+        default_pool = SPONSOR_DEEP_POOL_SIZE if is_sponsor else DEEP_POOL_SIZE
+        pool_size = max(top_k, default_pool)
+        candidates = await self.retrieve_candidates(attendee, top_k=pool_size)
+        if locked_counterparts:
+            candidates = [(c, s) for c, s in candidates if c.id not in locked_counterparts]
+        return candidates
+
     async def generate_matches_for_attendee(
         self, attendee_id: uuid.UUID, top_k: int = 10, clear_existing: bool = True,
-        notify: bool = True,
+        notify: bool = True, stream: bool | None = None,
     ) -> list[Match]:
         """Run full 3-stage pipeline for a single attendee.
 
@@ -1128,10 +1569,15 @@ Return ONLY the JSON array. No markdown, no commentary."""
                 rebuild would otherwise fire one intro email per attendee (739-blast)
                 the moment EMAIL_MODE=all. Genuine new-match paths (registration,
                 nightly new-attendee cron) keep notify=True.
+            stream: Stream the curated rerank and commit each curated match as
+                its entry arrives (default: settings.AI_RERANK_STREAMING).
+                Bulk regeneration passes False — nobody is watching, and a
+                commit per entry is wasted round trips.
         """
-        attendee = await self.db.get(Attendee, attendee_id)
+        attendee = await self.db.get(Attendee, attendee_id, options=[load_heavy(*MATCHING_COLUMNS)])
         if not attendee:
             raise ValueError(f"Attendee {attendee_id} not found")
+        await ensure_heavy(self.db, attendee, *MATCHING_COLUMNS)
 
         from app.services.consent_filter import is_match_gated
         if is_match_gated(attendee):
@@ -1148,23 +1594,7 @@ Return ONLY the JSON array. No markdown, no commentary."""
         # we purge only fully-stale rows and lock the surviving counterparts
         # out of new candidate generation so a) we never duplicate a locked
         # pair and b) we never resurface a previously-declined counterpart.
-        locked_counterparts: set = set()
-        if clear_existing:
-            locked_counterparts = await self._collect_locked_counterparts(attendee_id)
-
-        # Stage 2: Retrieve a deeper neighbour set so we can split into
-        # a curated head (GPT-explained) and a similarity-only deep tail.
-        # SPONSOR ticket_type gets a larger pool (50 vs 20) - gold partners
-        # need volume for prospecting, regular attendees do not.
-        ticket_str = str(
-            attendee.ticket_type.value if hasattr(attendee.ticket_type, "value") else attendee.ticket_type
-        ).lower()
-        is_sponsor = ticket_str == "sponsor"
-        default_pool = SPONSOR_DEEP_POOL_SIZE if is_sponsor else DEEP_POOL_SIZE
-        pool_size = max(top_k, default_pool)
-        candidates = await self.retrieve_candidates(attendee, top_k=pool_size)
-        if locked_counterparts:
-            candidates = [(c, s) for c, s in candidates if c.id not in locked_counterparts]
+        candidates = await self._candidate_pool(attendee, top_k, clear_existing)
         if not candidates:
             return []
 
@@ -1174,7 +1604,20 @@ Return ONLY the JSON array. No markdown, no commentary."""
         matches: list[Match] = []
 
         # Curated tier — full GPT-4o rerank + natural-language explanation.
-        curated_ranked = await self.rank_and_explain(attendee, curated_candidates)
+        # Streaming: each entry is persisted + committed as it arrives so the
+        # matches page fills in during onboarding; the persist below then
+        # rewrites those same rows in place (stable ids) with identical values
+        # and adds the ranked order.
+        on_entry = None
+        if settings.AI_RERANK_STREAMING if stream is None else stream:
+            async def on_entry(entry: dict) -> None:
+                if await self._persist_ranked(
+                    attendee, [entry], curated_candidates,
+                    tier="curated", floor=MIN_MATCH_SCORE, non_obvious_floor=MIN_NON_OBVIOUS_SCORE,
+                ):
+                    await self.db.commit()
+
+        curated_ranked = await self.rank_and_explain(attendee, curated_candidates, on_entry=on_entry)
         matches += await self._persist_ranked(
             attendee,
             curated_ranked,
@@ -1203,50 +1646,36 @@ Return ONLY the JSON array. No markdown, no commentary."""
         if not matches:
             a_verts = set(attendee.vertical_tags or []) | _grid_verticals(attendee)
             a_grid_sector = ((attendee.enriched_profile or {}).get("grid") or {}).get("grid_sector", "").strip().lower()
+            peers: list[tuple] = []
             for candidate, sim_score in candidates[:5]:
                 c_verts = set(candidate.vertical_tags or []) | _grid_verticals(candidate)
                 c_grid_sector = ((candidate.enriched_profile or {}).get("grid") or {}).get("grid_sector", "").strip().lower()
                 shares_vertical = bool(a_verts & c_verts)
                 shares_grid = bool(a_grid_sector and a_grid_sector == c_grid_sector)
-                if not (shares_vertical or shares_grid):
-                    continue
-                existing = (
-                    await self.db.execute(
-                        select(Match).where(
-                            or_(
-                                (Match.attendee_a_id == attendee.id) & (Match.attendee_b_id == candidate.id),
-                                (Match.attendee_a_id == candidate.id) & (Match.attendee_b_id == attendee.id),
-                            )
-                        )
-                    )
-                ).scalars().first()
-                if existing:
-                    continue
-                shared = sorted((a_verts & c_verts) or {a_grid_sector} if a_grid_sector else set())
-                fallback = Match(
-                    attendee_a_id=attendee.id,
-                    attendee_b_id=candidate.id,
-                    similarity_score=sim_score,
-                    complementary_score=sim_score,
-                    overall_score=max(0.60, sim_score),
-                    match_type="complementary",
-                    explanation=(
+                if shares_vertical or shares_grid:
+                    shared = sorted((a_verts & c_verts) or {a_grid_sector} if a_grid_sector else set())
+                    peers.append((candidate, sim_score, shared))
+            # Any existing row for the pair (touched or not) wins over a fallback.
+            existing = await self._existing_pairs(attendee.id, [c.id for c, _, _ in peers])
+            fallback_rows = [
+                {
+                    "attendee_a_id": attendee.id,
+                    "attendee_b_id": candidate.id,
+                    "similarity_score": sim_score,
+                    "complementary_score": sim_score,
+                    "overall_score": max(0.60, sim_score),
+                    "match_type": "complementary",
+                    "explanation": (
                         f"Sector peer match — both work in {', '.join(shared) or 'a related Web3 sector'}. "
                         f"No stronger deal-ready signal was found; surfacing as a sector connection worth a brief intro."
                     ),
-                    shared_context={"sectors": shared, "fallback": True},
-                    explanation_confidence=0.4,
-                )
-                # Race-guard: skip on unique-index conflict.
-                try:
-                    async with self.db.begin_nested():
-                        self.db.add(fallback)
-                        await self.db.flush()
-                    matches.append(fallback)
-                except IntegrityError:
-                    pass
-                if len(matches) >= 3:
-                    break
+                    "shared_context": {"sectors": shared, "fallback": True},
+                    "explanation_confidence": 0.4,
+                }
+                for candidate, sim_score, shared in peers
+                if candidate.id not in existing
+            ][:3]
+            matches += await self._insert_new_pairs(fallback_rows)
 
         await self.db.commit()
 
@@ -1299,48 +1728,151 @@ Return ONLY the JSON array. No markdown, no commentary."""
 
         return matches
 
-    async def generate_all_matches(self, top_k: int = 10) -> int:
+    async def prefetch_rankings_via_batch(
+        self,
+        attendees: list[Attendee],
+        top_k: int = 10,
+        clear_existing: bool = False,
+        batch_client=None,
+    ) -> dict:
+        """Answer every curated rerank for `attendees` through one OpenAI batch.
+
+        Builds each attendee's rerank prompt exactly as
+        generate_matches_for_attendee will (same pool, same curated slice),
+        skips prompts llm_cache already answers, submits the rest as one
+        Batch API job and waits for it. Parsed answers land in this engine's
+        prefetched rankings (and llm_cache), so the per-attendee pass that
+        follows runs realign / rerank / persist with no live GPT calls.
+        Anything the batch didn't answer falls through to the normal path.
+        """
+        from app.services import openai_batch
+        from app.services.consent_filter import is_match_gated
+
+        stats = {"prompts": 0, "cached": 0, "submitted": 0, "answered": 0, "failed": 0}
+        model = self._rerank_model()
+        requests: dict[str, dict] = {}
+        for attendee in attendees:
+            if attendee.embedding is None or is_match_gated(attendee):
+                continue
+            curated = (await self._candidate_pool(attendee, top_k, clear_existing))[:CURATED_COUNT]
+            if not curated:
+                continue
+            prompt = await self._build_rerank_prompt(attendee, curated)
+            key = llm_cache.fingerprint(
+                model=model, prompt=prompt, temperature=RERANK_TEMPERATURE, max_tokens=RERANK_MAX_TOKENS,
+            )
+            stats["prompts"] += 1
+            if key in requests or key in self._prefetched_rankings:
+                continue
+            cached = await llm_cache.lookup(key)
+            if cached is not None:
+                self._prefetched_rankings[key] = cached
+                stats["cached"] += 1
+                continue
+            requests[key] = openai_batch.chat_request(
+                key, model=model, prompt=prompt,
+                temperature=RERANK_TEMPERATURE, max_tokens=RERANK_MAX_TOKENS,
+            )
+
+        stats["submitted"] = len(requests)
+        try:
+            answers = await openai_batch.run_chat_batch(
+                list(requests.values()), client=batch_client or client, description="curated rerank",
+            )
+        except Exception as exc:  # noqa: BLE001
+            # Not fatal: every attendee still gets the live call, as before.
+            logger.warning("rerank batch failed, falling back to live calls: %s", exc)
+            stats["failed"] = len(requests)
+            return stats
+
+        for key, content in answers.items():
+            ranked = self._parse_rerank_response(content)
+            if ranked is None:
+                stats["failed"] += 1
+                continue
+            self._prefetched_rankings[key] = ranked
+            await llm_cache.store(key, model, ranked)
+            stats["answered"] += 1
+        logger.info("rerank batch: %s", stats)
+        return stats
+
+    async def generate_all_matches(self, top_k: int = 10, batch: bool = False) -> int:
         """Generate matches for all attendees.
 
         Wipes existing matches first so reruns produce a clean, deduplicated result.
         Each pair (A, B) produces exactly one Match record — whichever attendee is
         processed first becomes attendee_a.
+
+        batch=True answers the curated reranks through one OpenAI Batch API
+        job first (prefetch_rankings_via_batch) — half the price and none of
+        the per-minute rate limit, at the cost of waiting for the batch.
+        For overnight rebuilds only.
         """
+        await self.prepare_full_regeneration()
+        stats = await self.generate_shard(top_k, batch=batch)
+        return stats["matches"]
+
+    async def prepare_full_regeneration(self) -> None:
+        """The once-per-run half of generate_all_matches: wipe every match and
+        embed anyone missing an embedding. Must finish before any shard starts
+        — retrieval only sees candidates that already have an embedding."""
         # Start clean — prevents duplicates on reruns
         await self.db.execute(sql_delete(Match))
         await self.db.commit()
 
+        # Ensure all attendees have embeddings / AI summaries
+        await self.process_all_attendees()
+
+    async def generate_shard(
+        self, top_k: int = 10, batch: bool = False, shard: int = 0, shards: int = 1,
+    ) -> dict:
+        """Generate matches for the attendees in `shard` of `shards`
+        (shard_of), after prepare_full_regeneration. shards=1 is the whole
+        pool. With shards > 1 the other shards run at the same time in other
+        processes, so pair writes follow _owns_pair. Returns run stats.
+        """
+        started = time.monotonic()
+        self._pair_ownership = shards > 1
+
         # Exclude admin-linked attendees from the matching pool entirely
         admin_ids_subq = select(User.attendee_id).where(
             User.is_admin.is_(True),
             User.attendee_id.isnot(None),
         )
         result = await self.db.execute(
-            select(Attendee).where(~Attendee.id.in_(admin_ids_subq))
+            select(Attendee)
+            .where(~Attendee.id.in_(admin_ids_subq))
+            .options(load_heavy(*MATCHING_COLUMNS))
         )
         attendees = result.scalars().all()
-
-        # Ensure all attendees have embeddings / AI summaries
-        await self.process_all_attendees()
+        if shards > 1:
+            attendees = [a for a in attendees if shard_of(a.id, shards) == shard]
 
         # Candidate precompute cache to reduce repeated retrieval load in this run
         await self.precompute_candidate_cache(attendees, top_k=max(10, top_k))
+        batch_stats = await self.prefetch_rankings_via_batch(attendees, top_k) if batch else None
 
         total = 0
         batch_size = max(1, settings.MATCH_BATCH_SIZE)
         for i in range(0, len(attendees), batch_size):
-            batch = attendees[i : i + batch_size]
-            for attendee in batch:
+            chunk = attendees[i : i + batch_size]
+            for attendee in chunk:
                 # clear_existing=False because we wiped above and use dedup check.
                 # notify=False: a full rebuild must NOT email all 739 attendees.
                 matches = await self.generate_matches_for_attendee(
-                    attendee.id, top_k, clear_existing=False, notify=False
+                    attendee.id, top_k, clear_existing=False, notify=False, stream=False,
                 )
                 total += len(matches)
                 # Explicit yield to keep event loop responsive under load.
                 await asyncio.sleep(0)
 
-        return total
+        return {
+            "shard": shard,
+            "attendees": len(attendees),
+            "matches": total,
+            "seconds": round(time.monotonic() - started, 1),
+            "batch": batch_stats,
+        }
 
     async def precompute_candidate_cache(self, attendees: list[Attendee], top_k: int = 10) -> None:
         """Precompute candidate retrieval cache for the current pipeline run."""
@@ -1350,10 +1882,10 @@ Return ONLY the JSON array. No markdown, no commentary."""
             await self.retrieve_candidates(attendee, top_k=top_k)
 
 
-async def run_matching_pipeline(db: AsyncSession, top_k: int = 10) -> int:
+async def run_matching_pipeline(db: AsyncSession, top_k: int = 10, batch: bool = False) -> int:
     """Run the full matching pipeline and return generated match count."""
     engine = MatchingEngine(db)
-    return await engine.generate_all_matches(top_k=top_k)
+    return await engine.generate_all_matches(top_k=top_k, batch=batch)
 
 
 async def refresh_matches_for_new_attendees(db: AsyncSession, top_k: int = 10) -> dict:
@@ -1407,7 +1939,7 @@ async def refresh_matches_for_new_attendees(db: AsyncSession, top_k: int = 10) -
             async with async_session() as session:
                 engine = MatchingEngine(session)
                 matches = await engine.generate_matches_for_attendee(
-                    attendee_id, top_k, clear_existing=False
+                    attendee_id, top_k, clear_existing=False, stream=False,
                 )
                 total_new_matches += len(matches)
         except (DBAPIError, OperationalError, InterfaceError) as exc:
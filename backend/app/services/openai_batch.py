@@ -0,0 +1,192 @@
+"""OpenAI Batch API runner for chat completions, plus a file-based stand-in.
+
+Full-pool regeneration sends one GPT-4o rerank per attendee — ~800 calls
+that each take ~10s and count against the per-minute token limit, for a job
+that runs overnight and doesn't care about latency. The Batch API takes the
+same requests as a JSONL file, answers within 24h at half the price, and has
+its own (much larger) queue limit.
+
+run_chat_batch() uploads the requests, creates the batch, polls until it's
+terminal, and returns custom_id → message content. Requests that errored or
+never came back map to None, so the caller can fall back per request.
+
+LocalBatchClient mimics the four client calls (files.create, batches.create,
+batches.retrieve, files.content) against a directory on disk, answering each
+request with a `responder` callable. Used by the tests; also handy for
+inspecting exactly what a batch would submit.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+logger = logging.getLogger(__name__)
+
+ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+POLL_SECONDS = 30.0
+TIMEOUT_SECONDS = 24 * 3600  # the completion window; past it OpenAI expires the batch anyway
+
+
+def chat_request(custom_id: str, *, model: str, prompt: str, temperature: float, max_tokens: int) -> dict:
+    """One JSONL line for a single-user-message chat completion."""
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": ENDPOINT,
+        "body": {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+    }
+
+
+def _content_of(row: dict) -> str | None:
+    response = row.get("response") or {}
+    if row.get("error") or response.get("status_code") != 200:
+        return None
+    try:
+        return response["body"]["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+async def run_chat_batch(
+    requests: list[dict],
+    *,
+    client,
+    description: str = "",
+    poll_seconds: float | None = None,
+    timeout_seconds: float | None = None,
+) -> dict[str, str | None]:
+    """Submit `requests` (chat_request lines) as one batch and wait for it.
+
+    Returns custom_id → message content, None for each request that failed.
+    Raises TimeoutError (after cancelling the batch) if it isn't terminal
+    within `timeout_seconds`.
+    """
+    poll_seconds = POLL_SECONDS if poll_seconds is None else poll_seconds
+    timeout_seconds = TIMEOUT_SECONDS if timeout_seconds is None else timeout_seconds
+    results: dict[str, str | None] = {r["custom_id"]: None for r in requests}
+    if not requests:
+        return results
+
+    data = "\n".join(json.dumps(r, ensure_ascii=False) for r in requests).encode("utf-8")
+    upload = await client.files.create(file=("batch.jsonl", data), purpose="batch")
+    extra = {"metadata": {"description": description}} if description else {}
+    batch = await client.batches.create(
+        input_file_id=upload.id, endpoint=ENDPOINT, completion_window="24h", **extra,
+    )
+    logger.info("openai batch %s: submitted %d requests (%.1f MB)", batch.id, len(requests), len(data) / 1e6)
+
+    deadline = time.monotonic() + timeout_seconds
+    while batch.status not in TERMINAL_STATUSES:
+        if time.monotonic() > deadline:
+            await client.batches.cancel(batch.id)
+            raise TimeoutError(f"openai batch {batch.id} still {batch.status} after {timeout_seconds:.0f}s")
+        await asyncio.sleep(poll_seconds)
+        batch = await client.batches.retrieve(batch.id)
+        counts = getattr(batch, "request_counts", None)
+        if counts is not None:
+            logger.info("openai batch %s: %s %d/%d done, %d failed",
+                        batch.id, batch.status, counts.completed, counts.total, counts.failed)
+
+    if batch.status != "completed":
+        logger.warning("openai batch %s ended %s", batch.id, batch.status)
+    # An expired/cancelled batch still delivers whatever finished.
+    if getattr(batch, "output_file_id", None):
+        body = await client.files.content(batch.output_file_id)
+        for line in body.text.splitlines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if row.get("custom_id") in results:
+                results[row["custom_id"]] = _content_of(row)
+
+    missing = sum(1 for v in results.values() if v is None)
+    if missing:
+        logger.warning("openai batch %s: %d/%d requests without a usable answer", batch.id, missing, len(results))
+    return results
+
+
+class LocalBatchClient:
+    """File-based stand-in for the OpenAI client's Batch API surface.
+
+    Uploaded files are written under `root`; a created batch is answered on
+    its first retrieve (so callers go through one poll), one `responder(body)`
+    call per request. `responder` returns the message content string, or
+    raises to make that request come back as an error line. `fail` is a set
+    of custom_ids answered with a 500 instead.
+    """
+
+    def __init__(self, root, responder, fail=()):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.responder = responder
+        self.fail = set(fail)
+        self.submitted: list[dict] = []  # request lines of every batch, in order
+        self._ids = itertools.count(1)
+        self._batches: dict[str, SimpleNamespace] = {}
+        self.files = SimpleNamespace(create=self._files_create, content=self._files_content)
+        self.batches = SimpleNamespace(
+            create=self._batches_create, retrieve=self._batches_retrieve, cancel=self._batches_cancel,
+        )
+
+    async def _files_create(self, *, file, purpose):
+        name, data = file
+        file_id = f"file-local-{next(self._ids)}"
+        (self.root / f"{file_id}.jsonl").write_bytes(data)
+        return SimpleNamespace(id=file_id, filename=name, purpose=purpose)
+
+    async def _files_content(self, file_id):
+        return SimpleNamespace(text=(self.root / f"{file_id}.jsonl").read_text(encoding="utf-8"))
+
+    async def _batches_create(self, *, input_file_id, endpoint, completion_window, metadata=None):
+        batch = SimpleNamespace(
+            id=f"batch-local-{next(self._ids)}", status="validating", input_file_id=input_file_id,
+            endpoint=endpoint, output_file_id=None,
+            request_counts=SimpleNamespace(total=0, completed=0, failed=0),
+        )
+        self._batches[batch.id] = batch
+        return batch
+
+    async def _batches_cancel(self, batch_id):
+        self._batches[batch_id].status = "cancelled"
+        return self._batches[batch_id]
+
+    async def _batches_retrieve(self, batch_id):
+        batch = self._batches[batch_id]
+        if batch.status == "validating":
+            self._run(batch)
+        return batch
+
+    def _run(self, batch) -> None:
+        lines = (self.root / f"{batch.input_file_id}.jsonl").read_text(encoding="utf-8").splitlines()
+        out, failed = [], 0
+        for line in lines:
+            req = json.loads(line)
+            self.submitted.append(req)
+            cid = req["custom_id"]
+            try:
+                if cid in self.fail:
+                    raise RuntimeError("stand-in failure")
+                content = self.responder(req["body"])
+            except Exception as exc:  # noqa: BLE001
+                failed += 1
+                out.append({"custom_id": cid, "response": {"status_code": 500, "body": {}},
+                            "error": {"message": str(exc)}})
+                continue
+            out.append({"custom_id": cid, "error": None, "response": {
+                "status_code": 200,
+                "body": {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]},
+            }})
+        output_id = f"file-local-{next(self._ids)}"
+        (self.root / f"{output_id}.jsonl").write_text("\n".join(json.dumps(r) for r in out), encoding="utf-8")
+        batch.output_file_id = output_id
+        batch.status = "completed"
+        batch.request_counts = SimpleNamespace(total=len(lines), completed=len(lines) - failed, failed=failed)
@@ -1,45 +1,37 @@
 """Detached profile-enrichment + match-refresh triggers.
 
-Two functions, run via asyncio.create_task (NOT FastAPI BackgroundTasks —
-that holds the request worker through a 10-20s OpenAI/Grid pipeline and 504s
-the edge):
+Nothing here runs inside a request (NOT FastAPI BackgroundTasks — that holds
+the request worker through a 10-20s OpenAI/Grid pipeline and 504s the edge):
 
+- request_profile_refresh: what routes call on a profile save. Marks the
+  attendee dirty in this worker's refresh_queue and returns at once; the
+  queue waits for a quiet period, merges repeat requests and runs ONE
+  refresh_profile_matches per attendee, capped in concurrency.
 - refresh_profile_matches: LIGHT path. Re-embed from the current profile and
-  regenerate matches. No re-scraping. Used by every profile save and as
-  stages 2-3 of the cold-start join.
-- run_full_enrichment: COLD-START path. Grid + website enrichment, then
-  refresh_profile_matches. Used by the sponsor join (no enrichment data yet).
+  regenerate matches. No re-scraping. Only the queue runs it, so the queue
+  is the one place refreshes are debounced and serialized per worker.
+- run_full_enrichment: COLD-START path (asyncio.create_task). Grid + website
+  enrichment, then an immediate (no quiet period) queued refresh. Used by
+  the sponsor join (no enrichment data yet).
 """
 import asyncio
 import logging
+import time
 import traceback
 import uuid
-from weakref import WeakValueDictionary
+from dataclasses import dataclass
 
 from sqlalchemy import text as sql_text
 
+from app.core.config import get_settings
 from app.core.database import async_session
 from app.models.attendee import Attendee
+from app.services.advisory_locks import attendee_lock_key, refresh_locks
 from app.services.matching import MatchingEngine
 from app.services.enrichment import EnrichmentService
 
 logger = logging.getLogger(__name__)
 
-# Per-attendee asyncio locks. WeakValueDictionary so locks are GC'd once
-# all concurrent callers for an id have released — avoids unbounded growth
-# at 1000+ unique attendees. Trade-off: two callers arriving exactly at GC
-# time get fresh locks and don't serialize; that's a theoretical hole, not
-# a practical one (a Lock held by any caller keeps the entry alive).
-_REFRESH_LOCKS: "WeakValueDictionary[uuid.UUID, asyncio.Lock]" = WeakValueDictionary()
-
-
-def _lock_for(attendee_id: uuid.UUID) -> asyncio.Lock:
-    lock = _REFRESH_LOCKS.get(attendee_id)
-    if lock is None:
-        lock = asyncio.Lock()
-        _REFRESH_LOCKS[attendee_id] = lock
-    return lock
-
 
 async def _record_refresh_error(attendee_id: uuid.UUID, exc: Exception) -> None:
     """Surface a refresh_profile_matches failure into sync_status so the
@@ -121,41 +113,50 @@ async def refresh_profile_matches(attendee_id: uuid.UUID, notify: bool = False)
     # Per-attendee serialization: two concurrent saves for the same person
     # would otherwise both run the ~5-10s embed + GPT-4o rerank pipeline,
     # doubling cost and risking the (now-guarded) duplicate-match race.
-    # Lock is process-local — multi-worker concurrency still falls through
-    # to the DB-level unique constraint as the final backstop.
-    async with _lock_for(attendee_id):
-        last_exc: Exception | None = None
-        # One pooler-race retry with a fresh session. The pipeline is
-        # idempotent (process_attendee + generate_matches_for_attendee both
-        # upsert) so a retried partial run is safe.
-        for attempt in (1, 2):
-            try:
-                async with async_session() as db:
-                    engine = MatchingEngine(db)
-                    attendee = await db.get(Attendee, attendee_id)
-                    if not attendee:
-                        return
-                    await engine.process_attendee(attendee)
-                    # notify defaults False: saves shouldn't spam match emails; callers may opt in.
-                    await engine.generate_matches_for_attendee(
-                        attendee_id, top_k=10, notify=notify
-                    )
-                return
-            except Exception as exc:  # noqa: BLE001
-                last_exc = exc
-                if attempt == 1 and _is_pooler_prep_stmt_race(exc):
-                    logger.warning(
-                        "refresh_profile_matches: pgbouncer prep-stmt race for %s; retrying with fresh session",
-                        attendee_id,
-                    )
-                    continue
-                logger.exception("refresh_profile_matches failed for %s: %s", attendee_id, exc)
-                await _record_refresh_error(attendee_id, exc)
-                return
-        # Safety net: both attempts raised but neither path returned.
-        if last_exc is not None:
-            logger.exception("refresh_profile_matches failed for %s after retry: %s", attendee_id, last_exc)
-            await _record_refresh_error(attendee_id, last_exc)
+    #  - same worker: refresh_queue runs at most one refresh per attendee and
+    #    folds edits made meanwhile into one follow-up after its quiet period
+    #    (the only debounce — this function used to run a second one).
+    #  - across workers: pg advisory lock keyed on the attendee; a worker
+    #    that finds it taken waits, then runs on the other's result.
+    # The DB-level unique constraint stays the final backstop.
+    async with refresh_locks.hold(attendee_lock_key(attendee_id)):
+        await _refresh_once(attendee_id, notify)
+
+
+async def _refresh_once(attendee_id: uuid.UUID, notify: bool) -> None:
+    """One embed + match pass. Never raises: failures go to sync_status."""
+    last_exc: Exception | None = None
+    # One pooler-race retry with a fresh session. The pipeline is
+    # idempotent (process_attendee + generate_matches_for_attendee both
+    # upsert) so a retried partial run is safe.
+    for attempt in (1, 2):
+        try:
+            async with async_session() as db:
+                engine = MatchingEngine(db)
+                attendee = await db.get(Attendee, attendee_id)
+                if not attendee:
+                    return
+                await engine.process_attendee(attendee)
+                # notify defaults False: saves shouldn't spam match emails; callers may opt in.
+                await engine.generate_matches_for_attendee(
+                    attendee_id, top_k=10, notify=notify
+                )
+            return
+        except Exception as exc:  # noqa: BLE001
+            last_exc = exc
+            if attempt == 1 and _is_pooler_prep_stmt_race(exc):
+                logger.warning(
+                    "refresh_profile_matches: pgbouncer prep-stmt race for %s; retrying with fresh session",
+                    attendee_id,
+                )
+                continue
+            logger.exception("refresh_profile_matches failed for %s: %s", attendee_id, exc)
+            await _record_refresh_error(attendee_id, exc)
+            return
+    # Safety net: both attempts raised but neither path returned.
+    if last_exc is not None:
+        logger.exception("refresh_profile_matches failed for %s after retry: %s", attendee_id, last_exc)
+        await _record_refresh_error(attendee_id, last_exc)
 
 
 async def run_full_enrichment(attendee_id: uuid.UUID) -> None:
@@ -178,4 +179,163 @@ async def run_full_enrichment(attendee_id: uuid.UUID) -> None:
     except Exception as exc:
         logger.exception("run_full_enrichment outer failure for %s: %s", attendee_id, exc)
     # Always attempt the embed + match refresh, even if the enrich stage failed.
-    await refresh_profile_matches(attendee_id)
+    # Through the queue (no quiet period) so it can't overlap a save's refresh.
+    request_profile_refresh(attendee_id, immediate=True)
+
+
+@dataclass
+class _Dirty:
+    first_at: float
+    last_at: float
+    notify: bool = False
+    requests: int = 1
+    # Per-entry override of the quiet period (0 = dispatch on next tick).
+    quiet: float | None = None
+
+
+class ProfileRefreshQueue:
+    """Per-worker debounce queue in front of refresh_profile_matches.
+
+    Before this, every magic-link edit and concierge save_field started its
+    own full pipeline: an attendee filling in five fields in a minute paid
+    for five. Now each save records "attendee X dirty at T"; the dispatcher
+    refreshes X once X has been quiet for `quiet` seconds (or `max_delay`
+    after the first unprocessed edit, so a non-stop typist still gets
+    fresh matches). Requests that arrive while X is refreshing stay dirty
+    and become one follow-up run. At most `concurrency` refreshes run at
+    once; the rest wait for a slot, still merged.
+
+    In-memory and per worker: a deploy drops the pending set (logged in
+    close()) — the next save or the nightly refresh picks it up.
+    """
+
+    def __init__(self, quiet: float, max_delay: float, concurrency: int):
+        self.quiet = quiet
+        self.max_delay = max_delay
+        self.concurrency = concurrency
+        self._dirty: dict[uuid.UUID, _Dirty] = {}
+        self._active: dict[uuid.UUID, asyncio.Task] = {}
+        self._slots = asyncio.Semaphore(concurrency)
+        self._wakeup = asyncio.Event()
+        self._dispatcher: asyncio.Task | None = None
+        self._running = 0
+        self._m = {
+            "requested": 0, "coalesced": 0, "dispatched": 0, "completed": 0,
+            "failed": 0, "max_wait_ms": 0.0, "total_wait_ms": 0.0,
+        }
+
+    def enqueue(self, attendee_id: uuid.UUID, notify: bool = False, quiet: float | None = None) -> None:
+        """Mark dirty and return. Must be called on the event loop."""
+        now = time.monotonic()
+        self._m["requested"] += 1
+        entry = self._dirty.get(attendee_id)
+        if entry is None:
+            self._dirty[attendee_id] = _Dirty(first_at=now, last_at=now, notify=notify, quiet=quiet)
+        else:
+            self._m["coalesced"] += 1
+            entry.last_at = now
+            entry.requests += 1
+            entry.notify = entry.notify or notify
+            if quiet is not None:
+                entry.quiet = quiet if entry.quiet is None else min(entry.quiet, quiet)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+        self._wakeup.set()
+
+    def _due_at(self, entry: _Dirty) -> float:
+        quiet = self.quiet if entry.quiet is None else entry.quiet
+        return min(entry.last_at + quiet, entry.first_at + self.max_delay)
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            next_due: float | None = None
+            for aid, entry in list(self._dirty.items()):
+                if aid in self._active:
+                    continue  # refreshing now; stays dirty → one follow-up run
+                due = self._due_at(entry)
+                if due <= now:
+                    del self._dirty[aid]
+                    self._active[aid] = asyncio.create_task(self._run(aid, entry))
+                elif next_due is None or due < next_due:
+                    next_due = due
+            if not self._dirty and not self._active:
+                return  # idle; the next enqueue restarts the dispatcher
+            timeout = None if next_due is None else max(0.0, next_due - now)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, attendee_id: uuid.UUID, entry: _Dirty) -> None:
+        try:
+            async with self._slots:
+                wait_ms = (time.monotonic() - entry.first_at) * 1000
+                self._m["dispatched"] += 1
+                self._m["total_wait_ms"] += wait_ms
+                self._m["max_wait_ms"] = max(self._m["max_wait_ms"], wait_ms)
+                self._running += 1
+                try:
+                    await refresh_profile_matches(attendee_id, notify=entry.notify)
+                    self._m["completed"] += 1
+                except Exception:  # noqa: BLE001 — refresh_profile_matches records its own errors
+                    self._m["failed"] += 1
+                    logger.exception("profile refresh queue: run failed for %s", attendee_id)
+                finally:
+                    self._running -= 1
+        finally:
+            self._active.pop(attendee_id, None)
+            self._wakeup.set()
+
+    def metrics(self) -> dict:
+        now = time.monotonic()
+        dispatched = self._m["dispatched"]
+        return {
+            "dirty": len(self._dirty),
+            "running": self._running,
+            "waiting_for_slot": len(self._active) - self._running,
+            "concurrency_cap": self.concurrency,
+            "oldest_dirty_s": round(max((now - e.first_at for e in self._dirty.values()), default=0.0), 1),
+            "requested": self._m["requested"],
+            "coalesced": self._m["coalesced"],
+            "dispatched": dispatched,
+            "completed": self._m["completed"],
+            "failed": self._m["failed"],
+            "avg_wait_ms": round(self._m["total_wait_ms"] / dispatched, 1) if dispatched else 0.0,
+            "max_wait_ms": round(self._m["max_wait_ms"], 1),
+        }
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Shutdown: cancel the dispatcher, give in-flight refreshes
+        `timeout` seconds, drop (and log) whatever is still dirty."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        if self._dirty:
+            logger.warning(
+                "profile refresh queue: dropping %d pending refresh(es) on shutdown: %s",
+                len(self._dirty), [str(a) for a in self._dirty],
+            )
+            self._dirty.clear()
+        if self._active:
+            await asyncio.wait(list(self._active.values()), timeout=timeout)
+
+
+_settings = get_settings()
+refresh_queue = ProfileRefreshQueue(
+    quiet=_settings.PROFILE_REFRESH_QUIET_SECONDS,
+    max_delay=_settings.PROFILE_REFRESH_MAX_DELAY_SECONDS,
+    concurrency=_settings.PROFILE_REFRESH_CONCURRENCY,
+)
+
+
+def request_profile_refresh(attendee_id: uuid.UUID, notify: bool = False, immediate: bool = False) -> None:
+    """Queue a match refresh for a profile change. `immediate` skips the
+    quiet period (e.g. login of an existing attendee, where nobody is
+    mid-edit) but still merges with anything already queued and respects
+    the concurrency cap."""
+    refresh_queue.enqueue(attendee_id, notify=notify, quiet=0.0 if immediate else None)
+
+
+def refresh_queue_metrics() -> dict:
+    return refresh_queue.metrics()
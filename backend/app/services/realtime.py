@@ -0,0 +1,183 @@
+"""Real-time message push — Postgres LISTEN/NOTIFY fan-out to SSE clients.
+
+Writers (`publish`) run `pg_notify` inside the same transaction as the
+message INSERT / read-receipt UPDATE, so an event is delivered if and only
+if the write commits. NOTIFY travels fine through the transaction pooler.
+
+Each worker process owns ONE `MessageBroker` with one dedicated asyncpg
+connection LISTENing on `CHANNEL`, and fans payloads out to the in-process
+SSE subscribers of the addressed attendee. Because Postgres broadcasts a
+NOTIFY to every listening session, this works unchanged across gunicorn
+workers: whichever worker holds the recipient's stream delivers it.
+
+LISTEN needs a long-lived session, which the transaction-mode pooler
+(:6543) can't provide — see `listen_dsn()`.
+
+If the LISTEN connection drops, the broker reconnects with backoff and
+sends every subscriber a `resync` event (anything NOTIFYed while we were
+deaf is lost, so clients refetch once). Clients that can't hold a stream
+at all fall back to polling /messages/unread-count.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "pot_messages"
+
+# Postgres rejects NOTIFY payloads >= 8000 bytes. Message bodies are
+# unbounded Text, so oversized events ship without `message` and the
+# client refetches the conversation instead.
+MAX_PAYLOAD_BYTES = 7500
+
+# Per-stream buffer. A tab that stops reading (backgrounded, slow network)
+# must not grow memory without bound: on overflow the queue is drained and
+# a single `resync` is queued in its place.
+SUBSCRIBER_QUEUE_SIZE = 100
+
+RECONNECT_BACKOFF_SECONDS = (1, 2, 5, 10, 30)
+
+
+def listen_dsn() -> str:
+    """asyncpg DSN for the LISTEN connection.
+
+    REALTIME_DATABASE_URL wins; otherwise DATABASE_URL, with the Supabase
+    transaction pooler port (:6543) swapped for the session pooler (:5432).
+    """
+    settings = get_settings()
+    url = settings.REALTIME_DATABASE_URL or settings.DATABASE_URL.replace(":6543", ":5432")
+    return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+def encode_event(event: dict) -> str:
+    payload = json.dumps(event, default=str)
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES and "message" in event:
+        payload = json.dumps({**{k: v for k, v in event.items() if k != "message"}, "truncated": True}, default=str)
+    return payload
+
+
+async def publish(db: AsyncSession, event: dict) -> None:
+    """Queue `event` for delivery to attendee `event["to"]` on COMMIT.
+
+    Must run inside the caller's write transaction, before `db.commit()`.
+    """
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": CHANNEL, "payload": encode_event(event)},
+    )
+
+
+class MessageBroker:
+    """Per-worker LISTEN connection + attendee_id → SSE queues."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._conn: asyncpg.Connection | None = None
+        self._connect_lock = asyncio.Lock()
+        self._reconnect_task: asyncio.Task | None = None
+        self._closed = False
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    def subscriber_count(self) -> int:
+        return sum(len(qs) for qs in self._subscribers.values())
+
+    async def subscribe(self, attendee_id) -> asyncio.Queue:
+        """Register a stream for `attendee_id`. Raises if LISTEN can't start
+        (the route turns that into a 503 so the client keeps polling)."""
+        await self._ensure_listening()
+        q: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[str(attendee_id)].add(q)
+        return q
+
+    def unsubscribe(self, attendee_id, q: asyncio.Queue) -> None:
+        key = str(attendee_id)
+        qs = self._subscribers.get(key)
+        if qs is None:
+            return
+        qs.discard(q)
+        if not qs:
+            del self._subscribers[key]
+
+    def dispatch(self, payload: str) -> None:
+        """Route one NOTIFY payload to the addressed attendee's streams."""
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("realtime: dropping malformed payload")
+            return
+        for q in self._subscribers.get(str(event.get("to")), ()):
+            _offer(q, event)
+
+    def _broadcast_resync(self) -> None:
+        for qs in self._subscribers.values():
+            for q in qs:
+                _offer(q, {"type": "resync"})
+
+    async def _ensure_listening(self) -> None:
+        if self.connected:
+            return
+        async with self._connect_lock:
+            if self.connected:
+                return
+            # statement_cache_size=0: harmless on a direct connection, required
+            # if REALTIME_DATABASE_URL still points through pgbouncer.
+            conn = await asyncpg.connect(listen_dsn(), statement_cache_size=0)
+            await conn.add_listener(CHANNEL, self._on_notify)
+            conn.add_termination_listener(self._on_terminated)
+            self._conn = conn
+            logger.info("realtime: listening on %s", CHANNEL)
+
+    def _on_notify(self, _conn, _pid, _channel, payload: str) -> None:
+        self.dispatch(payload)
+
+    def _on_terminated(self, _conn) -> None:
+        self._conn = None
+        if self._closed or (self._reconnect_task and not self._reconnect_task.done()):
+            return
+        logger.warning("realtime: LISTEN connection lost, reconnecting")
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        attempt = 0
+        while not self._closed and self._subscribers:
+            try:
+                await self._ensure_listening()
+                self._broadcast_resync()
+                return
+            except Exception as exc:
+                delay = RECONNECT_BACKOFF_SECONDS[min(attempt, len(RECONNECT_BACKOFF_SECONDS) - 1)]
+                logger.warning("realtime: reconnect failed (%s), retrying in %ss", exc, delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+        # No subscribers left: stay disconnected, the next subscribe() reconnects.
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            await conn.close()
+
+
+def _offer(q: asyncio.Queue, event: dict) -> None:
+    try:
+        q.put_nowait(event)
+    except asyncio.QueueFull:
+        while not q.empty():
+            q.get_nowait()
+        q.put_nowait({"type": "resync"})
+
+
+broker = MessageBroker()
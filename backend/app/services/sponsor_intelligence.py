@@ -315,7 +315,7 @@ def _describe_attendee_block(a: dict, position: int) -> str:
     """Build one `Attendee {N+1}:` block for the sponsor intelligence GPT-4o
     prompt. For privacy_mode='b2b_only' attendees, the Name slot is masked
     to the company name, the Title is blanked, and the goals + ai_summary
-    fields are run through MatchingEngine._mask_text_for_candidate before
+    fields are run through MatchingEngine._mask_texts_for_candidate before
     the existing 200-char truncation. Reuses the matching-engine helpers
     so both LLM surfaces apply identical privacy semantics. Returns the
     finished string ready to join into the prompt.
@@ -335,8 +335,9 @@ def _describe_attendee_block(a: dict, position: int) -> str:
     display_title = "" if is_b2b else (a.get("title", "") or "")
     raw_goals = a.get("goals") or ""
     raw_summary = a.get("ai_summary") or ""
-    masked_goals = MatchingEngine._mask_text_for_candidate(raw_goals, mask_target)
-    masked_summary = MatchingEngine._mask_text_for_candidate(raw_summary, mask_target)
+    masked_goals, masked_summary = MatchingEngine._mask_texts_for_candidate(
+        [raw_goals, raw_summary], mask_target,
+    )
     goals_display = masked_goals[:200] if masked_goals else "NOT SPECIFIED"
     summary_display = masked_summary[:200] if masked_summary else "N/A"
     return (
@@ -0,0 +1,26 @@
+"""Opaque keyset cursors over (created_at, id).
+
+Shared by the paginated feeds (conversation history, warm-up thread
+posts): a page's boundary row is encoded as urlsafe base64 of
+`[created_at_iso, id]`, and decoded back for a row-value comparison
+`(created_at, id) < / > (:ts, :id)` that the composite indexes serve.
+"""
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+def encode_time_cursor(created_at: datetime, row_id) -> str:
+    raw = json.dumps([created_at.isoformat(), str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_time_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Raises ValueError on a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except Exception as exc:
+        raise ValueError("invalid cursor") from exc
@@ -112,7 +112,7 @@ async def main(
                     continue
                 try:
                     new_matches = await engine.generate_matches_for_attendee(
-                        attendee.id, top_k=10, clear_existing=True, notify=False,
+                        attendee.id, top_k=10, clear_existing=True, notify=False, stream=False,
                     )
                     print(f"  {attendee.name}: {len(new_matches)} matches regenerated")
                 except Exception as exc:
@@ -0,0 +1,113 @@
+"""Benchmark: per-email render cost for every send_* template.
+
+Each send_* function is called with realistic arguments and _send_email
+swapped for a no-op, so only subject/HTML/text building is timed — no
+gating, no outbox, no network. This is the loop the morning-schedule and
+T-1 crons run ~800 times back to back.
+
+--dump DIR writes each template's HTML/text to DIR, so two revisions can
+be diffed byte for byte (a layout refactor must render identically).
+
+Usage:
+    cd backend && source .venv/bin/activate
+    python scripts/bench_email_render.py              # 2000 renders each
+    python scripts/bench_email_render.py -n 5000
+    python scripts/bench_email_render.py --dump /tmp/emails-after
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app.services.email as email  # noqa: E402
+
+_CARDS = [
+    {"name": "Ana Souza", "title": "General Partner", "company": "Atlas Ventures"},
+    {"name": "Tom Becker", "title": "Head of Digital Assets", "company": "Nordbank"},
+    {"name": "Li Wei", "title": "", "company": "Orbit Labs"},
+]
+_MEETINGS = [
+    {"name": "Ana Souza", "company": "Atlas Ventures", "time": "10:20", "location": "Salle Richelieu, table 4"},
+    {"name": "Tom Becker", "company": "Nordbank", "time": "11:00", "location": "Cour Marly"},
+    {"name": "Li Wei", "company": "Orbit Labs", "time": "14:40", "location": "Salle Denon, table 12"},
+]
+_EXPLANATION = ("Both of you are working on tokenised private credit from opposite sides of the table: "
+                "Atlas allocates into it, you are building the rails. " * 3)
+
+
+def _cases(i: int) -> dict:
+    """template name → zero-arg call rendering email #i (per-recipient values vary with i)."""
+    who, token = f"Recipient{i} Example", f"tok{i:06d}"
+    to = f"r{i}@example.invalid"
+    return {
+        "password_reset": lambda: email.send_password_reset_email(to, who, f"jwt.{i}"),
+        "match_intro": lambda: email.send_match_intro_email(
+            to, who, "Ana Souza", "General Partner", "Atlas Ventures", _EXPLANATION, 12 + i % 5, magic_token=token),
+        "match_digest": lambda: email.send_match_digest_email(
+            to, who, 3 + i % 4, "Ana Souza", "General Partner", "Atlas Ventures", _EXPLANATION, magic_token=token),
+        "mutual_match": lambda: email.send_mutual_match_email(
+            to, who, "Ana Souza", "General Partner", "Atlas Ventures", magic_token=token),
+        "meeting_confirmation": lambda: email.send_meeting_confirmation_email(
+            to, who, "Ana Souza", "Atlas Ventures", "Tue 2 June, 10:20", "Salle Richelieu, table 4"),
+        "welcome": lambda: email.send_welcome_email(to, who, magic_token=token),
+        "interest": lambda: email.send_interest_notification(to, who, 1 + i % 7, magic_token=token),
+        "t_minus_one": lambda: email.send_t_minus_one_reminder_email(
+            to, who, _CARDS, i % 3, 14, magic_token=token),
+        "mid_event": lambda: email.send_mid_event_reengagement_email(
+            to, who, 1 + i % 4, _CARDS, magic_token=token),
+        "morning_schedule": lambda: email.send_morning_schedule_email(
+            to, who, _MEETINGS[: 1 + i % 3], "Day 1 - June 2", magic_token=token),
+    }
+
+
+def render_all(i: int = 0) -> dict[str, tuple]:
+    """template name → (subject, html, text) for email #i, without sending."""
+    captured: list[tuple] = []
+    real = email._send_email
+    email._send_email = lambda to, subject, html, text=None, **kw: captured.append((subject, html, text)) or True
+    try:
+        out = {}
+        for name, call in _cases(i).items():
+            captured.clear()
+            call()
+            out[name] = captured[0]
+        return out
+    finally:
+        email._send_email = real
+
+
+def main(args: argparse.Namespace) -> None:
+    captured: list[tuple] = []
+    email._send_email = lambda to, subject, html, text=None, **kw: captured.append((subject, html, text)) or True
+
+    if args.dump:
+        out = Path(args.dump)
+        out.mkdir(parents=True, exist_ok=True)
+        for i in (0, 1, 5):
+            for name, (subject, html, text) in render_all(i).items():
+                (out / f"{name}-{i}.html").write_text(f"{subject}\n{html}\n---\n{text}")
+        print(f"wrote {len(list(out.iterdir()))} files to {out}")
+        return
+
+    print(f"median of 5 runs x {args.iterations} renders, µs per email\n")
+    print(f"{'template':<22} {'µs/email':>9} {'html bytes':>11}")
+    for name in _cases(0):
+        calls = [_cases(i)[name] for i in range(args.iterations)]
+        runs = []
+        for _ in range(5):
+            captured.clear()
+            t0 = time.perf_counter()
+            for call in calls:
+                call()
+            runs.append((time.perf_counter() - t0) / len(calls) * 1e6)
+        print(f"{name:<22} {statistics.median(runs):>9.1f} {len(captured[0][1]):>11,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--iterations", type=int, default=2000)
+    parser.add_argument("--dump", metavar="DIR", help="write rendered emails to DIR instead of timing")
+    main(parser.parse_args())
@@ -0,0 +1,173 @@
+"""Benchmark: BaseHTTPMiddleware stack vs pure-ASGI ResponseHeadersMiddleware.
+
+Builds two in-process apps that differ ONLY in the header middleware:
+  before — the two @app.middleware("http") functions main.py used to
+           register (security_headers + sliding_token_refresh, verbatim)
+  after  — app/core/middleware.ResponseHeadersMiddleware
+and drives both through httpx's ASGI transport (no sockets, so the number
+is middleware + framework CPU, not network) on:
+  - GET /bench/ping                 trivial JSON route
+  - GET /api/v1/matches/m/{token}   real magic-link route, DB faked with
+                                    the FakeDB shape the magic-link tests use
+                                    (viewer found, no matches, no user row)
+
+Each request carries a Bearer token near expiry, so the sliding-refresh
+path (decode + re-sign) runs in both stacks.
+
+Usage:
+    cd backend && source .venv/bin/activate
+    python scripts/bench_middleware.py                 # 2000 requests, concurrency 20
+    python scripts/bench_middleware.py -n 5000 -c 50
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+
+from app.api.routes import matches  # noqa: E402
+from app.core.database import get_db  # noqa: E402
+from app.core.middleware import ResponseHeadersMiddleware  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+
+MAGIC_TOKEN = "tok-bench-1234567890"
+
+
+def _legacy_middleware(app: FastAPI) -> None:
+    """The pre-change main.py stack, kept verbatim as the baseline."""
+
+    @app.middleware("http")
+    async def security_headers(request: Request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
+        return response
+
+    @app.middleware("http")
+    async def sliding_token_refresh(request: Request, call_next):
+        response = await call_next(request)
+        auth = request.headers.get("authorization", "")
+        if not auth.lower().startswith("bearer "):
+            return response
+        token = auth.split(None, 1)[1]
+        try:
+            import time as _time
+            from app.core.security import decode_token, create_access_token
+            payload = decode_token(token)
+            exp = float(payload.get("exp") or 0)
+            sub = payload.get("sub")
+            remaining = exp - _time.time()
+            if sub and 0 < remaining < 7200:
+                response.headers["X-Refresh-Token"] = create_access_token({"sub": sub})
+                response.headers.setdefault("Access-Control-Expose-Headers", "X-Refresh-Token")
+        except Exception:
+            pass
+        return response
+
+
+def _viewer():
+    return SimpleNamespace(
+        id=uuid4(), name="Bench Viewer", email="bench@example.invalid", company="Acme",
+        title="Founder", ticket_type="DELEGATE", interests=["defi"], goals="raise a seed",
+        target_companies="", seeking=[], not_looking_for=[], preferred_geographies=[],
+        deal_stage=None, photo_url=None, linkedin_url=None, twitter_handle=None,
+        company_website=None, ai_summary=None, intent_tags=[], vertical_tags=[],
+        deal_readiness_score=None, enriched_profile={}, privacy_mode="full",
+        magic_access_token=MAGIC_TOKEN, created_at=datetime(2026, 1, 1), last_seen_at=None,
+    )
+
+
+class _FakeDB:
+    """Viewer lookup → viewer, match lookup → none, user lookup → none."""
+
+    def __init__(self, viewer):
+        self._viewer = viewer
+        self._n = 0
+
+    async def execute(self, *a, **k):
+        self._n += 1
+        row = self._viewer if self._n == 1 else None
+        rows = [row] if row else []
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(first=lambda: row, all=lambda: rows))
+
+    async def commit(self):
+        return None
+
+
+def _build(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/bench/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.include_router(matches.router, prefix="/api/v1")
+    viewer = _viewer()
+
+    async def _db():
+        yield _FakeDB(viewer)
+
+    app.dependency_overrides[get_db] = _db
+    if stack == "before":
+        _legacy_middleware(app)
+    else:
+        app.add_middleware(ResponseHeadersMiddleware)
+    return app
+
+
+async def _drive(app: FastAPI, path: str, n: int, concurrency: int, headers: dict) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        r = await client.get(path, headers=headers)  # warm-up + sanity
+        assert r.status_code == 200, (path, r.status_code, r.text[:200])
+        assert r.headers.get("x-frame-options") == "DENY"
+        assert r.headers.get("x-refresh-token")
+
+        queue = iter(range(n))
+
+        async def worker():
+            for _ in queue:
+                await client.get(path, headers=headers)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return n / (time.perf_counter() - t0)
+
+
+async def main(args: argparse.Namespace) -> None:
+    token = create_access_token({"sub": str(uuid4())}, expires_delta=timedelta(minutes=30))
+    headers = {"Authorization": f"Bearer {token}"}
+    paths = ["/bench/ping", f"/api/v1/matches/m/{MAGIC_TOKEN}"]
+
+    print(f"{args.requests} requests/route, concurrency {args.concurrency}, best of {args.rounds}\n")
+    print(f"{'route':<40} {'before rps':>11} {'after rps':>11} {'gain':>7}")
+    for path in paths:
+        best = {}
+        for stack in ("before", "after"):
+            app = _build(stack)
+            best[stack] = max([
+                await _drive(app, path, args.requests, args.concurrency, headers)
+                for _ in range(args.rounds)
+            ])
+        gain = (best["after"] / best["before"] - 1) * 100
+        label = path if len(path) < 40 else path[:37] + "..."
+        print(f"{label:<40} {best['before']:>11.0f} {best['after']:>11.0f} {gain:>6.0f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    parser.add_argument("-c", "--concurrency", type=int, default=20)
+    parser.add_argument("-r", "--rounds", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,120 @@
+"""Benchmark: deterministic rerank over a 50-candidate sponsor pool.
+
+before: the pre-feature-record scoring — per candidate, rebuild both vertical
+        sets, a nested loop over vertical pairs against COMPLEMENTARY_VERTICALS,
+        rebuild both signal-text blobs and both ICP keyword sets
+after:  MatchingEngine._deterministic_rerank on AttendeeFeatures —
+        cold (fresh engine, features built on first sight) and warm (feature
+        cache already filled, as for every rank after the first in a run)
+
+Also checks that no score moved: feature records are a pure speed-up.
+Only CPU is measured.
+
+Usage:
+    cd backend && source .venv/bin/activate
+    python scripts/bench_rerank.py           # 500 iterations each
+    python scripts/bench_rerank.py -n 2000
+"""
+import argparse
+import copy
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.matching import (  # noqa: E402
+    COMPLEMENTARY_VERTICALS, GRID_SECTOR_TO_VERTICALS, MatchingEngine,
+    _candidate_signal_text, _grid_verticals, _icp_signal_keywords, settings,
+)
+
+_VERTICALS = sorted(COMPLEMENTARY_VERTICALS) + ["custody", "rwa"]
+_SECTORS = sorted(GRID_SECTOR_TO_VERTICALS)
+_KEYWORDS = ["custody", "stablecoin", "market maker", "tokenized treasuries", "kyc", "allocator",
+             "l2", "zk", "payments", "bank", "family office", "rwa", "restaking", "oracle"]
+
+
+def _attendee(rng: random.Random, i: int):
+    personas = [{"who": "x", "signal_keywords": rng.sample(_KEYWORDS, 4)} for _ in range(3)]
+    return SimpleNamespace(
+        id=uuid.uuid4(), title="Head of Digital Assets", company=f"Company {i}",
+        goals="Meet allocators deploying into tokenised RWAs and custody partners in H2. " * 2,
+        vertical_tags=rng.sample(_VERTICALS, 2), intent_tags=["deploying_capital"],
+        ai_summary="Builds institutional custody and stablecoin payments rails for banks. " * 4,
+        enriched_profile={"grid": {
+            "grid_sector": rng.choice(_SECTORS), "grid_description": "Regulated custody provider. " * 3,
+            "grid_products": [{"name": f"Product {j}"} for j in range(rng.randint(0, 4))],
+        }},
+        inferred_customer_profile={"ideal_customers": personas[:2], "ideal_partners": personas[2:]},
+    )
+
+
+def _legacy_boosts(attendee, candidates, ranked):
+    """The pre-change vertical / Grid / ICP boost loop, verbatim."""
+    out = []
+    target_icp_kws = _icp_signal_keywords(attendee)
+    for entry in ranked:
+        score = float(entry["overall_score"])
+        candidate = candidates[entry["candidate_index"] - 1][0]
+        a_verts = set(attendee.vertical_tags or []) | _grid_verticals(attendee)
+        c_verts = set(candidate.vertical_tags or []) | _grid_verticals(candidate)
+        if any(v in COMPLEMENTARY_VERTICALS.get(av, []) for av in a_verts for v in c_verts):
+            score += 0.04
+        elif a_verts & c_verts:
+            score += 0.02
+        a_grid = (attendee.enriched_profile or {}).get("grid") or {}
+        c_grid = (candidate.enriched_profile or {}).get("grid") or {}
+        if a_grid.get("grid_products") and c_grid.get("grid_products"):
+            score += 0.02
+        candidate_text = _candidate_signal_text(candidate)
+        icp_hits = sum(1 for kw in target_icp_kws if kw and kw in candidate_text)
+        score += 0.05 if icp_hits >= 2 else 0.03 if icp_hits == 1 else 0.0
+        candidate_icp_kws = _icp_signal_keywords(candidate)
+        if candidate_icp_kws and any(kw in _candidate_signal_text(attendee) for kw in candidate_icp_kws):
+            score += 0.03
+        out.append(max(0.0, min(1.0, score)))
+    return out
+
+
+def _time(fn, iterations: int) -> float:
+    runs = []
+    for _ in range(5):
+        t0 = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        runs.append((time.perf_counter() - t0) / iterations * 1e6)
+    return statistics.median(runs)
+
+
+def main(args: argparse.Namespace) -> None:
+    settings.AI_RERANK_ENABLED = True
+    rng = random.Random(7)
+    target = _attendee(rng, 0)
+    candidates = [(_attendee(rng, i), rng.uniform(0.4, 0.8)) for i in range(1, 51)]
+    ranked = [{"candidate_index": i + 1, "overall_score": sim, "match_type": "complementary",
+               "shared_context": {"tier": "deep"}} for i, (_, sim) in enumerate(candidates)]
+
+    warm = MatchingEngine(db=None)
+    new = {e["candidate_index"]: e["overall_score"]
+           for e in warm._deterministic_rerank(copy.deepcopy(ranked), target, candidates, False)}
+    old = _legacy_boosts(target, candidates, ranked)
+    moved = sum(1 for i in range(50) if abs(new[i + 1] - old[i]) > 1e-9)
+
+    assert moved == 0, f"{moved}/50 scores differ from the legacy loop"
+
+    print(f"50-candidate pool, median of 5 runs x {args.iterations}, µs per pool\n")
+    print(f"{'before':<8} {_time(lambda: _legacy_boosts(target, candidates, ranked), args.iterations):>9.1f}")
+    print(f"{'cold':<8} {_time(lambda: MatchingEngine(db=None)._deterministic_rerank(
+        [dict(e) for e in ranked], target, candidates, False), args.iterations):>9.1f}")
+    print(f"{'warm':<8} {_time(lambda: warm._deterministic_rerank(
+        [dict(e) for e in ranked], target, candidates, False), args.iterations):>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--iterations", type=int, default=500)
+    main(parser.parse_args())
@@ -0,0 +1,155 @@
+"""Benchmark: response serialization CPU, old FastAPI path vs orjson fast path.
+
+Payloads (synthetic, realistic field fill):
+  - MatchListResponse with 50 matches, each carrying a nested attendee
+    (a third of them b2b_only, so redaction runs)
+  - AttendeeListResponse with 1000 attendees (GET /attendees?limit=1000)
+
+before: _build_match_response's old validate → dump → redact → re-validate,
+        then FastAPI's own serialize_response() against the route's
+        response_model (dump + validate + jsonable_encoder) and
+        JSONResponse.render (json.dumps)
+after:  one validate per object, redaction on the model's field dict,
+        model_response() (model_dump + orjson)
+
+Only CPU per response is measured — no DB, no HTTP.
+
+Usage:
+    cd backend && source .venv/bin/activate
+    python scripts/bench_serialization.py          # 30 iterations each
+    python scripts/bench_serialization.py -n 100
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+
+from app.core.responses import model_response  # noqa: E402
+from app.main import app  # noqa: E402
+from app.schemas.attendee import (  # noqa: E402
+    AttendeeListResponse, AttendeeResponse, MatchListResponse, MatchResponse, redact_for_privacy,
+)
+
+T0 = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _attendee(i: int):
+    return SimpleNamespace(
+        id=uuid.uuid4(), name=f"Attendee {i}", email=f"a{i}@example.invalid", company=f"Company {i % 97}",
+        title="Managing Partner", ticket_type="VIP", interests=["defi", "tokenization", "ai"],
+        goals="Meet allocators deploying into tokenised RWAs in H2.", target_companies="BlackRock, Fidelity",
+        seeking=["capital", "partners"], not_looking_for=["service providers"],
+        preferred_geographies=["EU", "MENA"], deal_stage="series_a", photo_url=f"https://cdn/p/{i}.jpg",
+        linkedin_url=f"https://linkedin.com/in/a{i}", twitter_handle=f"@a{i}",
+        company_website=f"https://c{i}.example", ai_summary="Allocator focused on tokenised credit. " * 6,
+        intent_tags=["deploying_capital", "seeking_partnerships"], vertical_tags=["tokenization_of_finance", "defi"],
+        deal_readiness_score=0.72,
+        enriched_profile={"grid": {"sector": "RWA", "employees": 40, "products": ["vault", "bridge"]},
+                          "linkedin": {"headline": "Partner", "skills": ["DeFi"] * 5}},
+        privacy_mode="b2b_only" if i % 3 == 0 else "full", created_at=T0 + timedelta(minutes=i),
+    )
+
+
+def _match(viewer, other):
+    return SimpleNamespace(
+        id=uuid.uuid4(), attendee_a_id=viewer, attendee_b_id=other.id, similarity_score=0.71,
+        complementary_score=0.64, overall_score=0.68, match_type="complementary",
+        explanation="Both are working on tokenised credit from opposite sides of the table. " * 4,
+        shared_context={"sectors": ["defi"], "synergies": ["distribution", "custody"], "action_items": ["intro"]},
+        status="pending", status_a="pending", status_b="accepted", meeting_time=None, meeting_location=None,
+        met_at=None, meeting_outcome=None, satisfaction_score=None, decline_reason=None, hidden_by_user=False,
+        explanation_confidence=0.8, tier="curated", accepted_a_at=None, accepted_b_at=T0,
+        priority_intro_meta=None, created_at=T0,
+    )
+
+
+def _build_before(match, other, viewer):
+    resp = MatchResponse.model_validate(match)
+    is_mutual = match.status_a == "accepted" and match.status_b == "accepted"
+    att_dict = AttendeeResponse.model_validate(other).model_dump()
+    resp.matched_attendee = AttendeeResponse(**redact_for_privacy(att_dict, is_mutual_match=is_mutual))
+    return resp
+
+
+def _build_after(match, other, viewer):
+    resp = MatchResponse.model_validate(match)
+    is_mutual = match.status_a == "accepted" and match.status_b == "accepted"
+    attendee_resp = AttendeeResponse.model_validate(other)
+    redact_for_privacy(attendee_resp.__dict__, is_mutual_match=is_mutual)
+    resp.matched_attendee = attendee_resp
+    return resp
+
+
+def _field(path: str):
+    route = next(r for r in app.routes if getattr(r, "path", "") == path and "GET" in r.methods)
+    return route.secure_cloned_response_field
+
+
+async def _old_path(field, model) -> bytes:
+    content = await serialize_response(field=field, response_content=model, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+def _time(fn, n: int) -> float:
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main(args: argparse.Namespace) -> None:
+    viewer_row = _attendee(-1)
+    others = [_attendee(i) for i in range(50)]
+    pairs = [(_match(viewer_row.id, o), o) for o in others]
+    people = [_attendee(i) for i in range(1000)]
+    match_field = _field("/api/v1/matches/{attendee_id}")
+    list_field = _field("/api/v1/attendees")
+    loop = asyncio.new_event_loop()
+
+    def matches(build, render):
+        responses = [build(m, o, viewer_row.id) for m, o in pairs]
+        return render(match_field, MatchListResponse(
+            matches=responses, attendee_id=viewer_row.id, tier="GOOD",
+            viewer=AttendeeResponse.model_validate(viewer_row), visible_count=50,
+        ))
+
+    def attendees(render):
+        return render(list_field, AttendeeListResponse(
+            attendees=[AttendeeResponse.model_validate(a) for a in people], total=len(people),
+        ))
+
+    def old(field, model):
+        return loop.run_until_complete(_old_path(field, model))
+
+    def new(_field, model):
+        return model_response(model).body
+
+    cases = [
+        ("50 matches  (MatchListResponse)", lambda: matches(_build_before, old), lambda: matches(_build_after, new)),
+        ("1000 attendees (AttendeeListResponse)", lambda: attendees(old), lambda: attendees(new)),
+    ]
+    print(f"median of {args.iterations} iterations, ms CPU per response\n")
+    print(f"{'payload':<40} {'before':>8} {'after':>8} {'saved':>8} {'bytes':>9}")
+    for label, before, after in cases:
+        size = len(after())
+        b, a = _time(before, args.iterations), _time(after, args.iterations)
+        print(f"{label:<40} {b:>8.2f} {a:>8.2f} {(1 - a / b) * 100:>7.0f}% {size:>9,}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--iterations", type=int, default=30)
+    main(parser.parse_args())
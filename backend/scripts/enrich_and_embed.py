@@ -41,6 +41,9 @@ import httpx
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from supabase_bulk_writer import AttendeeBulkWriter  # noqa: E402
+
 # ── Load env ──────────────────────────────────────────────────────────────────
 load_dotenv(Path(__file__).resolve().parents[1] / ".env")
 
@@ -490,8 +493,14 @@ async def process_attendee(
     force: bool,
     scrape_only: bool,
     skip_linkedin: bool = False,
+    writer: AttendeeBulkWriter | None = None,
 ) -> str:
-    """Run enrichment + AI pipeline for a single attendee. Returns status string."""
+    """Run enrichment + AI pipeline for a single attendee. Returns status string.
+
+    With a `writer`, the patch is queued on the bulk writer (status shows
+    `patch=queued`; failures surface in writer.failures at flush time).
+    Without one it falls back to a direct per-row patch_attendee.
+    """
     name = attendee.get("name", "Unknown")
     aid = attendee["id"]
     enriched = dict(attendee.get("enriched_profile") or {})
@@ -574,8 +583,7 @@ async def process_attendee(
     if scrape_only:
         # Only persist website data, skip AI/embedding
         if patch and not dry_run:
-            ok = patch_attendee(aid, patch, dry_run=False)
-            return f"{'DRY ' if dry_run else ''}{name}: {', '.join(status_parts)} | patch={'ok' if ok else 'ERR'}"
+            return f"{name}: {', '.join(status_parts)} | patch={await _persist(aid, patch, writer)}"
         return f"{'DRY ' if dry_run else ''}{name}: {', '.join(status_parts)}"
 
     # ── Layer 2: AI Summary ────────────────────────────────────────────────────
@@ -625,8 +633,14 @@ async def process_attendee(
     if dry_run:
         return f"DRY {name}: {', '.join(status_parts)}"
 
-    ok = patch_attendee(aid, patch, dry_run=False)
-    return f"{name}: {', '.join(status_parts)} | patch={'ok' if ok else 'ERR'}"
+    return f"{name}: {', '.join(status_parts)} | patch={await _persist(aid, patch, writer)}"
+
+
+async def _persist(aid: str, patch: dict, writer: AttendeeBulkWriter | None) -> str:
+    if writer is not None:
+        await writer.add(aid, patch)
+        return "queued"
+    return "ok" if patch_attendee(aid, patch, dry_run=False) else "ERR"
 
 
 async def run(dry_run: bool, force: bool, scrape_only: bool, skip_linkedin: bool = False) -> dict:
@@ -685,16 +699,26 @@ async def run(dry_run: bool, force: bool, scrape_only: bool, skip_linkedin: bool
     ok_count = 0
     err_count = 0
 
-    for attendee in attendees:
-        result = await process_attendee(attendee, dry_run=dry_run, force=force, scrape_only=scrape_only, skip_linkedin=skip_linkedin)
-        has_error = "ERR" in result
-        status_char = "✗" if has_error else "✓"
-        print(f"  {status_char} {result}")
-        if has_error:
-            err_count += 1
-        else:
-            ok_count += 1
-
+    # Writes are buffered and flushed in batches (see supabase_bulk_writer)
+    # instead of one PATCH per attendee.
+    async with AttendeeBulkWriter(dry_run=dry_run) as writer:
+        for attendee in attendees:
+            result = await process_attendee(attendee, dry_run=dry_run, force=force, scrape_only=scrape_only, skip_linkedin=skip_linkedin, writer=writer)
+            has_error = "ERR" in result
+            status_char = "✗" if has_error else "✓"
+            print(f"  {status_char} {result}")
+            if has_error:
+                err_count += 1
+            else:
+                ok_count += 1
+
+    # Rows the writer could not persist were printed as ok/queued above —
+    # move them to the error column now that the final flush has settled.
+    write_errors = len({aid for aid, _ in writer.failures})
+    ok_count -= write_errors
+    err_count += write_errors
+    if not dry_run:
+        print(f"\n  Writes ({writer.backend}): {writer.stats['written']} rows in {writer.stats['requests']} requests, {writer.stats['failed']} failed")
     print(f"\n{'DRY RUN ' if dry_run else ''}Done: {ok_count} ok, {err_count} errors / {len(attendees)} total")
     return {"ok": ok_count, "errors": err_count, "total": len(attendees)}
 
@@ -56,8 +56,13 @@ EXPORT_PATH = _EXPORT_DIR / f"companies_with_people_{_STAMP}.csv"
 EXPORT_PATH_PEOPLE = _EXPORT_DIR / f"companies_with_people_{_STAMP}_people.csv"
 EXPORT_PATH_XLSX = _EXPORT_DIR / f"companies_with_people_{_STAMP}.xlsx"
 
+# JSON-path select: only the three enriched_profile leaves the export reads,
+# not the whole LinkedIn/Grid blob per attendee.
 SELECT_FIELDS = (
-    "name,title,email,company,ticket_type,country_iso3,linkedin_url,enriched_profile"
+    "name,title,email,company,ticket_type,country_iso3,linkedin_url,"
+    "extasy_ticket_name:enriched_profile->extasy->>ticket_name,"
+    "linkedin_headline:enriched_profile->linkedin->>headline,"
+    "linkedin_first_title:enriched_profile->linkedin->experiences->0->>title"
 )
 
 
@@ -72,8 +77,7 @@ def granular_pass(row: dict) -> str:
     on every row that came in via the Extasy sync — read it first so the
     export shows the full taxonomy, not the lossy enum.
     """
-    extasy = ((row.get("enriched_profile") or {}).get("extasy") or {})
-    name = (extasy.get("ticket_name") or "").strip()
+    name = (row.get("extasy_ticket_name") or "").strip()
     if name:
         # Trim trailing " Pass" so columns stay narrow ("VIP Black",
         # "Investor", "General"). Rhuna's own report uses the suffixed
@@ -111,13 +115,9 @@ def best_position(row: dict, max_len: int = 60) -> str:
     if title:
         raw = title
     else:
-        enriched = row.get("enriched_profile") or {}
-        linkedin = enriched.get("linkedin") or {}
-        experiences = linkedin.get("experiences") or []
-        if experiences:
-            raw = (experiences[0].get("title") or "").strip()
+        raw = (row.get("linkedin_first_title") or "").strip()
         if not raw:
-            raw = (linkedin.get("headline") or "").strip()
+            raw = (row.get("linkedin_headline") or "").strip()
     if not raw:
         return ""
     flat = " ".join(raw.split())
@@ -0,0 +1,89 @@
+"""Stream match rows to a CSV / JSONL file with bounded memory.
+
+Offline twin of GET /dashboard/export/matches: same column registry and
+filters (app/services/exports.py), same server-side cursor, so a full
+training export (100k+ rows) writes chunk by chunk instead of building the
+whole result set in Python first.
+
+Usage:
+    cd backend && source .venv/bin/activate
+    python scripts/export_matches.py                                # all matches, CSV
+    python scripts/export_matches.py --format jsonl --feedback-only # training set
+    python scripts/export_matches.py --columns match_id,overall_score,status \\
+        --match-type deal_ready --min-score 0.6
+
+Output:
+    backend/exports/matches_YYYYMMDD_HHMM.{csv,jsonl}   (or --out PATH)
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.exports import (  # noqa: E402
+    DEFAULT_CHUNK_SIZE,
+    FEEDBACK_COLUMNS,
+    MATCH_COLUMNS,
+    build_match_export_query,
+    encode_export,
+    export_filename,
+    parse_columns,
+    stream_partitions,
+)
+
+_EXPORT_DIR = Path(__file__).resolve().parents[1] / "exports"
+
+
+async def main(args: argparse.Namespace) -> int:
+    default = FEEDBACK_COLUMNS if args.feedback_only else tuple(MATCH_COLUMNS)
+    try:
+        columns = parse_columns(args.columns, default)
+    except ValueError as exc:
+        print(f"ERROR: {exc}")
+        return 1
+
+    stmt = build_match_export_query(
+        columns,
+        match_type=args.match_type,
+        status=args.status,
+        tier=args.tier,
+        min_score=args.min_score,
+        feedback_only=args.feedback_only,
+        created_after=args.since,
+        limit=args.limit,
+    )
+    out = Path(args.out) if args.out else _EXPORT_DIR / export_filename("matches", args.format)
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    written = 0
+    with out.open("wb") as f:
+        async for chunk in encode_export(stream_partitions(stmt, args.chunk_size), columns, args.format):
+            f.write(chunk)
+            written += len(chunk)
+            print(f"  {written / 1_000_000:.1f} MB written", end="\r", flush=True)
+    print(f"\n{args.format.upper()} written: {out}")
+    return 0
+
+
+def _cli() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    p.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    p.add_argument("--columns", help=f"Comma-separated; available: {', '.join(MATCH_COLUMNS)}")
+    p.add_argument("--match-type")
+    p.add_argument("--status")
+    p.add_argument("--tier")
+    p.add_argument("--min-score", type=float)
+    p.add_argument("--feedback-only", action="store_true",
+                   help="Only rows with a decline reason, meeting outcome or satisfaction score.")
+    p.add_argument("--since", type=datetime.fromisoformat, help="created_at >= this (ISO date/time)")
+    p.add_argument("--limit", type=int)
+    p.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    p.add_argument("--out", help="Output path (default: backend/exports/matches_<stamp>.<format>)")
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(_cli())))
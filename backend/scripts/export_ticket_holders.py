@@ -20,6 +20,7 @@ import csv
 import os
 import sys
 from pathlib import Path
+from typing import Iterator
 
 import httpx
 from dotenv import load_dotenv
@@ -37,10 +38,14 @@ EXPORT_PATH = (
     Path(__file__).resolve().parents[1] / "exports" / "ticket_holders_company_position.csv"
 )
 
+# Only the two LinkedIn fields best_position() reads are pulled out of
+# enriched_profile (PostgREST JSON-path select) — the full blob carries the
+# scraped LinkedIn/Grid payloads and was most of the response size.
 SELECT_FIELDS = (
     "name,email,company,title,ticket_type,country_iso3,"
     "linkedin_url,twitter_handle,company_website,extasy_order_id,"
-    "enriched_profile"
+    "linkedin_headline:enriched_profile->linkedin->>headline,"
+    "linkedin_first_title:enriched_profile->linkedin->experiences->0->>title"
 )
 
 
@@ -50,20 +55,18 @@ def best_position(row: dict) -> tuple[str, str]:
     title = (row.get("title") or "").strip()
     if title:
         return title, "registration"
-    enriched = row.get("enriched_profile") or {}
-    linkedin = enriched.get("linkedin") or {}
-    headline = (linkedin.get("headline") or "").strip()
+    headline = (row.get("linkedin_headline") or "").strip()
     if headline:
         return headline, "linkedin_headline"
-    experiences = linkedin.get("experiences") or []
-    if experiences:
-        exp_title = (experiences[0].get("title") or "").strip()
-        if exp_title:
-            return exp_title, "linkedin_experience"
+    exp_title = (row.get("linkedin_first_title") or "").strip()
+    if exp_title:
+        return exp_title, "linkedin_experience"
     return "", ""
 
 
-def fetch_ticket_holders() -> list[dict]:
+def iter_ticket_holders() -> Iterator[dict]:
+    """Yield ticket holders page by page — the CSV is written as pages
+    arrive, so memory holds one 1000-row page, not the whole table."""
     url = f"{SUPABASE_URL}/rest/v1/attendees"
     headers_base = {
         "apikey": SUPABASE_SERVICE_ROLE_KEY,
@@ -71,7 +74,6 @@ def fetch_ticket_holders() -> list[dict]:
     }
     page_size = 1000
     offset = 0
-    rows: list[dict] = []
     with httpx.Client(timeout=30) as client:
         while True:
             headers = headers_base | {
@@ -89,18 +91,15 @@ def fetch_ticket_holders() -> list[dict]:
             )
             resp.raise_for_status()
             batch = resp.json()
-            rows.extend(batch)
+            yield from batch
             if len(batch) < page_size:
                 break
             offset += page_size
-    return rows
 
 
 def main() -> None:
     print("=== Ticket holder export (company + position) ===\n")
-    print("Fetching ticket holders from Supabase ...")
-    holders = fetch_ticket_holders()
-    print(f"  {len(holders)} ticket holders\n")
+    print("Streaming ticket holders from Supabase ...")
 
     header = [
         "name",
@@ -115,12 +114,13 @@ def main() -> None:
         "company_website",
     ]
 
-    with_company = with_position = with_both = with_linkedin = 0
+    n_holders = with_company = with_position = with_both = with_linkedin = 0
     EXPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
     with EXPORT_PATH.open("w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=header)
         writer.writeheader()
-        for r in holders:
+        for r in iter_ticket_holders():
+            n_holders += 1
             company = (r.get("company") or "").strip()
             position, source = best_position(r)
             if company:
@@ -146,13 +146,14 @@ def main() -> None:
                 }
             )
 
+    print(f"  {n_holders} ticket holders")
     print(f"CSV written: {EXPORT_PATH}\n")
-    total = len(holders) or 1
+    total = n_holders or 1
     print("── Coverage ────────────────────────────────────")
-    print(f"  Has company:           {with_company:>4} / {len(holders)}  ({with_company/total:.0%})")
-    print(f"  Has position:          {with_position:>4} / {len(holders)}  ({with_position/total:.0%})")
-    print(f"  Has both:              {with_both:>4} / {len(holders)}  ({with_both/total:.0%})")
-    print(f"  Has LinkedIn URL:      {with_linkedin:>4} / {len(holders)}  ({with_linkedin/total:.0%})")
+    print(f"  Has company:           {with_company:>4} / {n_holders}  ({with_company/total:.0%})")
+    print(f"  Has position:          {with_position:>4} / {n_holders}  ({with_position/total:.0%})")
+    print(f"  Has both:              {with_both:>4} / {n_holders}  ({with_both/total:.0%})")
+    print(f"  Has LinkedIn URL:      {with_linkedin:>4} / {n_holders}  ({with_linkedin/total:.0%})")
 
 
 if __name__ == "__main__":
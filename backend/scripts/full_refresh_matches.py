@@ -15,7 +15,12 @@ Each attendee is processed in its own session (resilience pattern from
 refresh_matches_for_new_attendees — pooler disconnects don't poison the
 loop).
 
-Run from backend/ as: python scripts/full_refresh_matches.py
+Run from backend/ as: python scripts/full_refresh_matches.py [START_IDX] [--batch]
+
+--batch answers every curated rerank up front through one OpenAI Batch API
+job (half price, no per-minute rate limit, waits up to 24h for the batch),
+then runs the loop below against those answers. Attendees the batch didn't
+answer get the usual live call.
 """
 
 from __future__ import annotations
@@ -31,7 +36,7 @@ from sqlalchemy import select  # noqa: E402
 from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError  # noqa: E402
 
 from app.core.database import async_session  # noqa: E402
-from app.models.attendee import Attendee  # noqa: E402
+from app.models.attendee import MATCHING_COLUMNS, Attendee, load_heavy  # noqa: E402
 from app.models.user import User  # noqa: E402
 from app.services.matching import MatchingEngine  # noqa: E402
 
@@ -40,9 +45,25 @@ PROGRESS_EVERY = 10
 PER_ATTENDEE_TIMEOUT = 180  # seconds — added after a single OpenAI/DB call hung indefinitely at #1261 in the first run, freezing the loop for 9h with no failure raised.
 
 
+async def _prefetch_via_batch(attendee_ids: list) -> dict:
+    """Run the rerank batch for `attendee_ids`; returns the shared answer map."""
+    prefetched: dict = {}
+    async with async_session() as db:
+        result = await db.execute(
+            select(Attendee).where(Attendee.id.in_(attendee_ids)).options(load_heavy(*MATCHING_COLUMNS))
+        )
+        engine = MatchingEngine(db, prefetched_rankings=prefetched)
+        stats = await engine.prefetch_rankings_via_batch(
+            list(result.scalars().all()), top_k=10, clear_existing=True,
+        )
+    print(f"[refresh] rerank batch: {stats}", flush=True)
+    return prefetched
+
+
 async def main() -> None:
+    args = [a for a in sys.argv[1:] if a != "--batch"]
     # Optional: resume mid-run after a crash/kill. Skip the first N attendees.
-    start_idx = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    start_idx = int(args[0]) if args else 0
 
     async with async_session() as db:
         admin_subq = select(User.attendee_id).where(
@@ -58,6 +79,9 @@ async def main() -> None:
         targets = list(result.all())
 
     print(f"[refresh] {len(targets)} attendees to process (resuming from idx {start_idx})", flush=True)
+    prefetched: dict = {}
+    if "--batch" in sys.argv[1:]:
+        prefetched = await _prefetch_via_batch([attendee_id for attendee_id, _ in targets[start_idx:]])
     start = time.time()
     failed = 0
     total_matches = 0
@@ -67,13 +91,14 @@ async def main() -> None:
             continue
         try:
             async with async_session() as session:
-                engine = MatchingEngine(session)
+                engine = MatchingEngine(session, prefetched_rankings=prefetched)
                 matches = await asyncio.wait_for(
                     engine.generate_matches_for_attendee(
                         attendee_id,
                         top_k=10,
                         clear_existing=True,
                         notify=False,
+                        stream=False,
                     ),
                     timeout=PER_ATTENDEE_TIMEOUT,
                 )
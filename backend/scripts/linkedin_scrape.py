@@ -42,6 +42,9 @@ if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
 
 import httpx
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from supabase_bulk_writer import AttendeeBulkWriter  # noqa: E402
+
 def sb_headers():
     return {
         "apikey": SUPABASE_SERVICE_ROLE_KEY,
@@ -658,7 +661,12 @@ async def run(dry_run: bool, limit: int | None, discover: bool, only_missing: bo
 
     from playwright.async_api import async_playwright
 
-    async with async_playwright() as p:
+    # Patches are buffered and flushed in batches (every 25 rows or 60s — the
+    # 10s/profile pacing means a size-only flush could sit for minutes) rather
+    # than one Supabase round trip per attendee. The writer is entered first so
+    # its final flush runs after the browser has closed.
+    writer = AttendeeBulkWriter(batch_size=25, flush_interval=60, dry_run=dry_run)
+    async with writer, async_playwright() as p:
         browser = await p.chromium.launch(
             headless=False,
             args=["--disable-blink-features=AutomationControlled"],
@@ -718,7 +726,7 @@ async def run(dry_run: bool, limit: int | None, discover: bool, only_missing: bo
                     if not verify_company:
                         discovered_count += 1
                         if not dry_run:
-                            patch_attendee(attendee["id"], {"linkedin_url": linkedin_url})
+                            await writer.add(attendee["id"], {"linkedin_url": linkedin_url})
                 else:
                     print(f"    Not found")
                     skipped_count += 1
@@ -782,7 +790,7 @@ async def run(dry_run: bool, limit: int | None, discover: bool, only_missing: bo
                         ep["linkedin_unscrapable"] = "verification_failed"
                         ep["linkedin_verify_failed_at"] = __import__("datetime").datetime.utcnow().isoformat()
                         ep["linkedin_verify_evidence"] = evidence
-                        patch_attendee(attendee["id"], {"enriched_profile": ep})
+                        await writer.add(attendee["id"], {"enriched_profile": ep})
                     skipped_count += 1
                     await asyncio.sleep(DELAY_SECONDS)
                     continue
@@ -790,7 +798,7 @@ async def run(dry_run: bool, limit: int | None, discover: bool, only_missing: bo
                     print(f"    🔎 Company verify ok: {evidence}")
                     discovered_count += 1
                     if not dry_run:
-                        patch_attendee(attendee["id"], {"linkedin_url": linkedin_url})
+                        await writer.add(attendee["id"], {"linkedin_url": linkedin_url})
 
                 print(f"    ✅ {data['headline'][:60]}")
                 print(f"    📷 photo_url: {data.get('profile_pic_url') or 'NULL'}")
@@ -856,12 +864,8 @@ async def run(dry_run: bool, limit: int | None, discover: bool, only_missing: bo
                             patch_payload["name"] = candidate
                             print(f"    📝 Name backfilled: '{db_name}' → '{candidate}'")
 
-                    ok = patch_attendee(attendee["id"], patch_payload)
-                    if ok:
-                        enriched_count += 1
-                    else:
-                        errors += 1
-                        print(f"    ❌ Supabase patch failed")
+                    await writer.add(attendee["id"], patch_payload)
+                    enriched_count += 1
                 else:
                     enriched_count += 1
             else:
@@ -874,6 +878,14 @@ async def run(dry_run: bool, limit: int | None, discover: bool, only_missing: bo
         await context.close()
         await browser.close()
 
+    # The writer's final flush has settled — rows it could not persist were
+    # counted as enriched above; move them to errors.
+    failed_ids = {aid for aid, _ in writer.failures}
+    errors += len(failed_ids)
+    enriched_count = max(0, enriched_count - len(failed_ids))
+    for aid, reason in writer.failures:
+        print(f"    ❌ Supabase write failed for {aid}: {reason}")
+
     prefix = "DRY-RUN " if dry_run else ""
     print(f"\n{prefix}Done: {enriched_count} enriched, {discovered_count} URLs discovered, {skipped_count} skipped, {errors} errors / {len(all_targets)} total")
 
@@ -14,6 +14,14 @@ the first 5 changes, then a summary. Pass --confirm to commit. Idempotent
 
     python scripts/redact_b2b_leaks_in_matches.py
     python scripts/redact_b2b_leaks_in_matches.py --confirm
+    python scripts/redact_b2b_leaks_in_matches.py --bulk [--confirm]
+
+--bulk streams the same rows through a server-side cursor instead of
+loading every Match ORM object (+ two db.get per row): one projected query
+carries the explanation, shared_context and both sides' name / company /
+privacy_mode, partitions of --chunk-size rows are masked as they arrive,
+and with --confirm each partition's changes go out as one executemany
+UPDATE on a second session. Memory stays at one partition.
 """
 import argparse
 import asyncio
@@ -22,12 +30,79 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from sqlalchemy import select, or_  # noqa: E402
+from sqlalchemy import select, or_, update  # noqa: E402
+from sqlalchemy.orm import aliased  # noqa: E402
 from sqlalchemy.orm.attributes import flag_modified  # noqa: E402
 
 from app.core.database import async_session  # noqa: E402
 from app.models.attendee import Attendee, Match  # noqa: E402
 from app.services.b2b_match_redact import redact_b2b_in_match_fields  # noqa: E402
+from app.services.exports import stream_partitions  # noqa: E402
+
+
+def _bulk_query():
+    side_a, side_b = aliased(Attendee, name="a"), aliased(Attendee, name="b")
+    return (
+        select(
+            Match.id, Match.explanation, Match.shared_context,
+            side_a.name.label("a_name"), side_a.company.label("a_company"),
+            side_a.privacy_mode.label("a_privacy_mode"),
+            side_b.name.label("b_name"), side_b.company.label("b_company"),
+            side_b.privacy_mode.label("b_privacy_mode"),
+        )
+        .join(side_a, side_a.id == Match.attendee_a_id)
+        .join(side_b, side_b.id == Match.attendee_b_id)
+        .where(or_(side_a.privacy_mode == "b2b_only", side_b.privacy_mode == "b2b_only"))
+    )
+
+
+def redact_row(row) -> dict | None:
+    """{"id", "explanation", "shared_context"} with both b2b sides masked,
+    or None if the row is already clean. `row` is a _bulk_query mapping."""
+    explanation, context = row["explanation"], row["shared_context"]
+    changed = False
+    for side in ("a", "b"):
+        fields = redact_b2b_in_match_fields(explanation, context, {
+            "name": row[f"{side}_name"], "company": row[f"{side}_company"],
+            "privacy_mode": row[f"{side}_privacy_mode"],
+        })
+        explanation = fields.get("explanation", explanation)
+        context = fields.get("shared_context", context)
+        changed = changed or bool(fields)
+    if not changed:
+        return None
+    return {"id": row["id"], "explanation": explanation, "shared_context": context}
+
+
+async def bulk(confirm: bool, preview_limit: int, chunk_size: int) -> None:
+    scanned = changed = 0
+    async for part in stream_partitions(_bulk_query(), chunk_size):
+        scanned += len(part)
+        updates = []
+        for row in part:
+            new = redact_row(row)
+            if new is None:
+                continue
+            updates.append(new)
+            if changed + len(updates) <= preview_limit:
+                print(f"\n=== Match {row['id']} ===")
+                if new["explanation"] != row["explanation"]:
+                    print(f"  EXPLANATION BEFORE: {(row['explanation'] or '')[:200]}")
+                    print(f"  EXPLANATION AFTER:  {(new['explanation'] or '')[:200]}")
+                if new["shared_context"] != row["shared_context"]:
+                    print("  CONTEXT changed (synergies / action_items / sectors)")
+        changed += len(updates)
+        if confirm and updates:
+            # Separate session: committing on the streaming one would close
+            # its cursor. ORM bulk UPDATE by primary key = one executemany.
+            async with async_session() as writer:
+                await writer.execute(update(Match), updates)
+                await writer.commit()
+        print(f"[redact] scanned={scanned} changed={changed}", flush=True)
+
+    verb = "Committed" if confirm else "DRY-RUN:"
+    print(f"\n{verb} {changed} updates ({scanned} b2b matches scanned)."
+          + ("" if confirm else "\nRe-run with --confirm to commit."))
 
 
 async def main(confirm: bool, preview_limit: int) -> None:
@@ -128,5 +203,16 @@ if __name__ == "__main__":
         "--preview-limit", type=int, default=5,
         help="How many per-row before/after diffs to print (default 5).",
     )
+    parser.add_argument(
+        "--bulk", action="store_true",
+        help="Stream rows through a server-side cursor and batch the UPDATEs.",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=1000,
+        help="Rows per streamed partition / UPDATE batch in --bulk mode (default 1000).",
+    )
     args = parser.parse_args()
-    asyncio.run(main(args.confirm, args.preview_limit))
+    if args.bulk:
+        asyncio.run(bulk(args.confirm, args.preview_limit, args.chunk_size))
+    else:
+        asyncio.run(main(args.confirm, args.preview_limit))
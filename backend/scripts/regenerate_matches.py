@@ -1,19 +1,131 @@
-"""Regenerate all matches — runs the full pipeline with the latest ranking logic."""
+"""Regenerate all matches — runs the full pipeline with the latest ranking logic.
+
+    python scripts/regenerate_matches.py              # live GPT-4o rerank per attendee
+    python scripts/regenerate_matches.py --batch      # one OpenAI Batch API job for all reranks
+                                                      # (half price, no rate limit; waits up to 24h)
+    python scripts/regenerate_matches.py --shards 4   # split the pool across 4 worker processes
+
+--shards K: a single run is one event loop on one core, and prompt building,
+JSON parsing and ORM work add up to most of it once the reranks are cached
+or batched. This process wipes and embeds once (prepare_full_regeneration),
+then K spawned worker processes each regenerate the attendees shard_of()
+assigns them. Each worker has its own DB pool (a 1/K share of DB_POOL_SIZE /
+DB_MAX_OVERFLOW) and its own OpenAI client with one rerank in flight, so K
+is capped at MATCH_MAX_CONCURRENCY — the OpenAI budget split K ways. A pair
+whose two sides land in different shards is written by its owner
+(MatchingEngine._owns_pair), never twice. Per-shard stats are merged at the
+end. Combines with --batch: one batch job per shard.
+"""
+import argparse
 import asyncio
+import multiprocessing
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from app.core.database import async_session
-from app.services.matching import run_matching_pipeline
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import async_session, engine  # noqa: E402
+from app.services.matching import MatchingEngine, run_matching_pipeline  # noqa: E402
+
+TOP_K = 10
 
 
-async def main():
+async def main(batch: bool = False):
     async with async_session() as db:
-        total = await run_matching_pipeline(db, top_k=10)
+        total = await run_matching_pipeline(db, top_k=TOP_K, batch=batch)
         print(f"Generated {total} matches")
 
 
+async def _prepare() -> None:
+    try:
+        async with async_session() as db:
+            await MatchingEngine(db).prepare_full_regeneration()
+    finally:
+        await engine.dispose()
+
+
+async def _shard_main(shard: int, shards: int, batch: bool) -> dict:
+    try:
+        async with async_session() as db:
+            return await MatchingEngine(db).generate_shard(TOP_K, batch=batch, shard=shard, shards=shards)
+    finally:
+        await engine.dispose()
+
+
+def _run_shard(shard: int, shards: int, batch: bool) -> dict:
+    """Worker entry point. Spawned, not forked: a fresh interpreter builds
+    its own DB engine (from the pool-share env vars) and OpenAI client."""
+    return asyncio.run(_shard_main(shard, shards, batch))
+
+
+def pool_share(shards: int) -> dict[str, str]:
+    """Per-worker DB pool sizing, as env overrides for the spawned workers."""
+    settings = get_settings()
+    return {
+        "DB_POOL_SIZE": str(max(2, settings.DB_POOL_SIZE // shards)),
+        "DB_MAX_OVERFLOW": str(settings.DB_MAX_OVERFLOW // shards),
+    }
+
+
+def merge_shard_stats(results: list[dict]) -> dict:
+    """Sum per-shard counts; `seconds` is the slowest shard (the wall time)."""
+    merged = {
+        "shards": len(results),
+        "attendees": sum(r["attendees"] for r in results),
+        "matches": sum(r["matches"] for r in results),
+        "seconds": max((r["seconds"] for r in results), default=0.0),
+        "batch": None,
+    }
+    batches = [r["batch"] for r in results if r.get("batch")]
+    if batches:
+        merged["batch"] = {k: sum(b[k] for b in batches) for k in batches[0]}
+    return merged
+
+
+def sharded(shards: int, batch: bool) -> int:
+    """Run a sharded regeneration; returns the process exit code."""
+    asyncio.run(_prepare())
+    # Read by the workers' get_settings(); this process's engine is already built.
+    os.environ.update(pool_share(shards))
+
+    results: list[dict] = []
+    failed = 0
+    with ProcessPoolExecutor(max_workers=shards, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(_run_shard, i, shards, batch) for i in range(shards)]
+        for i, future in enumerate(futures):
+            try:
+                stats = future.result()
+            except Exception as exc:  # noqa: BLE001
+                failed += 1
+                print(f"[shard {i}/{shards}] FAILED: {exc}", flush=True)
+                continue
+            results.append(stats)
+            print(f"[shard {i}/{shards}] {stats['attendees']} attendees, "
+                  f"{stats['matches']} matches in {stats['seconds']}s", flush=True)
+
+    merged = merge_shard_stats(results)
+    print(f"Generated {merged['matches']} matches for {merged['attendees']} attendees "
+          f"across {merged['shards']}/{shards} shards in {merged['seconds']}s", flush=True)
+    if merged["batch"]:
+        print(f"rerank batches: {merged['batch']}", flush=True)
+    if failed:
+        print(f"{failed} shard(s) failed — their attendees have no matches; rerun to fill them in.", flush=True)
+    return 1 if failed else 0
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch", action="store_true", help="answer reranks through the OpenAI Batch API")
+    parser.add_argument("--shards", type=int, default=1, help="worker processes (default 1: in-process)")
+    args = parser.parse_args()
+
+    limit = max(1, get_settings().MATCH_MAX_CONCURRENCY)
+    if args.shards > limit:
+        print(f"--shards {args.shards} exceeds MATCH_MAX_CONCURRENCY={limit}; using {limit}")
+        args.shards = limit
+    if args.shards > 1:
+        sys.exit(sharded(args.shards, args.batch))
+    asyncio.run(main(batch=args.batch))
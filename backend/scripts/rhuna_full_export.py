@@ -21,9 +21,9 @@ Output:
 """
 
 import csv
-import io
-from collections import defaultdict
+from collections import Counter, defaultdict
 from pathlib import Path
+from typing import Iterator
 
 import httpx
 
@@ -55,12 +55,30 @@ TICKET_FIELDS = [
 ]
 
 
-def fetch_csv(url: str) -> list[dict]:
+def iter_csv(url: str) -> Iterator[dict]:
+    """Stream a Rhuna report CSV row by row (response body read line by line,
+    never materialised as one string)."""
     with httpx.Client(timeout=30) as client:
-        resp = client.get(url)
-        resp.raise_for_status()
-        text = resp.content.decode("iso-8859-1", errors="replace")
-        return list(csv.DictReader(io.StringIO(text)))
+        with client.stream("GET", url) as resp:
+            resp.raise_for_status()
+            lines = (
+                line.decode("iso-8859-1", errors="replace")
+                for line in _iter_raw_lines(resp.iter_bytes())
+            )
+            yield from csv.DictReader(lines)
+
+
+def _iter_raw_lines(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    # Split on b"\n" ourselves: the report is iso-8859-1, so httpx's
+    # text-mode iter_lines() (which decodes as utf-8 by default) can't be used.
+    buf = b""
+    for chunk in chunks:
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            yield line + b"\n"
+    if buf:
+        yield buf
 
 
 def to_float(value) -> float:
@@ -91,18 +109,16 @@ def classify_payment(order: dict) -> str:
 def main() -> None:
     print("=== Rhuna full export (Orders + Tickets joined) ===\n")
 
-    print(f"Fetching orders  ... {ORDERS_URL}")
-    orders = fetch_csv(ORDERS_URL)
-    print(f"  {len(orders)} orders\n")
-
+    # Tickets are indexed by orderId for O(1) join; orders are then streamed
+    # straight through to the CSV, so only the (smaller) tickets report is
+    # ever held in memory.
     print(f"Fetching tickets ... {TICKETS_URL}")
-    tickets = fetch_csv(TICKETS_URL)
-    print(f"  {len(tickets)} tickets\n")
-
-    # Index tickets by orderId for O(1) join
     tickets_by_order: dict[str, list[dict]] = defaultdict(list)
-    for t in tickets:
+    n_tickets = 0
+    for t in iter_csv(TICKETS_URL):
         tickets_by_order[t.get("orderId") or ""].append(t)
+        n_tickets += 1
+    print(f"  {n_tickets} tickets\n")
 
     # ── Column schema ─────────────────────────────────────────────────────
     # 1. derived "summary" columns first (what Ferd actually reads)
@@ -127,10 +143,34 @@ def main() -> None:
     ticket_cols = [f"ticket_{f}" for f in TICKET_FIELDS]
     header = summary_fields + order_cols + ticket_cols
 
-    rows: list[dict] = []
     orders_with_tickets = orders_without_tickets = extra_ticket_rows = 0
+    n_orders = n_rows = reassigned = 0
+    status_counter: Counter[str] = Counter()
+    order_status_counter: Counter[str] = Counter()
+    pass_counter: Counter[str] = Counter()
+    total_paid = total_discount = 0.0
 
-    for order in orders:
+    EXPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    f = EXPORT_PATH.open("w", newline="", encoding="utf-8")
+    writer = csv.DictWriter(f, fieldnames=header)
+    writer.writeheader()
+
+    def emit(row: dict) -> None:
+        # Write immediately and keep only the running summary stats.
+        nonlocal n_rows, reassigned, total_paid, total_discount
+        writer.writerow(row)
+        n_rows += 1
+        status_counter[row["payment_status"]] += 1
+        order_status_counter[row["order_status"]] += 1
+        pass_counter[row["ticket_name"]] += 1
+        reassigned += row["is_reassigned_ticket"] == "TRUE"
+        if row["payment_status"] == "PAID":
+            total_paid += float(row["paid_amount_eur"])
+        total_discount += float(row["discount_eur"])
+
+    print(f"Streaming orders ... {ORDERS_URL}")
+    for order in iter_csv(ORDERS_URL):
+        n_orders += 1
         payment_status = classify_payment(order)
         order_list_price = to_float(order.get("fullPrice"))
         order_paid_amount = to_float(order.get("paymentsAmount"))
@@ -167,7 +207,7 @@ def main() -> None:
                 **order_prefixed,
                 **blank_ticket,
             }
-            rows.append(row)
+            emit(row)
             continue
 
         orders_with_tickets += 1
@@ -201,27 +241,14 @@ def main() -> None:
                 **order_prefixed,
                 **ticket_prefixed,
             }
-            rows.append(row)
-
-    # ── Write CSV ─────────────────────────────────────────────────────────
-    EXPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with EXPORT_PATH.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=header)
-        writer.writeheader()
-        writer.writerows(rows)
+            emit(row)
 
+    f.close()
+    print(f"  {n_orders} orders\n")
     print(f"CSV written: {EXPORT_PATH}\n")
 
     # ── Summary stats ─────────────────────────────────────────────────────
-    from collections import Counter
-    status_counter: Counter[str] = Counter(r["payment_status"] for r in rows)
-    order_status_counter: Counter[str] = Counter(r["order_status"] for r in rows)
-    pass_counter: Counter[str] = Counter(r["ticket_name"] for r in rows)
-    reassigned = sum(1 for r in rows if r["is_reassigned_ticket"] == "TRUE")
-    total_paid = sum(float(r["paid_amount_eur"]) for r in rows if r["payment_status"] == "PAID")
-    total_discount = sum(float(r["discount_eur"]) for r in rows)
-
-    print(f"Total rows written:        {len(rows)}")
+    print(f"Total rows written:        {n_rows}")
     print(f"  Orders with tickets:     {orders_with_tickets}")
     print(f"  Orders without tickets:  {orders_without_tickets} (failed / pending / not issued)")
     print(f"  Extra rows from multi-ticket orders: +{extra_ticket_rows}")
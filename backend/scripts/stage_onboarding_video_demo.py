@@ -43,7 +43,7 @@ from sqlalchemy import select, delete, or_
 sys.path.insert(0, ".")
 
 from app.core.database import async_session  # noqa: E402
-from app.models.attendee import Attendee, Match, TicketType  # noqa: E402
+from app.models.attendee import Attendee, Match, TicketType, load_heavy  # noqa: E402
 from app.models.user import User  # noqa: E402
 from app.models.message import Thread, ThreadPost, Conversation, Message  # noqa: E402
 from app.services.matching import MatchingEngine  # noqa: E402
@@ -136,7 +136,9 @@ DEMO_MATCHES = [
 
 
 async def _get_demo(db, email):
-    return (await db.execute(select(Attendee).where(Attendee.email == email))).scalars().first()
+    return (
+        await db.execute(select(Attendee).where(Attendee.email == email).options(load_heavy("embedding")))
+    ).scalars().first()
 
 
 async def build_demo_matches(db, alex):
@@ -193,7 +195,7 @@ async def restage_matches_only(db):
         engine = MatchingEngine(db)
         await engine.process_attendee(alex)
         await db.commit()
-        await db.refresh(alex)
+        await db.refresh(alex, ["embedding"])
     mutual = await build_demo_matches(db, alex)
     print(f"[matches-only] rebuilt demo matches; mutual={mutual}")
     print(f"MUTUAL_MATCH_ID={mutual}")
@@ -244,7 +246,7 @@ async def stage(db):
     engine = MatchingEngine(db)
     await engine.process_attendee(alex)
     await db.commit()
-    await db.refresh(alex)
+    await db.refresh(alex, ["embedding"])
     print(f"[stage] embedded Alex: embedding={'set' if alex.embedding is not None else 'MISSING'}")
 
     # Replace Alex's match rows with the hand-built demo-only curated set so
@@ -276,7 +278,7 @@ async def seed_thread_posts(db):
     beat. The 11 public default threads still exist and are untouched.
     """
     # Make sure default threads exist too (so the threads LIST looks populated).
-    from app.api.routes.threads import _ensure_default_threads
+    from app.api.routes.threads import _bump_post_counters, _ensure_default_threads
     await _ensure_default_threads(db)
 
     thread = (await db.execute(
@@ -316,18 +318,25 @@ async def seed_thread_posts(db):
          "custody is the bottleneck."),
     ]
     added = 0
+    latest = None
     for email, content in seed:
         a = await _get_demo(db, email)
         if not a:
             continue
+        latest = datetime.utcnow()
         db.add(ThreadPost(
             id=uuid.uuid4(),
             thread_id=thread.id,
             sender_attendee_id=a.id,
             content=content,
-            created_at=datetime.utcnow(),
+            created_at=latest,
         ))
         added += 1
+    if added:
+        # Same relative counter UPDATE as create_post, in the same transaction
+        # as the INSERTs — /threads is served from these counters.
+        await db.flush()
+        await _bump_post_counters(db, thread.id, added, latest)
     await db.commit()
     print(f"[stage] seeded {added} post(s) into thread '{thread.title}'")
 
@@ -0,0 +1,383 @@
+"""
+Buffered bulk writer for attendee updates from the enrichment scripts.
+=====================================================================
+`enrich_and_embed.py` and `linkedin_scrape.py` used to send one PATCH per
+attendee (fresh client, own retries) — a full sweep was ~800 round trips to
+Supabase. This writer accumulates `{id: payload}` updates and flushes them
+in batches, so the same sweep does a few dozen writes.
+
+Two backends, picked automatically:
+
+  * asyncpg   — when DATABASE_URL is set. One `executemany` UPDATE per
+                distinct column set in the batch, in a transaction that first
+                locks the rows it will touch — an id that's gone is reported,
+                not counted as written. Never inserts.
+  * PostgREST — otherwise. One `POST /attendees?on_conflict=id` upsert per
+                distinct column set (PostgREST requires every object in a
+                bulk body to carry the same keys; a PATCH can only set ONE
+                body on every row it matches, and these payloads differ per
+                row). Right before each upsert its rows are re-read with one
+                `id=in.(...)` GET: an attendee deleted mid-sweep is reported,
+                not re-inserted, and the NOT NULL columns the payload doesn't
+                set ride along in the body (see _UPSERT_REQUIRED_COLUMNS).
+
+                Race: those carried columns are written back with the values
+                just read, so a profile edit to one of them (name, company,
+                interests, ...) that commits between that GET and the POST —
+                one round trip — is overwritten. The window is per column
+                group, not per flush, and only the required columns the
+                payload doesn't already set are exposed. Use the asyncpg
+                backend (row locks, plain UPDATE) where that matters.
+
+Flushes happen when the buffer reaches `batch_size`, when `flush_interval`
+seconds have passed since the last flush (checked by a background ticker so
+a slow Playwright loop still drains), and on exit. A batch that fails as a
+whole is replayed row-by-row so one bad payload can't sink its neighbours;
+every row that still fails lands in `writer.failures` as (id, reason).
+
+Usage:
+    async with AttendeeBulkWriter() as writer:
+        for attendee in attendees:
+            ...
+            await writer.add(attendee["id"], patch)
+    print(writer.stats, writer.failures)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+# Every attendees column that is NOT NULL with no server-side default (the
+# defaults live in the SQLAlchemy model only). Postgres checks NOT NULL on
+# the INSERT row of an upsert before it resolves ON CONFLICT, so the body
+# must carry all of them even though the row always exists — with only
+# name/email every bulk upsert failed and fell back to per-row PATCH.
+# Fetched by the existence probe; tests pin this against the model.
+_UPSERT_REQUIRED_COLUMNS = (
+    "created_at", "updated_at", "name", "email", "company", "title", "ticket_type",
+    "interests", "seeking", "not_looking_for", "preferred_geographies", "privacy_mode",
+    "enriched_profile", "intent_tags", "vertical_tags", "inferred_customer_profile",
+    "crunchbase_data", "pot_history",
+)
+
+# Columns asyncpg can't encode from the script's plain-JSON payloads. Each
+# value is sent as text and cast server-side.
+_TEXT_CASTS = {
+    "enriched_profile": "jsonb",
+    "crunchbase_data": "jsonb",
+    "pot_history": "jsonb",
+    "inferred_customer_profile": "jsonb",
+    "embedding": "vector",
+    "enriched_at": "timestamp",
+    "ai_summary_edited_at": "timestamp",
+    "ticket_bought_at": "timestamptz",
+}
+
+
+@dataclass
+class FlushResult:
+    written: int = 0
+    failed: list[tuple[str, str]] = field(default_factory=list)
+    requests: int = 0
+
+
+def _asyncpg_dsn(url: str) -> str:
+    """SQLAlchemy-style URL → plain libpq DSN asyncpg understands."""
+    return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+class AttendeeBulkWriter:
+    def __init__(
+        self,
+        *,
+        batch_size: int = 50,
+        flush_interval: float = 30.0,
+        supabase_url: str | None = None,
+        service_role_key: str | None = None,
+        database_url: str | None = None,
+        dry_run: bool = False,
+        retries: int = 3,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dry_run = dry_run
+        self.retries = retries
+        self._supabase_url = supabase_url or os.getenv("SUPABASE_URL")
+        self._key = service_role_key or os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+        self._database_url = database_url if database_url is not None else os.getenv("DATABASE_URL")
+        self._transport = transport
+
+        self._pending: dict[str, dict] = {}
+        self._lock = asyncio.Lock()
+        self._last_flush = time.monotonic()
+        self._ticker: asyncio.Task | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._pg = None
+
+        self.failures: list[tuple[str, str]] = []
+        self.stats = {"queued": 0, "written": 0, "failed": 0, "flushes": 0, "requests": 0}
+
+    @property
+    def backend(self) -> str:
+        return "asyncpg" if self._database_url else "postgrest"
+
+    # ── lifecycle ────────────────────────────────────────────────────────
+
+    async def __aenter__(self) -> "AttendeeBulkWriter":
+        if self.flush_interval and self.flush_interval > 0:
+            self._ticker = asyncio.create_task(self._tick())
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._ticker:
+            self._ticker.cancel()
+            try:
+                await self._ticker
+            except asyncio.CancelledError:
+                pass
+            self._ticker = None
+        await self.flush()
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+        if self._pg is not None:
+            await self._pg.close()
+            self._pg = None
+
+    async def _tick(self) -> None:
+        while True:
+            await asyncio.sleep(min(self.flush_interval, 5.0))
+            if self._pending and time.monotonic() - self._last_flush >= self.flush_interval:
+                await self.flush()
+
+    # ── public API ───────────────────────────────────────────────────────
+
+    async def add(self, attendee_id: str, payload: dict) -> None:
+        """Queue `payload` for `attendee_id`. A second update for the same id
+        before the flush is merged key-by-key (later wins), so a script that
+        patches a row twice in one pass still costs a single write."""
+        if self.dry_run or not payload:
+            return
+        aid = str(attendee_id)
+        async with self._lock:
+            self._pending.setdefault(aid, {}).update(payload)
+            self.stats["queued"] += 1
+            full = len(self._pending) >= self.batch_size
+        if full:
+            await self.flush()
+
+    async def flush(self) -> FlushResult:
+        async with self._lock:
+            batch, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+            if not batch:
+                return FlushResult()
+            try:
+                if self.backend == "asyncpg":
+                    result = await self._flush_asyncpg(batch)
+                else:
+                    result = await self._flush_postgrest(batch)
+            except Exception as exc:  # noqa: BLE001 — e.g. asyncpg connect refused
+                reason = f"{type(exc).__name__}: {exc}"[:200]
+                result = FlushResult(failed=[(aid, reason) for aid in batch])
+        self.stats["flushes"] += 1
+        self.stats["written"] += result.written
+        self.stats["failed"] += len(result.failed)
+        self.stats["requests"] += result.requests
+        self.failures.extend(result.failed)
+        for aid, reason in result.failed:
+            print(f"    ⚠ bulk write failed for {aid}: {reason}")
+        return result
+
+    # ── shared helpers ───────────────────────────────────────────────────
+
+    @staticmethod
+    def _group_by_columns(batch: dict[str, dict]) -> dict[tuple[str, ...], list[str]]:
+        groups: dict[tuple[str, ...], list[str]] = {}
+        for aid, payload in batch.items():
+            groups.setdefault(tuple(sorted(payload)), []).append(aid)
+        return groups
+
+    # ── asyncpg backend ──────────────────────────────────────────────────
+
+    async def _connection(self):
+        if self._pg is None:
+            import asyncpg
+
+            # statement_cache_size=0 keeps this safe on the transaction-mode
+            # pooler (:6543), same reason as app/core/database.py.
+            self._pg = await asyncpg.connect(_asyncpg_dsn(self._database_url), statement_cache_size=0)
+        return self._pg
+
+    @staticmethod
+    def _update_sql(columns: tuple[str, ...]) -> str:
+        sets = []
+        for i, col in enumerate(columns, start=2):
+            cast = _TEXT_CASTS.get(col)
+            sets.append(f'"{col}" = ${i}::text::{cast}' if cast else f'"{col}" = ${i}')
+        return f"UPDATE attendees SET {', '.join(sets)} WHERE id = $1::uuid"
+
+    @staticmethod
+    def _update_args(aid: str, payload: dict, columns: tuple[str, ...]) -> tuple:
+        args = [aid]
+        for col in columns:
+            value = payload[col]
+            if col in _TEXT_CASTS and value is not None and not isinstance(value, str):
+                value = json.dumps(value) if _TEXT_CASTS[col] == "jsonb" else str(value)
+            args.append(value)
+        return tuple(args)
+
+    async def _flush_asyncpg(self, batch: dict[str, dict]) -> FlushResult:
+        result = FlushResult()
+        conn = await self._connection()
+        for columns, ids in self._group_by_columns(batch).items():
+            sql = self._update_sql(columns)
+            rows = [self._update_args(aid, batch[aid], columns) for aid in ids]
+            result.requests += 1
+            try:
+                # executemany is atomic: all rows land or none do. It returns
+                # no per-row status, so lock the rows first — an id missing
+                # here was deleted mid-sweep and its UPDATE would match 0 rows.
+                async with conn.transaction():
+                    found = {
+                        str(r["id"]) for r in await conn.fetch(
+                            "SELECT id FROM attendees WHERE id = ANY($1::uuid[]) FOR UPDATE", ids,
+                        )
+                    }
+                    live = [args for aid, args in zip(ids, rows) if aid in found]
+                    if live:
+                        await conn.executemany(sql, live)
+                result.written += len(live)
+                result.failed.extend((aid, "row no longer exists") for aid in ids if aid not in found)
+                continue
+            except Exception as exc:  # noqa: BLE001 — replay row-by-row below
+                print(f"    ⚠ batch of {len(rows)} failed ({type(exc).__name__}), isolating rows")
+            for aid, args in zip(ids, rows):
+                result.requests += 1
+                try:
+                    status = await conn.execute(sql, *args)
+                except Exception as exc:  # noqa: BLE001
+                    result.failed.append((aid, f"{type(exc).__name__}: {exc}"[:200]))
+                    continue
+                if status.endswith(" 0"):
+                    result.failed.append((aid, "row no longer exists"))
+                else:
+                    result.written += 1
+        return result
+
+    # ── PostgREST backend ────────────────────────────────────────────────
+
+    def _headers(self) -> dict:
+        return {
+            "apikey": self._key,
+            "Authorization": f"Bearer {self._key}",
+            "Content-Type": "application/json",
+        }
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=30, transport=self._transport)
+        return self._client
+
+    async def _request(self, method: str, params: dict, **kwargs) -> httpx.Response:
+        """One PostgREST call with the same retry policy patch_attendee used:
+        retry network errors and 5xx with linear backoff, give up on 4xx."""
+        url = f"{self._supabase_url}/rest/v1/attendees"
+        last: httpx.Response | Exception | None = None
+        for attempt in range(1, self.retries + 1):
+            try:
+                resp = await self._http().request(method, url, params=params, **kwargs)
+                if resp.status_code < 500:
+                    return resp
+                last = resp
+            except httpx.HTTPError as exc:
+                last = exc
+            if attempt < self.retries:
+                await asyncio.sleep(2 * attempt)
+        if isinstance(last, Exception):
+            raise last
+        return last
+
+    async def _existing_rows(self, ids: list[str], columns: tuple[str, ...]) -> dict[str, dict]:
+        """id → the row's `columns`, for the ids that still exist."""
+        resp = await self._request(
+            "GET",
+            {"select": ",".join(("id", *columns)), "id": f"in.({','.join(ids)})"},
+            headers=self._headers(),
+        )
+        resp.raise_for_status()
+        return {str(r.pop("id")): r for r in resp.json()}
+
+    async def _patch_one(self, aid: str, payload: dict) -> str | None:
+        """Fallback single-row PATCH. Returns an error string, or None on success."""
+        try:
+            resp = await self._request(
+                "PATCH",
+                {"id": f"eq.{aid}"},
+                headers={**self._headers(), "Prefer": "return=minimal"},
+                content=json.dumps(payload),
+            )
+        except httpx.HTTPError as exc:
+            return f"network error: {exc}"
+        if resp.status_code in (200, 204):
+            return None
+        return f"HTTP {resp.status_code}: {resp.text[:120]}"
+
+    async def _flush_postgrest(self, batch: dict[str, dict]) -> FlushResult:
+        result = FlushResult()
+        for columns, ids in self._group_by_columns(batch).items():
+            # Only the required columns this payload leaves alone are read and
+            # written back — the only way to keep the INSERT half valid. Read
+            # per group, immediately before its upsert, to keep the window in
+            # which a concurrent edit of them can be overwritten to one round
+            # trip (see the module docstring).
+            carry = tuple(c for c in _UPSERT_REQUIRED_COLUMNS if c not in columns)
+            result.requests += 1
+            try:
+                existing = await self._existing_rows(ids, carry)
+            except httpx.HTTPError as exc:
+                result.failed.extend((aid, f"existence probe failed: {exc}") for aid in ids)
+                continue
+            result.failed.extend((aid, "row no longer exists") for aid in ids if aid not in existing)
+            ids = [aid for aid in ids if aid in existing]
+            body = [{**existing[aid], **batch[aid], "id": aid} for aid in ids]
+            single: list[str] = []
+            if body:
+                result.requests += 1
+                try:
+                    resp = await self._request(
+                        "POST",
+                        {"on_conflict": "id"},
+                        headers={**self._headers(), "Prefer": "resolution=merge-duplicates,return=minimal"},
+                        content=json.dumps(body),
+                    )
+                    ok = resp.status_code in (200, 201, 204)
+                    if not ok:
+                        print(f"    ⚠ bulk upsert of {len(body)} returned {resp.status_code}: {resp.text[:120]}")
+                except httpx.HTTPError as exc:
+                    ok = False
+                    print(f"    ⚠ bulk upsert of {len(body)} network error: {exc}")
+                if ok:
+                    result.written += len(ids)
+                else:
+                    single.extend(ids)
+            # Rows from a failed batch go one by one so each failure is
+            # attributable to a single attendee.
+            for aid in single:
+                result.requests += 1
+                err = await self._patch_one(aid, batch[aid])
+                if err:
+                    result.failed.append((aid, err))
+                else:
+                    result.written += 1
+        return result
@@ -1,8 +1,76 @@
 import pytest
 import json
+import uuid
 from pathlib import Path
 from unittest.mock import AsyncMock, patch
-from app.models.attendee import Attendee, TicketType
+from sqlalchemy import Column, MetaData, Table, create_engine, select
+from app.models.attendee import Attendee, Match, TicketType
+from app.services.advisory_locks import AdvisoryLocks
+
+
+@pytest.fixture(autouse=True)
+def _no_advisory_lock_connection(monkeypatch):
+    """Never open the session-pooler lock connection from tests: behave as
+    if it's unavailable (fail-open). test_refresh_lock fakes it explicitly."""
+    monkeypatch.setattr(AdvisoryLocks, "_connection", AsyncMock(return_value=None))
+
+
+class _SqliteSession:
+    """Just enough AsyncSession for the crons: execute + commit on a sync
+    SQLite connection (aiosqlite isn't a dependency)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.statements = []
+
+    async def execute(self, stmt, *a, **kw):
+        self.statements.append(stmt)
+        return self.conn.execute(stmt, *a, **kw)
+
+    async def commit(self):
+        self.conn.commit()
+
+    def attendee(self, **cols):
+        cols.setdefault("id", uuid.uuid4())
+        cols.setdefault("email_opt_out", False)
+        cols.setdefault("magic_access_token", "tok")
+        cols.setdefault("privacy_mode", "full")
+        self.conn.execute(self.attendees.insert(), cols)
+        return cols["id"]
+
+    def match(self, a, b, **cols):
+        cols = {"id": uuid.uuid4(), "attendee_a_id": a, "attendee_b_id": b, "status": "pending",
+                "status_a": "pending", "status_b": "pending", "tier": "curated", **cols}
+        self.conn.execute(self.matches.insert(), cols)
+        return cols["id"]
+
+    def read(self, table, column, id_):
+        return self.conn.execute(select(table.c[column]).where(table.c.id == id_)).scalar_one()
+
+
+@pytest.fixture
+def sqlite_db():
+    """In-memory SQLite holding slim attendees/matches tables (the columns
+    the crons read, with the models' types), so their real aggregate /
+    window / UPDATE statements run end to end against rows."""
+    md = MetaData()
+
+    def slim(model, cols):
+        return Table(model.__tablename__, md,
+                     *[Column(c, model.__table__.c[c].type, primary_key=c == "id") for c in cols])
+
+    attendees = slim(Attendee, ["id", "name", "title", "company", "email", "email_opt_out",
+                                "magic_access_token", "privacy_mode", "last_interest_notified_at",
+                                "last_match_digest_at", "updated_at"])
+    matches = slim(Match, ["id", "attendee_a_id", "attendee_b_id", "status", "status_a", "status_b",
+                           "tier", "overall_score", "created_at", "explanation", "mutual_notified_at"])
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        md.create_all(conn)
+        db = _SqliteSession(conn)
+        db.attendees, db.matches = attendees, matches
+        yield db
+    engine.dispose()
 
 
 @pytest.fixture
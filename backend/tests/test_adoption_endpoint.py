@@ -58,7 +58,7 @@ def _make_db():
 @pytest.mark.asyncio
 async def test_adoption_shape_and_pct_math():
     db = _make_db()
-    out = await dash.get_adoption(db=db, _admin=SimpleNamespace(is_admin=True))
+    out = await dash._compute_adoption(db)
 
     assert out["accounts"]["total"] == 162
     assert out["accounts"]["real"] == 154
@@ -96,7 +96,7 @@ async def test_adoption_empty_usage_falls_back_to_today():
         _Rows([]),                                         # live attendee rows (empty)
         _Rows([]),                                         # usage_by_day EMPTY
     ]
-    out = await dash.get_adoption(db=db, _admin=SimpleNamespace(is_admin=True))
+    out = await dash._compute_adoption(db)
     assert out["usage_by_day"] == []
     assert out["accounts"]["pct_of_directory"] == 0.0   # no div-by-zero
     assert out["tracking_started_at"] == datetime.utcnow().date().isoformat()
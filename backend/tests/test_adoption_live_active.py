@@ -93,7 +93,7 @@ async def test_cumulative_active_counts_login_only_users():
     user_rows = [(None, datetime(2026, 5, 20))]
     attendee_rows = []
     db = _make_db_live(user_rows=user_rows, attendee_rows=attendee_rows)
-    out = await dash.get_adoption(db=db, _admin=SimpleNamespace(is_admin=True))
+    out = await dash._compute_adoption(db)
     assert out["usage"]["cumulative_active"] == 1
 
 
@@ -107,7 +107,7 @@ async def test_cumulative_active_counts_magic_link_only_account_holders():
     user_rows = []
     attendee_rows = [(aid, datetime(2026, 5, 20))]
     db = _make_db_live(user_rows=user_rows, attendee_rows=attendee_rows)
-    out = await dash.get_adoption(db=db, _admin=SimpleNamespace(is_admin=True))
+    out = await dash._compute_adoption(db)
     assert out["usage"]["cumulative_active"] == 1
 
 
@@ -118,7 +118,7 @@ async def test_cumulative_active_deduplicates_person_with_both():
     user_rows = [(aid, datetime(2026, 5, 22))]      # login
     attendee_rows = [(aid, datetime(2026, 5, 21))]  # magic-link open, same person
     db = _make_db_live(user_rows=user_rows, attendee_rows=attendee_rows)
-    out = await dash.get_adoption(db=db, _admin=SimpleNamespace(is_admin=True))
+    out = await dash._compute_adoption(db)
     assert out["usage"]["cumulative_active"] == 1, (
         "person with both login + magic-link must be counted once, not twice"
     )
@@ -132,7 +132,7 @@ async def test_cumulative_active_two_distinct_people():
     user_rows = [(aid_a, datetime(2026, 5, 22))]
     attendee_rows = [(aid_b, datetime(2026, 5, 21))]
     db = _make_db_live(user_rows=user_rows, attendee_rows=attendee_rows)
-    out = await dash.get_adoption(db=db, _admin=SimpleNamespace(is_admin=True))
+    out = await dash._compute_adoption(db)
     assert out["usage"]["cumulative_active"] == 2
 
 
@@ -144,7 +144,7 @@ async def test_active_last_7d_includes_recent():
     user_rows = [(aid, recent)]
     attendee_rows = []
     db = _make_db_live(user_rows=user_rows, attendee_rows=attendee_rows)
-    out = await dash.get_adoption(db=db, _admin=SimpleNamespace(is_admin=True))
+    out = await dash._compute_adoption(db)
     assert out["usage"]["active_last_7d"] == 1
 
 
@@ -156,7 +156,7 @@ async def test_active_last_7d_excludes_older():
     user_rows = [(aid, old)]
     attendee_rows = []
     db = _make_db_live(user_rows=user_rows, attendee_rows=attendee_rows)
-    out = await dash.get_adoption(db=db, _admin=SimpleNamespace(is_admin=True))
+    out = await dash._compute_adoption(db)
     assert out["usage"]["cumulative_active"] == 1  # still ever-active
     assert out["usage"]["active_last_7d"] == 0     # outside 7-day window
 
@@ -171,7 +171,7 @@ async def test_active_last_7d_uses_max_of_login_and_magic():
     user_rows = [(aid, old_login)]
     attendee_rows = [(aid, recent_magic)]
     db = _make_db_live(user_rows=user_rows, attendee_rows=attendee_rows)
-    out = await dash.get_adoption(db=db, _admin=SimpleNamespace(is_admin=True))
+    out = await dash._compute_adoption(db)
     assert out["usage"]["cumulative_active"] == 1
     assert out["usage"]["active_last_7d"] == 1, (
         "max(login_at, seen_at) within 7d should qualify person for active_last_7d"
@@ -186,7 +186,7 @@ async def test_active_last_7d_deduplicates():
     user_rows = [(aid, recent)]
     attendee_rows = [(aid, recent)]  # same person, same timeframe
     db = _make_db_live(user_rows=user_rows, attendee_rows=attendee_rows)
-    out = await dash.get_adoption(db=db, _admin=SimpleNamespace(is_admin=True))
+    out = await dash._compute_adoption(db)
     assert out["usage"]["active_last_7d"] == 1
 
 
@@ -194,7 +194,7 @@ async def test_active_last_7d_deduplicates():
 async def test_cumulative_active_zero_when_no_activity():
     """No user/attendee activity → cumulative_active and active_last_7d are 0."""
     db = _make_db_live(user_rows=[], attendee_rows=[])
-    out = await dash.get_adoption(db=db, _admin=SimpleNamespace(is_admin=True))
+    out = await dash._compute_adoption(db)
     assert out["usage"]["cumulative_active"] == 0
     assert out["usage"]["active_last_7d"] == 0
 
@@ -204,7 +204,7 @@ async def test_usage_by_day_still_comes_from_snapshot():
     """usage_by_day trend chart is still sourced from usage_daily (unchanged)."""
     usage_rows = [(date(2026, 5, 24), 4, 9)]
     db = _make_db_live(usage_by_day_rows=usage_rows)
-    out = await dash.get_adoption(db=db, _admin=SimpleNamespace(is_admin=True))
+    out = await dash._compute_adoption(db)
     assert out["usage_by_day"] == [
         {"day": "2026-05-24", "active_today": 4, "cumulative_active": 9}
     ]
@@ -217,7 +217,7 @@ async def test_live_active_does_not_affect_usage_by_day():
     user_rows = [(aid, datetime(2026, 5, 23))]
     usage_rows = [(date(2026, 5, 24), 2, 99)]  # snapshot has stale/different number
     db = _make_db_live(user_rows=user_rows, usage_by_day_rows=usage_rows)
-    out = await dash.get_adoption(db=db, _admin=SimpleNamespace(is_admin=True))
+    out = await dash._compute_adoption(db)
     # Live count (1) != snapshot's cumulative_active (99) — they're separate
     assert out["usage"]["cumulative_active"] == 1
     assert out["usage_by_day"][0]["cumulative_active"] == 99
@@ -231,5 +231,5 @@ async def test_tracking_started_at_still_from_snapshot():
         (date(2026, 5, 11), 2, 3),
     ]
     db = _make_db_live(usage_by_day_rows=usage_rows)
-    out = await dash.get_adoption(db=db, _admin=SimpleNamespace(is_admin=True))
+    out = await dash._compute_adoption(db)
     assert out["tracking_started_at"] == "2026-05-10"
@@ -0,0 +1,140 @@
+# backend/tests/test_asgi_middleware.py
+"""Pure-ASGI ResponseHeadersMiddleware (security headers + sliding refresh).
+
+Driven at the ASGI level so we can see exactly which messages reach the
+server: headers must be added to http.response.start and every body chunk
+must pass through as-is (no buffering of streaming responses).
+"""
+import uuid
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import get_db
+from app.core.middleware import SECURITY_HEADERS, ResponseHeadersMiddleware
+from app.core.security import create_access_token, create_reset_token, create_stream_ticket
+from app.main import app
+
+
+async def _run(mw, scope):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await mw(scope, receive, send)
+    return sent
+
+
+def _scope(token=None):
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return {"type": "http", "method": "GET", "path": "/", "headers": headers}
+
+
+@pytest.mark.asyncio
+async def test_streamed_chunks_pass_through_unbuffered():
+    seen_by_server = []
+
+    async def streaming_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/event-stream")]})
+        for i in range(3):
+            await send({"type": "http.response.body", "body": f"chunk{i}".encode(), "more_body": True})
+            # The middleware must have forwarded this chunk already.
+            seen_by_server.append(len(sent_so_far))
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    sent_so_far: list = []
+    mw = ResponseHeadersMiddleware(streaming_app)
+
+    async def send(message):
+        sent_so_far.append(message)
+
+    async def receive():
+        return {"type": "http.request"}
+
+    await mw(_scope(), receive, send)
+
+    assert seen_by_server == [2, 3, 4]
+    assert [m.get("body") for m in sent_so_far[1:]] == [b"chunk0", b"chunk1", b"chunk2", b""]
+    start_headers = dict(sent_so_far[0]["headers"])
+    assert start_headers[b"x-frame-options"] == b"DENY"
+    assert start_headers[b"content-type"] == b"text/event-stream"
+
+
+@pytest.mark.asyncio
+async def test_refresh_header_only_near_expiry():
+    async def ok_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    mw = ResponseHeadersMiddleware(ok_app)
+    sub = str(uuid.uuid4())
+    fresh = create_access_token({"sub": sub})
+    near = create_access_token({"sub": sub}, expires_delta=timedelta(minutes=30))
+
+    headers = dict((await _run(mw, _scope(fresh)))[0]["headers"])
+    assert b"x-refresh-token" not in headers
+
+    headers = dict((await _run(mw, _scope(near)))[0]["headers"])
+    assert headers[b"x-refresh-token"]
+    assert headers[b"access-control-expose-headers"] == b"X-Refresh-Token"
+
+    headers = dict((await _run(mw, _scope("garbage")))[0]["headers"])
+    assert b"x-refresh-token" not in headers
+
+
+@pytest.mark.asyncio
+async def test_non_http_scopes_are_untouched():
+    calls = []
+
+    async def lifespan_app(scope, receive, send):
+        calls.append(scope["type"])
+
+    await ResponseHeadersMiddleware(lifespan_app)({"type": "lifespan"}, None, None)
+    assert calls == ["lifespan"]
+
+
+def test_app_is_wired_without_base_http_middleware():
+    from starlette.middleware.base import BaseHTTPMiddleware
+
+    classes = [m.cls for m in app.user_middleware]
+    assert ResponseHeadersMiddleware in classes
+    assert BaseHTTPMiddleware not in classes
+
+    # An unmatched path: no DB, no auth deps (other tests override those on
+    # the shared app), still has to come back with the headers.
+    r = TestClient(app).get("/api/v1/__no_such_route__")
+    assert r.status_code == 404
+    for name, value in SECURITY_HEADERS.items():
+        assert r.headers[name] == value
+
+
+@pytest.mark.parametrize("make", [create_stream_ticket, create_reset_token])
+def test_single_purpose_tokens_are_not_bearer_tokens(make):
+    """A stream ticket leaks via the ?ticket= query string into access
+    logs; it (and a reset link token) must not authenticate as a bearer
+    token, nor be traded for a fresh session by the sliding refresh."""
+    db = AsyncMock()
+
+    async def _db():
+        yield db
+
+    # Other modules install app-wide require_auth overrides at import time;
+    # this test needs the real auth chain, so run with only the db override.
+    saved = dict(app.dependency_overrides)
+    app.dependency_overrides.clear()
+    app.dependency_overrides[get_db] = _db
+    try:
+        r = TestClient(app).get("/api/v1/auth/me", headers={"Authorization": f"Bearer {make(str(uuid.uuid4()))}"})
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(saved)
+
+    assert r.status_code == 401
+    assert "X-Refresh-Token" not in r.headers and "X-Refreshed-Token" not in r.headers
+    db.execute.assert_not_awaited()
@@ -0,0 +1,101 @@
+# backend/tests/test_attendee_heavy_columns.py
+"""Heavy Attendee columns are deferred; only allowlisted code loads them.
+
+The route allowlist is enforced statically (AST over app/api/routes): a
+route that starts reading `attendee.embedding`, or asks load_heavy /
+ensure_heavy for it, fails here until it is added below on purpose.
+"""
+import ast
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+import app.models.attendee as attendee_model
+from app.models.attendee import HEAVY_COLUMNS, Attendee, ensure_heavy, load_heavy
+
+ROUTES_DIR = Path(__file__).resolve().parent.parent / "app" / "api" / "routes"
+
+# route function → heavy columns it may load. Embeddings are deliberately
+# absent: routes that need them go through MatchingEngine.
+ALLOWED_HEAVY_LOADS = {
+    ("enrichment", "enrichment_status"): {"crunchbase_data", "pot_history"},
+}
+
+# Named projections the AST scan resolves.
+_PROJECTIONS = {
+    "MATCHING_COLUMNS": set(attendee_model.MATCHING_COLUMNS),
+    "ENRICHMENT_COLUMNS": set(attendee_model.ENRICHMENT_COLUMNS),
+}
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_select_attendee_skips_heavy_columns_by_default():
+    sql = _sql(select(Attendee))
+    for col in HEAVY_COLUMNS:
+        assert f"attendees.{col}" not in sql
+    assert "attendees.enriched_profile" in sql and "attendees.name" in sql
+
+    sql = _sql(select(Attendee).options(load_heavy("embedding")))
+    assert "attendees.embedding" in sql and "attendees.pot_history" not in sql
+    sql = _sql(select(Attendee).options(load_heavy()))
+    assert all(f"attendees.{col}" in sql for col in HEAVY_COLUMNS)
+
+
+def _heavy_loads(fn: ast.AST) -> set[str]:
+    """Heavy columns a function body reads or explicitly loads."""
+    loaded: set[str] = set()
+    for node in ast.walk(fn):
+        if isinstance(node, ast.Attribute) and node.attr in HEAVY_COLUMNS and isinstance(node.ctx, ast.Load):
+            # `Attendee.embedding` in a WHERE clause is SQL, not a load.
+            if not (isinstance(node.value, ast.Name) and node.value.id == "Attendee"):
+                loaded.add(node.attr)
+        if isinstance(node, ast.Call) and getattr(node.func, "id", None) in {"load_heavy", "ensure_heavy"}:
+            names = set()
+            for arg in node.args:
+                if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                    names.add(arg.value)
+                elif isinstance(arg, ast.Starred):
+                    names |= _PROJECTIONS[arg.value.id]
+            loaded |= names or set(HEAVY_COLUMNS)
+    return loaded
+
+
+def test_only_allowlisted_routes_load_heavy_columns():
+    found = {}
+    for path in sorted(ROUTES_DIR.glob("*.py")):
+        tree = ast.parse(path.read_text())
+        for fn in ast.walk(tree):
+            if isinstance(fn, (ast.AsyncFunctionDef, ast.FunctionDef)):
+                cols = _heavy_loads(fn)
+                if cols:
+                    found[(path.stem, fn.name)] = cols
+    assert found == ALLOWED_HEAVY_LOADS
+    assert not any("embedding" in cols for cols in found.values())
+
+
+@pytest.mark.asyncio
+async def test_ensure_heavy_refreshes_only_what_is_missing(monkeypatch):
+    db = AsyncMock()
+    row = object()
+    state = SimpleNamespace(persistent=True, unloaded={"embedding", "pot_history"})
+    monkeypatch.setattr(attendee_model, "inspect", lambda obj, raiseerr=True: state)
+
+    assert await ensure_heavy(db, row, "embedding", "crunchbase_data") is row
+    db.refresh.assert_awaited_once_with(row, attribute_names=["embedding"])
+
+    db.refresh.reset_mock()
+    state.unloaded = set()
+    await ensure_heavy(db, row, "embedding")
+    db.refresh.assert_not_awaited()  # already loaded → no query
+
+    state.persistent = False
+    state.unloaded = {"embedding"}
+    await ensure_heavy(db, row)
+    db.refresh.assert_not_awaited()  # transient/pending rows have nothing to load
@@ -0,0 +1,112 @@
+# backend/tests/test_attendee_search.py
+"""/attendees/search — indexed FTS + trigram, ranked, keyset-paginated.
+
+SQL is compiled (postgresql dialect) and inspected; the route is driven
+with a mock DB that returns canned (Attendee, rank) rows.
+"""
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.api.routes import attendees as attendees_route
+from app.services import attendee_search as search
+
+
+def _compiled(stmt):
+    c = stmt.compile(dialect=postgresql.dialect())
+    return str(c), c.params
+
+
+def test_prefix_tsquery_strips_operators_and_keeps_accents():
+    assert search.prefix_tsquery_text("Stéph  ven!") == "stéph:* & ven:*"
+    # tsquery syntax in user input can't reach to_tsquery().
+    assert search.prefix_tsquery_text("a|b & !c:*") == "a:* & b:* & c:*"
+    assert search.prefix_tsquery_text("++ @") is None
+
+
+def test_query_is_accent_insensitive_on_both_sides():
+    sql, params = _compiled(search.build_search_query("Chloé", 20))
+    # Columns side: the exact expressions the trigram indexes are built on.
+    assert "immutable_unaccent(lower(attendees.name)) LIKE immutable_unaccent(" in sql
+    assert "immutable_unaccent(lower(attendees.company))" in sql
+    # Term side: tsquery and LIKE pattern are unaccented in SQL too.
+    assert "to_tsquery(%(to_tsquery_1)s, immutable_unaccent(" in sql
+    assert "attendees.search_vector @@" in sql
+    assert "chloé:*" in params.values()
+    assert "%chloé%" in params.values()
+    # The old unindexable form is gone.
+    assert "unaccent(lower(attendees.goals))" not in sql
+
+
+def test_ranked_keyset_order_without_offset():
+    sql, params = _compiled(search.build_search_query("defi", 10))
+    assert "ts_rank(attendees.search_vector" in sql
+    assert "word_similarity(" in sql
+    assert "ORDER BY rank DESC, attendees.id" in sql
+    assert "OFFSET" not in sql
+    assert 11 in params.values()  # limit + 1 to detect a next page
+
+
+def test_like_wildcards_in_term_are_escaped():
+    _sql, params = _compiled(search.build_search_query("100%_", 5))
+    assert "%100\\%\\_%" in params.values()
+
+
+def test_cursor_round_trip_and_predicate():
+    aid = uuid.uuid4()
+    cur = search.encode_cursor(0.25, aid)
+    assert search.decode_cursor(cur) == (0.25, aid)
+
+    sql, params = _compiled(search.build_search_query("defi", 10, cur))
+    assert "attendees.id >" in sql
+    assert aid in params.values()
+    with pytest.raises(ValueError):
+        search.decode_cursor("not-a-cursor")
+
+
+def _attendee(name):
+    return SimpleNamespace(
+        id=uuid.uuid4(), name=name, email=f"{name.lower()}@x.com", company="Acme",
+        title="CEO", ticket_type="delegate", interests=[], goals=None,
+        linkedin_url=None, twitter_handle=None, company_website=None, phone_number=None,
+        photo_url=None, ai_summary=None, intent_tags=[], deal_readiness_score=None,
+        enriched_profile={}, crunchbase_data={}, created_at=None, updated_at=None,
+    )
+
+
+class _Rows:
+    def __init__(self, rows): self._rows = rows
+    def all(self): return self._rows
+
+
+@pytest.mark.asyncio
+async def test_route_returns_next_cursor_only_when_more_rows(monkeypatch):
+    monkeypatch.setattr(
+        attendees_route.AttendeeResponse, "model_validate", classmethod(lambda cls, a: {"name": a.name})
+    )
+    monkeypatch.setattr(
+        attendees_route, "AttendeeListResponse", lambda **kw: SimpleNamespace(**kw)
+    )
+    monkeypatch.setattr(attendees_route, "model_response", lambda model: model)
+    a, b, c = _attendee("Alice"), _attendee("Bob"), _attendee("Chloé")
+    db = AsyncMock()
+    db.execute.return_value = _Rows([(a, 0.9), (b, 0.5), (c, 0.1)])
+
+    out = await attendees_route.search_attendees(q="a", limit=2, cursor=None, db=db, _user=SimpleNamespace())
+    assert [x["name"] for x in out.attendees] == ["Alice", "Bob"]
+    assert search.decode_cursor(out.next_cursor) == (0.5, b.id)
+
+    db.execute.return_value = _Rows([(c, 0.1)])
+    out = await attendees_route.search_attendees(q="a", limit=2, cursor=out.next_cursor, db=db, _user=SimpleNamespace())
+    assert out.total == 1 and out.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_route_rejects_bad_cursor():
+    with pytest.raises(HTTPException) as exc:
+        await attendees_route.search_attendees(q="a", limit=5, cursor="@@", db=AsyncMock(), _user=SimpleNamespace())
+    assert exc.value.status_code == 400
@@ -0,0 +1,104 @@
+# backend/tests/test_b2b_mask_engine.py
+"""Cached single-pass b2b name masking (_b2b_name_masker /
+_mask_texts_for_candidate) and the streaming --bulk mode of
+scripts/redact_b2b_leaks_in_matches.py. No DB."""
+import sys
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import scripts.redact_b2b_leaks_in_matches as redact_script
+from app.services.matching import MatchingEngine, _b2b_name_masker
+
+
+def _b2b(name="Marcello Mari", company="AIVM"):
+    return SimpleNamespace(name=name, company=company, privacy_mode="b2b_only")
+
+
+def test_pattern_is_compiled_once_per_name_and_company():
+    _b2b_name_masker.cache_clear()
+    cand = _b2b()
+    for _ in range(5):
+        MatchingEngine._mask_texts_for_candidate(["Marcello said hi", None, "Ask Mari"], cand)
+    info = _b2b_name_masker.cache_info()
+    assert (info.misses, info.hits) == (1, 4)
+
+
+def test_one_pass_never_rescans_the_replacement():
+    # Sequential per-token subs turned "Marc Atlas" → "Atlas Capital" and
+    # then hit "Atlas" again inside the replacement.
+    cand = _b2b("Marc Atlas", "Atlas Capital")
+    out = MatchingEngine._mask_text_for_candidate("Marc Atlas met marc at the desk.", cand)
+    assert out == "Atlas Capital met Atlas Capital at the desk."
+
+
+def test_fields_stay_separate_and_company_is_literal():
+    cand = _b2b(company=r"A\1 Labs")
+    out = MatchingEngine._mask_texts_for_candidate(
+        ["ends with Marcello", "Mari starts this", None, "Marcellos are fine", "odd\x00Mari"], cand,
+    )
+    assert out == [r"ends with A\1 Labs", r"A\1 Labs starts this", "", "Marcellos are fine", "odd\x00A\\1 Labs"]
+
+
+def test_non_b2b_passes_through_untouched():
+    full = SimpleNamespace(name="Marcello Mari", company="AIVM", privacy_mode="full")
+    assert MatchingEngine._mask_texts_for_candidate(["Marcello Mari", None], full) == ["Marcello Mari", ""]
+
+
+def _row(**kw):
+    base = dict(
+        id=uuid.uuid4(), explanation="Marcello Mari meets Ana Souza.",
+        shared_context={"synergies": ["Ana and Marcello"], "sectors": ["ai"], "fallback": True},
+        a_name="Marcello Mari", a_company="AIVM", a_privacy_mode="b2b_only",
+        b_name="Ana Souza", b_company="Atlas", b_privacy_mode="full",
+    )
+    base.update(kw)
+    return base
+
+
+def test_redact_row_masks_every_b2b_side():
+    both = _row(b_privacy_mode="b2b_only")
+    new = redact_script.redact_row(both)
+    assert new["explanation"] == "AIVM meets Atlas."
+    assert new["shared_context"] == {"synergies": ["Atlas and AIVM"], "sectors": ["ai"], "fallback": True}
+    assert both["shared_context"]["synergies"] == ["Ana and Marcello"]  # input untouched
+
+    assert redact_script.redact_row(_row(explanation="AIVM meets Ana.", shared_context={})) is None
+
+
+class _Session:
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        return self.db
+
+    async def __aexit__(self, *a):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_bulk_streams_partitions_and_batches_updates(monkeypatch, capsys):
+    parts = [[_row(), _row(explanation="clean", shared_context={})], [_row()]]
+
+    async def fake_stream(stmt, chunk_size):
+        assert chunk_size == 2
+        for p in parts:
+            yield p
+
+    writer = AsyncMock()
+    monkeypatch.setattr(redact_script, "stream_partitions", fake_stream)
+    monkeypatch.setattr(redact_script, "async_session", lambda: _Session(writer))
+
+    await redact_script.bulk(confirm=True, preview_limit=1, chunk_size=2)
+
+    assert writer.execute.await_count == 2 and writer.commit.await_count == 2
+    first_batch = writer.execute.await_args_list[0].args[1]
+    assert [u["explanation"] for u in first_batch] == ["AIVM meets Ana Souza."]
+    out = capsys.readouterr().out
+    assert out.count("=== Match") == 1 and "Committed 2 updates (3 b2b matches scanned)" in out
@@ -0,0 +1,126 @@
+# backend/tests/test_conversation_history.py
+"""GET /messages/conversations/{match_id} — keyset pages + set-based read receipts.
+
+Mock DB: `db.execute` records each compiled statement and returns the next
+canned result, so the tests assert both the SQL shape and the response.
+"""
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+import app.api.routes.messages as messages
+from app.utils.cursors import decode_time_cursor, encode_time_cursor
+
+ME, OTHER = uuid.uuid4(), uuid.uuid4()
+MATCH = SimpleNamespace(id=uuid.uuid4(), attendee_a_id=ME, attendee_b_id=OTHER, status="accepted")
+CONV = SimpleNamespace(id=uuid.uuid4())
+T0 = datetime(2026, 6, 2, 10, 0)
+
+
+class _Res:
+    def __init__(self, rows): self._rows = rows
+    def all(self): return list(self._rows)
+    def scalars(self): return self
+
+
+def _person(pid, name):
+    return SimpleNamespace(id=pid, name=name, company="Acme", title="CEO", ticket_type="vip")
+
+
+def _msg(i, sender=OTHER):
+    return SimpleNamespace(
+        id=uuid.UUID(int=i), conversation_id=CONV.id, sender_attendee_id=sender,
+        content=f"m{i}", created_at=T0 + timedelta(minutes=i), read_at=None,
+    )
+
+
+def _db(*results):
+    sql: list[str] = []
+    seq = list(results)
+
+    async def _execute(stmt, params=None):
+        sql.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return seq.pop(0)
+
+    db = AsyncMock()
+    db.execute.side_effect = _execute
+    return db, sql
+
+
+async def _call(db, **kw):
+    params = {"before": None, "after": None, "limit": 3} | kw
+    with patch.object(messages, "_get_and_verify_match", AsyncMock(return_value=MATCH)), \
+         patch.object(messages, "_get_or_create_conversation", AsyncMock(return_value=CONV)), \
+         patch.object(messages.realtime, "publish", AsyncMock()) as publish:
+        out = await messages.get_conversation(
+            MATCH.id, user=SimpleNamespace(attendee_id=ME), db=db, **params
+        )
+    return out, publish
+
+
+@pytest.mark.asyncio
+async def test_newest_page_marks_read_in_one_update_and_pages_backwards():
+    people = _Res([_person(ME, "Me"), _person(OTHER, "Them")])
+    # Newest-first fetch of limit+1 rows → has_more.
+    page = _Res([_msg(9), _msg(8, sender=ME), _msg(7), _msg(6)])
+    db, sql = _db(people, _Res([uuid.uuid4(), uuid.uuid4()]), page)
+
+    out, publish = await _call(db)
+
+    assert sql[1].startswith("UPDATE messages SET read_at=")
+    assert "messages.read_at IS NULL" in sql[1] and "RETURNING messages.id" in sql[1]
+    assert publish.await_args.args[1]["unread_delta"] == -2
+    assert "ORDER BY messages.created_at DESC, messages.id DESC" in sql[2]
+    assert "LIMIT" in sql[2] and "OFFSET" not in sql[2]
+    db.get.assert_not_called()  # counterpart comes from the projected IN query
+
+    assert [m["content"] for m in out["messages"]] == ["m7", "m8", "m9"]  # oldest→newest
+    assert [m["is_mine"] for m in out["messages"]] == [False, True, False]
+    assert out["messages"][1]["sender_name"] == "Me"
+    assert out["has_more"] is True
+    assert decode_time_cursor(out["before_cursor"]) == (T0 + timedelta(minutes=7), uuid.UUID(int=7))
+    assert out["other_attendee"]["name"] == "Them"
+
+
+@pytest.mark.asyncio
+async def test_before_cursor_skips_read_receipts_and_uses_row_comparison():
+    cursor = encode_time_cursor(T0 + timedelta(minutes=7), uuid.UUID(int=7))
+    db, sql = _db(_Res([_person(ME, "Me"), _person(OTHER, "Them")]), _Res([_msg(2), _msg(1)]))
+
+    out, publish = await _call(db, before=cursor)
+
+    assert len(sql) == 2 and not any(s.startswith("UPDATE") for s in sql)
+    publish.assert_not_awaited()
+    assert "(messages.created_at, messages.id) < (" in sql[1]
+    assert [m["content"] for m in out["messages"]] == ["m1", "m2"]
+    assert out["has_more"] is False
+
+
+@pytest.mark.asyncio
+async def test_after_cursor_fetches_newer_ascending():
+    cursor = encode_time_cursor(T0, uuid.UUID(int=0))
+    db, sql = _db(_Res([_person(ME, "Me")]), _Res([]), _Res([_msg(1), _msg(2)]))
+
+    out, publish = await _call(db, after=cursor)
+
+    publish.assert_not_awaited()  # nothing was unread
+    assert "(messages.created_at, messages.id) > (" in sql[2]
+    assert "ORDER BY messages.created_at ASC, messages.id ASC" in sql[2]
+    assert [m["content"] for m in out["messages"]] == ["m1", "m2"]
+    assert out["other_attendee"] is None
+
+
+@pytest.mark.asyncio
+async def test_bad_or_conflicting_cursors_are_400():
+    db, _ = _db(_Res([_person(ME, "Me")]))
+    with pytest.raises(HTTPException) as exc:
+        await _call(db, before="x", after="y")
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException) as exc:
+        await _call(db, before="%%%")
+    assert exc.value.status_code == 400
@@ -0,0 +1,148 @@
+# backend/tests/test_dashboard_aggregates.py
+"""Dashboard analytics run as SQL aggregates, never `select(Attendee)`.
+
+Mock-DB convention (see test_usage_snapshot.py): each `db.execute` pops the
+next canned result. Every statement is also compiled so we can assert the
+routes never pull the embedding / full attendee rows back into Python.
+"""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import app.api.routes.dashboard as dash
+
+
+class _Result:
+    def __init__(self, one=None, rows=()):
+        self._one = one
+        self._rows = list(rows)
+
+    def one(self):
+        return self._one
+
+    def all(self):
+        return self._rows
+
+    def fetchall(self):
+        return self._rows
+
+    def mappings(self):
+        return self
+
+
+def _make_db(results):
+    sql: list[str] = []
+    seq = list(results)
+
+    async def _execute(stmt, params=None):
+        sql.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return seq.pop(0)
+
+    db = AsyncMock()
+    db.execute.side_effect = _execute
+    return db, sql
+
+
+def _assert_no_full_rows(sql):
+    for q in sql:
+        assert "attendees.embedding" not in q
+        assert "attendees.enriched_profile AS" not in q
+
+
+@pytest.mark.asyncio
+async def test_investor_heatmap_two_queries_and_zero_fill():
+    db, sql = _make_db([
+        _Result(rows=[("bitcoin", 4, 3, 0.5), ("privacy", 9, 9, 1.0)]),
+        _Result(one=(10, 2, 3, 5)),
+    ])
+    out = await dash._compute_investor_heatmap(db)
+
+    assert len(sql) == 2
+    _assert_no_full_rows(sql)
+    assert "unnest(attendees.vertical_tags)" in sql[0]
+    assert "FILTER" in sql[1]
+
+    by_v = {h["vertical"]: h for h in out["heatmap"]}
+    assert out["heatmap"][0]["vertical"] == "bitcoin"  # highest capital_active first
+    assert by_v["bitcoin"]["attendee_count"] == 4
+    assert by_v["bitcoin"]["avg_deal_readiness"] == 0.5
+    # Verticals with no rows are still present, zeroed.
+    assert by_v["decentralized_ai"] == {
+        "vertical": "decentralized_ai", "label": "Decentralized Ai",
+        "attendee_count": 0, "capital_active": 0, "avg_deal_readiness": 0.0,
+    }
+    # Only the 11 heatmap verticals are reported.
+    assert "privacy" not in by_v
+    assert out["total_attendees"] == 10
+    assert out["deal_readiness_distribution"] == {"high": 2, "medium": 3, "low": 5}
+
+
+@pytest.mark.asyncio
+async def test_attendees_by_sector_projects_columns():
+    row = SimpleNamespace(id="a-1", name="Alice", title="CEO", company="Acme")
+    db, sql = _make_db([_Result(rows=[row])])
+    out = await dash.attendees_by_sector("defi", db=db, _user=SimpleNamespace())
+
+    assert len(sql) == 1
+    _assert_no_full_rows(sql)
+    assert "= ANY (attendees.interests)" in sql[0]
+    assert out == {
+        "attendees": [{"id": "a-1", "name": "Alice", "title": "CEO", "company": "Acme"}],
+        "total": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_stats_top_sectors_grouped_in_sql():
+    matches = SimpleNamespace(
+        generated=10, accepted=4, declined=1, scheduled=2, shown=1,
+        avg_score=0.7, avg_satisfaction=None,
+    )
+    db, sql = _make_db([
+        _Result(one=(20, 15)),
+        _Result(one=matches),
+        _Result(rows=[("complementary", 10)]),
+        _Result(rows=[("defi", 7), ("rwa", 3)]),
+    ])
+    out = await dash._compute_stats(db)
+
+    assert len(sql) == 4
+    _assert_no_full_rows(sql)
+    assert "unnest(attendees.interests)" in sql[3]
+    assert out["total_attendees"] == 20
+    assert out["enrichment_coverage"] == 0.75
+    assert out["matches_accepted"] == 4
+    assert out["mutual_accept_rate"] == 0.4
+    assert out["post_meeting_satisfaction"] == 0.0
+    assert out["top_sectors"] == [{"sector": "defi", "count": 7}, {"sector": "rwa", "count": 3}]
+
+
+@pytest.mark.asyncio
+async def test_revenue_completeness_from_aggregates():
+    counts = SimpleNamespace(
+        total=100, with_goals=60, with_linkedin=50, with_linkedin_data=40,
+        pending_linkedin=2, with_twitter=5, with_website=70, with_grid=30,
+        with_photo=45, with_targets=20, from_extasy=80, from_speakers=10, from_seed=5,
+    )
+    passes = [
+        {"pass_name": "General Pass", "total": 50, "with_goals": 30, "with_linkedin_data": 20,
+         "with_target_companies": 10, "with_photo": 25, "with_grid": 15},
+        {"pass_name": "VIP Pass", "total": 70, "with_goals": 1, "with_linkedin_data": 1,
+         "with_target_companies": 1, "with_photo": 1, "with_grid": 1},
+    ]
+    db, sql = _make_db([_Result(one=counts), _Result(rows=passes), _Result(rows=[])])
+    with patch.object(dash, "_get_extasy_orders", AsyncMock(return_value=([], None))):
+        out = await dash._compute_revenue(db)
+
+    _assert_no_full_rows(sql)
+    assert "enriched_profile ?" in sql[0]  # JSONB key test, not a str() scan
+    assert out["source_breakdown"] == {
+        "extasy": 80, "speakers_1000minds": 10, "seed": 5, "other": 5, "total": 100,
+    }
+    assert out["profile_completeness"]["pending_linkedin_enrichment"] == 2
+    assert out["profile_completeness"]["with_grid"] == 30
+    assert out["ticket_types_breakdown"]["total"] == 120
+    assert [p["pass_name"] for p in out["ticket_types_breakdown"]["by_pass"]] == ["VIP Pass", "General Pass"]
+    assert out["ticket_types_breakdown"]["completeness"][1]["with_goals"] == 30
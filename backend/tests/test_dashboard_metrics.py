@@ -0,0 +1,232 @@
+# backend/tests/test_dashboard_metrics.py
+"""Materialized dashboard metrics — serve from snapshot, refresh, scheduling.
+
+Same mock-DB convention as test_usage_snapshot.py: `db.execute` returns the
+next canned result; SQL text is captured to check what was written.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import app.api.routes.dashboard as dash
+import app.main as main
+from app.services import advisory_locks as advisory
+from app.services import dashboard_metrics as dm
+
+
+class _First:
+    def __init__(self, row): self._row = row
+    def first(self): return self._row
+
+
+def _make_db(*results):
+    sql: list[str] = []
+    seq = list(results)
+
+    async def _execute(stmt, params=None):
+        sql.append(str(stmt))
+        return seq.pop(0) if seq else None
+
+    db = AsyncMock()
+    db.execute.side_effect = _execute
+    return db, sql
+
+
+def _snapshot(payload, age_seconds):
+    return SimpleNamespace(payload=payload, computed_at=datetime.utcnow() - timedelta(seconds=age_seconds))
+
+
+@pytest.mark.asyncio
+async def test_fresh_snapshot_is_served_without_computing():
+    db, sql = _make_db(_First(_snapshot({"total_matches": 7}, age_seconds=120)))
+    compute = AsyncMock()
+
+    out = await dm.serve_metric(db, "match_quality", compute)
+
+    compute.assert_not_awaited()
+    assert len(sql) == 1 and "FROM dashboard_metrics" in sql[0]
+    assert out["total_matches"] == 7
+    assert 119 <= out["age_seconds"] <= 121
+    assert out["computed_at"]
+
+
+@pytest.mark.asyncio
+async def test_missing_snapshot_is_computed_and_stored():
+    db, sql = _make_db(_First(None), None)
+    compute = AsyncMock(return_value={"total_matches": 3})
+
+    out = await dm.serve_metric(db, "match_quality", compute)
+
+    compute.assert_awaited_once_with(db)
+    assert "INSERT INTO dashboard_metrics" in sql[1]
+    assert "ON CONFLICT (key) DO UPDATE" in sql[1]
+    db.commit.assert_awaited()
+    assert out["total_matches"] == 3
+    assert out["age_seconds"] == 0
+
+
+@pytest.mark.asyncio
+async def test_source_error_keeps_serving_last_good_snapshot():
+    stale = dm.MAX_SNAPSHOT_AGE_SECONDS + 60
+    db, sql = _make_db(_First(_snapshot({"revenue": {"total": 10}}, age_seconds=stale)))
+    compute = AsyncMock(return_value={"error": "Extasy API unavailable: boom"})
+
+    out = await dm.serve_metric(db, "revenue", compute)
+
+    assert out["revenue"] == {"total": 10}
+    assert out["age_seconds"] >= stale
+    assert not any("INSERT" in q for q in sql)
+
+
+@pytest.mark.asyncio
+async def test_refresh_isolates_failing_keys():
+    db, sql = _make_db()
+    computers = {
+        "stats": AsyncMock(return_value={"total_attendees": 1}),
+        "revenue": AsyncMock(return_value={"error": "Extasy API unavailable"}),
+        "adoption": AsyncMock(side_effect=RuntimeError("db hiccup")),
+    }
+
+    stats = await dm.refresh_dashboard_metrics(db, computers)
+
+    assert stats["refreshed"] == 1
+    assert stats["errors"] == 2
+    assert set(stats["failed"]) == {"revenue", "adoption"}
+    assert sum("INSERT INTO dashboard_metrics" in q for q in sql) == 1
+    assert db.rollback.await_count == 2
+
+
+def _computers():
+    return {"stats": AsyncMock(return_value={"total_attendees": 1}),
+            "revenue": AsyncMock(return_value={"revenue": {"total": 10}})}
+
+
+@pytest.mark.asyncio
+async def test_scheduled_refresh_skips_when_another_worker_just_refreshed():
+    cutoff = datetime.utcnow() - timedelta(minutes=9)
+    db, sql = _make_db(_First(SimpleNamespace(n=2, oldest=cutoff + timedelta(minutes=5))))
+    computers = _computers()
+
+    stats = await dm.refresh_if_stale(db, computers, cutoff)
+
+    assert stats["refreshed"] == 0 and stats["skipped"] == "fresh"
+    assert not any(c.await_count for c in computers.values())
+    assert len(sql) == 1 and "min(computed_at)" in sql[0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("row", [
+    SimpleNamespace(n=2, oldest=datetime.utcnow() - timedelta(minutes=12)),   # one stale
+    SimpleNamespace(n=1, oldest=datetime.utcnow()),                           # one missing
+])
+async def test_scheduled_refresh_runs_when_any_snapshot_is_stale_or_missing(row):
+    db, sql = _make_db(_First(row))
+    computers = _computers()
+
+    stats = await dm.refresh_if_stale(db, computers, datetime.utcnow() - timedelta(minutes=9))
+
+    assert stats["refreshed"] == 2
+    assert sum("INSERT INTO dashboard_metrics" in q for q in sql) == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduled_refresh_waits_for_the_worker_holding_the_lock(monkeypatch):
+    """Second worker: lock busy → poll; once free, the first worker's rows
+    are fresh, so nothing is recomputed. The lock is the dashboard key in
+    the jobs namespace, never an attendee key."""
+    monkeypatch.setattr(advisory, "LOCK_POLL_SECONDS", 0.01)
+    locks = advisory.AdvisoryLocks()
+    monkeypatch.setattr(locks, "try_acquire", AsyncMock(side_effect=[False, True]))
+    monkeypatch.setattr(locks, "release", AsyncMock())
+    monkeypatch.setattr(dm, "refresh_locks", locks)
+    since = datetime.utcnow()
+    db, _sql = _make_db(_First(SimpleNamespace(n=2, oldest=since + timedelta(seconds=3))))
+    computers = _computers()
+
+    stats = await dm.refresh_if_stale(db, computers, since)
+
+    assert stats["skipped"] == "fresh"
+    assert not any(c.await_count for c in computers.values())
+    key = (advisory.DASHBOARD_METRICS_KEY, advisory.JOBS_NAMESPACE)
+    assert locks.try_acquire.await_args.args == key
+    locks.release.assert_awaited_once_with(*key)
+
+
+@pytest.mark.asyncio
+async def test_stats_endpoint_serves_snapshot_with_freshness():
+    payload = {
+        "total_attendees": 20, "matches_generated": 10, "matches_accepted": 4,
+        "matches_declined": 1, "enrichment_coverage": 0.75, "avg_match_score": 0.7,
+        "top_sectors": [], "match_type_distribution": {},
+    }
+    db, _sql = _make_db(_First(_snapshot(payload, age_seconds=30)))
+    out = await dash.get_stats(db=db, _user=SimpleNamespace())
+    assert out["total_attendees"] == 20
+    assert out["computed_at"]
+    # Response model accepts the freshness fields.
+    assert dash.DashboardStats(**out).age_seconds == out["age_seconds"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_now_rejects_unknown_keys():
+    from fastapi import HTTPException
+    with pytest.raises(HTTPException) as exc:
+        await dash.refresh_dashboard_metrics_now(keys=["nope"], db=AsyncMock(), _admin=SimpleNamespace())
+    assert exc.value.status_code == 400
+
+
+def test_every_dashboard_card_has_a_computer():
+    assert set(dash.METRIC_COMPUTERS) == {
+        "stats", "match_quality", "investor_heatmap", "revenue", "adoption",
+    }
+
+
+def test_dashboard_metrics_job_is_scheduled_every_10_minutes():
+    job = next(j for j in main.scheduler.get_jobs() if j.func is main._dashboard_metrics_refresh)
+    assert job.trigger.interval == timedelta(minutes=10)
+
+
+@pytest.mark.asyncio
+async def test_dashboard_metrics_refresh_runs_through_heartbeat():
+    with patch.object(main, "_run_with_heartbeat", AsyncMock()) as hb:
+        await main._dashboard_metrics_refresh()
+    hb.assert_awaited_once()
+    assert hb.await_args.args[0] == "dashboard_metrics_refresh"
+
+
+@pytest.mark.asyncio
+async def test_interval_refresh_accepts_snapshots_from_this_interval(monkeypatch):
+    guarded = AsyncMock(return_value={})
+    monkeypatch.setattr(dash, "refresh_metrics_if_stale", guarded)
+    monkeypatch.setattr("app.core.database.async_session", lambda: _Ctx())
+
+    async def _run(job_name, go):
+        return await go()
+
+    with patch.object(main, "_run_with_heartbeat", _run):
+        await main._dashboard_metrics_refresh()
+        cutoff = guarded.await_args.args[1]
+        assert timedelta(minutes=8) < datetime.utcnow() - cutoff <= timedelta(minutes=9, seconds=1)
+
+        since = datetime(2026, 5, 29, 2, 16)
+        await main._dashboard_metrics_refresh(since)
+        assert guarded.await_args.args[1] == since
+
+
+class _Ctx:
+    async def __aenter__(self): return AsyncMock()
+    async def __aexit__(self, *a): return False
+
+
+def test_post_sync_triggers_coalesce_into_one_pending_run():
+    before = datetime.utcnow()
+    with patch.object(main.scheduler, "add_job") as add_job:
+        main._trigger_dashboard_metrics_refresh()
+        main._trigger_dashboard_metrics_refresh()
+    ids = {c.kwargs["id"] for c in add_job.call_args_list}
+    assert ids == {"dashboard_metrics_refresh_event"}
+    # Post-sync runs only accept snapshots computed after the sync finished.
+    assert all(before <= c.kwargs["kwargs"]["since"] <= datetime.utcnow() for c in add_job.call_args_list)
+    assert all(c.kwargs["replace_existing"] for c in add_job.call_args_list)
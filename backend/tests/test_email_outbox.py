@@ -0,0 +1,175 @@
+# backend/tests/test_email_outbox.py
+"""Email outbox (app/services/email_outbox.py): gates at enqueue, batch
+delivery through the LocalResend stand-in, per-email isolation of a
+rejected batch, backoff, and the worker's thread-safe submit path.
+No network, no DB."""
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import app.services.email as email_mod
+import app.services.email_outbox as outbox_mod
+from app.services.email_outbox import MAX_ATTEMPTS, EmailOutboxWorker, LocalResend
+
+
+def _settings(**kw):
+    base = dict(
+        RESEND_API_KEY="re_test", RESEND_API_BASE="https://api.resend.com",
+        RESEND_FROM_EMAIL="PoT <team@x.de>", EMAIL_REPLY_TO="", EMAIL_GLOBAL_DISABLED=False,
+        EMAIL_MODE="allowlist", EMAIL_ALLOWLIST="@team.io,vip@fund.example",
+    )
+    base.update(kw)
+    return SimpleNamespace(**base)
+
+
+def _payload(to="a@team.io", **kw):
+    return {"from": "PoT <team@x.de>", "to": [to], "subject": f"Hi {to}", "html": "<p>x</p>", **kw}
+
+
+def _row(to="a@team.io", attempts=1, critical=False, **kw):
+    return SimpleNamespace(id=uuid.uuid4(), payload=_payload(to, **kw), attempts=attempts, critical=critical)
+
+
+def _worker(monkeypatch, resend: LocalResend, rate: float = 1000.0, **settings):
+    monkeypatch.setattr(outbox_mod, "get_settings", lambda: _settings(**settings))
+    return EmailOutboxWorker(rate_per_second=rate, transport=httpx.MockTransport(resend))
+
+
+def test_send_email_applies_gates_then_queues(monkeypatch):
+    outbox = SimpleNamespace(started=True, submit=MagicMock())
+    monkeypatch.setattr(email_mod, "email_outbox", outbox)
+    monkeypatch.setattr(email_mod.httpx, "post", MagicMock(side_effect=AssertionError("sync POST")))
+    monkeypatch.setattr(email_mod, "get_settings", lambda: _settings())
+
+    assert email_mod._send_email("bob@team.io", "Subj", "<p>h</p>", "t") is True
+    payload = outbox.submit.call_args.args[0]
+    assert payload["to"] == ["bob@team.io"] and payload["text"] == "t"
+    assert outbox.submit.call_args.kwargs == {"critical": False}
+
+    outbox.submit.reset_mock()
+    assert email_mod._send_email("stranger@gmail.com", "Subj", "<p>h</p>") is False
+    outbox.submit.assert_not_called()  # allowlist gate ran before enqueue
+
+    monkeypatch.setattr(email_mod, "get_settings", lambda: _settings(EMAIL_GLOBAL_DISABLED=True))
+    assert email_mod._send_email("bob@team.io", "Subj", "<p>h</p>") is False
+    outbox.submit.assert_not_called()
+    assert email_mod._send_email("bob@team.io", "Reset", "<p>h</p>", critical=True) is True
+    assert outbox.submit.call_args.kwargs == {"critical": True}
+
+
+@pytest.mark.asyncio
+async def test_batch_delivery_is_one_request(monkeypatch):
+    resend = LocalResend()
+    worker = _worker(monkeypatch, resend)
+    rows = [_row(f"p{i}@team.io") for i in range(3)]
+
+    outcomes = await worker._deliver(rows)
+
+    assert resend.requests == [("/emails/batch", 3)]
+    assert [o["new_status"] for o in outcomes] == ["sent"] * 3
+    assert [o["pid"] for o in outcomes] == [e["id"] for e in resend.sent]
+    assert [o["oid"] for o in outcomes] == [r.id for r in rows]
+    assert worker.metrics()["sent"] == 3
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_is_retried_one_by_one_and_throttled(monkeypatch):
+    resend = LocalResend(reject={"bad@team.io"})
+    worker = _worker(monkeypatch, resend, rate=50.0)
+    rows = [_row("a@team.io"), _row("bad@team.io"), _row("c@team.io")]
+
+    t0 = time.monotonic()
+    outcomes = await worker._deliver(rows)
+
+    assert resend.requests == [("/emails/batch", 3)] + [("/emails", 1)] * 3
+    assert time.monotonic() - t0 >= 3 / 50.0  # 4 requests, paced at 50/s
+    assert [o["new_status"] for o in outcomes] == ["sent", "failed", "sent"]
+    assert "422" in outcomes[1]["error"]
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_backs_off_then_gives_up(monkeypatch):
+    resend = LocalResend(fail_with=[503, 429])
+    worker = _worker(monkeypatch, resend)
+
+    before = datetime.utcnow()
+    (first,) = await worker._deliver([_row(attempts=1)])
+    assert first["new_status"] == "pending"
+    assert first["next_at"] >= before + timedelta(seconds=outbox_mod.RETRY_BASE_SECONDS)
+
+    (last,) = await worker._deliver([_row(attempts=MAX_ATTEMPTS)])
+    assert last["new_status"] == "failed" and "429" in last["error"]
+    assert worker.metrics()["retried"] == 1 and worker.metrics()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_attachments_go_single_and_kill_switch_holds_queued_mail(monkeypatch):
+    resend = LocalResend()
+    worker = _worker(monkeypatch, resend, EMAIL_GLOBAL_DISABLED=True)
+    reset = _row("r@team.io", critical=True, attachments=[{"filename": "qr.png", "content": "eA=="}])
+    digest = _row("d@team.io")
+
+    outcomes = await worker._deliver([reset, digest])
+
+    assert resend.requests == [("/emails", 1)]  # batch can't carry attachments
+    assert [o["new_status"] for o in outcomes] == ["sent", "failed"]
+    assert outcomes[1]["error"] == "EMAIL_GLOBAL_DISABLED at delivery"
+
+
+class _Session:
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        return self.db
+
+    async def __aexit__(self, *a):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_submit_from_thread_wakes_worker_which_persists_and_claims(monkeypatch):
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=[])))
+    monkeypatch.setattr(outbox_mod, "async_session", lambda: _Session(db))
+    monkeypatch.setattr(outbox_mod, "POLL_SECONDS", 60.0)
+    worker = _worker(monkeypatch, LocalResend())
+    worker.start()
+    await asyncio.sleep(0.01)  # idle pass
+    db.execute.reset_mock()
+
+    await asyncio.to_thread(worker.submit, _payload("t@team.io"), critical=True)
+    for _ in range(100):
+        if db.execute.await_count >= 2:
+            break
+        await asyncio.sleep(0.01)
+    await worker.close()
+
+    insert_call, claim_call = db.execute.await_args_list[:2]
+    assert insert_call.args[0].__visit_name__ == "insert"
+    (row,) = insert_call.args[1]
+    assert row["to_email"] == "t@team.io" and row["critical"] is True
+    claim_sql = str(claim_call.args[0].compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE SKIP LOCKED" in claim_sql and "RETURNING" in claim_sql
+    assert worker.metrics()["queued"] == 1 and not worker.started
+
+
+@pytest.mark.asyncio
+async def test_failed_persist_keeps_buffer_in_order(monkeypatch):
+    db = AsyncMock()
+    db.execute = AsyncMock(side_effect=ConnectionError("db down"))
+    monkeypatch.setattr(outbox_mod, "async_session", lambda: _Session(db))
+    worker = _worker(monkeypatch, LocalResend())
+    worker.submit(_payload("1@team.io"))
+    worker.submit(_payload("2@team.io"))
+
+    with pytest.raises(ConnectionError):
+        await worker._persist_buffer()
+    assert [p["to"][0] for p, _ in worker._buffer] == ["1@team.io", "2@team.io"]
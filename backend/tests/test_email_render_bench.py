@@ -0,0 +1,24 @@
+# backend/tests/test_email_render_bench.py
+"""scripts/bench_email_render.py must keep exercising every send_* template:
+each case renders (no send), carries its per-recipient values, and leaves
+_send_email untouched afterwards."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app.services.email as email_mod
+from scripts.bench_email_render import render_all
+
+
+def test_every_template_renders_per_recipient():
+    real = email_mod._send_email
+    first, second = render_all(0), render_all(1)
+
+    assert email_mod._send_email is real
+    assert len(first) == 10
+    for name, (subject, html, text) in first.items():
+        assert subject and text, name
+        assert html.startswith("<!DOCTYPE html>") and html.endswith("</body></html>"), name
+        assert "Recipient0" in subject + html + text and "Recipient1" not in html + text, name
+        assert first[name] != second[name], name
@@ -0,0 +1,170 @@
+# backend/tests/test_exports.py
+"""Streaming match exports (app/services/exports.py + dashboard routes).
+
+The DB is never touched: statements are compiled to check the projection,
+and the server-side cursor is faked with a session whose `stream()` hands
+back canned partitions.
+"""
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.dialects import postgresql
+
+import app.api.routes.dashboard as dash
+from app.services import exports
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+async def _parts(*parts):
+    for p in parts:
+        yield p
+
+
+async def _collect(gen) -> bytes:
+    return b"".join([chunk async for chunk in gen])
+
+
+def test_parse_columns_default_dedupe_and_unknown():
+    assert exports.parse_columns(None, ("match_id",)) == ["match_id"]
+    assert exports.parse_columns("status, match_id,status", ()) == ["status", "match_id"]
+    with pytest.raises(ValueError, match="embedding"):
+        exports.parse_columns("match_id,embedding", ())
+
+
+def test_query_projects_only_requested_columns():
+    q = _sql(exports.build_match_export_query(["match_id", "overall_score"], min_score=0.5))
+    assert "JOIN" not in q  # no name columns → no attendee join
+    assert "attendees" not in q
+    assert "matches.overall_score >=" in q
+
+    q = _sql(exports.build_match_export_query(list(exports.FEEDBACK_COLUMNS), feedback_only=True, limit=10))
+    assert "LEFT OUTER JOIN attendees AS attendee_a" in q
+    assert "LEFT OUTER JOIN attendees AS attendee_b" in q
+    assert "embedding" not in q and "enriched_profile" not in q
+    assert "matches.decline_reason IS NOT NULL" in q
+    assert "LIMIT" in q
+
+
+@pytest.mark.asyncio
+async def test_csv_header_once_and_values_serialised():
+    mid = uuid.uuid4()
+    cols = ["match_id", "created_at", "overall_score"]
+    rows1 = [{"match_id": mid, "created_at": datetime(2026, 6, 2, 10, 0), "overall_score": 0.8}]
+    rows2 = [{"match_id": mid, "created_at": None, "overall_score": 0.1}]
+
+    body = await _collect(exports.encode_export(_parts(rows1, rows2), cols, "csv"))
+
+    parsed = list(csv.DictReader(io.StringIO(body.decode())))
+    assert body.decode().count("match_id,created_at") == 1
+    assert parsed[0] == {"match_id": str(mid), "created_at": "2026-06-02T10:00:00", "overall_score": "0.8"}
+    assert parsed[1]["created_at"] == ""
+
+
+@pytest.mark.asyncio
+async def test_empty_csv_still_has_header_and_jsonl_is_line_per_row():
+    assert await _collect(exports.encode_export(_parts(), ["status"], "csv")) == b"status\r\n"
+
+    body = await _collect(exports.encode_export(_parts([{"status": "met"}], [{"status": "déclin"}]), ["status"], "jsonl"))
+    assert [json.loads(line) for line in body.decode().splitlines()] == [{"status": "met"}, {"status": "déclin"}]
+
+
+@pytest.mark.asyncio
+async def test_stream_partitions_uses_server_side_cursor():
+    seen = {}
+
+    class _Result:
+        def mappings(self):
+            return self
+
+        async def partitions(self, size):
+            seen["size"] = size
+            yield [{"a": 1}]
+            yield [{"a": 2}]
+
+    session = AsyncMock()
+
+    async def _stream(stmt):
+        seen["opts"] = stmt.get_execution_options()
+        return _Result()
+
+    session.stream.side_effect = _stream
+    stmt = exports.build_match_export_query(["match_id"])
+    parts = [p async for p in exports.stream_partitions(stmt, chunk_size=250, session=session)]
+
+    assert parts == [[{"a": 1}], [{"a": 2}]]
+    assert seen["opts"]["yield_per"] == 250
+    assert seen["size"] == 250
+
+
+@pytest.mark.asyncio
+async def test_feedback_dataset_csv_streams_with_selected_columns():
+    with patch.object(dash, "stream_partitions", lambda stmt: _parts([{"match_id": "m-1", "status": "met"}])):
+        resp = await dash.feedback_dataset(
+            limit=None, db=AsyncMock(), _admin=SimpleNamespace(),
+            format="csv", columns="match_id,status",
+            match_type=None, created_after=None, created_before=None,
+        )
+    assert isinstance(resp, StreamingResponse)
+    assert resp.media_type.startswith("text/csv")
+    assert 'filename="feedback_dataset_' in resp.headers["content-disposition"]
+    body = await _collect(resp.body_iterator)
+    assert body.decode().splitlines() == ["match_id,status", "m-1,met"]
+
+
+@pytest.mark.asyncio
+async def test_feedback_dataset_json_is_one_joined_query():
+    row = {c: None for c in exports.FEEDBACK_COLUMNS} | {"match_id": uuid.uuid4(), "attendee_a_name": "Alice"}
+
+    class _R:
+        def mappings(self):
+            return self
+
+        def all(self):
+            return [row]
+
+    db = AsyncMock()
+    db.execute.return_value = _R()
+    out = await dash.feedback_dataset(
+        limit=None, db=db, _admin=SimpleNamespace(), format="json", columns=None,
+        match_type=None, created_after=None, created_before=None,
+    )
+    db.execute.assert_awaited_once()
+    db.get.assert_not_called()
+    assert out["total"] == 1
+    assert out["rows"][0]["attendee_a_name"] == "Alice"
+    assert isinstance(out["rows"][0]["match_id"], str)
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_unknown_columns():
+    with pytest.raises(HTTPException) as exc:
+        await dash.export_matches(
+            _admin=SimpleNamespace(), format="jsonl", columns="embedding",
+            match_type=None, status=None, tier=None, min_score=None, feedback_only=False,
+            created_after=None, created_before=None, limit=None,
+        )
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_matches_by_type_stream_is_admin_only():
+    kw = dict(match_type="complementary", limit=20, db=AsyncMock(), format="csv", columns=None)
+    with pytest.raises(HTTPException) as exc:
+        await dash.matches_by_type(_user=SimpleNamespace(is_admin=False), **kw)
+    assert exc.value.status_code == 403
+
+    with patch.object(dash, "stream_partitions", lambda stmt: _parts([])):
+        resp = await dash.matches_by_type(_user=SimpleNamespace(is_admin=True), **kw)
+    assert isinstance(resp, StreamingResponse)
+    assert 'filename="matches_complementary_' in resp.headers["content-disposition"]
@@ -0,0 +1,103 @@
+# backend/tests/test_fast_serialization.py
+"""orjson fast path for the large list routes (app/core/responses.py).
+
+The payload must be byte-for-byte what the old FastAPI path produced, and
+_build_match_response must validate each attendee once and redact in place.
+"""
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+import app.api.routes.matches as matches_route
+from app.core.responses import FastJSONResponse, model_response
+from app.main import app
+from app.schemas.attendee import AttendeeListResponse, AttendeeResponse, MatchListResponse
+
+
+def _attendee(privacy_mode="full", **kw):
+    base = dict(
+        id=uuid.uuid4(), name="Ana Souza", email="ana@fund.example", company="Fund",
+        title="GP", ticket_type="VIP", interests=["defi"], goals="LPs", target_companies=None,
+        seeking=[], not_looking_for=[], preferred_geographies=["EU"], deal_stage=None,
+        photo_url="https://x/p.png", linkedin_url="https://linkedin/ana", twitter_handle="@ana",
+        company_website="https://fund.example", ai_summary="Invests in DeFi.", intent_tags=["deploying_capital"],
+        vertical_tags=["defi"], deal_readiness_score=0.8, enriched_profile={"grid": {"n": 1}, "k": None},
+        privacy_mode=privacy_mode, created_at=datetime(2026, 3, 1, 12, 30, 5, 123456, tzinfo=timezone.utc),
+    )
+    base.update(kw)
+    return SimpleNamespace(**base)
+
+
+def _match(viewer, other, status_a="pending", status_b="pending"):
+    return SimpleNamespace(
+        id=uuid.uuid4(), attendee_a_id=viewer, attendee_b_id=other, similarity_score=0.7,
+        complementary_score=0.6, overall_score=0.65, match_type="complementary", explanation="why",
+        shared_context={"sectors": ["defi"]}, status="pending", status_a=status_a, status_b=status_b,
+        meeting_time=None, meeting_location=None, met_at=None, meeting_outcome=None,
+        satisfaction_score=None, decline_reason=None, hidden_by_user=False, explanation_confidence=None,
+        tier="curated", accepted_a_at=None, accepted_b_at=None, priority_intro_meta=None,
+        created_at=datetime(2026, 3, 2),
+    )
+
+
+class _NoRebuild(AttendeeResponse):
+    def __init__(self, **kw):
+        raise AssertionError("AttendeeResponse rebuilt from a dict")
+
+
+@pytest.mark.asyncio
+async def test_build_match_response_validates_once_and_redacts_in_place(monkeypatch):
+    monkeypatch.setattr(matches_route, "AttendeeResponse", _NoRebuild)
+    viewer = uuid.uuid4()
+    other = _attendee(privacy_mode="b2b_only")
+    db = AsyncMock()
+    db.get.return_value = other
+
+    resp = await matches_route._build_match_response(db, _match(viewer, other.id), viewer)
+
+    att = resp.matched_attendee
+    assert (att.name, att.email, att.title, att.photo_url, att.ai_summary) == ("Fund", None, None, None, None)
+    assert att.company == "Fund" and att.vertical_tags == ["defi"]
+    assert other.name == "Ana Souza"  # ORM row untouched
+
+    # Mutual match → nothing redacted (no mutual slots either: meeting booked).
+    m = _match(viewer, other.id, "accepted", "accepted")
+    m.meeting_time = datetime(2026, 6, 2, 10)
+    resp = await matches_route._build_match_response(db, m, viewer)
+    assert resp.matched_attendee.name == "Ana Souza"
+
+
+def test_model_response_is_byte_identical_to_pydantic_json():
+    viewer = uuid.uuid4()
+    matches = []
+    for i in range(3):
+        other = _attendee(name=f"A{i}")
+        mr = matches_route.MatchResponse.model_validate(_match(viewer, other.id))
+        mr.matched_attendee = AttendeeResponse.model_validate(other)
+        mr.mutual_free_slots = [datetime(2026, 6, 2, 9, tzinfo=timezone.utc)]
+        matches.append(mr)
+    payloads = [
+        MatchListResponse(matches=matches, attendee_id=viewer, tier="GOOD", visible_count=3),
+        AttendeeListResponse(attendees=[AttendeeResponse.model_validate(_attendee()) for _ in range(5)], total=5),
+    ]
+    for model in payloads:
+        r = model_response(model)
+        assert r.media_type == "application/json" and r.status_code == 200
+        # Same bytes modulo whitespace: Pydantic JSON mode is what FastAPI's
+        # jsonable_encoder path emitted before.
+        assert r.body == json.dumps(json.loads(model.model_dump_json()), separators=(",", ":"),
+                                    ensure_ascii=False).encode()
+        assert b'"2026-03-01T12:30:05.123456Z"' in r.body
+
+
+def test_app_default_response_class_is_orjson():
+    from fastapi.datastructures import DefaultPlaceholder
+
+    assert app.router.default_response_class is FastJSONResponse
+    stats = next(r for r in app.routes if getattr(r, "path", "") == "/api/v1/dashboard/stats")
+    rc = stats.response_class
+    assert (rc.value if isinstance(rc, DefaultPlaceholder) else rc) is FastJSONResponse
@@ -3,29 +3,37 @@
 Part A: run_interest_notifications
 Part B: run_mutual_notifications
 
-Uses AsyncMock fake-DB pattern (no test database), monkeypatches email sends.
+Both jobs read one projected/aggregated result set and stamp with one bulk
+UPDATE. The counting / selection / stamping tests run those statements
+against rows in the in-memory sqlite_db fixture (conftest); the per-row
+gate branches use an AsyncMock fake DB that hands back pre-baked rows.
+Email sends are monkeypatched throughout.
 """
 from datetime import datetime, timedelta
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
 
 # ── helpers ──────────────────────────────────────────────────────────────────
 
-def _attendee(
+def _recipient(
     *,
-    id=None,
+    recipient_id=None,
+    n=1,
     name="Test User",
     email="test@example.com",
     email_opt_out=False,
     magic_access_token="tok-abc123",
     last_interest_notified_at=None,
 ):
+    """One row of the interest aggregate: incoming count + gate columns."""
     return SimpleNamespace(
-        id=id or uuid4(),
+        recipient_id=recipient_id or uuid4(),
+        n=n,
         name=name,
         email=email,
         email_opt_out=email_opt_out,
@@ -34,60 +42,57 @@ def _attendee(
     )
 
 
-def _match(
-    *,
-    id=None,
-    attendee_a_id=None,
-    attendee_b_id=None,
-    status_a="pending",
-    status_b="pending",
-    status="pending",
-    mutual_notified_at=None,
-):
-    return SimpleNamespace(
-        id=id or uuid4(),
-        attendee_a_id=attendee_a_id or uuid4(),
-        attendee_b_id=attendee_b_id or uuid4(),
-        status_a=status_a,
-        status_b=status_b,
-        status=status,
-        mutual_notified_at=mutual_notified_at,
-    )
+def _party(*, name="Test User", title="Title", company="Co", email="test@example.com",
+           email_opt_out=False, magic_access_token="tok-abc123"):
+    return dict(name=name, title=title, company=company, email=email,
+                email_opt_out=email_opt_out, magic_access_token=magic_access_token)
+
+
+def _mutual(a=None, b=None, *, id=None):
+    """One row of the mutual query: Match.id + a_*/b_* party columns
+    (all None for a party whose attendee row is gone)."""
+    cols = {"id": id or uuid4()}
+    for side, party in (("a", a), ("b", b)):
+        for field, value in (party or dict.fromkeys(_party())).items():
+            cols[f"{side}_{field}"] = value
+    return SimpleNamespace(**cols)
 
 
 def _make_db(rows_by_query=None):
     """Fake async DB that returns pre-baked rows per execute() call.
 
     rows_by_query: list of lists — each execute() call pops the next list
-    from the front and returns it via .scalars().all().
-    db.get() returns None by default; override per test.
+    from the front and returns it via .all(). Every statement is kept in
+    db.statements (compiled for Postgres in db.sql).
     """
     queues = list(rows_by_query or [])
-    call_idx = 0
-
-    class _Scalars:
-        def __init__(self, items): self._items = items
-        def all(self): return self._items
-        def first(self): return self._items[0] if self._items else None
 
     class _Result:
         def __init__(self, items): self._items = items
-        def scalars(self): return _Scalars(self._items)
+        def all(self): return self._items
 
     db = AsyncMock()
+    db.statements = []
 
-    async def _execute(*a, **kw):
-        nonlocal call_idx
-        rows = queues[call_idx] if call_idx < len(queues) else []
-        call_idx += 1
-        return _Result(rows)
+    async def _execute(stmt, *a, **kw):
+        idx = len(db.statements)
+        db.statements.append(stmt)
+        return _Result(queues[idx] if idx < len(queues) else [])
 
     db.execute = _execute
     db.commit = AsyncMock()
-    db.get = AsyncMock(return_value=None)
+    db.get = AsyncMock(side_effect=AssertionError("per-row db.get is gone"))
+    db.sql = lambda i: str(db.statements[i].compile(dialect=postgresql.dialect()))
     return db
 
 
+def _stamped_ids(stmt):
+    """The id list bound into a bulk `UPDATE ... WHERE id IN (...)`."""
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    (ids,) = [v for k, v in params.items() if k.startswith("id_")]
+    return ids
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Part A — run_interest_notifications
 # ─────────────────────────────────────────────────────────────────────────────
@@ -96,78 +101,47 @@ class TestRunInterestNotifications:
     """run_interest_notifications: incoming-pending counting, skips, sends."""
 
     @pytest.mark.asyncio
-    async def test_counts_incoming_pending_for_b(self):
-        """status_a=accepted, status_b=pending → attendee_b gets +1."""
+    async def test_counts_incoming_interest_per_waiting_side(self, sqlite_db):
+        """A match is incoming for the side still pending while the other
+        side accepted — either way round; anything else doesn't count."""
         from app.services.interest_cron import run_interest_notifications
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status_a="accepted", status_b="pending")
-        # execute #1: pending-side matches; execute #2: attendees with those ids
-        attendee_b = _attendee(id=aid_b)
-
-        db = _make_db(rows_by_query=[[m]])
-        # db.get for the attendee
-        db.get = AsyncMock(side_effect=lambda model, aid: attendee_b if aid == aid_b else None)
+        db = sqlite_db
+        ana, ben, cy, dee = (db.attendee(name=n, email=f"{n}@x.com") for n in ("ana", "ben", "cy", "dee"))
+        db.match(ana, ben, status_a="pending", status_b="accepted")    # ana waits
+        db.match(cy, ana, status_a="accepted", status_b="pending")     # ana waits
+        db.match(ana, dee, status_a="accepted", status_b="pending")    # dee waits
+        db.match(ben, cy, status_a="pending", status_b="pending")      # nobody has asked
+        db.match(ben, dee, status_a="accepted", status_b="accepted")   # already mutual
+        db.match(cy, dee, status_a="declined", status_b="accepted")    # cy said no
 
         sent = []
         with patch("app.services.interest_cron.send_interest_notification",
                    side_effect=lambda **kw: sent.append(kw) or True):
             result = await run_interest_notifications(db)
 
-        assert result["sent"] == 1
-        assert result["skipped"] == 0
-        assert result["errors"] == 0
-        assert sent[0]["to_email"] == "test@example.com"
-        assert sent[0]["count"] == 1
+        assert sorted((kw["to_email"], kw["count"]) for kw in sent) == [("ana@x.com", 2), ("dee@x.com", 1)]
+        assert result == {"sent": 2, "skipped": 0, "errors": 0}
+        assert len(db.statements) == 2   # aggregate + one UPDATE
 
     @pytest.mark.asyncio
-    async def test_counts_incoming_pending_for_a(self):
-        """status_b=accepted, status_a=pending → attendee_a gets +1."""
+    async def test_count_comes_from_aggregate(self):
         from app.services.interest_cron import run_interest_notifications
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status_b="accepted", status_a="pending")
-        attendee_a = _attendee(id=aid_a)
-
-        db = _make_db(rows_by_query=[[m]])
-        db.get = AsyncMock(side_effect=lambda model, aid: attendee_a if aid == aid_a else None)
+        db = _make_db(rows_by_query=[[_recipient(n=3)]])
 
         sent = []
         with patch("app.services.interest_cron.send_interest_notification",
                    side_effect=lambda **kw: sent.append(kw) or True):
             result = await run_interest_notifications(db)
 
-        assert result["sent"] == 1
-        assert sent[0]["count"] == 1
-
-    @pytest.mark.asyncio
-    async def test_aggregates_multiple_incomings(self):
-        """Three matches all pending on B → B gets count=3."""
-        from app.services.interest_cron import run_interest_notifications
-        aid_a1, aid_a2, aid_a3, aid_b = uuid4(), uuid4(), uuid4(), uuid4()
-        matches = [
-            _match(attendee_a_id=aid_a1, attendee_b_id=aid_b, status_a="accepted", status_b="pending"),
-            _match(attendee_a_id=aid_a2, attendee_b_id=aid_b, status_a="accepted", status_b="pending"),
-            _match(attendee_a_id=aid_a3, attendee_b_id=aid_b, status_a="accepted", status_b="pending"),
-        ]
-        attendee_b = _attendee(id=aid_b)
-        db = _make_db(rows_by_query=[matches])
-        db.get = AsyncMock(side_effect=lambda model, aid: attendee_b if aid == aid_b else None)
-
-        sent = []
-        with patch("app.services.interest_cron.send_interest_notification",
-                   side_effect=lambda **kw: sent.append(kw) or True):
-            result = await run_interest_notifications(db)
-
-        assert result["sent"] == 1
+        assert result == {"sent": 1, "skipped": 0, "errors": 0}
+        assert sent[0]["to_email"] == "test@example.com"
         assert sent[0]["count"] == 3
+        assert sent[0]["magic_token"] == "tok-abc123"
 
     @pytest.mark.asyncio
     async def test_skips_email_opt_out(self):
         from app.services.interest_cron import run_interest_notifications
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status_a="accepted", status_b="pending")
-        attendee = _attendee(id=aid_b, email_opt_out=True)
-        db = _make_db(rows_by_query=[[m]])
-        db.get = AsyncMock(return_value=attendee)
+        db = _make_db(rows_by_query=[[_recipient(email_opt_out=True)]])
 
         with patch("app.services.interest_cron.send_interest_notification") as mock_send:
             result = await run_interest_notifications(db)
@@ -178,27 +152,21 @@ class TestRunInterestNotifications:
 
     @pytest.mark.asyncio
     async def test_skips_no_email(self):
+        """Also covers a recipient with no attendee row (LEFT JOIN → NULLs)."""
         from app.services.interest_cron import run_interest_notifications
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status_a="accepted", status_b="pending")
-        attendee = _attendee(id=aid_b, email=None)
-        db = _make_db(rows_by_query=[[m]])
-        db.get = AsyncMock(return_value=attendee)
+        db = _make_db(rows_by_query=[[_recipient(email=None), _recipient(
+            email=None, name=None, email_opt_out=None, magic_access_token=None)]])
 
         with patch("app.services.interest_cron.send_interest_notification") as mock_send:
             result = await run_interest_notifications(db)
 
         mock_send.assert_not_called()
-        assert result["skipped"] == 1
+        assert result["skipped"] == 2
 
     @pytest.mark.asyncio
     async def test_skips_no_magic_token(self):
         from app.services.interest_cron import run_interest_notifications
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status_a="accepted", status_b="pending")
-        attendee = _attendee(id=aid_b, magic_access_token=None)
-        db = _make_db(rows_by_query=[[m]])
-        db.get = AsyncMock(return_value=attendee)
+        db = _make_db(rows_by_query=[[_recipient(magic_access_token=None)]])
 
         with patch("app.services.interest_cron.send_interest_notification") as mock_send:
             result = await run_interest_notifications(db)
@@ -209,11 +177,7 @@ class TestRunInterestNotifications:
     @pytest.mark.asyncio
     async def test_skips_demo_domain(self):
         from app.services.interest_cron import run_interest_notifications
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status_a="accepted", status_b="pending")
-        attendee = _attendee(id=aid_b, email="persona@demo.proofoftalk.io")
-        db = _make_db(rows_by_query=[[m]])
-        db.get = AsyncMock(return_value=attendee)
+        db = _make_db(rows_by_query=[[_recipient(email="persona@demo.proofoftalk.io")]])
 
         with patch("app.services.interest_cron.send_interest_notification") as mock_send:
             result = await run_interest_notifications(db)
@@ -225,12 +189,8 @@ class TestRunInterestNotifications:
     async def test_skips_recently_notified(self):
         """last_interest_notified_at within 20h → throttled."""
         from app.services.interest_cron import run_interest_notifications
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status_a="accepted", status_b="pending")
         recent_ts = datetime.utcnow() - timedelta(hours=5)
-        attendee = _attendee(id=aid_b, last_interest_notified_at=recent_ts)
-        db = _make_db(rows_by_query=[[m]])
-        db.get = AsyncMock(return_value=attendee)
+        db = _make_db(rows_by_query=[[_recipient(last_interest_notified_at=recent_ts)]])
 
         with patch("app.services.interest_cron.send_interest_notification") as mock_send:
             result = await run_interest_notifications(db)
@@ -242,12 +202,8 @@ class TestRunInterestNotifications:
     async def test_sends_when_notified_more_than_20h_ago(self):
         """last_interest_notified_at > 20h ago → eligible, should send."""
         from app.services.interest_cron import run_interest_notifications
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status_a="accepted", status_b="pending")
         old_ts = datetime.utcnow() - timedelta(hours=25)
-        attendee = _attendee(id=aid_b, last_interest_notified_at=old_ts)
-        db = _make_db(rows_by_query=[[m]])
-        db.get = AsyncMock(return_value=attendee)
+        db = _make_db(rows_by_query=[[_recipient(last_interest_notified_at=old_ts)]])
 
         sent = []
         with patch("app.services.interest_cron.send_interest_notification",
@@ -258,97 +214,80 @@ class TestRunInterestNotifications:
         assert len(sent) == 1
 
     @pytest.mark.asyncio
-    async def test_stamps_last_interest_notified_at_on_success(self):
-        """After successful send, last_interest_notified_at is set and commit called."""
+    async def test_stamps_everyone_sent_in_one_update(self, sqlite_db):
+        """Successful sends are stamped by a single bulk UPDATE, then the
+        next run throttles them; a recipient with no attendee row is skipped."""
         from app.services.interest_cron import run_interest_notifications
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status_a="accepted", status_b="pending")
-        attendee = _attendee(id=aid_b)
-        db = _make_db(rows_by_query=[[m]])
-        db.get = AsyncMock(return_value=attendee)
+        db = sqlite_db
+        ok_1, ok_2 = db.attendee(email="ok1@x.com"), db.attendee(email="ok2@x.com")
+        opted_out = db.attendee(email="out@x.com", email_opt_out=True)
+        other = db.attendee(email="other@x.com")
+        for who in (ok_1, opted_out, ok_2, uuid4()):
+            db.match(who, other, status_b="accepted")
 
         with patch("app.services.interest_cron.send_interest_notification", return_value=True):
-            await run_interest_notifications(db)
+            result = await run_interest_notifications(db)
+
+        assert result == {"sent": 2, "skipped": 2, "errors": 0}
+        assert len(db.statements) == 2   # aggregate + one UPDATE
+        stamps = {who: db.read(db.attendees, "last_interest_notified_at", who) for who in (ok_1, ok_2, opted_out)}
+        assert stamps[ok_1] is not None and stamps[ok_1] == stamps[ok_2]
+        assert stamps[opted_out] is None
 
-        assert attendee.last_interest_notified_at is not None
-        db.commit.assert_awaited()
+        with patch("app.services.interest_cron.send_interest_notification") as mock_send:
+            result = await run_interest_notifications(db)
+        mock_send.assert_not_called()
+        assert result == {"sent": 0, "skipped": 4, "errors": 0}
 
     @pytest.mark.asyncio
     async def test_does_not_stamp_on_send_failure(self):
-        """If send returns False, last_interest_notified_at is NOT set."""
+        """If send returns False, no UPDATE is issued."""
         from app.services.interest_cron import run_interest_notifications
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status_a="accepted", status_b="pending")
-        attendee = _attendee(id=aid_b)
-        db = _make_db(rows_by_query=[[m]])
-        db.get = AsyncMock(return_value=attendee)
+        db = _make_db(rows_by_query=[[_recipient()]])
 
         with patch("app.services.interest_cron.send_interest_notification", return_value=False):
             result = await run_interest_notifications(db)
 
-        assert attendee.last_interest_notified_at is None
+        assert len(db.statements) == 1
         # counted as skipped (send returned False), not error
         assert result["sent"] == 0
+        assert result["skipped"] == 1
 
     @pytest.mark.asyncio
     async def test_no_pending_matches_returns_zero_counts(self):
-        """No pending-sided matches → nothing to do."""
+        """Empty aggregate → nothing to do, nothing written."""
         from app.services.interest_cron import run_interest_notifications
-        # Two mutual matches, no pending sides
-        aid_a, aid_b = uuid4(), uuid4()
-        matches = [
-            _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status_a="accepted", status_b="accepted"),
-        ]
-        db = _make_db(rows_by_query=[matches])
+        db = _make_db(rows_by_query=[[]])
 
         with patch("app.services.interest_cron.send_interest_notification") as mock_send:
             result = await run_interest_notifications(db)
 
         mock_send.assert_not_called()
-        assert result["sent"] == 0
-        assert result["skipped"] == 0
+        assert result == {"sent": 0, "skipped": 0, "errors": 0}
+        assert len(db.statements) == 1
 
     @pytest.mark.asyncio
     async def test_per_attendee_error_counted_not_raised(self):
         """An exception during a single attendee's send is caught; others proceed."""
         from app.services.interest_cron import run_interest_notifications
-        aid_a, aid_b, aid_c = uuid4(), uuid4(), uuid4()
-        aid_d = uuid4()
-        matches = [
-            _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status_a="accepted", status_b="pending"),
-            _match(attendee_a_id=aid_c, attendee_b_id=aid_d, status_a="accepted", status_b="pending"),
-        ]
-        attendee_b = _attendee(id=aid_b)
-        attendee_d = _attendee(id=aid_d)
-
-        db = _make_db(rows_by_query=[matches])
-
-        call_count = 0
-        def _get(model, aid):
-            if aid == aid_b:
-                return attendee_b
-            if aid == aid_d:
-                return attendee_d
-            return None
-
-        db.get = AsyncMock(side_effect=_get)
-
-        sends = []
+        failing, fine = _recipient(), _recipient()
+        db = _make_db(rows_by_query=[[failing, fine]])
+
         call_n = 0
         def _side(*a, **kw):
             nonlocal call_n
             call_n += 1
             if call_n == 1:
                 raise RuntimeError("network timeout")
-            sends.append(kw)
             return True
 
         with patch("app.services.interest_cron.send_interest_notification", side_effect=_side):
             result = await run_interest_notifications(db)
 
-        # One error, one send
+        # One error, one send — and only the successful one is stamped
         assert result["errors"] == 1
         assert result["sent"] == 1
+        assert _stamped_ids(db.statements[1]) == [fine.recipient_id]
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -359,44 +298,35 @@ class TestRunMutualNotifications:
     """run_mutual_notifications: un-notified mutual matches → emails to both parties."""
 
     @pytest.mark.asyncio
-    async def test_picks_only_unnotified_mutuals(self):
-        """status='accepted', mutual_notified_at=None → selected."""
+    async def test_picks_only_unnotified_mutuals(self, sqlite_db):
+        """status='accepted', mutual_notified_at IS NULL, both parties joined
+        in; the processed match is stamped so the next run skips it."""
         from app.services.interest_cron import run_mutual_notifications
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status="accepted", mutual_notified_at=None)
-
-        att_a = _attendee(id=aid_a, name="Alice", email="alice@x.com")
-        att_b = _attendee(id=aid_b, name="Bob", email="bob@x.com")
+        db = sqlite_db
+        alice = db.attendee(name="Alice", email="alice@x.com")
+        bob = db.attendee(name="Bob", title="CTO", company="Acme", email="bob@x.com")
+        cy = db.attendee(name="Cy", email="cy@x.com")
+        mutual = db.match(alice, bob, status="accepted", status_a="accepted", status_b="accepted")
+        db.match(alice, cy, status="accepted", status_a="accepted", status_b="accepted",
+                 mutual_notified_at=datetime(2026, 5, 1))
+        db.match(bob, cy, status="pending", status_a="accepted")
 
-        db = _make_db(rows_by_query=[[m]])
-        db.get = AsyncMock(side_effect=lambda model, aid: att_a if aid == aid_a else att_b)
-
-        sent_to = []
+        sent = []
         with patch("app.services.interest_cron.send_mutual_match_email",
-                   side_effect=lambda **kw: sent_to.append(kw.get("to_email")) or True):
+                   side_effect=lambda **kw: sent.append(kw) or True):
             result = await run_mutual_notifications(db)
 
-        assert result["sent"] == 2           # both parties
-        assert result["errors"] == 0
-        assert set(sent_to) == {"alice@x.com", "bob@x.com"}
+        assert result == {"sent": 2, "skipped": 0, "errors": 0}
+        assert {kw["to_email"] for kw in sent} == {"alice@x.com", "bob@x.com"}
+        to_alice = next(kw for kw in sent if kw["to_email"] == "alice@x.com")
+        assert (to_alice["other_name"], to_alice["other_title"], to_alice["other_company"]) == ("Bob", "CTO", "Acme")
+        assert db.read(db.matches, "mutual_notified_at", mutual) is not None
 
-    @pytest.mark.asyncio
-    async def test_stamps_mutual_notified_at(self):
-        """match.mutual_notified_at is set after emails go out."""
-        from app.services.interest_cron import run_mutual_notifications
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status="accepted", mutual_notified_at=None)
-        att_a = _attendee(id=aid_a, email="alice@x.com")
-        att_b = _attendee(id=aid_b, email="bob@x.com")
-
-        db = _make_db(rows_by_query=[[m]])
-        db.get = AsyncMock(side_effect=lambda model, aid: att_a if aid == aid_a else att_b)
-
-        with patch("app.services.interest_cron.send_mutual_match_email", return_value=True):
-            await run_mutual_notifications(db)
-
-        assert m.mutual_notified_at is not None
-        db.commit.assert_awaited()
+        sent.clear()
+        with patch("app.services.interest_cron.send_mutual_match_email",
+                   side_effect=lambda **kw: sent.append(kw) or True):
+            result = await run_mutual_notifications(db)
+        assert sent == [] and result["sent"] == 0
 
     @pytest.mark.asyncio
     async def test_skips_already_notified_mutuals(self):
@@ -410,46 +340,14 @@ class TestRunMutualNotifications:
 
         mock_send.assert_not_called()
         assert result["sent"] == 0
-
-    @pytest.mark.asyncio
-    async def test_does_not_resend_on_rerun(self):
-        """Idempotency: run once, mutual_notified_at is set, second run sees empty list."""
-        from app.services.interest_cron import run_mutual_notifications
-
-        # First run: one un-notified match
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status="accepted", mutual_notified_at=None)
-        att_a = _attendee(id=aid_a, email="a@x.com")
-        att_b = _attendee(id=aid_b, email="b@x.com")
-
-        db1 = _make_db(rows_by_query=[[m]])
-        db1.get = AsyncMock(side_effect=lambda model, aid: att_a if aid == aid_a else att_b)
-
-        with patch("app.services.interest_cron.send_mutual_match_email", return_value=True):
-            r1 = await run_mutual_notifications(db1)
-
-        assert r1["sent"] == 2
-        assert m.mutual_notified_at is not None
-
-        # Second run: match now has mutual_notified_at set — simulate DB returning []
-        db2 = _make_db(rows_by_query=[[]])
-        with patch("app.services.interest_cron.send_mutual_match_email") as mock_send2:
-            r2 = await run_mutual_notifications(db2)
-
-        mock_send2.assert_not_called()
-        assert r2["sent"] == 0
+        assert len(db.statements) == 1   # no UPDATE
 
     @pytest.mark.asyncio
     async def test_respects_opt_out_per_party(self):
         """One party has email_opt_out=True → only other party gets email; match still stamped."""
         from app.services.interest_cron import run_mutual_notifications
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status="accepted", mutual_notified_at=None)
-        att_a = _attendee(id=aid_a, email="a@x.com", email_opt_out=True)
-        att_b = _attendee(id=aid_b, email="b@x.com", email_opt_out=False)
-
+        m = _mutual(_party(email="a@x.com", email_opt_out=True), _party(email="b@x.com"))
         db = _make_db(rows_by_query=[[m]])
-        db.get = AsyncMock(side_effect=lambda model, aid: att_a if aid == aid_a else att_b)
 
         sent_to = []
         with patch("app.services.interest_cron.send_mutual_match_email",
@@ -459,49 +357,35 @@ class TestRunMutualNotifications:
         assert sent_to == ["b@x.com"]   # only the non-opted-out party
         assert result["sent"] == 1
         # match is still stamped even though one side was skipped
-        assert m.mutual_notified_at is not None
+        assert _stamped_ids(db.statements[1]) == [m.id]
 
     @pytest.mark.asyncio
     async def test_respects_no_email_per_party(self):
-        """One party has no email → only other party gets email."""
+        """One party has no email (or no attendee row) → only other party gets email."""
         from app.services.interest_cron import run_mutual_notifications
-        aid_a, aid_b = uuid4(), uuid4()
-        m = _match(attendee_a_id=aid_a, attendee_b_id=aid_b, status="accepted", mutual_notified_at=None)
-        att_a = _attendee(id=aid_a, email=None)
-        att_b = _attendee(id=aid_b, email="b@x.com")
-
-        db = _make_db(rows_by_query=[[m]])
-        db.get = AsyncMock(side_effect=lambda model, aid: att_a if aid == aid_a else att_b)
+        m1 = _mutual(_party(email=None), _party(email="b@x.com"))
+        m2 = _mutual(None, _party(email="d@x.com"))
+        db = _make_db(rows_by_query=[[m1, m2]])
 
-        sent_to = []
+        sent = []
         with patch("app.services.interest_cron.send_mutual_match_email",
-                   side_effect=lambda **kw: sent_to.append(kw.get("to_email")) or True):
+                   side_effect=lambda **kw: sent.append(kw) or True):
             result = await run_mutual_notifications(db)
 
-        assert sent_to == ["b@x.com"]
-        assert result["sent"] == 1
+        assert [kw["to_email"] for kw in sent] == ["b@x.com", "d@x.com"]
+        assert sent[1]["other_name"] == ""   # vanished partner renders blank
+        assert result["sent"] == 2
+        assert result["skipped"] == 2
 
     @pytest.mark.asyncio
     async def test_per_match_error_counted_not_raised(self):
-        """Exception during a match's processing is caught; others proceed."""
+        """Exception during a match's processing is caught; others proceed
+        and only the processed match is stamped (the failed one retries)."""
         from app.services.interest_cron import run_mutual_notifications
-        aid_a1, aid_b1 = uuid4(), uuid4()
-        aid_a2, aid_b2 = uuid4(), uuid4()
-        m1 = _match(attendee_a_id=aid_a1, attendee_b_id=aid_b1, status="accepted", mutual_notified_at=None)
-        m2 = _match(attendee_a_id=aid_a2, attendee_b_id=aid_b2, status="accepted", mutual_notified_at=None)
-
-        att_a1 = _attendee(id=aid_a1, email="a1@x.com")
-        att_b1 = _attendee(id=aid_b1, email="b1@x.com")
-        att_a2 = _attendee(id=aid_a2, email="a2@x.com")
-        att_b2 = _attendee(id=aid_b2, email="b2@x.com")
-
+        m1 = _mutual(_party(email="a1@x.com"), _party(email="b1@x.com"))
+        m2 = _mutual(_party(email="a2@x.com"), _party(email="b2@x.com"))
         db = _make_db(rows_by_query=[[m1, m2]])
 
-        def _get(model, aid):
-            return {aid_a1: att_a1, aid_b1: att_b1, aid_a2: att_a2, aid_b2: att_b2}.get(aid)
-
-        db.get = AsyncMock(side_effect=_get)
-
         call_n = 0
         def _send(**kw):
             nonlocal call_n
@@ -513,4 +397,6 @@ class TestRunMutualNotifications:
         with patch("app.services.interest_cron.send_mutual_match_email", side_effect=_send):
             result = await run_mutual_notifications(db)
 
-        assert result["errors"] >= 1
+        assert result["errors"] == 1
+        assert result["sent"] == 2
+        assert _stamped_ids(db.statements[1]) == [m2.id]
@@ -69,10 +69,10 @@ async def test_register_fresh_attendee_dispatches_full_enrichment():
     with patch.object(auth, "get_settings",
                       lambda: SimpleNamespace(REQUIRE_TICKET_TO_REGISTER=False,
                                               SPONSOR_INVITE_CODE="")), \
-         patch.object(auth, "get_password_hash", lambda p: "hashed"), \
+         patch.object(auth, "hash_password_async", AsyncMock(return_value="hashed")), \
          patch.object(auth, "create_access_token", lambda c: "jwt"), \
          patch.object(auth, "run_full_enrichment", AsyncMock()) as enrich, \
-         patch.object(auth, "refresh_profile_matches", AsyncMock()) as refresh, \
+         patch.object(auth, "request_profile_refresh", MagicMock()) as refresh, \
          patch("asyncio.create_task", ct):
         out = await auth.register.__wrapped__(SimpleNamespace(), data, None, db)
     assert out.access_token == "jwt"
@@ -106,14 +106,14 @@ async def test_register_existing_enriched_attendee_dispatches_refresh_only():
     with patch.object(auth, "get_settings",
                       lambda: SimpleNamespace(REQUIRE_TICKET_TO_REGISTER=True,
                                               SPONSOR_INVITE_CODE="")), \
-         patch.object(auth, "get_password_hash", lambda p: "hashed"), \
+         patch.object(auth, "hash_password_async", AsyncMock(return_value="hashed")), \
          patch.object(auth, "create_access_token", lambda c: "jwt"), \
          patch.object(auth, "run_full_enrichment", AsyncMock()) as enrich, \
-         patch.object(auth, "refresh_profile_matches", AsyncMock()) as refresh, \
+         patch.object(auth, "request_profile_refresh", MagicMock()) as refresh, \
          patch("asyncio.create_task", ct):
         out = await auth.register.__wrapped__(SimpleNamespace(), data, None, db)
     assert out.access_token == "jwt"
-    refresh.assert_called_once()
+    refresh.assert_called_once_with(existing_attendee.id, immediate=True)
     enrich.assert_not_called()
 
 
@@ -136,7 +136,7 @@ def _join_settings(code="secret-code"):
 
 async def _call_join(data, db, settings):
     with patch.object(auth, "get_settings", lambda: settings), \
-         patch.object(auth, "get_password_hash", lambda p: "hashed"), \
+         patch.object(auth, "hash_password_async", AsyncMock(return_value="hashed")), \
          patch.object(auth, "create_access_token", lambda c: "jwt-token"), \
          patch.object(auth, "run_full_enrichment", AsyncMock()) as enrich, \
          patch("asyncio.create_task", _fake_ct()) as ct:
@@ -193,7 +193,7 @@ async def test_profile_save_dispatches_refresh():
     db = AsyncMock()
     db.get = AsyncMock(return_value=attendee)
     ct = _fake_ct()
-    with patch.object(auth, "refresh_profile_matches", AsyncMock()) as refresh, \
+    with patch.object(auth, "request_profile_refresh", MagicMock()) as refresh, \
          patch("asyncio.create_task", ct), \
          patch.object(auth, "UserResponse") as UR, \
          patch("app.schemas.attendee.AttendeeResponse") as AR:
@@ -201,7 +201,7 @@ async def test_profile_save_dispatches_refresh():
         AR.model_validate.return_value = {}
         await auth.update_profile({"goals": "new goals"}, user, db)
     refresh.assert_called_once_with(aid)
-    ct.assert_called_once()
+    ct.assert_not_called()  # queued, not a task per save
 
 
 @pytest.mark.asyncio
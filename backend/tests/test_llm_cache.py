@@ -0,0 +1,168 @@
+# backend/tests/test_llm_cache.py
+"""Prompt-fingerprint cache (app/services/llm_cache.py) and its use in
+rank_and_explain: key stability/sensitivity, the UPDATE … RETURNING read,
+failure → miss, and the hit path skipping OpenAI. No network, no DB."""
+import json
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import app.services.llm_cache as cache_mod
+import app.services.matching as matching_mod
+from app.services.matching import MatchingEngine
+
+
+class _Session:
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        return self.db
+
+    async def __aexit__(self, *a):
+        return False
+
+
+@pytest.fixture(autouse=True)
+def _fresh_counters(monkeypatch):
+    monkeypatch.setattr(cache_mod, "_counters", {"hits": 0, "misses": 0, "stores": 0, "errors": 0})
+    monkeypatch.setattr(cache_mod, "_ttl_hours", lambda: 168)
+
+
+def _key(**kw):
+    base = dict(model="gpt-4o", prompt="Rank these:\nCandidate 1", temperature=0.2, max_tokens=2000)
+    base.update(kw)
+    return cache_mod.fingerprint(**base)
+
+
+def test_fingerprint_is_stable_and_sensitive_to_every_input():
+    assert _key() == _key() and len(_key()) == 64
+    # Trailing whitespace / surrounding blank lines are invisible to the model.
+    assert _key(prompt="\nRank these:  \nCandidate 1\n\n") == _key()
+    assert _key(model="gpt-4o-mini") != _key()
+    assert _key(temperature=0.3) != _key()
+    assert _key(max_tokens=1500) != _key()
+    assert _key(prompt="Rank these:\nCandidate 2") != _key()
+
+
+@pytest.mark.asyncio
+async def test_lookup_is_one_update_returning_and_counts_hits(monkeypatch):
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=[{"candidate_index": 1}])))
+    monkeypatch.setattr(cache_mod, "async_session", lambda: _Session(db))
+
+    assert await cache_mod.lookup("k" * 64) == [{"candidate_index": 1}]
+
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE llm_cache SET hits=(llm_cache.hits +")
+    assert "llm_cache.expires_at >" in sql and "RETURNING llm_cache.payload" in sql
+    db.commit.assert_awaited_once()
+    assert cache_mod.llm_cache_metrics() == {"hits": 1, "misses": 0, "stores": 0, "errors": 0, "hit_rate": 1.0}
+
+
+@pytest.mark.asyncio
+async def test_db_failure_is_a_miss_not_an_error_to_the_caller(monkeypatch):
+    db = AsyncMock()
+    db.execute = AsyncMock(side_effect=ConnectionError("pooler down"))
+    monkeypatch.setattr(cache_mod, "async_session", lambda: _Session(db))
+
+    assert await cache_mod.lookup("k" * 64) is None
+    await cache_mod.store("k" * 64, "gpt-4o", [])
+
+    m = cache_mod.llm_cache_metrics()
+    assert (m["hits"], m["misses"], m["stores"], m["errors"]) == (0, 1, 0, 2)
+
+
+@pytest.mark.asyncio
+async def test_ttl_zero_disables_without_touching_the_db(monkeypatch):
+    monkeypatch.setattr(cache_mod, "_ttl_hours", lambda: 0)
+    monkeypatch.setattr(cache_mod, "async_session", MagicMock(side_effect=AssertionError("db touched")))
+
+    assert await cache_mod.lookup("k" * 64) is None
+    await cache_mod.store("k" * 64, "gpt-4o", [])
+
+
+@pytest.mark.asyncio
+async def test_store_upserts_with_fresh_ttl(monkeypatch):
+    db = AsyncMock()
+    monkeypatch.setattr(cache_mod, "async_session", lambda: _Session(db))
+
+    await cache_mod.store("k" * 64, "gpt-4o", [{"candidate_index": 2}])
+
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("INSERT INTO llm_cache")
+    assert "ON CONFLICT (key) DO UPDATE SET" in sql and "expires_at = %(" in sql and "hits = %(" in sql
+    assert cache_mod.llm_cache_metrics()["stores"] == 1
+
+
+# ── rank_and_explain wiring ──────────────────────────────────────────────────
+
+def _person(name: str, company: str):
+    return SimpleNamespace(
+        id=uuid.uuid4(), name=name, title="Partner", company=company, goals="Meet builders",
+        target_companies=None, interests=["rwa"], ai_summary="Invests in RWA.", intent_tags=[],
+        vertical_tags=["tokenisation"], deal_readiness_score=0.5, enriched_profile={},
+        privacy_mode="full",
+    )
+
+
+def _engine():
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=MagicMock(scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=[])))))
+    return MatchingEngine(db)
+
+
+def _gpt_reply(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def _rank_env(monkeypatch):
+    monkeypatch.setattr(matching_mod.settings, "AI_RERANK_ENABLED", False)
+    monkeypatch.setattr(matching_mod.settings, "AI_CONFIDENCE_ENABLED", False)
+    create = AsyncMock()
+    monkeypatch.setattr(matching_mod, "client", SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    store = AsyncMock()
+    monkeypatch.setattr(cache_mod, "store", store)
+    return create, store
+
+
+@pytest.mark.asyncio
+async def test_rank_and_explain_hit_skips_openai(monkeypatch, _rank_env):
+    create, store = _rank_env
+    target, cand = _person("Ana Souza", "Atlas"), _person("Li Wei", "Orbit")
+    cached = [{"candidate_index": 1, "candidate_name": "Li Wei", "overall_score": 0.8,
+               "match_type": "complementary", "explanation": "cached", "shared_context": {}}]
+    lookup = AsyncMock(return_value=cached)
+    monkeypatch.setattr(cache_mod, "lookup", lookup)
+
+    ranked = await _engine().rank_and_explain(target, [(cand, 0.7)])
+
+    create.assert_not_awaited()
+    store.assert_not_awaited()
+    assert ranked[0]["explanation"] == "cached"
+    assert len(lookup.await_args.args[0]) == 64
+
+
+@pytest.mark.asyncio
+async def test_rank_and_explain_miss_stores_only_parsed_json(monkeypatch, _rank_env):
+    create, store = _rank_env
+    monkeypatch.setattr(cache_mod, "lookup", AsyncMock(return_value=None))
+    target, cand = _person("Ana Souza", "Atlas"), _person("Li Wei", "Orbit")
+    answer = [{"candidate_index": 1, "candidate_name": "Li Wei", "overall_score": 0.9,
+               "match_type": "deal_ready", "explanation": "fresh", "shared_context": {}}]
+
+    create.return_value = _gpt_reply("```json\n" + json.dumps(answer) + "\n```")
+    ranked = await _engine().rank_and_explain(target, [(cand, 0.7)])
+    assert ranked[0]["explanation"] == "fresh"
+    key, model, payload = store.await_args.args
+    assert len(key) == 64 and payload == answer and model == create.await_args.kwargs["model"]
+
+    store.reset_mock()
+    create.return_value = _gpt_reply("Sorry, I can't help with that.")
+    ranked = await _engine().rank_and_explain(target, [(cand, 0.7)])
+    store.assert_not_awaited()  # a garbled answer must not be pinned for a week
+    assert ranked[0]["explanation"] == "Match based on profile similarity."
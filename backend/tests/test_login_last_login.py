@@ -23,7 +23,7 @@ class _ScalarResult:
 async def _call_login(db, user):
     """Invoke the undecorated coroutine (bypasses the slowapi limiter)."""
     data = SimpleNamespace(email=user.email, password="pw")
-    with patch.object(auth, "verify_password", MagicMock(return_value=True)), \
+    with patch.object(auth, "verify_password_async", AsyncMock(return_value=True)), \
          patch.object(auth, "create_access_token", MagicMock(return_value="jwt")):
         return await auth.login.__wrapped__(SimpleNamespace(), data, db)
 
@@ -89,7 +89,7 @@ async def test_login_bad_password_still_401_and_no_stamp():
     db.execute.return_value = _ScalarResult(user)
     data = SimpleNamespace(email="a@b.com", password="wrong")
     from fastapi import HTTPException
-    with patch.object(auth, "verify_password", MagicMock(return_value=False)):
+    with patch.object(auth, "verify_password_async", AsyncMock(return_value=False)):
         with pytest.raises(HTTPException) as ei:
             await auth.login.__wrapped__(SimpleNamespace(), data, db)
     assert ei.value.status_code == 401
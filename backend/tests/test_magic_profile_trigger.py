@@ -35,7 +35,7 @@ async def test_magic_profile_save_dispatches_refresh():
         coro.close()
         return MagicMock()
 
-    with patch.object(matches, "refresh_profile_matches", AsyncMock()) as refresh, \
+    with patch.object(matches, "request_profile_refresh", MagicMock()) as refresh, \
          patch("asyncio.create_task", MagicMock(side_effect=_ct)):
         out = await matches.update_profile_via_magic_link(
             "tok-abcdef1234567890", data, db
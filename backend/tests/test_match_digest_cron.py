@@ -92,64 +92,73 @@ def test_digest_email_truncates_long_explanation(monkeypatch):
 
 
 # ── cron tests ───────────────────────────────────────────────────────────────
+#
+# run_match_digest reads (1) the per-recipient aggregate — new-pending count
+# + gate columns — and (2) the featured match for recipients who pass, then
+# (3) stamps with one UPDATE. Counting, "new since last digest" and top-score
+# selection happen in SQL, so they run against rows in the sqlite_db fixture
+# (conftest); the gate branches are fed rows shaped like the aggregate.
 
+NOW = datetime(2026, 5, 29, 9, 0)
 
-def _attendee(*, id=None, email_addr="x@y.com", name="Person", company="Co",
-              title="Title", magic_access_token="t", email_opt_out=False,
-              last_match_digest_at=None, privacy_mode="full"):
-    return SimpleNamespace(
-        id=id or uuid4(), email=email_addr, name=name, company=company,
-        title=title, magic_access_token=magic_access_token,
-        email_opt_out=email_opt_out, last_match_digest_at=last_match_digest_at,
-        privacy_mode=privacy_mode,
-    )
 
-
-def _match_row(*, attendee_a_id, attendee_b_id, tier="curated",
-               status_a="pending", status_b="pending", overall_score=0.85,
-               explanation="x", created_at=None):
-    if created_at is None:
-        created_at = datetime(2026, 5, 28, 12, 0)
-    return SimpleNamespace(
-        attendee_a_id=attendee_a_id, attendee_b_id=attendee_b_id,
-        tier=tier, status_a=status_a, status_b=status_b,
-        overall_score=overall_score, explanation=explanation,
-        created_at=created_at,
-    )
+def _person(db, name, **cols):
+    return db.attendee(name=name, title=f"{name} title", company=f"{name} Co",
+                       email=f"{name.lower()}@x.com", **cols)
 
 
-def _mock_db(matches, attendees_by_id):
-    """Build a mock AsyncSession that returns `matches` on the .execute call
-    and lets `.get(Attendee, id)` look up `attendees_by_id`."""
-    def _scalar_factory(items):
-        scalars_obj = MagicMock()
-        scalars_obj.all = MagicMock(return_value=items)
-        r = MagicMock()
-        r.scalars = MagicMock(return_value=scalars_obj)
-        return r
-    db = AsyncMock()
-    db.execute = AsyncMock(return_value=_scalar_factory(matches))
-    db.get = AsyncMock(side_effect=lambda model, the_id: attendees_by_id.get(the_id))
-    db.commit = AsyncMock()
-    return db
+def _new_matches(db, recipient, n, *, created_at=NOW - timedelta(hours=1)):
+    """n curated matches with `recipient` pending on side A."""
+    for i in range(n):
+        db.match(recipient, _person(db, f"Filler{i}{recipient.hex[:4]}"), status_b="accepted",
+                 overall_score=0.5, created_at=created_at, explanation="filler")
 
 
 @pytest.mark.asyncio
-async def test_threshold_three_fires_below_three_skips(monkeypatch):
-    a1 = _attendee(name="Alice", email_addr="alice@x.com")
-    b1, b2, b3 = (_attendee(name=f"B{i}", email_addr=f"b{i}@x.com") for i in range(3))
-    # Three curated matches for Alice — meets threshold of 3.
-    matches = [
-        _match_row(attendee_a_id=a1.id, attendee_b_id=b.id)
-        for b in (b1, b2, b3)
-    ]
-    db = _mock_db(matches, {a1.id: a1, b1.id: b1, b2.id: b2, b3.id: b3})
+async def test_counts_new_pending_matches_per_side(sqlite_db, monkeypatch):
+    """A match counts for each side still pending on it, only if it's a
+    digest tier and was created after that side's last digest."""
+    db = sqlite_db
+    last = NOW - timedelta(days=5)
+    ana = _person(db, "Ana", last_match_digest_at=last)
+    ben = _person(db, "Ben")
+    cy = _person(db, "Cy")
+    fresh, stale = NOW - timedelta(days=1), NOW - timedelta(days=6)
+
+    db.match(ana, ben, created_at=fresh, overall_score=0.8)                            # both pending
+    db.match(ben, ana, created_at=fresh, overall_score=0.7)                            # both pending
+    db.match(ana, cy, created_at=fresh, overall_score=0.6, status_a="accepted")        # cy only
+    db.match(cy, ana, created_at=stale, overall_score=0.9)                             # old for ana
+    db.match(ana, cy, created_at=fresh, overall_score=0.9, tier="discovery")           # wrong tier
+    captured = _capture_sends(monkeypatch)
+
+    res = await mdc.run_match_digest(db, threshold=2, now=NOW)
+
+    counts = {kw["to_email"]: kw["new_count"] for kw in captured}
+    # ana: 2 new (the stale one predates her digest); ben: 2; cy: 2 (never sent,
+    # so the stale match counts too), while ana's accepted side doesn't count.
+    assert counts == {"ana@x.com": 2, "ben@x.com": 2, "cy@x.com": 2}
+    assert res == {"sent": 3, "skipped": 0, "errors": 0, "eligible": 3}
+
+    # Ben declined his side of a new match: it counts for ana only.
+    db.match(ana, ben, created_at=fresh, status_b="declined")
+    db.conn.execute(db.attendees.update().values(last_match_digest_at=None))
+    captured.clear()
+    await mdc.run_match_digest(db, threshold=4, now=NOW)
+    assert [(kw["to_email"], kw["new_count"]) for kw in captured] == [("ana@x.com", 4)]
 
-    captured = []
-    monkeypatch.setattr(mdc, "send_match_digest_email",
-                        lambda **kw: (captured.append(kw), True)[1])
-    res = await mdc.run_match_digest(db, threshold=3)
-    assert res["sent"] == 1
+
+@pytest.mark.asyncio
+async def test_threshold_three_fires_below_three_skips(sqlite_db, monkeypatch):
+    db = sqlite_db
+    alice, bob = _person(db, "Alice"), _person(db, "Bob")
+    _new_matches(db, alice, 3)
+    _new_matches(db, bob, 2)
+    captured = _capture_sends(monkeypatch)
+
+    res = await mdc.run_match_digest(db, threshold=3, now=NOW)
+    # The 5 fillers each have an accepted side, so they aren't recipients.
+    assert res == {"sent": 1, "skipped": 1, "errors": 0, "eligible": 1}
     assert len(captured) == 1
     assert captured[0]["to_email"] == "alice@x.com"
     assert captured[0]["new_count"] == 3
@@ -157,238 +166,233 @@ async def test_threshold_three_fires_below_three_skips(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_two_matches_below_threshold_skipped(monkeypatch):
-    a1 = _attendee(name="Alice", email_addr="alice@x.com")
-    b1, b2 = _attendee(name="B1"), _attendee(name="B2")
-    matches = [
-        _match_row(attendee_a_id=a1.id, attendee_b_id=b1.id),
-        _match_row(attendee_a_id=a1.id, attendee_b_id=b2.id),
-    ]
-    db = _mock_db(matches, {a1.id: a1, b1.id: b1, b2.id: b2})
+async def test_features_the_top_new_match(sqlite_db, monkeypatch):
+    """Highest overall_score among the recipient's *new* matches (newest
+    first on a tie), with the counterpart's display columns."""
+    db = sqlite_db
+    alice = _person(db, "Alice", last_match_digest_at=NOW - timedelta(days=4))
+    old_best, best, tie_old, tie_new, low = (_person(db, n) for n in ("Old", "Best", "TieOld", "TieNew", "Low"))
+    db.match(alice, old_best, overall_score=0.99, created_at=NOW - timedelta(days=5), explanation="old")
+    db.match(best, alice, overall_score=0.91, created_at=NOW - timedelta(days=2), explanation="best")
+    db.match(alice, low, overall_score=None, created_at=NOW - timedelta(days=1), explanation="low")
+    captured = _capture_sends(monkeypatch)
+
+    await mdc.run_match_digest(db, threshold=2, now=NOW)
+    assert captured[0]["top_match_name"] == "Best"
+    assert captured[0]["top_match_title"] == "Best title"
+    assert captured[0]["top_match_company"] == "Best Co"
+    assert captured[0]["top_explanation"] == "best"
 
-    captured = []
-    monkeypatch.setattr(mdc, "send_match_digest_email",
-                        lambda **kw: (captured.append(kw), True)[1])
-    res = await mdc.run_match_digest(db, threshold=3)
-    assert res["sent"] == 0
-    assert res["skipped"] >= 1
-    assert captured == []
+    db.conn.execute(db.attendees.update().values(last_match_digest_at=NOW - timedelta(days=4)))
+    db.match(alice, tie_old, overall_score=0.95, created_at=NOW - timedelta(days=3), explanation="tie old")
+    db.match(tie_new, alice, overall_score=0.95, created_at=NOW - timedelta(hours=2), explanation="tie new")
+    captured.clear()
+    await mdc.run_match_digest(db, threshold=2, now=NOW)
+    assert captured[0]["top_match_name"] == "TieNew"
+    assert captured[0]["new_count"] == 4
 
 
 @pytest.mark.asyncio
-async def test_throttle_skips_recently_notified(monkeypatch):
-    now = datetime(2026, 5, 29, 9, 0)
-    recent = now - timedelta(hours=10)   # inside 72h window
-    a1 = _attendee(name="Alice", email_addr="alice@x.com", last_match_digest_at=recent)
-    bs = [_attendee(name=f"B{i}") for i in range(4)]
-    matches = [_match_row(attendee_a_id=a1.id, attendee_b_id=b.id) for b in bs]
-    db = _mock_db(matches, {a1.id: a1, **{b.id: b for b in bs}})
+async def test_featured_query_only_for_recipients_past_every_gate(sqlite_db, monkeypatch):
+    db = sqlite_db
+    opted_out = _person(db, "Opted", email_opt_out=True)
+    _new_matches(db, opted_out, 3)
+    captured = _capture_sends(monkeypatch)
 
-    captured = []
-    monkeypatch.setattr(mdc, "send_match_digest_email",
-                        lambda **kw: (captured.append(kw), True)[1])
-    res = await mdc.run_match_digest(db, threshold=3, throttle_hours=72, now=now)
-    assert res["sent"] == 0
-    assert res["skipped"] >= 1
+    res = await mdc.run_match_digest(db, threshold=3, now=NOW)
+    assert res == {"sent": 0, "skipped": 1, "errors": 0, "eligible": 1}
+    assert captured == [] and len(db.statements) == 1  # no featured query, no UPDATE
 
 
 @pytest.mark.asyncio
-async def test_only_counts_matches_created_after_last_digest(monkeypatch):
-    now = datetime(2026, 5, 29, 9, 0)
-    last_digest = now - timedelta(hours=80)   # outside throttle, valid cutoff
-    a1 = _attendee(name="Alice", email_addr="alice@x.com",
-                   last_match_digest_at=last_digest)
-    bs = [_attendee(name=f"B{i}") for i in range(5)]
-    # 2 OLD (pre-last_digest) + 3 NEW (post-last_digest) — should fire on 3.
-    old_ts = last_digest - timedelta(hours=5)
-    new_ts = last_digest + timedelta(hours=5)
-    matches = (
-        [_match_row(attendee_a_id=a1.id, attendee_b_id=bs[i].id, created_at=old_ts)
-         for i in range(2)]
-        + [_match_row(attendee_a_id=a1.id, attendee_b_id=bs[i].id, created_at=new_ts)
-           for i in range(2, 5)]
-    )
-    db = _mock_db(matches, {a1.id: a1, **{b.id: b for b in bs}})
-
-    captured = []
-    monkeypatch.setattr(mdc, "send_match_digest_email",
-                        lambda **kw: (captured.append(kw), True)[1])
-    res = await mdc.run_match_digest(db, threshold=3, throttle_hours=72, now=now)
+async def test_b2b_only_top_match_uses_company_name(sqlite_db, monkeypatch):
+    db = sqlite_db
+    alice = _person(db, "Alice")
+    hidden = db.attendee(name="Real Name", title="CEO", company="Elliptic", privacy_mode="b2b_only")
+    db.match(alice, hidden, overall_score=0.9, created_at=NOW)
+    _new_matches(db, alice, 2)
+    captured = _capture_sends(monkeypatch)
+
+    res = await mdc.run_match_digest(db, threshold=3, now=NOW)
     assert res["sent"] == 1
-    assert captured[0]["new_count"] == 3   # only the 3 new ones
+    assert captured[0]["top_match_name"] == "Elliptic"
+    assert captured[0]["top_match_title"] == ""
+    assert "Real Name" not in str(captured[0])
 
 
 @pytest.mark.asyncio
-async def test_opt_out_attendees_skipped(monkeypatch):
-    a1 = _attendee(name="Opt", email_addr="opt@x.com", email_opt_out=True)
-    bs = [_attendee(name=f"B{i}") for i in range(3)]
-    matches = [_match_row(attendee_a_id=a1.id, attendee_b_id=b.id) for b in bs]
-    db = _mock_db(matches, {a1.id: a1, **{b.id: b for b in bs}})
-
-    captured = []
+async def test_throttle_stamp_set_in_one_update_on_successful_send(sqlite_db, monkeypatch):
+    db = sqlite_db
+    earlier = NOW - timedelta(days=10)
+    ok_1, failed, ok_2 = (_person(db, n, last_match_digest_at=earlier) for n in ("Ok1", "Failed", "Ok2"))
+    for who in (ok_1, failed, ok_2):
+        _new_matches(db, who, 3)
     monkeypatch.setattr(mdc, "send_match_digest_email",
-                        lambda **kw: (captured.append(kw), True)[1])
-    res = await mdc.run_match_digest(db, threshold=3)
-    assert res["sent"] == 0
-    assert captured == []
+                        lambda **kw: kw["to_email"] != "failed@x.com")
 
+    res = await mdc.run_match_digest(db, threshold=3, now=NOW)
+    assert res["sent"] == 2 and res["skipped"] == 1
+    assert len(db.statements) == 3  # aggregate, featured, one UPDATE
+    stamped = {who: db.read(db.attendees, "last_match_digest_at", who) for who in (ok_1, failed, ok_2)}
+    assert stamped == {ok_1: NOW, failed: earlier, ok_2: NOW}
 
-@pytest.mark.asyncio
-async def test_no_magic_token_skipped(monkeypatch):
-    a1 = _attendee(name="Alice", email_addr="alice@x.com", magic_access_token=None)
-    bs = [_attendee(name=f"B{i}") for i in range(3)]
-    matches = [_match_row(attendee_a_id=a1.id, attendee_b_id=b.id) for b in bs]
-    db = _mock_db(matches, {a1.id: a1, **{b.id: b for b in bs}})
+    # Stamped recipients are throttled on the next run; the failed one retries.
+    sends = _capture_sends(monkeypatch)
+    res = await mdc.run_match_digest(db, threshold=3, now=NOW + timedelta(hours=1))
+    assert [kw["to_email"] for kw in sends] == ["failed@x.com"]
+    assert res["skipped"] == 2
 
-    captured = []
-    monkeypatch.setattr(mdc, "send_match_digest_email",
-                        lambda **kw: (captured.append(kw), True)[1])
-    res = await mdc.run_match_digest(db, threshold=3)
-    assert res["sent"] == 0
-    assert captured == []
 
+# Gate branches, on rows shaped like the aggregate.
 
-@pytest.mark.asyncio
-async def test_already_reviewed_matches_dont_count(monkeypatch):
-    """If Alice already accepted/declined a curated match, that match should
-    NOT count toward the digest threshold — she has already seen it."""
-    a1 = _attendee(name="Alice", email_addr="alice@x.com")
-    bs = [_attendee(name=f"B{i}") for i in range(4)]
-    # 2 already-reviewed (a-side accepted) + 2 pending = only 2 new — below 3.
-    matches = (
-        [_match_row(attendee_a_id=a1.id, attendee_b_id=bs[i].id, status_a="accepted")
-         for i in range(2)]
-        + [_match_row(attendee_a_id=a1.id, attendee_b_id=bs[i].id)
-           for i in range(2, 4)]
+def _recipient(*, recipient_id=None, new_count=3, email_addr="x@y.com", name="Person",
+               magic_access_token="t", email_opt_out=False, last_match_digest_at=None,
+               attendee_id=...):
+    recipient_id = recipient_id or uuid4()
+    return SimpleNamespace(
+        recipient_id=recipient_id, new_count=new_count,
+        attendee_id=recipient_id if attendee_id is ... else attendee_id,
+        name=name, email=email_addr, email_opt_out=email_opt_out,
+        magic_access_token=magic_access_token, last_match_digest_at=last_match_digest_at,
     )
-    db = _mock_db(matches, {a1.id: a1, **{b.id: b for b in bs}})
 
+
+def _featured(recipient, *, name="Top", title="CTO", company="TopCo",
+              privacy_mode="full", explanation="best", other_id=...):
+    return SimpleNamespace(
+        recipient_id=recipient.recipient_id, explanation=explanation,
+        other_id=uuid4() if other_id is ... else other_id,
+        other_name=name, other_title=title, other_company=company,
+        other_privacy_mode=privacy_mode,
+    )
+
+
+def _mock_db(recipients, featured=()):
+    """AsyncSession stand-in: execute #1 → aggregate rows, #2 → featured
+    rows, later calls (the stamp UPDATE) → nothing. Statements are kept."""
+    results = [list(recipients), list(featured)]
+    db = AsyncMock()
+    db.statements = []
+
+    async def _execute(stmt, *a, **kw):
+        rows = results[len(db.statements)] if len(db.statements) < len(results) else []
+        db.statements.append(stmt)
+        return MagicMock(all=MagicMock(return_value=rows))
+
+    db.execute = _execute
+    db.get = AsyncMock(side_effect=AssertionError("per-row db.get is gone"))
+    db.commit = AsyncMock()
+    return db
+
+
+def _capture_sends(monkeypatch):
     captured = []
     monkeypatch.setattr(mdc, "send_match_digest_email",
                         lambda **kw: (captured.append(kw), True)[1])
-    res = await mdc.run_match_digest(db, threshold=3)
-    assert res["sent"] == 0
-    assert captured == []
+    return captured
 
 
 @pytest.mark.asyncio
-async def test_features_highest_score_match_in_digest(monkeypatch):
-    a1 = _attendee(name="Alice", email_addr="alice@x.com")
-    low = _attendee(name="LowScore", company="LowCo", title="Junior")
-    mid = _attendee(name="MidScore", company="MidCo", title="Senior")
-    high = _attendee(name="TopMatch", company="TopCo", title="CTO")
-    matches = [
-        _match_row(attendee_a_id=a1.id, attendee_b_id=low.id, overall_score=0.62, explanation="low"),
-        _match_row(attendee_a_id=a1.id, attendee_b_id=mid.id, overall_score=0.74, explanation="mid"),
-        _match_row(attendee_a_id=a1.id, attendee_b_id=high.id, overall_score=0.91, explanation="best"),
-    ]
-    db = _mock_db(matches, {a1.id: a1, low.id: low, mid.id: mid, high.id: high})
+async def test_empty_pool_returns_zero_counts(monkeypatch):
+    db = _mock_db([])
+    _capture_sends(monkeypatch)
+    res = await mdc.run_match_digest(db)
+    assert res == {"sent": 0, "skipped": 0, "errors": 0, "eligible": 0}
+    assert len(db.statements) == 1
 
-    captured = []
-    monkeypatch.setattr(mdc, "send_match_digest_email",
-                        lambda **kw: (captured.append(kw), True)[1])
-    res = await mdc.run_match_digest(db, threshold=3)
-    assert res["sent"] == 1
-    assert captured[0]["top_match_name"] == "TopMatch"
-    assert captured[0]["top_match_company"] == "TopCo"
-    assert captured[0]["top_explanation"] == "best"
+
+@pytest.mark.asyncio
+async def test_throttle_skips_recently_notified(monkeypatch):
+    now = datetime(2026, 5, 29, 9, 0)
+    recent = now - timedelta(hours=10)   # inside 72h window
+    alice = _recipient(name="Alice", email_addr="alice@x.com", new_count=4,
+                       last_match_digest_at=recent)
+    db = _mock_db([alice])
+    captured = _capture_sends(monkeypatch)
+
+    res = await mdc.run_match_digest(db, threshold=3, throttle_hours=72, now=now)
+    assert res["sent"] == 0
+    assert res["skipped"] == 1
+    assert captured == []
+    assert len(db.statements) == 1   # no featured query, no UPDATE
 
 
 @pytest.mark.asyncio
-async def test_priority_intro_tier_counts(monkeypatch):
-    """priority_intro tier matches should count just like curated."""
-    a1 = _attendee(name="Alice", email_addr="alice@x.com")
-    bs = [_attendee(name=f"B{i}") for i in range(3)]
-    matches = [
-        _match_row(attendee_a_id=a1.id, attendee_b_id=bs[i].id, tier="priority_intro")
-        for i in range(3)
-    ]
-    db = _mock_db(matches, {a1.id: a1, **{b.id: b for b in bs}})
+async def test_tz_aware_last_digest_from_postgres_does_not_crash(monkeypatch):
+    """Regression: timestamps come back from Supabase with tz info (+00:00)
+    even though the ORM column is `DateTime` not `DateTime(tz)`. Comparing
+    against a naive cutoff used to raise TypeError and the whole cron
+    returned errors=N, sent=0. _naive() strips tz on read."""
+    now = datetime(2026, 5, 29, 9, 0)
+    stale = datetime(2026, 5, 20, 9, 0, tzinfo=timezone.utc)
+    alice = _recipient(email_addr="alice@x.com", last_match_digest_at=stale)
+    db = _mock_db([alice], [_featured(alice)])
+    _capture_sends(monkeypatch)
 
-    captured = []
-    monkeypatch.setattr(mdc, "send_match_digest_email",
-                        lambda **kw: (captured.append(kw), True)[1])
-    res = await mdc.run_match_digest(db, threshold=3)
+    res = await mdc.run_match_digest(db, threshold=3, now=now)
+    assert res["errors"] == 0
     assert res["sent"] == 1
-    assert captured[0]["new_count"] == 3
 
 
 @pytest.mark.asyncio
-async def test_b2b_only_top_match_uses_company_name(monkeypatch):
-    a1 = _attendee(name="Alice", email_addr="alice@x.com")
-    top = _attendee(name="Real Name", company="Elliptic", privacy_mode="b2b_only")
-    others = [_attendee(name=f"B{i}") for i in range(2)]
-    matches = (
-        [_match_row(attendee_a_id=a1.id, attendee_b_id=top.id, overall_score=0.95)]
-        + [_match_row(attendee_a_id=a1.id, attendee_b_id=o.id, overall_score=0.70)
-           for o in others]
-    )
-    db = _mock_db(matches, {a1.id: a1, top.id: top, **{o.id: o for o in others}})
+async def test_gates_skip_opt_out_no_token_no_email_demo_and_missing_attendee(monkeypatch):
+    rows = [
+        _recipient(email_opt_out=True),
+        _recipient(magic_access_token=None),
+        _recipient(email_addr="  "),
+        _recipient(email_addr="persona@demo.proofoftalk.io"),
+        _recipient(attendee_id=None, email_addr=None, name=None),
+    ]
+    db = _mock_db(rows)
+    captured = _capture_sends(monkeypatch)
 
-    captured = []
-    monkeypatch.setattr(mdc, "send_match_digest_email",
-                        lambda **kw: (captured.append(kw), True)[1])
     res = await mdc.run_match_digest(db, threshold=3)
-    assert res["sent"] == 1
-    assert captured[0]["top_match_name"] == "Elliptic"
-    assert captured[0]["top_match_title"] == ""
-    assert "Real Name" not in str(captured[0])
+    assert res == {"sent": 0, "skipped": 5, "errors": 0, "eligible": 4}
+    assert captured == []
+    assert len(db.statements) == 1
 
 
 @pytest.mark.asyncio
-async def test_tz_aware_created_at_from_postgres_does_not_crash(monkeypatch):
-    """Regression: Match.created_at comes back from Supabase with tz info
-    (+00:00) even though the ORM column is `DateTime` not `DateTime(tz)`.
-    Comparing it against a naive cutoff used to raise TypeError and the
-    whole cron returned errors=N, sent=0. The _naive() helper strips tz
-    on read so the comparison succeeds."""
-    a1 = _attendee(name="Alice", email_addr="alice@x.com")
-    bs = [_attendee(name=f"B{i}") for i in range(3)]
-    tz_aware = datetime(2026, 5, 28, 12, 0, tzinfo=timezone.utc)
-    matches = [
-        _match_row(attendee_a_id=a1.id, attendee_b_id=bs[i].id, created_at=tz_aware)
-        for i in range(3)
-    ]
-    db = _mock_db(matches, {a1.id: a1, **{b.id: b for b in bs}})
-    captured = []
-    monkeypatch.setattr(mdc, "send_match_digest_email",
-                        lambda **kw: (captured.append(kw), True)[1])
+async def test_missing_featured_counterpart_skipped(monkeypatch):
+    gone = _recipient(email_addr="gone@x.com")
+    none_found = _recipient(email_addr="none@x.com")
+    db = _mock_db([gone, none_found], [_featured(gone, other_id=None)])
+    captured = _capture_sends(monkeypatch)
+
     res = await mdc.run_match_digest(db, threshold=3)
-    assert res["errors"] == 0
-    assert res["sent"] == 1
+    assert res["sent"] == 0 and res["skipped"] == 2
+    assert captured == []
 
 
 @pytest.mark.asyncio
 async def test_max_sends_caps_run(monkeypatch):
     """A runaway scenario (cold-start, mass insert) must not blow through the
-    domain's reputation budget. max_sends caps a single run."""
-    recipients = [_attendee(name=f"A{i}", email_addr=f"a{i}@x.com") for i in range(10)]
-    matches: list = []
-    all_attendees: list = list(recipients)
-    for a in recipients:
-        bs = [_attendee(name=f"B{a.name}{i}") for i in range(3)]
-        all_attendees.extend(bs)
-        for b in bs:
-            matches.append(_match_row(attendee_a_id=a.id, attendee_b_id=b.id))
-    by_id = {x.id: x for x in all_attendees}
-    db = _mock_db(matches, by_id)
-    captured: list = []
-    monkeypatch.setattr(mdc, "send_match_digest_email",
-                        lambda **kw: (captured.append(kw), True)[1])
+    domain's reputation budget. max_sends caps a single run; recipients the
+    cap leaves for tomorrow aren't tallied as eligible or skipped."""
+    recipients = [_recipient(name=f"A{i}", email_addr=f"a{i}@x.com") for i in range(10)]
+    db = _mock_db(recipients, [_featured(r) for r in recipients])
+    captured = _capture_sends(monkeypatch)
+
     res = await mdc.run_match_digest(db, threshold=3, max_sends=3)
-    assert res["sent"] == 3
+    assert res == {"sent": 3, "skipped": 0, "errors": 0, "eligible": 3}
     assert len(captured) == 3
 
 
 @pytest.mark.asyncio
-async def test_throttle_stamp_set_on_successful_send(monkeypatch):
-    a1 = _attendee(name="Alice", email_addr="alice@x.com")
-    assert a1.last_match_digest_at is None
-    bs = [_attendee(name=f"B{i}") for i in range(3)]
-    matches = [_match_row(attendee_a_id=a1.id, attendee_b_id=b.id) for b in bs]
-    db = _mock_db(matches, {a1.id: a1, **{b.id: b for b in bs}})
-    monkeypatch.setattr(mdc, "send_match_digest_email", lambda **kw: True)
-    now = datetime(2026, 5, 29, 9, 0)
-    res = await mdc.run_match_digest(db, threshold=3, now=now)
-    assert res["sent"] == 1
-    assert a1.last_match_digest_at == now
+async def test_max_sends_tally_stops_at_the_break(monkeypatch):
+    """Skips before the cap count; gate failures after it don't."""
+    rows = [
+        _recipient(email_addr="a@x.com"),
+        _recipient(email_opt_out=True),              # eligible, skipped
+        _recipient(new_count=1),                     # below threshold, skipped
+        _recipient(email_addr="b@x.com"),            # second send hits the cap
+        _recipient(email_opt_out=True),
+        _recipient(new_count=1),
+        _recipient(email_addr="c@x.com"),
+    ]
+    db = _mock_db(rows, [_featured(r) for r in rows])
+    captured = _capture_sends(monkeypatch)
+
+    res = await mdc.run_match_digest(db, threshold=3, max_sends=2)
+    assert res == {"sent": 2, "skipped": 2, "errors": 0, "eligible": 3}
+    assert [kw["to_email"] for kw in captured] == ["a@x.com", "b@x.com"]
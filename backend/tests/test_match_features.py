@@ -0,0 +1,150 @@
+# backend/tests/test_match_features.py
+"""Per-attendee feature records behind _deterministic_rerank: the vertical
+bitmask matrix must agree with the COMPLEMENTARY_VERTICALS pair loop it
+replaced, bits stay limited to the taxonomy, scores are identical to the
+pre-feature-record boost loop (ICP keywords still substring-match), and
+features are cached per engine until the row's updated_at moves."""
+import itertools
+import random
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.services import matching
+from app.services.matching import (
+    COMPLEMENTARY_VERTICALS,
+    MatchingEngine,
+    _candidate_signal_text,
+    _grid_verticals,
+    _icp_signal_keywords,
+    _keyword_hits,
+    attendee_features,
+)
+
+
+def _person(verticals=(), sector="", products=0, keywords=(), summary="", **kw):
+    base = dict(
+        id=None, title="", company="", goals="", intent_tags=[], vertical_tags=list(verticals),
+        ai_summary=summary,
+        enriched_profile={"grid": {"grid_sector": sector, "grid_products": [{"name": f"P{i}"} for i in range(products)]}},
+        inferred_customer_profile={"ideal_customers": [{"who": "x", "signal_keywords": list(keywords)}]},
+    )
+    base.update(kw)
+    return SimpleNamespace(**base)
+
+
+def _pair_loop(a, b) -> tuple[bool, bool]:
+    a_verts = set(a.vertical_tags) | _grid_verticals(a)
+    c_verts = set(b.vertical_tags) | _grid_verticals(b)
+    return (
+        any(v in COMPLEMENTARY_VERTICALS.get(av, []) for av in a_verts for v in c_verts),
+        bool(a_verts & c_verts),
+    )
+
+
+def test_bitmask_complementarity_matches_the_pair_loop():
+    rng = random.Random(3)
+    pool = sorted(COMPLEMENTARY_VERTICALS) + ["custody", "not_in_taxonomy"]
+    sectors = ["", "defi", "ai", "payments", "regulation", "unknown sector"]
+    people = [_person(rng.sample(pool, rng.randint(0, 3)), rng.choice(sectors)) for _ in range(60)]
+    for a, b in itertools.product(people, repeat=2):
+        fa, fb = attendee_features(a), attendee_features(b)
+        shared = bool(fa.vertical_mask & fb.vertical_mask) or not fa.off_taxonomy.isdisjoint(fb.off_taxonomy)
+        assert (bool(fa.complement_mask & fb.vertical_mask), shared) == _pair_loop(a, b)
+
+
+def test_unknown_tags_get_no_bit_and_the_bit_table_stays_fixed():
+    bits = dict(matching._VERTICAL_BITS)
+    people = [_person([f"free_form_{i}", "bitcoin"]) for i in range(100)]
+    features = [attendee_features(p) for p in people]
+    assert matching._VERTICAL_BITS == bits
+    assert {f.vertical_mask for f in features} == {bits["bitcoin"]}
+    assert features[3].off_taxonomy == {"free_form_3"}
+
+
+def test_icp_keywords_substring_match_as_before():
+    """Pinned: same hits as the pre-feature-record substring test, so the
+    prompt's ICP MATCH SIGNAL line and the ICP boosts are unchanged."""
+    text = attendee_features(_person(summary="He said the AI-native market-maker runs custody, domain experts.")).signal_text
+    assert _keyword_hits(["ai", "market maker", "custody", "main", ""], text) == ["ai", "custody", "main"]
+
+
+def _legacy_scores(attendee, candidates, ranked):
+    """The boost loop _deterministic_rerank had before feature records."""
+    out = {}
+    target_icp_kws = _icp_signal_keywords(attendee)
+    for entry in ranked:
+        score = float(entry["overall_score"])
+        candidate = candidates[entry["candidate_index"] - 1][0]
+        a_verts = set(attendee.vertical_tags or []) | _grid_verticals(attendee)
+        c_verts = set(candidate.vertical_tags or []) | _grid_verticals(candidate)
+        if any(v in COMPLEMENTARY_VERTICALS.get(av, []) for av in a_verts for v in c_verts):
+            score += 0.04
+        elif a_verts & c_verts:
+            score += 0.02
+        a_grid = (attendee.enriched_profile or {}).get("grid") or {}
+        c_grid = (candidate.enriched_profile or {}).get("grid") or {}
+        if a_grid.get("grid_products") and c_grid.get("grid_products"):
+            score += 0.02
+        candidate_text = _candidate_signal_text(candidate)
+        icp_hits = sum(1 for kw in target_icp_kws if kw and kw in candidate_text)
+        score += 0.05 if icp_hits >= 2 else 0.03 if icp_hits == 1 else 0.0
+        candidate_icp_kws = _icp_signal_keywords(candidate)
+        if candidate_icp_kws and any(kw in _candidate_signal_text(attendee) for kw in candidate_icp_kws):
+            score += 0.03
+        out[entry["candidate_index"]] = max(0.0, min(1.0, score))
+    return out
+
+
+def test_rerank_scores_match_the_legacy_boost_loop():
+    rng = random.Random(11)
+    pool = sorted(COMPLEMENTARY_VERTICALS) + ["custody", "rwa", "not_in_taxonomy"]
+    sectors = ["", "defi", "ai", "payments", "regulation", "unknown sector"]
+    words = ["custody", "ai", "stablecoin", "market maker", "main", "rails", "zk", "bank"]
+
+    def person():
+        return _person(rng.sample(pool, rng.randint(0, 3)), rng.choice(sectors), rng.randint(0, 2),
+                       keywords=rng.sample(words, rng.randint(0, 3)),
+                       summary=" ".join(rng.sample(words + ["said", "domain", "maintain"], 4)))
+
+    for _ in range(20):
+        target = person()
+        candidates = [(person(), 0.5) for _ in range(30)]
+        ranked = [{"candidate_index": i + 1, "overall_score": 0.5, "match_type": "complementary",
+                   "shared_context": {}} for i in range(30)]
+        out = MatchingEngine(db=None)._deterministic_rerank(
+            [dict(e) for e in ranked], target, candidates, suppress_duplicate_topics=False,
+        )
+        assert {e["candidate_index"]: e["overall_score"] for e in out} == _legacy_scores(target, candidates, ranked)
+
+
+def test_features_are_cached_until_updated_at_moves():
+    engine = MatchingEngine(db=None)
+    person = _person(["bitcoin"], updated_at=datetime(2026, 5, 1))
+    first = engine._features(person)
+    assert engine._features(person) is first
+
+    person.vertical_tags = ["privacy"]
+    person.updated_at = datetime(2026, 5, 2)
+    assert engine._features(person) is not first
+    assert engine._features(person).vertical_mask != first.vertical_mask
+
+
+def test_rerank_applies_each_boost_once():
+    target = _person(["policy_regulation_macro"], products=2, keywords=["custody", "stablecoin", "zk"],
+                     summary="Regulator drafting stablecoin rules.")
+    strong = _person(["privacy"], products=1, keywords=["regulator"],
+                     summary="Custody and stablecoin rails for banks.")
+    weak = _person(["bitcoin"], summary="Mining pools.")
+    ranked = [
+        {"candidate_index": 1, "overall_score": 0.6, "match_type": "complementary", "shared_context": {}},
+        {"candidate_index": 2, "overall_score": 0.6, "match_type": "complementary", "shared_context": {}},
+    ]
+
+    out = MatchingEngine(db=None)._deterministic_rerank(
+        ranked, target, [(strong, 0.7), (weak, 0.7)], suppress_duplicate_topics=False,
+    )
+
+    by_idx = {e["candidate_index"]: e["overall_score"] for e in out}
+    # complementary vertical +0.04, both Grid products +0.02, 2 ICP hits +0.05, two-way +0.03
+    assert round(by_idx[1], 4) == round(0.6 + 0.04 + 0.02 + 0.05 + 0.03, 4)
+    assert by_idx[2] == 0.6
@@ -1,13 +1,14 @@
 # backend/tests/test_matching_pair_uniqueness.py
-"""Race-guard for the (attendee_a_id, attendee_b_id) unique index added
-by migration c4f1a2e8b3d7. When a concurrent writer wins the insert race,
-the loser's flush throws IntegrityError; the savepoint should roll back
-just that one row and the loop should continue to the next match instead
-of aborting the entire transaction.
+"""Race-guard for the (LEAST(a, b), GREATEST(a, b)) unique index added
+by migration c4f1a2e8b3d7. When a concurrent writer wins the insert race
+for a pair, our write must skip just that pair instead of aborting the
+entire transaction.
 
 Tests both Match-insert call sites in matching.py:
-- _persist_ranked (curated + deep tiers)
-- _apply_priority_intros (force-add path)
+- _persist_ranked (curated + deep tiers, company fallback): one
+  INSERT ... ON CONFLICT (least, greatest) DO NOTHING RETURNING — a pair
+  the other writer holds simply isn't returned
+- _apply_priority_intros (force-add path): savepoint per row
 """
 import uuid
 from datetime import datetime
@@ -15,6 +16,7 @@ from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
 
 from app.models.attendee import Match, RequestedIntro
@@ -81,32 +83,24 @@ class _NestedCM:
         return False
 
 
-async def _persist_ranked_setup(integrity_on_calls: list[int]):
-    """integrity_on_calls = list of 0-indexed flush call counts that should
-    raise IntegrityError. e.g. [0] = first flush raises; [1] = second; [] = none."""
+def _persist_ranked_setup(lost_races: set[int]):
+    """lost_races = candidate positions (0-indexed) a concurrent writer
+    inserted first — the INSERT's RETURNING omits those rows."""
     requester = _att("Alice")
     target1 = _att("Bob")
     target2 = _att("Carol")
+    candidates = [(target1, 0.9), (target2, 0.85)]
 
-    db = AsyncMock()
-    db.begin_nested = MagicMock(side_effect=lambda: _NestedCM())
-
-    flush_calls = {"n": 0}
-
-    async def fake_flush():
-        n = flush_calls["n"]
-        flush_calls["n"] += 1
-        if n in integrity_on_calls:
-            # SQLAlchemy IntegrityError takes (statement, params, orig)
-            raise IntegrityError("INSERT INTO matches", {}, Exception("dup"))
-
-    db.flush = fake_flush
+    async def execute(stmt):
+        if stmt.__visit_name__ == "select":
+            return _Rows([])  # prefetch: no existing pair for either candidate
+        return _Rows([
+            SimpleNamespace(attendee_a_id=requester.id, attendee_b_id=c.id)
+            for i, (c, _) in enumerate(candidates) if i not in lost_races
+        ])
 
-    # First SELECT in _persist_ranked: existing-match check (returns None twice)
-    db.execute = AsyncMock(side_effect=[
-        _Rows([]),  # existing check for target1
-        _Rows([]),  # existing check for target2
-    ])
+    db = AsyncMock()
+    db.execute = AsyncMock(side_effect=execute)
 
     engine = MatchingEngine(db)
     ranked = [
@@ -115,42 +109,41 @@ async def _persist_ranked_setup(integrity_on_calls: list[int]):
         {"candidate_index": 2, "overall_score": 0.85, "complementary_score": 0.85,
          "match_type": "complementary", "explanation": "y", "shared_context": {}},
     ]
-    candidates = [(target1, 0.9), (target2, 0.85)]
-    return engine, requester, ranked, candidates
+    return engine, db, requester, ranked, candidates
 
 
-async def test_persist_ranked_skips_when_race_wins_other_writer():
-    """First flush raises IntegrityError (other writer beat us to that pair).
-    The second match should still persist successfully."""
-    engine, requester, ranked, candidates = await _persist_ranked_setup(
-        integrity_on_calls=[0]
-    )
+async def test_persist_ranked_insert_is_one_on_conflict_do_nothing():
+    engine, db, requester, ranked, candidates = _persist_ranked_setup(set())
     persisted = await engine._persist_ranked(
         requester, ranked, candidates,
         tier="curated", floor=0.0, non_obvious_floor=0.0,
     )
-    # Only the second match landed; the first was a no-op skip on IntegrityError
-    assert len(persisted) == 1
-    assert persisted[0].attendee_b_id == candidates[1][0].id
+    assert len(persisted) == 2
+    # Prefetch + one INSERT — no per-row SELECT, no savepoints.
+    assert db.execute.await_count == 2
+    db.begin_nested.assert_not_called()
+    insert = db.execute.await_args_list[1].args[0]
+    sql = str(insert.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("INSERT INTO matches")
+    assert ("ON CONFLICT (least(attendee_a_id, attendee_b_id), "
+            "greatest(attendee_a_id, attendee_b_id)) DO NOTHING") in sql
+    assert "RETURNING matches.id" in sql
 
 
-async def test_persist_ranked_all_succeed_when_no_race():
-    """No IntegrityError: both matches land normally."""
-    engine, requester, ranked, candidates = await _persist_ranked_setup(
-        integrity_on_calls=[]
-    )
+async def test_persist_ranked_skips_when_race_wins_other_writer():
+    """Other writer beat us to the first pair: only the second lands."""
+    engine, _db, requester, ranked, candidates = _persist_ranked_setup({0})
     persisted = await engine._persist_ranked(
         requester, ranked, candidates,
         tier="curated", floor=0.0, non_obvious_floor=0.0,
     )
-    assert len(persisted) == 2
+    assert len(persisted) == 1
+    assert persisted[0].attendee_b_id == candidates[1][0].id
 
 
 async def test_persist_ranked_all_lose_when_total_race():
-    """Both flushes IntegrityError: empty result, no crash."""
-    engine, requester, ranked, candidates = await _persist_ranked_setup(
-        integrity_on_calls=[0, 1]
-    )
+    """Every pair taken by the other writer: empty result, no crash."""
+    engine, _db, requester, ranked, candidates = _persist_ranked_setup({0, 1})
     persisted = await engine._persist_ranked(
         requester, ranked, candidates,
         tier="curated", floor=0.0, non_obvious_floor=0.0,
@@ -24,6 +24,7 @@ from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
 from app.models.attendee import Match
 from app.services.matching import MatchingEngine
@@ -114,40 +115,96 @@ def test_is_stale_pending_matrix():
     assert MatchingEngine._is_stale_pending(hidden) is False
 
 
+class _Rows:
+    def __init__(self, rows):
+        self._rows = list(rows)
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+def _persist_db(existing_rows, updated_ids=None):
+    """db whose prefetch SELECT returns `existing_rows` and whose bulk UPDATE
+    RETURNING yields `updated_ids` (default: every row it was asked to touch)."""
+    db = MagicMock()
+
+    async def execute(stmt):
+        if stmt.__visit_name__ == "select":
+            return _Rows(existing_rows)
+        if stmt.__visit_name__ == "update":
+            return _Rows(updated_ids if updated_ids is not None else [m.id for m in existing_rows])
+        raise AssertionError(f"unexpected {stmt.__visit_name__}")
+
+    db.execute = AsyncMock(side_effect=execute)
+    db.flush = AsyncMock()
+    db.add = MagicMock()
+    return db
+
+
+def _fresh_entry(explanation="fresh reasoning", score=0.91):
+    return [{
+        "candidate_index": 1, "overall_score": score, "complementary_score": 0.88,
+        "match_type": "complementary", "explanation": explanation,
+        "shared_context": {"x": 1}, "explanation_confidence": 0.9,
+    }]
+
+
 @pytest.mark.asyncio
 async def test_persist_reuses_stale_row_in_place_keeping_id():
     """When a stale pending row already exists for the pair, _persist_ranked
     must REFRESH it in place (same id) and add NO new row — this is what keeps
-    accept/decline working across regens."""
+    accept/decline working across regens. The refresh is one UPDATE ... FROM
+    (VALUES ...) that re-checks the stale guards in SQL."""
     me_id, other_id = uuid.uuid4(), uuid.uuid4()
     attendee = SimpleNamespace(id=me_id)
     candidate = SimpleNamespace(id=other_id)
-    existing = _stale_match(me_id, other_id)
+    existing = _stale_match(other_id, me_id)  # stored in the other direction
     original_id = existing.id
 
-    db = MagicMock()
-    sel_result = MagicMock()
-    sel_result.scalars.return_value.first.return_value = existing
-    db.execute = AsyncMock(return_value=sel_result)
-    db.flush = AsyncMock()
-    db.add = MagicMock()
+    db = _persist_db([existing])
     engine = MatchingEngine(db)
 
-    ranked = [{
-        "candidate_index": 1, "overall_score": 0.91, "complementary_score": 0.88,
-        "match_type": "complementary", "explanation": "fresh reasoning",
-        "shared_context": {"x": 1}, "explanation_confidence": 0.9,
-    }]
     persisted = await engine._persist_ranked(
-        attendee, ranked, [(candidate, 0.91)],
-        tier="curated", floor=0.0, non_obvious_floor=0.0,
+        attendee, _fresh_entry(), [(candidate, 0.91)],
+        tier="deep", floor=0.0, non_obvious_floor=0.0,
     )
 
     assert persisted == [existing]
     assert existing.id == original_id, "match id must stay stable"
     assert existing.overall_score == 0.91 and existing.explanation == "fresh reasoning"
+    assert existing.tier == "deep"
     db.add.assert_not_called(), "must reuse, not insert a duplicate row"
 
+    kinds = [c.args[0].__visit_name__ for c in db.execute.await_args_list]
+    assert kinds == ["select", "update"], "one prefetch + one bulk UPDATE, no INSERT"
+    sql = str(db.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+    assert "FROM (VALUES" in sql
+    for required in ("status_a", "status_b", "meeting_time", "decline_reason",
+                     "hidden_by_user", "met_at"):
+        assert f"matches.{required}" in sql.split("WHERE", 1)[1], required
+
+
+@pytest.mark.asyncio
+async def test_persist_skips_row_touched_between_prefetch_and_update():
+    """The user accepts in the gap between our prefetch and the UPDATE: the
+    SQL stale guard matches nothing, so the row is neither reported nor
+    rewritten in memory."""
+    me_id, other_id = uuid.uuid4(), uuid.uuid4()
+    existing = _stale_match(me_id, other_id)
+    db = _persist_db([existing], updated_ids=[])
+    engine = MatchingEngine(db)
+
+    persisted = await engine._persist_ranked(
+        SimpleNamespace(id=me_id), _fresh_entry(), [(SimpleNamespace(id=other_id), 0.91)],
+        tier="curated", floor=0.0, non_obvious_floor=0.0,
+    )
+
+    assert persisted == []
+    assert existing.explanation == "old"
+
 
 @pytest.mark.asyncio
 async def test_persist_never_overwrites_user_touched_row():
@@ -160,21 +217,11 @@ async def test_persist_never_overwrites_user_touched_row():
     accepted.status_a = "accepted"
     accepted.explanation = "user already accepted this"
 
-    db = MagicMock()
-    sel_result = MagicMock()
-    sel_result.scalars.return_value.first.return_value = accepted
-    db.execute = AsyncMock(return_value=sel_result)
-    db.flush = AsyncMock()
-    db.add = MagicMock()
+    db = _persist_db([accepted])
     engine = MatchingEngine(db)
 
-    ranked = [{
-        "candidate_index": 1, "overall_score": 0.99, "complementary_score": 0.99,
-        "match_type": "complementary", "explanation": "regen wants to overwrite",
-        "shared_context": {}, "explanation_confidence": 0.9,
-    }]
     persisted = await engine._persist_ranked(
-        attendee, ranked, [(candidate, 0.99)],
+        attendee, _fresh_entry("regen wants to overwrite", 0.99), [(candidate, 0.99)],
         tier="curated", floor=0.0, non_obvious_floor=0.0,
     )
 
@@ -182,3 +229,4 @@ async def test_persist_never_overwrites_user_touched_row():
     assert accepted.status_a == "accepted"
     assert accepted.explanation == "user already accepted this", "user-touched row must be untouched"
     db.add.assert_not_called()
+    assert db.execute.await_count == 1, "only the prefetch — no UPDATE, no INSERT"
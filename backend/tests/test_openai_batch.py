@@ -0,0 +1,121 @@
+# backend/tests/test_openai_batch.py
+"""Batch mode for full-pool regeneration: run_chat_batch against the
+LocalBatchClient stand-in, and prefetch_rankings_via_batch feeding
+rank_and_explain so the per-attendee pass makes no live GPT calls.
+No network, no DB."""
+import json
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import app.services.llm_cache as cache_mod
+import app.services.matching as matching_mod
+import app.services.openai_batch as batch_mod
+from app.services.matching import MatchingEngine
+from app.services.openai_batch import LocalBatchClient, chat_request, run_chat_batch
+
+
+def _echo(body: dict) -> str:
+    return "echo:" + body["messages"][0]["content"]
+
+
+@pytest.mark.asyncio
+async def test_run_chat_batch_maps_answers_and_failures(tmp_path):
+    local = LocalBatchClient(tmp_path, _echo, fail={"b"})
+    reqs = [chat_request(cid, model="gpt-4o", prompt=f"p-{cid}", temperature=0.2, max_tokens=2000) for cid in "abc"]
+
+    out = await run_chat_batch(reqs, client=local, poll_seconds=0)
+
+    assert out == {"a": "echo:p-a", "b": None, "c": "echo:p-c"}
+    assert [r["custom_id"] for r in local.submitted] == ["a", "b", "c"]
+    assert local.submitted[0]["url"] == "/v1/chat/completions"
+    assert local.submitted[0]["body"]["temperature"] == 0.2
+    # The uploaded input is a real JSONL file, one request per line.
+    (first,) = sorted(tmp_path.glob("file-local-1.jsonl"))
+    assert len(first.read_text().splitlines()) == 3
+
+
+@pytest.mark.asyncio
+async def test_run_chat_batch_cancels_on_timeout(tmp_path):
+    local = LocalBatchClient(tmp_path, _echo)
+    local.batches.retrieve = AsyncMock(side_effect=AssertionError("polled past deadline"))
+    reqs = [chat_request("a", model="gpt-4o", prompt="p", temperature=0.2, max_tokens=10)]
+
+    with pytest.raises(TimeoutError):
+        await run_chat_batch(reqs, client=local, poll_seconds=0, timeout_seconds=-1)
+    assert [b.status for b in local._batches.values()] == ["cancelled"]
+
+
+# ── prefetch → rank_and_explain ──────────────────────────────────────────────
+
+def _person(name: str, company: str):
+    return SimpleNamespace(
+        id=uuid.uuid4(), name=name, title="Partner", company=company, goals="Meet builders",
+        target_companies=None, interests=["rwa"], ai_summary="Invests in RWA.", intent_tags=[],
+        vertical_tags=["tokenisation"], deal_readiness_score=0.5, enriched_profile={},
+        privacy_mode="full", embedding=[0.1], matching_consent=None,
+    )
+
+
+def _answer(body: dict) -> str:
+    prompt = body["messages"][0]["content"]
+    name = prompt.split("Candidate 1:\n  Name: ", 1)[1].split("\n", 1)[0]
+    return "```json\n" + json.dumps([{
+        "candidate_index": 1, "candidate_name": name, "overall_score": 0.9,
+        "match_type": "deal_ready", "explanation": f"batched for {name}", "shared_context": {},
+    }]) + "\n```"
+
+
+@pytest.fixture
+def _env(monkeypatch):
+    monkeypatch.setattr(batch_mod, "POLL_SECONDS", 0)
+    monkeypatch.setattr(matching_mod.settings, "AI_RERANK_ENABLED", False)
+    monkeypatch.setattr(matching_mod.settings, "AI_CONFIDENCE_ENABLED", False)
+    live = AsyncMock(side_effect=AssertionError("live GPT call"))
+    monkeypatch.setattr(matching_mod, "client", SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=live))))
+    monkeypatch.setattr(cache_mod, "lookup", AsyncMock(return_value=None))
+    store = AsyncMock()
+    monkeypatch.setattr(cache_mod, "store", store)
+
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=MagicMock(scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=[])))))
+    engine = MatchingEngine(db)
+    people = [_person(f"Target {i}", f"T{i}") for i in range(3)]
+    pools = {p.id: [(_person(f"Cand {i}", f"C{i}"), 0.8)] for i, p in enumerate(people)}
+    engine._candidate_pool = AsyncMock(side_effect=lambda a, top_k, clear: pools[a.id])
+    return engine, people, pools, live, store
+
+
+@pytest.mark.asyncio
+async def test_prefetched_batch_answers_every_rerank_without_live_calls(tmp_path, _env):
+    engine, people, pools, live, store = _env
+    people[2].matching_consent = "pending"  # gated → never prompted
+    local = LocalBatchClient(tmp_path, _answer)
+
+    stats = await engine.prefetch_rankings_via_batch(people, batch_client=local)
+
+    assert stats == {"prompts": 2, "cached": 0, "submitted": 2, "answered": 2, "failed": 0}
+    assert store.await_count == 2
+    for person in people[:2]:
+        (cand, _), = pools[person.id]
+        ranked = await engine.rank_and_explain(person, pools[person.id])
+        assert ranked[0]["explanation"] == f"batched for {cand.name}"
+    live.assert_not_awaited()
+    assert engine._prefetched_rankings == {}  # each answer used once
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_to_live_calls(tmp_path, _env):
+    engine, people, pools, live, store = _env
+    local = LocalBatchClient(tmp_path, _answer)
+    local.files.create = AsyncMock(side_effect=ConnectionError("upload failed"))
+
+    stats = await engine.prefetch_rankings_via_batch(people, batch_client=local)
+    assert stats["submitted"] == 3 and stats["failed"] == 3 and stats["answered"] == 0
+
+    live.side_effect = None
+    live.return_value = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="[]"))])
+    await engine.rank_and_explain(people[0], pools[people[0].id])
+    live.assert_awaited_once()
@@ -0,0 +1,64 @@
+# backend/tests/test_password_hash_pool.py
+"""bcrypt runs on a bounded pool, off the event loop, with queue metrics.
+
+Uses a fake slow hash (time.sleep) so the tests are fast and deterministic;
+one round-trip through the real bcrypt wrappers checks they stay compatible.
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.core import security
+
+
+def _slow(x, delay=0.05):
+    time.sleep(delay)
+    return x
+
+
+@pytest.mark.asyncio
+async def test_hashing_does_not_block_the_event_loop():
+    pool = security._HashPool(workers=1, max_queue=4)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    t = asyncio.create_task(ticker())
+    assert await pool.run(_slow, "ok", 0.1) == "ok"
+    t.cancel()
+    # Inline bcrypt would have frozen the loop: zero ticks for 100ms.
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_queue_metrics_and_fail_fast():
+    pool = security._HashPool(workers=2, max_queue=2)
+    tasks = [asyncio.create_task(pool.run(_slow, i)) for i in range(4)]
+    await asyncio.sleep(0.01)
+
+    m = pool.metrics()
+    assert m["in_flight"] == 2 and m["queued"] == 2
+
+    with pytest.raises(security.PasswordHashBusy):
+        await pool.run(_slow, 99)
+
+    assert sorted(await asyncio.gather(*tasks)) == [0, 1, 2, 3]
+    m = pool.metrics()
+    assert m["in_flight"] == 0 and m["queued"] == 0
+    assert m["completed"] == 4 and m["rejected"] == 1 and m["peak_queued"] == 2
+    # Two of the four had to wait for a free thread.
+    assert m["max_wait_ms"] >= 30
+    assert m["avg_run_ms"] >= 40
+
+
+@pytest.mark.asyncio
+async def test_async_wrappers_round_trip_real_bcrypt():
+    hashed = await security.hash_password_async("correct horse")
+    assert await security.verify_password_async("correct horse", hashed)
+    assert not await security.verify_password_async("wrong", hashed)
+    assert security.verify_password("correct horse", hashed)  # sync path for scripts
@@ -3,7 +3,7 @@ rejects > 2000 chars.
 
 Pattern mirrors tests/test_profile_update.py: TestClient with require_auth + get_db
 overridden, a MagicMock attendee whose mutations we inspect directly. We patch
-`refresh_profile_matches` (fired via asyncio.create_task) so the test never touches
+`request_profile_refresh` (the profile refresh queue) so the test never touches
 a real DB / OpenAI.
 """
 
@@ -91,7 +91,7 @@ def profile_client():
     client = TestClient(app, raise_server_exceptions=False)
 
     # Stop the fire-and-forget match refresh from touching a real DB / OpenAI.
-    with patch.object(auth, "refresh_profile_matches", new=AsyncMock(return_value=None)):
+    with patch.object(auth, "request_profile_refresh", new=MagicMock(return_value=None)):
         yield client, attendee
 
     app.dependency_overrides.clear()
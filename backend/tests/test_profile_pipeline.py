@@ -56,11 +56,12 @@ async def test_run_full_enrichment_enriches_then_refreshes():
     svc.enrich_attendee = AsyncMock(return_value={"grid": {"x": 1}})
     with patch.object(pp, "async_session", _fake_session(db)), \
          patch.object(pp, "EnrichmentService", MagicMock(return_value=svc)), \
-         patch.object(pp, "refresh_profile_matches", AsyncMock()) as refresh:
+         patch.object(pp, "request_profile_refresh", MagicMock()) as refresh:
         await pp.run_full_enrichment(aid)
     svc.enrich_attendee.assert_awaited_once_with(attendee)
     assert attendee.enriched_profile == {"grid": {"x": 1}}
-    refresh.assert_awaited_once_with(aid)
+    # Queued like a save (no quiet period), so it can't overlap one in flight.
+    refresh.assert_called_once_with(aid, immediate=True)
 
 
 @pytest.mark.asyncio
@@ -73,9 +74,9 @@ async def test_run_full_enrichment_still_refreshes_when_enrich_fails():
     svc.enrich_attendee = AsyncMock(side_effect=RuntimeError("grid down"))
     with patch.object(pp, "async_session", _fake_session(db)), \
          patch.object(pp, "EnrichmentService", MagicMock(return_value=svc)), \
-         patch.object(pp, "refresh_profile_matches", AsyncMock()) as refresh:
+         patch.object(pp, "request_profile_refresh", MagicMock()) as refresh:
         await pp.run_full_enrichment(aid)
-    refresh.assert_awaited_once_with(aid)
+    refresh.assert_called_once_with(aid, immediate=True)
 
 
 @pytest.mark.asyncio
@@ -87,7 +88,7 @@ async def test_run_full_enrichment_noop_when_attendee_missing():
     svc.enrich_attendee = AsyncMock()
     with patch.object(pp, "async_session", _fake_session(db)), \
          patch.object(pp, "EnrichmentService", MagicMock(return_value=svc)), \
-         patch.object(pp, "refresh_profile_matches", AsyncMock()) as refresh:
+         patch.object(pp, "request_profile_refresh", MagicMock()) as refresh:
         await pp.run_full_enrichment(aid)
     svc.enrich_attendee.assert_not_awaited()
-    refresh.assert_not_awaited()
+    refresh.assert_not_called()
@@ -0,0 +1,154 @@
+# backend/tests/test_realtime_messages.py
+"""Real-time message push — LISTEN/NOTIFY broker, publish, SSE stream.
+
+No Postgres: `pg_notify` calls are captured off a mock session and fed
+straight into `broker.dispatch`, which is exactly what the LISTEN callback
+does with a delivered payload.
+"""
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from jose import JWTError
+from sqlalchemy.dialects import postgresql
+
+import app.api.routes.messages as messages
+from app.core.security import create_stream_ticket, decode_stream_ticket
+from app.services import realtime
+
+
+def _notify_payloads(db) -> list[dict]:
+    return [
+        json.loads(call.args[1]["payload"])
+        for call in db.execute.await_args_list
+        if "pg_notify" in str(call.args[0])
+    ]
+
+
+def test_listen_dsn_swaps_transaction_pooler_for_session_pooler(monkeypatch):
+    settings = SimpleNamespace(
+        REALTIME_DATABASE_URL="",
+        DATABASE_URL="postgresql+asyncpg://u:p@aws-0.pooler.supabase.com:6543/postgres",
+    )
+    monkeypatch.setattr(realtime, "get_settings", lambda: settings)
+    assert realtime.listen_dsn() == "postgresql://u:p@aws-0.pooler.supabase.com:5432/postgres"
+
+    settings.REALTIME_DATABASE_URL = "postgresql+asyncpg://u:p@db.x.supabase.co:5432/postgres"
+    assert realtime.listen_dsn() == "postgresql://u:p@db.x.supabase.co:5432/postgres"
+
+
+def test_oversized_event_drops_message_body():
+    event = {"type": "message", "to": "a", "match_id": "m", "message": {"content": "x" * 10_000}}
+    out = json.loads(realtime.encode_event(event))
+    assert "message" not in out and out["truncated"] is True and out["match_id"] == "m"
+
+
+@pytest.mark.asyncio
+async def test_dispatch_routes_by_recipient_and_overflow_becomes_resync():
+    broker = realtime.MessageBroker()
+    broker._ensure_listening = AsyncMock()
+    alice, bob = uuid.uuid4(), uuid.uuid4()
+    qa = await broker.subscribe(alice)
+    qb = await broker.subscribe(bob)
+
+    broker.dispatch(json.dumps({"type": "message", "to": str(alice), "unread_delta": 1}))
+    assert qa.get_nowait()["unread_delta"] == 1
+    assert qb.empty()
+
+    for _ in range(realtime.SUBSCRIBER_QUEUE_SIZE + 1):
+        broker.dispatch(json.dumps({"type": "read", "to": str(bob)}))
+    assert qb.qsize() == 1 and qb.get_nowait() == {"type": "resync"}
+
+    broker.unsubscribe(alice, qa)
+    broker.unsubscribe(bob, qb)
+    assert broker.subscriber_count() == 0
+
+
+def test_unread_total_is_one_count_query():
+    db = AsyncMock()
+    db.execute.return_value = SimpleNamespace(scalar_one=lambda: 3)
+    assert asyncio.run(messages._unread_total(db, uuid.uuid4())) == 3
+    db.execute.assert_awaited_once()
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "count(messages.id)" in sql
+    assert "JOIN conversations" in sql and "JOIN matches" in sql
+
+
+@pytest.mark.asyncio
+async def test_send_message_notifies_both_parties_before_commit():
+    me, other = uuid.uuid4(), uuid.uuid4()
+    attendee = SimpleNamespace(id=me, name="Alice")
+    match = SimpleNamespace(id=uuid.uuid4(), attendee_a_id=me, attendee_b_id=other)
+    conv = SimpleNamespace(id=uuid.uuid4())
+
+    db = AsyncMock()
+    db.add = lambda obj: setattr(obj, "id", uuid.uuid4())
+    order: list[str] = []
+    db.execute.side_effect = lambda *a, **k: order.append("notify")
+    db.commit.side_effect = lambda: order.append("commit")
+
+    with patch.object(messages, "_get_attendee", AsyncMock(return_value=attendee)), \
+         patch.object(messages, "_get_and_verify_match", AsyncMock(return_value=match)), \
+         patch.object(messages, "_get_or_create_conversation", AsyncMock(return_value=conv)):
+        out = await messages.send_message(match.id, {"content": "hi"}, user=SimpleNamespace(), db=db)
+
+    assert order == ["notify", "notify", "commit"]
+    to_other, to_me = _notify_payloads(db)
+    assert to_other["to"] == str(other) and to_other["unread_delta"] == 1
+    assert to_other["message"]["is_mine"] is False and to_other["message"]["content"] == "hi"
+    assert to_me["to"] == str(me) and to_me["unread_delta"] == 0
+    assert out["is_mine"] is True
+
+
+def test_stream_ticket_is_single_purpose():
+    uid = str(uuid.uuid4())
+    assert decode_stream_ticket(create_stream_ticket(uid)) == uid
+    from app.core.security import create_access_token, decode_token
+    assert decode_stream_ticket(create_access_token({"sub": uid})) is None
+    with pytest.raises(JWTError):
+        decode_token(create_stream_ticket(uid))
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_bad_ticket_and_503s_when_listen_fails(monkeypatch):
+    with pytest.raises(HTTPException) as exc:
+        await messages.stream(request=SimpleNamespace(), ticket="nope", db=AsyncMock())
+    assert exc.value.status_code == 401
+
+    user = SimpleNamespace(id=uuid.uuid4(), attendee_id=uuid.uuid4())
+    db = AsyncMock()
+    db.get.return_value = user
+    monkeypatch.setattr(realtime.broker, "subscribe", AsyncMock(side_effect=OSError("no route")))
+    with pytest.raises(HTTPException) as exc:
+        await messages.stream(request=SimpleNamespace(), ticket=create_stream_ticket(str(user.id)), db=db)
+    assert exc.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_unread_then_pushed_events(monkeypatch):
+    user = SimpleNamespace(id=uuid.uuid4(), attendee_id=uuid.uuid4())
+    db = AsyncMock()
+    db.get.return_value = user
+    broker = realtime.MessageBroker()
+    broker._ensure_listening = AsyncMock()
+    monkeypatch.setattr(realtime, "broker", broker)
+    monkeypatch.setattr(messages, "_unread_total", AsyncMock(return_value=4))
+
+    request = SimpleNamespace(is_disconnected=AsyncMock(return_value=False))
+    resp = await messages.stream(request=request, ticket=create_stream_ticket(str(user.id)), db=db)
+    body = resp.body_iterator
+
+    assert (await body.__anext__()).startswith("retry:")
+    assert await body.__anext__() == 'event: unread\ndata: {"unread_count": 4}\n\n'
+
+    broker.dispatch(json.dumps({"type": "read", "to": str(user.attendee_id), "unread_delta": -2}))
+    chunk = await body.__anext__()
+    assert chunk.startswith("event: read\n")
+    assert json.loads(chunk.split("data: ", 1)[1]) == {"unread_delta": -2}
+
+    await body.aclose()
+    assert broker.subscriber_count() == 0
@@ -1,14 +1,15 @@
 # backend/tests/test_refresh_lock.py
-"""Per-attendee asyncio.Lock in refresh_profile_matches serializes
-concurrent calls for the SAME attendee so they don't both pay the
-~5-10s embed + GPT-4o rerank cost. Different attendees still run
-in parallel."""
+"""refresh_profile_matches: one pass under a Postgres advisory lock, so
+refreshes of the SAME attendee in different workers never overlap.
+Coalescing within a worker is refresh_queue's (test_refresh_queue.py).
+Different attendees still run in parallel."""
 import asyncio
 import uuid
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+import app.services.advisory_locks as advisory
 import app.services.profile_pipeline as pp
 
 pytestmark = pytest.mark.asyncio
@@ -25,95 +26,112 @@ class _Ctx:
         return False
 
 
-async def _setup_slow_engine(call_order: list, key: str, delay: float = 0.1):
-    """Returns a (db_factory, engine_factory) pair that records when the
-    engine starts/ends per attendee, with a configurable delay."""
-    db = AsyncMock()
-    db.get = AsyncMock(return_value=object())
+def _recording_pipeline(monkeypatch, order: list, delay: float = 0.05):
+    """Every session/engine pair records start/end of process_attendee,
+    labelled by attendee id prefix + run number."""
+    runs: dict = {}
 
-    async def slow_process(*a, **kw):
-        call_order.append(f"{key}-start")
-        await asyncio.sleep(delay)
-        call_order.append(f"{key}-end")
+    def make_engine(db):
+        async def slow_process(attendee):
+            n = runs[attendee] = runs.get(attendee, 0) + 1
+            order.append(f"{attendee}{n}-start")
+            await asyncio.sleep(delay)
+            order.append(f"{attendee}{n}-end")
 
-    engine = MagicMock()
-    engine.process_attendee = slow_process
-    engine.generate_matches_for_attendee = AsyncMock()
+        engine = MagicMock()
+        engine.process_attendee = slow_process
+        engine.generate_matches_for_attendee = AsyncMock()
+        return engine
 
-    return db, engine
+    def make_session():
+        db = AsyncMock()
+        db.get = AsyncMock(side_effect=lambda model, aid: str(aid)[:4])
+        return _Ctx(db)
 
+    monkeypatch.setattr(pp, "async_session", make_session)
+    monkeypatch.setattr(pp, "MatchingEngine", make_engine)
+    return runs
 
-async def test_same_attendee_calls_serialize(monkeypatch):
-    """Two concurrent refreshes for the same attendee_id must run
-    sequentially under the lock."""
-    aid = uuid.uuid4()
-    order: list[str] = []
 
-    db1, eng1 = await _setup_slow_engine(order, "A", delay=0.05)
-    db2, eng2 = await _setup_slow_engine(order, "B", delay=0.05)
+async def test_refresh_is_one_pass_with_no_debounce_of_its_own(monkeypatch):
+    """Debouncing is refresh_queue's job; a call here runs exactly one
+    pass and returns once it's done — no sleep, no trailing pass."""
+    aid = uuid.uuid4()
+    calls = []
 
-    sessions = iter([_Ctx(db1), _Ctx(db2)])
-    engines = iter([eng1, eng2])
+    async def fake_refresh(attendee_id, notify):
+        calls.append((attendee_id, notify))
 
-    monkeypatch.setattr(pp, "async_session", lambda: next(sessions))
-    monkeypatch.setattr(pp, "MatchingEngine", lambda db: next(engines))
+    monkeypatch.setattr(pp, "_refresh_once", fake_refresh)
+    sleep = AsyncMock()
+    monkeypatch.setattr(pp.asyncio, "sleep", sleep)
 
-    await asyncio.gather(
-        pp.refresh_profile_matches(aid),
-        pp.refresh_profile_matches(aid),
-    )
+    await pp.refresh_profile_matches(aid, notify=True)
 
-    # Strict serialization: A must fully finish before B starts (or vice versa)
-    assert order in (
-        ["A-start", "A-end", "B-start", "B-end"],
-        ["B-start", "B-end", "A-start", "A-end"],
-    ), f"Calls did not serialize. Order: {order}"
+    assert calls == [(aid, True)]
+    sleep.assert_not_awaited()
 
 
 async def test_different_attendees_run_in_parallel(monkeypatch):
-    """Two concurrent refreshes for DIFFERENT attendee_ids must overlap
-    (no global lock)."""
-    aid_a = uuid.uuid4()
-    aid_b = uuid.uuid4()
+    a, b = uuid.uuid4(), uuid.uuid4()
     order: list[str] = []
+    _recording_pipeline(monkeypatch, order)
+
+    await asyncio.gather(pp.refresh_profile_matches(a), pp.refresh_profile_matches(b))
 
-    db1, eng1 = await _setup_slow_engine(order, "A", delay=0.05)
-    db2, eng2 = await _setup_slow_engine(order, "B", delay=0.05)
+    ta, tb = str(a)[:4], str(b)[:4]
+    assert order.index(f"{ta}1-end") > order.index(f"{tb}1-start") or \
+        order.index(f"{tb}1-end") > order.index(f"{ta}1-start"), order
 
-    sessions = iter([_Ctx(db1), _Ctx(db2)])
-    engines = iter([eng1, eng2])
 
-    monkeypatch.setattr(pp, "async_session", lambda: next(sessions))
-    monkeypatch.setattr(pp, "MatchingEngine", lambda db: next(engines))
+async def test_state_and_lock_released_on_exception(monkeypatch):
+    aid = uuid.uuid4()
+    db = AsyncMock()
+    db.get = AsyncMock(side_effect=RuntimeError("boom"))
+    monkeypatch.setattr(pp, "async_session", lambda: _Ctx(db))
+    monkeypatch.setattr(pp, "_record_refresh_error", AsyncMock())
+    locks = advisory.AdvisoryLocks()
+    monkeypatch.setattr(locks, "try_acquire", AsyncMock(return_value=True))
+    monkeypatch.setattr(locks, "release", AsyncMock())
+    monkeypatch.setattr(pp, "refresh_locks", locks)
 
-    await asyncio.gather(
-        pp.refresh_profile_matches(aid_a),
-        pp.refresh_profile_matches(aid_b),
-    )
+    await pp.refresh_profile_matches(aid)
+    await pp.refresh_profile_matches(aid)
 
-    # Both starts should occur before either end (interleaved)
-    starts_before_ends = order.index("A-end") > order.index("B-start") or \
-                          order.index("B-end") > order.index("A-start")
-    assert starts_before_ends, f"Calls did not run in parallel. Order: {order}"
+    assert locks.release.await_count == 2
+    locks.release.assert_awaited_with(advisory.attendee_lock_key(aid))
 
 
-async def test_lock_released_on_exception(monkeypatch):
-    """If the inner pipeline raises, the lock must still release so the
-    next call for the same attendee can acquire it."""
+async def test_waits_for_another_worker_then_runs(monkeypatch):
+    """pg_try_advisory_lock false (another worker mid-refresh) → poll, then
+    run once it's free."""
     aid = uuid.uuid4()
+    order: list[str] = []
+    runs = _recording_pipeline(monkeypatch, order)
+    monkeypatch.setattr(advisory, "LOCK_POLL_SECONDS", 0.01)
+    locks = advisory.AdvisoryLocks()
+    monkeypatch.setattr(locks, "try_acquire", AsyncMock(side_effect=[False, False, True]))
+    monkeypatch.setattr(locks, "release", AsyncMock())
+    monkeypatch.setattr(pp, "refresh_locks", locks)
 
-    db = AsyncMock()
-    db.get = AsyncMock(side_effect=RuntimeError("boom"))
+    await pp.refresh_profile_matches(aid)
 
-    sessions = iter([_Ctx(db), _Ctx(db)])
-    monkeypatch.setattr(pp, "async_session", lambda: next(sessions))
-    # Stub the error recorder so it's a no-op
-    monkeypatch.setattr(pp, "_record_refresh_error", AsyncMock())
+    assert locks.try_acquire.await_count == 3
+    assert runs[str(aid)[:4]] == 1
+    locks.release.assert_awaited_once()
 
-    # Two sequential calls — both must complete without hanging
-    await pp.refresh_profile_matches(aid)
+
+async def test_no_lock_connection_fails_open(monkeypatch):
+    """conftest makes the lock connection unavailable: refresh still runs."""
+    aid = uuid.uuid4()
+    runs = _recording_pipeline(monkeypatch, [])
     await pp.refresh_profile_matches(aid)
+    assert runs[str(aid)[:4]] == 1
+
 
-    # Lock should not have leaked — verify by acquiring and checking it's free
-    lock = pp._lock_for(aid)
-    assert not lock.locked()
+async def test_lock_key_is_stable_signed_int4():
+    aid = uuid.UUID("ffffffff-0000-4000-8000-000000000000")
+    assert advisory.attendee_lock_key(aid) == -1
+    assert advisory.attendee_lock_key(uuid.UUID(int=7 << 96)) == 7
+    for _ in range(50):
+        assert -(2 ** 31) <= advisory.attendee_lock_key(uuid.uuid4()) < 2 ** 31
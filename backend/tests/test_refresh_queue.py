@@ -0,0 +1,107 @@
+# backend/tests/test_refresh_queue.py
+"""Profile-save refresh queue: quiet-period debounce, merging, one refresh
+per attendee, concurrency cap, metrics. Real asyncio timing with short
+(tens of ms) windows; refresh_profile_matches itself is faked."""
+import asyncio
+import uuid
+
+import pytest
+
+import app.services.profile_pipeline as pp
+
+pytestmark = pytest.mark.asyncio
+
+
+def _queue(monkeypatch, *, quiet=0.05, max_delay=1.0, concurrency=2, run_for=0.03):
+    runs: list[tuple[uuid.UUID, bool]] = []
+    live = {"now": 0, "peak": 0}
+
+    async def fake_refresh(attendee_id, notify=False):
+        live["now"] += 1
+        live["peak"] = max(live["peak"], live["now"])
+        runs.append((attendee_id, notify))
+        await asyncio.sleep(run_for)
+        live["now"] -= 1
+
+    monkeypatch.setattr(pp, "refresh_profile_matches", fake_refresh)
+    return pp.ProfileRefreshQueue(quiet=quiet, max_delay=max_delay, concurrency=concurrency), runs, live
+
+
+async def _drain(q, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while (q._dirty or q._active) and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.01)
+
+
+async def test_burst_of_saves_becomes_one_refresh_after_quiet_period(monkeypatch):
+    q, runs, _ = _queue(monkeypatch, quiet=0.08)
+    aid = uuid.uuid4()
+    for i in range(5):  # five field saves, 20ms apart
+        q.enqueue(aid, notify=(i == 3))
+        await asyncio.sleep(0.02)
+    assert runs == []  # still inside the quiet period
+    assert q.metrics()["dirty"] == 1
+
+    await _drain(q)
+    assert runs == [(aid, True)]  # merged, notify OR-ed in
+    m = q.metrics()
+    assert (m["requested"], m["coalesced"], m["dispatched"], m["completed"]) == (5, 4, 1, 1)
+    assert m["avg_wait_ms"] >= 80 and m["dirty"] == 0
+
+
+async def test_max_delay_bounds_a_never_quiet_attendee(monkeypatch):
+    q, runs, _ = _queue(monkeypatch, quiet=0.1, max_delay=0.15, run_for=0.0)
+    aid = uuid.uuid4()
+    for _ in range(12):  # an edit every 25ms for 300ms: never 100ms quiet
+        q.enqueue(aid)
+        await asyncio.sleep(0.025)
+    assert len(runs) >= 1  # max_delay forced a refresh mid-burst
+    await _drain(q)
+    assert len(runs) <= 3
+
+
+async def test_edit_during_refresh_gives_exactly_one_follow_up(monkeypatch):
+    q, runs, live = _queue(monkeypatch, quiet=0.0, run_for=0.1)
+    aid = uuid.uuid4()
+    q.enqueue(aid)
+    await asyncio.sleep(0.03)
+    assert live["now"] == 1
+    q.enqueue(aid)
+    q.enqueue(aid)  # while the first run is still going
+    await _drain(q)
+    assert [r[0] for r in runs] == [aid, aid]
+    assert live["peak"] == 1  # never two refreshes of one attendee at once
+
+
+async def test_concurrency_cap_across_attendees(monkeypatch):
+    q, runs, live = _queue(monkeypatch, quiet=0.0, concurrency=2, run_for=0.05)
+    ids = [uuid.uuid4() for _ in range(5)]
+    for aid in ids:
+        q.enqueue(aid)
+    await asyncio.sleep(0.02)
+    m = q.metrics()
+    assert m["running"] == 2 and m["waiting_for_slot"] == 3 and m["concurrency_cap"] == 2
+    await _drain(q)
+    assert sorted(r[0] for r in runs) == sorted(ids)
+    assert live["peak"] == 2
+
+
+async def test_immediate_request_skips_the_quiet_period(monkeypatch):
+    q, runs, _ = _queue(monkeypatch, quiet=5.0)
+    aid = uuid.uuid4()
+    monkeypatch.setattr(pp, "refresh_queue", q)
+    pp.request_profile_refresh(aid, immediate=True)
+    await asyncio.sleep(0.02)
+    assert runs == [(aid, False)]
+    await _drain(q)
+
+
+async def test_close_drops_pending_and_waits_for_running(monkeypatch):
+    q, runs, live = _queue(monkeypatch, quiet=0.0, run_for=0.05)
+    running, pending = uuid.uuid4(), uuid.uuid4()
+    q.enqueue(running)
+    await asyncio.sleep(0.01)
+    q.enqueue(pending, quiet=10.0)
+    await q.close(timeout=1.0)
+    assert runs == [(running, False)] and live["now"] == 0
+    assert q.metrics()["dirty"] == 0
@@ -0,0 +1,187 @@
+# backend/tests/test_rerank_stream.py
+"""Streaming curated rerank: JsonArrayStream parsing a chunked array,
+rank_and_explain(on_entry=...) finishing entries as they arrive with the
+same values as the blocking path, keeping a truncated answer's prefix, and
+generate_matches_for_attendee committing curated matches mid-stream.
+No network, no DB."""
+import copy
+import json
+import random
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+import app.services.consent_filter as consent_mod
+import app.services.llm_cache as cache_mod
+import app.services.matching as matching_mod
+from app.services.json_stream import JsonArrayStream
+from app.services.matching import MatchingEngine
+
+
+def test_parser_matches_json_loads_across_any_chunking():
+    data = [{"a": 'x "q" [}] \\ ü', "b": [1, {"c": None}]}, 3, "s]", True, [], {"n": -1.5e3}]
+    text = "```json\n" + json.dumps(data, indent=2, ensure_ascii=False) + "\n```"
+    for seed in range(50):
+        rng, parser, out, i = random.Random(seed), JsonArrayStream(), [], 0
+        while i < len(text):
+            step = rng.randint(1, 9)
+            out += parser.feed(text[i:i + step])
+            i += step
+        assert out == data and parser.closed
+
+
+def test_parser_skips_bad_elements_and_reports_truncation():
+    parser = JsonArrayStream()
+    assert parser.feed('[{"a": 1}, {oops}, {"b": 2}, {"c": "cut of') == [{"a": 1}, {"b": 2}]
+    assert (parser.count, parser.malformed, parser.closed) == (2, 1, False)
+
+
+# ── rank_and_explain streaming ───────────────────────────────────────────────
+
+def _person(name, verticals=("tokenisation",), summary="Invests in RWA."):
+    return SimpleNamespace(
+        id=uuid.uuid4(), name=name, title="Partner", company=f"{name} Co", goals="Meet builders",
+        target_companies=None, interests=["rwa"], ai_summary=summary, intent_tags=[],
+        vertical_tags=list(verticals), deal_readiness_score=0.5, enriched_profile={},
+        inferred_customer_profile={}, privacy_mode="full", embedding=[0.1], matching_consent=None,
+    )
+
+
+def _answer(candidates) -> list[dict]:
+    # Reversed on purpose, one hallucinated name, one duplicate topic.
+    out = [{
+        "candidate_index": 1, "candidate_name": c.name, "overall_score": 0.7 + 0.02 * i,
+        "match_type": "non_obvious" if i % 2 else "deal_ready",
+        "explanation": f"why {c.name} " * 12, "shared_context": {"sectors": ["rwa"], "action_items": ["a", "b"]},
+    } for i, (c, _) in enumerate(reversed(candidates))]
+    out.insert(1, {**out[0], "candidate_name": "Rob Hadick"})
+    return out
+
+
+def _stream_of(text: str, size=7, fail_after=None):
+    async def gen():
+        for n, i in enumerate(range(0, len(text), size)):
+            if fail_after is not None and n == fail_after:
+                raise ConnectionError("stream reset")
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text[i:i + size]))])
+    return gen()
+
+
+@pytest.fixture
+def _env(monkeypatch):
+    monkeypatch.setattr(matching_mod.settings, "AI_RERANK_ENABLED", True)
+    monkeypatch.setattr(matching_mod.settings, "AI_CONFIDENCE_ENABLED", True)
+    monkeypatch.setattr(cache_mod, "lookup", AsyncMock(return_value=None))
+    store = AsyncMock()
+    monkeypatch.setattr(cache_mod, "store", store)
+    create = AsyncMock()
+    monkeypatch.setattr(matching_mod, "client", SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    engine = MatchingEngine(db=AsyncMock())
+    engine._build_rerank_prompt = AsyncMock(return_value="prompt")
+    target = _person("Target", verticals=("policy_regulation_macro",))
+    candidates = [(_person(f"Cand {i}", verticals=("privacy",) if i % 2 else ("bitcoin",)), 0.8) for i in range(5)]
+    return engine, target, candidates, create, store
+
+
+@pytest.mark.asyncio
+async def test_streamed_entries_match_the_blocking_path(_env):
+    engine, target, candidates, create, store = _env
+    answer = _answer(candidates)
+    create.return_value = _stream_of("```json\n" + json.dumps(answer) + "\n```")
+    seen = []
+
+    async def on_entry(entry):
+        seen.append(copy.deepcopy(entry))
+
+    ranked = await engine.rank_and_explain(target, candidates, on_entry=on_entry)
+
+    assert create.await_args.kwargs["stream"] is True
+    expected = engine._finish_ranking(copy.deepcopy(answer), target, candidates)
+    assert ranked == expected and len(ranked) == 5  # hallucinated name dropped
+    # Arrival (LLM) order, each with its final values.
+    assert [e["candidate_index"] for e in seen] == [5, 4, 3, 2, 1]
+    assert sorted(seen, key=lambda e: e["overall_score"], reverse=True) == expected
+    store.assert_awaited_once_with(store.await_args.args[0], store.await_args.args[1], answer)
+
+
+@pytest.mark.asyncio
+async def test_truncated_stream_keeps_its_prefix_and_skips_the_cache(_env):
+    engine, target, candidates, create, store = _env
+    text = json.dumps(_answer(candidates))
+    create.return_value = _stream_of(text[: text.index('"Cand 2"')])
+    on_entry = AsyncMock()
+
+    ranked = await engine.rank_and_explain(target, candidates, on_entry=on_entry)
+
+    assert sorted(e["candidate_index"] for e in ranked) == [4, 5]
+    assert on_entry.await_count == 2
+    store.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_dropped_connection_keeps_prefix_but_fails_if_nothing_arrived(_env):
+    engine, target, candidates, create, store = _env
+    text = json.dumps(_answer(candidates))
+    create.return_value = _stream_of(text, size=len(text) // 3 + 1, fail_after=2)
+    ranked = await engine.rank_and_explain(target, candidates, on_entry=AsyncMock())
+    assert 0 < len(ranked) < 5
+
+    create.return_value = _stream_of(text, fail_after=0)
+    with pytest.raises(ConnectionError):
+        await engine.rank_and_explain(target, candidates, on_entry=AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_on_entry_errors_are_not_a_dropped_stream(_env):
+    """A persist/commit failure in on_entry must propagate, not be logged as
+    a broken stream and swallowed once the first entry has arrived."""
+    engine, target, candidates, create, store = _env
+    create.return_value = _stream_of(json.dumps(_answer(candidates)))
+    on_entry = AsyncMock(side_effect=[None, RuntimeError("commit failed")])
+    with pytest.raises(RuntimeError, match="commit failed"):
+        await engine.rank_and_explain(target, candidates, on_entry=on_entry)
+    assert on_entry.await_count == 2
+    store.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_unparseable_stream_falls_back_to_similarity_order(_env):
+    engine, target, candidates, create, store = _env
+    create.return_value = _stream_of("Sorry, I can't rank these.")
+    ranked = await engine.rank_and_explain(target, candidates, on_entry=AsyncMock())
+    assert sorted(e["candidate_index"] for e in ranked) == [1, 2, 3, 4, 5]
+    assert {e["explanation"] for e in ranked} == {"Match based on profile similarity."}
+
+
+# ── early persistence ────────────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_curated_matches_are_committed_as_they_stream(_env, monkeypatch):
+    engine, target, candidates, create, store = _env
+    create.return_value = _stream_of(json.dumps(_answer(candidates)))
+    events = []
+    engine.db.get = AsyncMock(return_value=target)
+    engine.db.commit = AsyncMock(side_effect=lambda: events.append("commit"))
+    monkeypatch.setattr(matching_mod, "ensure_heavy", AsyncMock())
+    monkeypatch.setattr(consent_mod, "is_match_gated", lambda a: False)
+    engine._candidate_pool = AsyncMock(return_value=candidates)
+    engine._apply_priority_intros = AsyncMock(side_effect=lambda a, m: m)
+
+    async def persist(attendee, ranked, cands, **kw):
+        events.append(("persist", len(ranked)))
+        return [SimpleNamespace(id=uuid.uuid4()) for _ in ranked]
+
+    engine._persist_ranked = persist
+
+    await engine.generate_matches_for_attendee(target.id, clear_existing=False, notify=False, stream=True)
+
+    assert events == [("persist", 1), "commit"] * 5 + [("persist", 5), "commit"]
+
+    events.clear()
+    create.return_value = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(
+        content=json.dumps(_answer(candidates))))])
+    await engine.generate_matches_for_attendee(target.id, clear_existing=False, notify=False, stream=False)
+    assert events == [("persist", 5), "commit"]
+    assert "stream" not in create.await_args.kwargs
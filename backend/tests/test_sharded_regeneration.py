@@ -0,0 +1,148 @@
+# backend/tests/test_sharded_regeneration.py
+"""Sharded full-pool regeneration: stable shard assignment, pair ownership
+between concurrently running shards, generate_shard's slice of the pool,
+and scripts/regenerate_matches.py's stats merge / pool share. No DB."""
+import sys
+import uuid
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import scripts.regenerate_matches as regen_script
+from app.models.attendee import Match
+from app.services.matching import MatchingEngine, shard_of
+
+
+def test_shard_of_is_stable_and_spreads_the_pool():
+    ids = [uuid.UUID(int=i * 7919 + 1) for i in range(4000)]
+    first = [shard_of(i, 4) for i in ids]
+    assert first == [shard_of(uuid.UUID(str(i)), 4) for i in ids]
+    counts = Counter(first)
+    assert set(counts) == {0, 1, 2, 3} and min(counts.values()) > 900
+
+
+def test_pair_owner_is_the_least_side_of_the_pair_key():
+    for _ in range(200):
+        a, b = uuid.uuid4(), uuid.uuid4()
+        # Postgres compares uuids bytewise — least(a, b) is min by bytes.
+        owner = min(a, b, key=lambda u: u.bytes)
+        assert MatchingEngine._owns_pair(owner, a if owner == b else b)
+        assert not MatchingEngine._owns_pair(a if owner == b else b, owner)
+
+
+def _ordered_pair():
+    lo, hi = sorted((uuid.uuid4(), uuid.uuid4()), key=lambda u: u.int)
+    return lo, hi
+
+
+def _stale(a, b):
+    return Match(
+        id=uuid.uuid4(), attendee_a_id=a, attendee_b_id=b, overall_score=0.5, explanation="owner's",
+        status_a="pending", status_b="pending", meeting_time=None, decline_reason=None,
+        hidden_by_user=False, met_at=None,
+    )
+
+
+class _Rows:
+    def __init__(self, rows):
+        self._rows = list(rows)
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+def _scripted_db(*results):
+    """db.execute answering each statement with the next entry of `results`."""
+    queue = list(results)
+    seen = []
+
+    async def execute(stmt):
+        seen.append(stmt.__visit_name__)
+        return _Rows(queue.pop(0))
+
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=execute)
+    return db, seen
+
+
+def _entry(explanation):
+    return [{"candidate_index": 1, "overall_score": 0.9, "match_type": "complementary",
+             "explanation": explanation, "shared_context": {}}]
+
+
+@pytest.mark.asyncio
+async def test_non_owner_keeps_the_owners_row_in_a_sharded_run():
+    lo, hi = _ordered_pair()
+    row = _stale(lo, hi)
+    db, seen = _scripted_db([row])
+    engine = MatchingEngine(db)
+    engine._pair_ownership = True
+
+    out = await engine._persist_ranked(SimpleNamespace(id=hi), _entry("non-owner's"), [(SimpleNamespace(id=lo), 0.9)],
+                                       tier="curated", floor=0.0, non_obvious_floor=0.0)
+
+    assert out == [row] and row.explanation == "owner's"
+    assert seen == ["select"]  # no UPDATE
+
+    # Outside a sharded run the old last-writer behaviour is unchanged.
+    db, seen = _scripted_db([row], [row.id])
+    await MatchingEngine(db)._persist_ranked(SimpleNamespace(id=hi), _entry("non-owner's"), [(SimpleNamespace(id=lo), 0.9)],
+                                             tier="curated", floor=0.0, non_obvious_floor=0.0)
+    assert seen == ["select", "update"] and row.explanation == "non-owner's"
+
+
+@pytest.mark.asyncio
+async def test_owner_reclaims_a_pair_another_shard_inserted_first():
+    lo, hi = _ordered_pair()
+    theirs = _stale(hi, lo)
+    theirs.explanation = "non-owner's"
+    # SELECT: nothing yet → INSERT loses ON CONFLICT → re-SELECT → UPDATE.
+    db, seen = _scripted_db([], [], [theirs], [theirs.id])
+    engine = MatchingEngine(db)
+    engine._pair_ownership = True
+
+    out = await engine._persist_ranked(SimpleNamespace(id=lo), _entry("owner's"), [(SimpleNamespace(id=hi), 0.9)],
+                                       tier="curated", floor=0.0, non_obvious_floor=0.0)
+
+    assert seen == ["select", "insert", "select", "update"]
+    assert out == [theirs] and theirs.explanation == "owner's"
+
+
+@pytest.mark.asyncio
+async def test_generate_shard_runs_only_its_slice():
+    people = [SimpleNamespace(id=uuid.uuid4(), embedding=None) for _ in range(40)]
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=_Rows(people))
+    engine = MatchingEngine(db)
+    engine.generate_matches_for_attendee = AsyncMock(return_value=[object()])
+
+    stats = await engine.generate_shard(shard=1, shards=3)
+
+    done = [c.args[0] for c in engine.generate_matches_for_attendee.await_args_list]
+    assert done == [p.id for p in people if shard_of(p.id, 3) == 1]
+    assert stats["shard"] == 1 and stats["attendees"] == stats["matches"] == len(done)
+    assert engine._pair_ownership is True
+    for call in engine.generate_matches_for_attendee.await_args_list:
+        assert call.kwargs["notify"] is False and call.kwargs["stream"] is False
+
+
+def test_merge_shard_stats_and_pool_share(monkeypatch):
+    batch = {"prompts": 3, "cached": 1, "submitted": 2, "answered": 2, "failed": 0}
+    merged = regen_script.merge_shard_stats([
+        {"shard": 0, "attendees": 10, "matches": 80, "seconds": 12.5, "batch": batch},
+        {"shard": 1, "attendees": 12, "matches": 95, "seconds": 14.0, "batch": batch},
+    ])
+    assert merged == {"shards": 2, "attendees": 22, "matches": 175, "seconds": 14.0,
+                      "batch": {"prompts": 6, "cached": 2, "submitted": 4, "answered": 4, "failed": 0}}
+
+    monkeypatch.setattr(regen_script, "get_settings", lambda: SimpleNamespace(DB_POOL_SIZE=20, DB_MAX_OVERFLOW=30))
+    assert regen_script.pool_share(4) == {"DB_POOL_SIZE": "5", "DB_MAX_OVERFLOW": "7"}
+    assert regen_script.pool_share(16) == {"DB_POOL_SIZE": "2", "DB_MAX_OVERFLOW": "1"}
@@ -0,0 +1,266 @@
+# backend/tests/test_supabase_bulk_writer.py
+"""scripts/supabase_bulk_writer.py — batching, flush triggers, per-row failures.
+
+PostgREST is faked with httpx.MockTransport over an in-memory attendees
+table that enforces the model's NOT NULL constraints the way Postgres does
+for an upsert; the asyncpg backend with a tiny connection double. No
+network, no DB.
+"""
+import json
+import sys
+import pathlib
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "scripts"))
+from supabase_bulk_writer import _UPSERT_REQUIRED_COLUMNS, AttendeeBulkWriter  # noqa: E402
+
+from app.models.attendee import Attendee  # noqa: E402
+
+# NOT NULL with no server default — what an INSERT row must supply itself.
+_NOT_NULL = {
+    c.name for c in Attendee.__table__.columns
+    if not c.nullable and c.server_default is None
+}
+
+
+def _full_row(aid):
+    return {
+        "id": aid, "created_at": "2026-05-01T00:00:00", "updated_at": "2026-05-01T00:00:00",
+        "name": f"Name {aid}", "email": f"{aid}@x.com", "company": "Co", "title": "CEO",
+        "ticket_type": "delegate", "interests": [], "seeking": [], "not_looking_for": [],
+        "preferred_geographies": [], "privacy_mode": "full", "enriched_profile": {"keep": aid},
+        "intent_tags": [], "vertical_tags": ["defi"], "inferred_customer_profile": {},
+        "crunchbase_data": {}, "pot_history": {}, "ai_summary": None, "photo_url": None,
+        "linkedin_url": None, "matching_consent": "not_required",
+    }
+
+
+class _FakePostgrest:
+    """Records every request over an in-memory attendees table. `bad_ids`
+    make any upsert/patch that contains them fail with a 400. An upsert
+    whose INSERT row lacks a NOT NULL column fails the whole statement
+    with 23502 — Postgres checks it before resolving ON CONFLICT."""
+
+    def __init__(self, existing, bad_ids=()):
+        self.rows = {aid: _full_row(aid) for aid in existing}
+        self.bad_ids = set(bad_ids)
+        self.calls: list[tuple[str, dict, object]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        body = json.loads(request.content) if request.content else None
+        self.calls.append((request.method, params, body))
+        if request.method == "GET":
+            ids = params["id"][len("in.("):-1].split(",")
+            cols = params["select"].split(",")
+            return httpx.Response(200, json=[
+                {c: self.rows[i][c] for c in cols} for i in ids if i in self.rows
+            ])
+        if request.method == "POST":
+            for r in body:
+                missing = sorted(c for c in _NOT_NULL if r.get(c) is None)
+                if missing:
+                    return httpx.Response(400, json={"code": "23502", "message": f"null value in column {missing[0]!r}"})
+            if any(r["id"] in self.bad_ids for r in body):
+                return httpx.Response(400, text="bad row")
+            for r in body:
+                self.rows.setdefault(r["id"], {}).update(r)
+            return httpx.Response(201)
+        if request.method == "PATCH":
+            aid = params["id"][len("eq."):]
+            if aid in self.bad_ids:
+                return httpx.Response(400, text="bad row")
+            self.rows[aid].update(body)
+            return httpx.Response(204)
+        return httpx.Response(405)
+
+
+def _writer(fake, **kw):
+    return AttendeeBulkWriter(
+        supabase_url="https://sb.example",
+        service_role_key="k",
+        database_url="",
+        transport=httpx.MockTransport(fake),
+        flush_interval=0,
+        retries=1,
+        **kw,
+    )
+
+
+def test_required_columns_match_the_model():
+    assert set(_UPSERT_REQUIRED_COLUMNS) == _NOT_NULL - {"id"}
+
+
+@pytest.mark.asyncio
+async def test_postgrest_flushes_one_upsert_per_column_set():
+    fake = _FakePostgrest(existing=["a", "b", "c"])
+    async with _writer(fake, batch_size=100) as w:
+        await w.add("a", {"ai_summary": "s1"})
+        await w.add("b", {"ai_summary": "s2"})
+        await w.add("c", {"photo_url": "p"})
+        assert fake.calls == []  # nothing sent until flush
+
+    methods = [c[0] for c in fake.calls]
+    assert methods == ["GET", "POST", "GET", "POST"]  # each group re-read right before its upsert; no PATCH fallback
+    posted = [c[2] for c in fake.calls if c[0] == "POST"]
+    assert {r["id"] for r in posted[0]} == {"a", "b"}
+    # Every NOT NULL column rides along so the upsert's INSERT half is valid.
+    assert _NOT_NULL <= set(posted[0][0])
+    assert w.stats["written"] == 3
+    assert w.failures == []
+    # Changed columns land; untouched ones keep their values.
+    assert fake.rows["a"]["ai_summary"] == "s1" and fake.rows["c"]["photo_url"] == "p"
+    assert fake.rows["a"]["enriched_profile"] == {"keep": "a"} and fake.rows["a"]["vertical_tags"] == ["defi"]
+
+
+@pytest.mark.asyncio
+async def test_upsert_reads_back_only_untouched_required_columns():
+    """The carried columns are re-read at flush time, not at add() time, and
+    a column the payload sets is never read back — so a profile edit that
+    commits while the update sits in the buffer survives the upsert."""
+    fake = _FakePostgrest(existing=["a"])
+    async with _writer(fake) as w:
+        await w.add("a", {"ai_summary": "s", "company": "NewCo"})
+        fake.rows["a"]["interests"] = ["edited meanwhile"]
+
+    (_, get_params, _), (_, _, posted) = fake.calls
+    selected = get_params["select"].split(",")
+    assert "company" not in selected and "ai_summary" not in selected
+    assert set(selected) == {"id", *_UPSERT_REQUIRED_COLUMNS} - {"company"}
+    assert posted[0]["company"] == "NewCo"
+    assert fake.rows["a"]["interests"] == ["edited meanwhile"]
+
+
+@pytest.mark.asyncio
+async def test_flush_on_size():
+    fake = _FakePostgrest(existing=["a", "b"])
+    w = _writer(fake, batch_size=2)
+    await w.add("a", {"ai_summary": "s"})
+    assert fake.calls == []
+    await w.add("b", {"ai_summary": "s"})
+    assert [c[0] for c in fake.calls] == ["GET", "POST"]
+    await w.close()
+
+
+@pytest.mark.asyncio
+async def test_repeated_updates_for_same_row_are_merged():
+    fake = _FakePostgrest(existing=["a"])
+    async with _writer(fake) as w:
+        await w.add("a", {"linkedin_url": "u"})
+        await w.add("a", {"enriched_profile": {"x": 1}})
+    posted = [c[2] for c in fake.calls if c[0] == "POST"]
+    assert len(posted) == 1
+    assert posted[0][0]["linkedin_url"] == "u"
+    assert posted[0][0]["enriched_profile"] == {"x": 1}
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_isolated_row_by_row():
+    fake = _FakePostgrest(existing=["a", "b", "c"], bad_ids=["b"])
+    async with _writer(fake) as w:
+        for aid in ("a", "b", "c"):
+            await w.add(aid, {"ai_summary": "s"})
+    assert [aid for aid, _ in w.failures] == ["b"]
+    assert w.stats["written"] == 2
+    patched = [c[1]["id"] for c in fake.calls if c[0] == "PATCH"]
+    assert sorted(patched) == ["eq.a", "eq.b", "eq.c"]
+
+
+@pytest.mark.asyncio
+async def test_deleted_row_is_reported_not_reinserted():
+    fake = _FakePostgrest(existing=["a"])
+    async with _writer(fake) as w:
+        await w.add("a", {"ai_summary": "s"})
+        await w.add("gone", {"ai_summary": "s"})
+    posted = [c[2] for c in fake.calls if c[0] == "POST"]
+    assert [r["id"] for r in posted[0]] == ["a"]
+    assert w.failures == [("gone", "row no longer exists")]
+
+
+@pytest.mark.asyncio
+async def test_dry_run_never_writes():
+    fake = _FakePostgrest(existing=["a"])
+    async with _writer(fake, dry_run=True) as w:
+        await w.add("a", {"ai_summary": "s"})
+    assert fake.calls == []
+
+
+class _Tx:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeConn:
+    def __init__(self, fail_executemany=False, missing=()):
+        self.fail_executemany = fail_executemany
+        self.missing = set(missing)
+        self.executemany_calls: list[tuple[str, list]] = []
+        self.execute_calls: list[tuple] = []
+
+    def transaction(self):
+        return _Tx()
+
+    async def fetch(self, sql, ids):
+        assert "FOR UPDATE" in sql
+        return [{"id": i} for i in ids if i not in self.missing]
+
+    async def executemany(self, sql, rows):
+        self.executemany_calls.append((sql, rows))
+        if self.fail_executemany:
+            raise RuntimeError("boom")
+
+    async def execute(self, sql, *args):
+        self.execute_calls.append(args)
+        return "UPDATE 0" if args[0] in self.missing else "UPDATE 1"
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_asyncpg_backend_uses_executemany_with_casts():
+    conn = _FakeConn()
+    w = AttendeeBulkWriter(database_url="postgresql+asyncpg://u:p@h/db", flush_interval=0)
+    w._pg = conn
+    assert w.backend == "asyncpg"
+    await w.add("a", {"enriched_profile": {"k": "v"}, "embedding": "[0.1]"})
+    await w.add("b", {"enriched_profile": {}, "embedding": "[0.2]"})
+    await w.close()
+
+    assert len(conn.executemany_calls) == 1
+    sql, rows = conn.executemany_calls[0]
+    assert '"embedding" = $2::text::vector' in sql
+    assert '"enriched_profile" = $3::text::jsonb' in sql
+    assert rows[0] == ("a", "[0.1]", '{"k": "v"}')
+    assert w.stats["written"] == 2
+
+
+@pytest.mark.asyncio
+async def test_asyncpg_failed_batch_reports_missing_rows():
+    conn = _FakeConn(fail_executemany=True, missing=["b"])
+    w = AttendeeBulkWriter(database_url="postgresql://u:p@h/db", flush_interval=0)
+    w._pg = conn
+    await w.add("a", {"ai_summary": "s"})
+    await w.add("b", {"ai_summary": "s"})
+    await w.close()
+    assert w.failures == [("b", "row no longer exists")]
+    assert w.stats["written"] == 1
+
+
+@pytest.mark.asyncio
+async def test_asyncpg_counts_only_rows_that_still_exist():
+    conn = _FakeConn(missing=["gone"])
+    w = AttendeeBulkWriter(database_url="postgresql://u:p@h/db", flush_interval=0)
+    w._pg = conn
+    await w.add("a", {"ai_summary": "s"})
+    await w.add("gone", {"ai_summary": "s"})
+    await w.close()
+    (_, rows), = conn.executemany_calls
+    assert [r[0] for r in rows] == ["a"]
+    assert w.stats["written"] == 1
+    assert w.failures == [("gone", "row no longer exists")]
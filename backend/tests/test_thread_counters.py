@@ -0,0 +1,123 @@
+# backend/tests/test_thread_counters.py
+"""Warm-up threads — counter-backed listing, batched authors, keyset posts.
+
+Mock DB: `db.execute` compiles + records each statement and hands back the
+next canned result, so query COUNT (not just results) is asserted.
+"""
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+import app.api.routes.threads as threads
+from app.utils.cursors import decode_time_cursor
+
+T0 = datetime(2026, 5, 20, 9, 0)
+
+
+class _Res:
+    def __init__(self, rows=(), scalar=None):
+        self._rows, self._scalar = list(rows), scalar
+    def all(self): return list(self._rows)
+    def first(self): return self._rows[0] if self._rows else None
+    def scalars(self): return self
+    def scalar_one_or_none(self): return self._scalar
+
+
+def _db(*results):
+    sql: list[str] = []
+    seq = list(results)
+
+    async def _execute(stmt, params=None):
+        sql.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return seq.pop(0)
+
+    db = AsyncMock()
+    db.add = lambda obj: setattr(obj, "id", uuid.uuid4())
+    db.execute.side_effect = _execute
+    return db, sql
+
+
+def _thread(slug, count, latest=None):
+    return SimpleNamespace(
+        id=uuid.uuid4(), slug=slug, title=slug.title(), description=None,
+        post_count=count, latest_post_at=latest,
+    )
+
+
+@pytest.mark.asyncio
+async def test_listing_is_served_from_counters_in_constant_queries():
+    rows = [_thread("bitcoin", 3, T0), _thread("defi", 12, T0), _thread("decentralized_ai", 0)]
+    db, sql = _db(_Res(scalar=["bitcoin"]), _Res(rows))
+
+    with patch.object(threads, "_ensure_default_threads", AsyncMock()):
+        out = await threads.list_threads(db=db, user=SimpleNamespace(attendee_id=uuid.uuid4()))
+
+    assert len(sql) == 2  # vertical tags + threads — not 2 per thread
+    assert "thread_posts" not in " ".join(sql)
+    assert "attendees.vertical_tags" in sql[0] and "embedding" not in sql[0]
+    assert [t.slug for t in out["threads"]] == ["bitcoin", "defi", "decentralized_ai"]
+    assert out["threads"][0].is_member and out["threads"][0].latest_post_at == T0.isoformat()
+    assert out["threads"][2].latest_post_at is None
+
+
+@pytest.mark.asyncio
+async def test_create_post_bumps_counters_in_the_same_transaction():
+    tid = uuid.uuid4()
+    db, sql = _db(_Res(scalar=tid), _Res([SimpleNamespace(name="Ana", title="GP", company="Fund")]), _Res())
+
+    out = await threads.create_post(
+        "bitcoin", threads.PostRequest(content=" gm "), db=db, user=SimpleNamespace(attendee_id=uuid.uuid4())
+    )
+
+    update_sql = sql[2]
+    assert update_sql.startswith("UPDATE threads SET post_count=(threads.post_count + ")
+    assert "latest_post_at=greatest(coalesce(threads.latest_post_at" in update_sql
+    db.commit.assert_awaited_once()
+    assert out.content == "gm" and out.sender_name == "Ana"
+
+
+@pytest.mark.asyncio
+async def test_get_thread_hydrates_authors_once_and_pages_by_keyset():
+    me, other = uuid.uuid4(), uuid.uuid4()
+    thread = _thread("bitcoin", 5)
+    posts = [
+        SimpleNamespace(id=uuid.UUID(int=i), sender_attendee_id=me if i % 2 else other,
+                        content=f"p{i}", created_at=T0 + timedelta(minutes=i))
+        for i in (5, 4, 3)  # newest first, limit+1 for limit=2
+    ]
+    authors = [SimpleNamespace(id=me, name="Me", title="", company=""),
+               SimpleNamespace(id=other, name="Them", title="CTO", company="X")]
+    db, sql = _db(_Res([thread]), _Res(posts), _Res(authors))
+
+    out = await threads.get_thread("bitcoin", limit=2, before=None, db=db, user=SimpleNamespace(attendee_id=me))
+
+    assert len(sql) == 3
+    db.get.assert_not_called()
+    assert "ORDER BY thread_posts.created_at DESC, thread_posts.id DESC" in sql[1]
+    assert "attendees.id IN" in sql[2] and "embedding" not in sql[2]
+    assert [p.content for p in out["posts"]] == ["p4", "p5"]
+    assert [p.sender_name for p in out["posts"]] == ["Them", "Me"]
+    assert out["posts"][1].is_mine is True
+    assert out["has_more"] is True and out["thread"]["post_count"] == 5
+    assert decode_time_cursor(out["before_cursor"]) == (T0 + timedelta(minutes=4), uuid.UUID(int=4))
+
+    db, sql = _db(_Res([thread]), _Res([]))
+    out = await threads.get_thread(
+        "bitcoin", limit=2, before=out["before_cursor"], db=db, user=SimpleNamespace(attendee_id=me)
+    )
+    assert "(thread_posts.created_at, thread_posts.id) < (" in sql[1]
+    assert len(sql) == 2  # no author query for an empty page
+    assert out["posts"] == [] and out["has_more"] is False
+
+
+@pytest.mark.asyncio
+async def test_get_thread_bad_cursor_is_400():
+    db, _ = _db(_Res([_thread("bitcoin", 0)]))
+    with pytest.raises(HTTPException) as exc:
+        await threads.get_thread("bitcoin", limit=5, before="nope", db=db, user=SimpleNamespace(attendee_id=None))
+    assert exc.value.status_code == 400
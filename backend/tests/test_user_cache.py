@@ -0,0 +1,119 @@
+# backend/tests/test_user_cache.py
+"""Per-worker authenticated-user cache in core/deps.get_current_user.
+
+A warm request must neither SELECT the users row nor re-decode the JWT, and
+the decoded payload is handed to sliding_token_refresh via request.state.
+"""
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import app.core.deps as deps
+from app.core.middleware import refreshed_token
+from app.core.security import create_access_token
+from app.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    deps.invalidate_user_cache()
+    yield
+    deps.invalidate_user_cache()
+
+
+def _user(**kw):
+    return User(
+        id=kw.get("id", uuid.uuid4()), email="a@x.com", hashed_password="h",
+        full_name=kw.get("full_name", "Ana"), is_admin=kw.get("is_admin", False),
+        attendee_id=None, last_login_at=None, created_at=None,
+    )
+
+
+class _First:
+    def __init__(self, row): self._row = row
+    def scalars(self): return self
+    def first(self): return self._row
+
+
+def _db(user):
+    db = AsyncMock()
+    db.execute.return_value = _First(user)
+    db.merge.side_effect = lambda obj, load=True: obj
+    return db
+
+
+def _request():
+    return SimpleNamespace(state=SimpleNamespace())
+
+
+@pytest.mark.asyncio
+async def test_second_request_skips_select_and_decode():
+    u = _user(is_admin=True)
+    token = create_access_token({"sub": str(u.id)})
+
+    db = _db(u)
+    req = _request()
+    assert await deps.get_current_user(req, token, db) is u
+    db.execute.assert_awaited_once()
+    assert req.state.jwt_payload["sub"] == str(u.id)
+
+    db2 = _db(None)
+    req2 = _request()
+    with patch.object(deps, "decode_token", side_effect=AssertionError("decoded twice")):
+        cached = await deps.get_current_user(req2, token, db2)
+    db2.execute.assert_not_awaited()
+    db2.merge.assert_awaited_once()
+    assert db2.merge.await_args.kwargs == {"load": False}
+    assert (cached.id, cached.full_name, cached.is_admin) == (u.id, "Ana", True)
+    assert cached is not u  # a fresh instance per request/session
+    assert req2.state.jwt_payload["sub"] == str(u.id)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_every_token_for_that_user():
+    u, other = _user(), _user()
+    t1 = create_access_token({"sub": str(u.id), "n": 1})
+    t2 = create_access_token({"sub": str(u.id), "n": 2})
+    t3 = create_access_token({"sub": str(other.id)})
+    for tok, row in ((t1, u), (t2, u), (t3, other)):
+        await deps.get_current_user(_request(), tok, _db(row))
+
+    deps.invalidate_user_cache(u.id)
+
+    assert t1 not in deps._user_cache and t2 not in deps._user_cache
+    assert t3 in deps._user_cache
+    renamed = _user(id=u.id, full_name="Ana B")
+    db = _db(renamed)
+    assert (await deps.get_current_user(_request(), t1, db)).full_name == "Ana B"
+    db.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_and_unknown_users_are_not_cached(monkeypatch):
+    u = _user()
+    token = create_access_token({"sub": str(u.id)})
+    await deps.get_current_user(_request(), token, _db(u))
+
+    real_time = time.time
+    monkeypatch.setattr(deps.time, "time", lambda: real_time() + deps.USER_CACHE_TTL_SECONDS + 1)
+    db = _db(u)
+    await deps.get_current_user(_request(), token, db)
+    db.execute.assert_awaited_once()  # expired → back to the DB
+
+    ghost = create_access_token({"sub": str(uuid.uuid4())})
+    assert await deps.get_current_user(_request(), ghost, _db(None)) is None
+    assert ghost not in deps._user_cache
+
+
+def test_sliding_refresh_reuses_the_decoded_payload():
+    sub = str(uuid.uuid4())
+    scope = {
+        "type": "http",
+        "headers": [(b"authorization", b"Bearer whatever")],
+        "state": {"jwt_payload": {"sub": sub, "exp": time.time() + 600}},
+    }
+    with patch("app.core.security.decode_token", side_effect=AssertionError("decoded twice")):
+        assert refreshed_token(scope)
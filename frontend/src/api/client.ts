@@ -277,6 +277,31 @@ export async function getRevenueStats(): Promise<{
   return data;
 }
 
+export async function refreshDashboardMetrics(): Promise<{
+  status: string;
+  refreshed: number;
+  errors: number;
+  duration_ms: Record<string, number>;
+  failed?: Record<string, string>;
+}> {
+  const { data } = await api.post("/dashboard/metrics/refresh");
+  return data;
+}
+
+export interface LlmCacheStatus {
+  ttl_hours: number;
+  entries: number;
+  live_entries: number;
+  stored_hits: number;
+  last_hit_at: string | null;
+  worker: { hits: number; misses: number; stores: number; errors: number; hit_rate: number | null };
+}
+
+export async function getLlmCache(): Promise<LlmCacheStatus> {
+  const { data } = await api.get("/dashboard/llm-cache");
+  return data;
+}
+
 export async function getAdoption(): Promise<Adoption> {
   const { data } = await api.get("/dashboard/adoption");
   return data;
@@ -564,8 +589,13 @@ export async function listConversations(): Promise<{ conversations: Conversation
   return data;
 }
 
-export async function getConversation(matchId: string): Promise<ConversationDetail> {
-  const { data } = await api.get(`/messages/conversations/${matchId}`);
+// Newest page by default; pass `before` (a page's before_cursor) for the
+// next-older page. Keyset-paginated server-side.
+export async function getConversation(
+  matchId: string,
+  params: { before?: string; after?: string; limit?: number } = {},
+): Promise<ConversationDetail> {
+  const { data } = await api.get(`/messages/conversations/${matchId}`, { params });
   return data;
 }
 
@@ -579,6 +609,17 @@ export async function getUnreadCount(): Promise<{ unread_count: number }> {
   return data;
 }
 
+// Short-lived ticket for the SSE push channel (EventSource can't send the
+// Authorization header). See useMessageStream in hooks/useMessages.ts.
+export async function getMessageStreamTicket(): Promise<{ ticket: string }> {
+  const { data } = await api.post("/messages/stream-ticket");
+  return data;
+}
+
+export function messageStreamUrl(ticket: string): string {
+  return `${api.defaults.baseURL}/messages/stream?ticket=${encodeURIComponent(ticket)}`;
+}
+
 // ── Threads ─────────────────────────────────────────────────────────
 
 export interface ThreadSummary {
@@ -607,11 +648,15 @@ export async function listThreads(): Promise<{ threads: ThreadSummary[] }> {
   return data;
 }
 
-export async function getThread(slug: string): Promise<{
-  thread: { id: string; slug: string; title: string; description: string | null };
+// Newest page of posts by default; pass a page's before_cursor for the
+// next-older page (keyset-paginated server-side).
+export async function getThread(slug: string, before?: string | null): Promise<{
+  thread: { id: string; slug: string; title: string; description: string | null; post_count: number };
   posts: ThreadPost[];
+  has_more: boolean;
+  before_cursor: string | null;
 }> {
-  const { data } = await api.get(`/threads/${slug}`);
+  const { data } = await api.get(`/threads/${slug}`, { params: before ? { before } : {} });
   return data;
 }
 
@@ -1,33 +1,146 @@
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { useEffect, useMemo } from "react";
+import { useInfiniteQuery, useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import {
   listConversations,
   getConversation,
   sendMessage,
   getUnreadCount,
+  getMessageStreamTicket,
+  messageStreamUrl,
 } from "../api/client";
 
 function isAuthed() {
   return !!localStorage.getItem("token");
 }
 
+// ── Push channel ──────────────────────────────────────────────────────
+// While the SSE stream (GET /messages/stream, Postgres LISTEN/NOTIFY on the
+// backend) is open, the queries below stop polling and are refreshed by
+// events instead. Polling is the fallback for when the stream is down
+// (503 / network / proxy that buffers SSE).
+let streamLive = false;
+
+const pollWhenOffline = (ms: number) => () => (streamLive ? false : ms);
+
+export function useMessageStream() {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    if (!isAuthed()) return;
+    let source: EventSource | null = null;
+    let retryTimer: ReturnType<typeof setTimeout> | undefined;
+    let attempt = 0;
+    let stopped = false;
+
+    const setLive = (live: boolean) => {
+      if (streamLive === live) return;
+      streamLive = live;
+      // Re-evaluates refetchInterval: polling resumes when the stream drops.
+      queryClient.invalidateQueries({ queryKey: ["conversations"] });
+      queryClient.invalidateQueries({ queryKey: ["conversation"] });
+      queryClient.invalidateQueries({ queryKey: ["unread-count"] });
+    };
+
+    const applyDelta = (delta: number) => {
+      if (!delta) return;
+      queryClient.setQueryData<{ unread_count: number }>(["unread-count"], (old) =>
+        old ? { unread_count: Math.max(0, old.unread_count + delta) } : old,
+      );
+    };
+
+    const connect = async () => {
+      try {
+        // Tickets live 60s, so a fresh one per (re)connect — EventSource's
+        // own auto-retry would reuse the expired URL.
+        const { ticket } = await getMessageStreamTicket();
+        if (stopped) return;
+        source = new EventSource(messageStreamUrl(ticket));
+      } catch {
+        scheduleRetry();
+        return;
+      }
+      source.onopen = () => {
+        attempt = 0;
+        setLive(true);
+      };
+      source.addEventListener("unread", (e) => {
+        queryClient.setQueryData(["unread-count"], JSON.parse((e as MessageEvent).data));
+      });
+      source.addEventListener("message", (e) => {
+        const evt = JSON.parse((e as MessageEvent).data);
+        applyDelta(evt.unread_delta);
+        queryClient.invalidateQueries({ queryKey: ["conversation", evt.match_id] });
+        queryClient.invalidateQueries({ queryKey: ["conversations"] });
+      });
+      source.addEventListener("read", (e) => {
+        const evt = JSON.parse((e as MessageEvent).data);
+        applyDelta(evt.unread_delta);
+        queryClient.invalidateQueries({ queryKey: ["conversations"] });
+      });
+      source.addEventListener("resync", () => {
+        queryClient.invalidateQueries({ queryKey: ["conversations"] });
+        queryClient.invalidateQueries({ queryKey: ["conversation"] });
+        queryClient.invalidateQueries({ queryKey: ["unread-count"] });
+      });
+      source.onerror = () => {
+        source?.close();
+        source = null;
+        setLive(false);
+        scheduleRetry();
+      };
+    };
+
+    const scheduleRetry = () => {
+      if (stopped) return;
+      const delay = Math.min(30_000, 1_000 * 2 ** attempt++);
+      retryTimer = setTimeout(connect, delay);
+    };
+
+    connect();
+    return () => {
+      stopped = true;
+      clearTimeout(retryTimer);
+      source?.close();
+      setLive(false);
+    };
+  }, [queryClient]);
+}
+
 export function useConversations() {
   return useQuery({
     queryKey: ["conversations"],
     queryFn: listConversations,
     enabled: isAuthed(),
-    refetchInterval: 5_000,
+    refetchInterval: pollWhenOffline(5_000),
     staleTime: 3_000,
   });
 }
 
+// Pages run newest → oldest; "load earlier" fetches the next page. On
+// refetch react-query re-walks the loaded pages from the newest one, so
+// cursors stay consistent when new messages shift the first page.
 export function useConversation(matchId: string | null) {
-  return useQuery({
+  const query = useInfiniteQuery({
     queryKey: ["conversation", matchId],
-    queryFn: () => getConversation(matchId!),
+    queryFn: ({ pageParam }) => getConversation(matchId!, pageParam ? { before: pageParam } : {}),
+    initialPageParam: null as string | null,
+    getNextPageParam: (page) => (page.has_more ? page.before_cursor : undefined),
     enabled: !!matchId && isAuthed(),
-    refetchInterval: 3_000,
+    refetchInterval: pollWhenOffline(3_000),
     staleTime: 1_000,
   });
+  const data = useMemo(() => {
+    const pages = query.data?.pages;
+    if (!pages?.length) return undefined;
+    return { ...pages[0], messages: [...pages].reverse().flatMap((p) => p.messages) };
+  }, [query.data]);
+  return {
+    data,
+    isLoading: query.isLoading,
+    hasEarlier: query.hasNextPage,
+    loadEarlier: query.fetchNextPage,
+    isLoadingEarlier: query.isFetchingNextPage,
+  };
 }
 
 export function useSendMessage(matchId: string | null) {
@@ -59,7 +172,7 @@ export function useUnreadCount() {
     queryKey: ["unread-count"],
     queryFn: getUnreadCount,
     enabled: isAuthed(),
-    refetchInterval: 10_000,
+    refetchInterval: pollWhenOffline(10_000),
     staleTime: 5_000,
   });
 }
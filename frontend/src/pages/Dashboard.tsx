@@ -11,8 +11,8 @@ import {
   useAdoption,
 } from "../hooks/useDashboard";
 import { useAuth } from "../hooks/useAuth";
-import { enrichAll, syncExtasy, syncSpeakers, getInvestorHeatmap, getRevenueStats, getSponsors, generateSponsorReport, reEnrichGrid } from "../api/client";
-import { useQuery } from "@tanstack/react-query";
+import { enrichAll, syncExtasy, syncSpeakers, getInvestorHeatmap, getRevenueStats, getSponsors, generateSponsorReport, reEnrichGrid, refreshDashboardMetrics, getLlmCache } from "../api/client";
+import { useQuery, useQueryClient } from "@tanstack/react-query";
 
 function StatCard({
   icon: Icon,
@@ -82,6 +82,8 @@ export default function Dashboard() {
   const [syncingSpeakers, setSyncingSpeakers] = useState(false);
   const [actionResult, setActionResult] = useState<string | null>(null);
   const [reEnrichingGrid, setReEnrichingGrid] = useState(false);
+  const [refreshingMetrics, setRefreshingMetrics] = useState(false);
+  const queryClient = useQueryClient();
   const [selectedSponsor, setSelectedSponsor] = useState("");
   const [sponsorReport, setSponsorReport] = useState<Record<string, unknown> | null>(null);
   const [generatingReport, setGeneratingReport] = useState(false);
@@ -105,6 +107,12 @@ export default function Dashboard() {
     staleTime: 300_000,
     enabled: isAdmin,
   });
+  const { data: llmCache } = useQuery({
+    queryKey: ["llm-cache"],
+    queryFn: getLlmCache,
+    staleTime: 60_000,
+    enabled: isAdmin,
+  });
   const processMutation = useTriggerProcessing();
   const matchMutation = useTriggerMatching();
 
@@ -255,6 +263,11 @@ export default function Dashboard() {
       <div>
         <h1 className="text-3xl font-bold">Organiser Dashboard</h1>
         <p className="text-white/50 mt-1">Proof of Talk 2026 — Event Intelligence Overview</p>
+        {stats?.age_seconds != null && (
+          <p className="text-xs text-white/30 mt-1">
+            Metrics updated {stats.age_seconds < 60 ? "just now" : `${Math.round(stats.age_seconds / 60)} min ago`}
+          </p>
+        )}
       </div>
 
       {/* Admin actions */}
@@ -305,6 +318,23 @@ export default function Dashboard() {
               <RefreshCw className={`w-4 h-4 ${syncingSpeakers ? "animate-spin" : ""}`} />
               {syncingSpeakers ? "Syncing…" : "Sync Speakers"}
             </button>
+            <button
+              onClick={async () => {
+                setRefreshingMetrics(true); setActionResult(null);
+                try {
+                  const r = await refreshDashboardMetrics();
+                  await queryClient.invalidateQueries();
+                  setActionResult(`Dashboard metrics refreshed — ${r.refreshed} updated${r.errors ? `, ${r.errors} failed` : ""}`);
+                } catch (err: unknown) {
+                  setActionResult(`Metrics refresh error: ${err instanceof Error ? err.message : "failed"}`);
+                } finally { setRefreshingMetrics(false); }
+              }}
+              disabled={refreshingMetrics}
+              className="flex items-center gap-2 px-4 py-2 rounded-lg bg-white/5 border border-white/10 text-sm text-white/70 hover:text-white hover:border-white/20 transition-all disabled:opacity-50"
+            >
+              <RefreshCw className={`w-4 h-4 ${refreshingMetrics ? "animate-spin" : ""}`} />
+              {refreshingMetrics ? "Refreshing…" : "Refresh Metrics"}
+            </button>
             <button
               onClick={async () => {
                 setReEnrichingGrid(true); setActionResult(null);
@@ -508,6 +538,33 @@ export default function Dashboard() {
         </>
       )}
 
+      {/* Rerank LLM cache — identical rank_and_explain prompts served from
+          llm_cache instead of GPT-4o. Hit rate is this worker since deploy;
+          "served from cache" is the durable all-worker total. */}
+      {isAdmin && llmCache && (
+        <div className="p-4 rounded-2xl bg-white/[0.03] border border-white/10">
+          <div className="flex items-center gap-2 mb-3">
+            <Brain className="w-4 h-4 text-white/60" />
+            <h2 className="text-sm font-semibold text-white/80">LLM Cache</h2>
+            <span className="text-[10px] text-white/30">rerank prompts, TTL {llmCache.ttl_hours}h</span>
+          </div>
+          <div className="grid grid-cols-2 md:grid-cols-5 gap-2">
+            {[
+              ["hit rate", llmCache.worker.hit_rate == null ? "—" : `${Math.round(llmCache.worker.hit_rate * 100)}%`],
+              ["hits / misses", `${llmCache.worker.hits} / ${llmCache.worker.misses}`],
+              ["served from cache", llmCache.stored_hits.toLocaleString()],
+              ["live entries", `${llmCache.live_entries} / ${llmCache.entries}`],
+              ["errors", String(llmCache.worker.errors)],
+            ].map(([label, value]) => (
+              <div key={label} className="px-3 py-2 rounded-lg bg-white/[0.02] border border-white/5">
+                <div className="text-[10px] text-white/40 uppercase">{label}</div>
+                <div className="text-sm font-mono text-white/80">{value}</div>
+              </div>
+            ))}
+          </div>
+        </div>
+      )}
+
       {/* Adoption & Usage — accounts created + signup trend (historical),
           plus real usage (logins + magic-link opens) anchored to the
           tracking-start date. Usage numbers start at 0 and grow forward;
@@ -1,7 +1,7 @@
 import { useState } from "react";
 import { useSearchParams, Link } from "react-router-dom";
 import { MessageSquare, Send, Crown, Mic, Megaphone, User, Heart, ArrowLeft } from "lucide-react";
-import { useConversations, useConversation, useSendMessage } from "../hooks/useMessages";
+import { useConversations, useConversation, useSendMessage, useMessageStream } from "../hooks/useMessages";
 import { useAuth } from "../hooks/useAuth";
 
 const ticketColors: Record<string, string> = {
@@ -34,8 +34,15 @@ export default function Messages() {
   const activeMatchId = searchParams.get("match");
   const [messageInput, setMessageInput] = useState("");
 
+  useMessageStream();
   const { data: convsData, isLoading: loadingConvs } = useConversations();
-  const { data: thread, isLoading: loadingThread } = useConversation(activeMatchId);
+  const {
+    data: thread,
+    isLoading: loadingThread,
+    hasEarlier,
+    loadEarlier,
+    isLoadingEarlier,
+  } = useConversation(activeMatchId);
   const sendMutation = useSendMessage(activeMatchId);
 
   const handleSend = async () => {
@@ -195,6 +202,18 @@ export default function Messages() {
 
             {/* Messages */}
             <div className="flex-1 overflow-y-auto p-4 space-y-3">
+              {hasEarlier && (
+                <div className="text-center">
+                  <button
+                    type="button"
+                    onClick={() => loadEarlier()}
+                    disabled={isLoadingEarlier}
+                    className="text-xs text-white/40 hover:text-white/70 px-3 py-1.5 rounded-full border border-white/10 hover:bg-white/5 transition-all disabled:opacity-50"
+                  >
+                    {isLoadingEarlier ? "Loading…" : "Load earlier messages"}
+                  </button>
+                </div>
+              )}
               {thread?.messages.length === 0 && (
                 <div className="text-center py-8 text-white/20 text-sm">
                   No messages yet. Say hello!
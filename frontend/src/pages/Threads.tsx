@@ -1,5 +1,5 @@
 import { useState } from "react";
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { useInfiniteQuery, useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import {
   MessageCircle, Send, ArrowLeft, Users, Clock, Star,
 } from "lucide-react";
@@ -28,9 +28,18 @@ export default function Threads() {
     staleTime: 10_000,
   });
 
-  const { data: threadDetail, isLoading: loadingThread } = useQuery({
+  // Pages run newest → oldest; "load earlier" walks back with the cursor.
+  const {
+    data: threadPages,
+    isLoading: loadingThread,
+    hasNextPage: hasEarlier,
+    fetchNextPage: loadEarlier,
+    isFetchingNextPage: loadingEarlier,
+  } = useInfiniteQuery({
     queryKey: ["thread", activeSlug],
-    queryFn: () => getThread(activeSlug!),
+    queryFn: ({ pageParam }) => getThread(activeSlug!, pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (page) => (page.has_more ? page.before_cursor : undefined),
     enabled: !!activeSlug,
     staleTime: 5_000,
     refetchInterval: 5_000,
@@ -119,8 +128,9 @@ export default function Threads() {
   }
 
   // Thread detail view
-  const thread = threadDetail?.thread;
-  const posts = threadDetail?.posts ?? [];
+  const thread = threadPages?.pages[0]?.thread;
+  const posts = threadPages ? [...threadPages.pages].reverse().flatMap((p) => p.posts) : [];
+  const postCount = thread?.post_count ?? posts.length;
 
   return (
     <div className="max-w-3xl mx-auto space-y-4">
@@ -140,7 +150,7 @@ export default function Threads() {
         </div>
         <div className="flex items-center gap-1 text-white/30 text-sm">
           <Users className="w-4 h-4" />
-          {posts.length} post{posts.length !== 1 ? "s" : ""}
+          {postCount} post{postCount !== 1 ? "s" : ""}
         </div>
       </div>
 
@@ -156,7 +166,19 @@ export default function Threads() {
             <p>No posts yet. Be the first to start the conversation.</p>
           </div>
         ) : (
-          posts.map((post) => (
+          <>
+          {hasEarlier && (
+            <div className="text-center">
+              <button
+                onClick={() => loadEarlier()}
+                disabled={loadingEarlier}
+                className="text-xs text-white/40 hover:text-white/70 px-3 py-1.5 rounded-full border border-white/10 hover:bg-white/5 transition-all disabled:opacity-50"
+              >
+                {loadingEarlier ? "Loading…" : "Load earlier posts"}
+              </button>
+            </div>
+          )}
+          {posts.map((post) => (
             <div
               key={post.id}
               className={`p-4 rounded-xl border ${
@@ -179,7 +201,8 @@ export default function Threads() {
               </div>
               <p className="text-sm text-white/70 leading-relaxed pl-9">{post.content}</p>
             </div>
-          ))
+          ))}
+          </>
         )}
       </div>
 
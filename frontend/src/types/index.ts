@@ -77,6 +77,9 @@ export interface DashboardStats {
   post_meeting_satisfaction: number;
   top_sectors: { sector: string; count: number }[];
   match_type_distribution: Record<string, number>;
+  // Freshness of the materialized dashboard snapshot.
+  computed_at?: string | null;
+  age_seconds?: number | null;
 }
 
 export interface MatchQuality {
@@ -165,6 +168,9 @@ export interface ConversationDetail {
     ticket_type: string;
   } | null;
   messages: MessageData[];
+  has_more: boolean;
+  before_cursor: string | null;
+  after_cursor: string | null;
 }
 
 export interface MatchListResult {